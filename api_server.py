@@ -0,0 +1,581 @@
+"""
+비동기 HTTP API 서버 - 심리 상담 챗봇 + 도서 추천
+Gradio 없이 단독 실행되는 JSON API (FastAPI + uvicorn 멀티 워커)
+
+엔드포인트:
+-     POST /chat                    : Counselor Agent와 대화 (단일 턴)
+-     POST /chat/stream             : 대화 응답을 Server-Sent Events로 스트리밍
+-     POST /analyze                 : 대화 심리 분석 (PsychologicalSummary, 분석 후 이어진 대화는 새 메시지만 증분 분석)
+-     POST /analyze/update          : 이전 분석 결과 + 새 메시지만으로 증분 분석 (AnalysisUpdate, 바뀐 필드 포함)
+-     POST /recommend               : 분석 결과 기반 도서 추천 (CounselingResult, 검색어/장르가 같으면 이전 추천 재사용)
+-     POST /analyze-and-recommend   : 분석 + 추천 한 번에 실행
+-     GET  /books/{isbn}/similar    : 비슷한 책 (지금까지 검색된 책의 MinHash LSH 색인, LLM 호출 없음)
+-     POST /books/{isbn}/click      : 추천 도서 클릭 기록 (인기도 count-min sketch, PAGEMIND_POPULARITY_WEIGHT)
+-     GET  /conversation/{id}       : 대화 조회
+-     GET  /conversation/{id}/export: 대화 내보내기 (NDJSON 스트리밍)
+-     GET  /conversation/{id}/followup: 위기 턴(안전 안내를 먼저 보낸 턴)의 상담사 응답 (세션 저장소에서 생성될 때까지 대기)
+-     GET  /health                  : 헬스 체크 (liveness)
+-     GET  /ready                   : 에이전트 준비 완료 여부 (readiness, 준비 전 503)
+-     GET  /usage                   : 전체 토큰/비용 사용량 (워커별 집계)
+-     GET  /cache/warmer            : 검색 캐시 워머 상태 (상위 검색어, 오늘 네이버 호출 수, 워커별)
+-     GET  /metrics                 : Prometheus 메트릭 (PAGEMIND_TRACING=1일 때 기록, 워커별 집계)
+
+대화/분석 상태는 세션 저장소(PAGEMIND_SESSION_STORE)에 보관하므로
+저장소를 공유하면 어느 워커든 같은 대화의 다음 턴을 처리할 수 있음
+세션 저장소 호출(디스크/네트워크 I/O)은 스레드 풀에서 실행 (이벤트 루프와 SSE 스트림을 막지 않음)
+
+실행:
+    python api_server.py      # 공유 저장소(sqlite/redis)면 기본 4 워커, 프로세스별 저장소(memory 등)면 1 워커
+    PAGEMIND_SESSION_STORE=sqlite:///pagemind_sessions.db uvicorn api_server:app --workers 4 --timeout-keep-alive 30
+"""
+
+import asyncio
+import os
+import threading
+import uuid
+from contextlib import asynccontextmanager
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from dotenv import load_dotenv
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import PlainTextResponse, StreamingResponse
+
+from core_crewai.models import (
+    ChatRequest,
+    ChatResponse,
+    SummaryRequest,
+    PsychologicalSummary,
+    RecommendRequest,
+    BookRecommendation,
+    CounselingResult,
+    AnalysisUpdateRequest,
+    AnalysisUpdate,
+    SessionState,
+)
+from core_crewai.cache_warmer import cache_warmer
+from core_crewai.crisis_triage import CRISIS_FOLLOWUP_SECONDS
+from core_crewai.incremental_analysis import mark_analyzed, new_messages_since, reusable_books
+from core_crewai.popularity import popularity_tracker
+from core_crewai.serialization import dumps
+from core_crewai.session_store import (
+    create_session_store,
+    conversation_fingerprint,
+    iter_conversation_ndjson,
+)
+from core_crewai.similar_books import similar_books_index
+from core_crewai.startup import start_warmup
+from core_crewai.tracing import current_span, is_enabled, record_cache, render_prometheus, span
+
+load_dotenv()
+
+# 서버 설정 (환경 변수로 조정)
+API_HOST = os.getenv("PAGEMIND_API_HOST", "0.0.0.0")
+API_PORT = int(os.getenv("PAGEMIND_API_PORT", "8000"))
+KEEP_ALIVE_SECONDS = int(os.getenv("PAGEMIND_KEEP_ALIVE_SECONDS", "30"))
+SSE_PING_SECONDS = float(os.getenv("PAGEMIND_SSE_PING_SECONDS", "10"))
+SSE_CHUNK_CHARS = 40  # SSE delta 이벤트 하나에 담을 글자 수 (완성된 응답을 나누는 단위)
+
+# 워커 프로세스마다 하나의 오케스트레이터 (CrewAI 에이전트 재사용)
+# crewai import와 에이전트 생성은 백그라운드에서 진행되어 서버는 바로 요청을 받음 (PAGEMIND_WARMUP)
+orchestrator = start_warmup()
+# 자주 나오는 검색어의 네이버 결과를 한가한 시간에 미리 캐시 (PAGEMIND_CACHE_WARMER=1일 때)
+cache_warmer.start()
+# 추천 노출/클릭 인기도를 워커 간 공유 파일에 주기적으로 병합 (PAGEMIND_POPULARITY_PATH가 있을 때)
+popularity_tracker.start()
+
+# 세션 저장소 (대화, 분석 상태, 분석 결과 캐시)
+# spill://은 변경된 세션을 주기적으로 디스크에 기록하고 종료 시(lifespan, atexit) 모두 기록
+session_store = create_session_store().start()
+# 워커 수 - 프로세스별 저장소(memory://, local-kv://, spill://)는 워커마다 따로 생기므로 1 워커만
+API_WORKERS = int(os.getenv("PAGEMIND_API_WORKERS") or (4 if session_store.shared else 1))
+MAX_CACHED_SUMMARIES = 8  # 세션당 보관할 분석 결과 캐시 수
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    # 워커 종료 전 메모리에만 있는 세션 변경 기록
+    session_store.close()
+
+
+app = FastAPI(
+    title="심리 상담 챗봇 + 도서 추천 시스템 API",
+    version="1.0.0",
+    lifespan=lifespan,
+)
+
+
+@app.middleware("http")
+async def trace_requests(request: Request, call_next):
+    """요청마다 루트 스팬 생성 (오케스트레이터 단계 스팬이 이 아래에 중첩됨)"""
+    if not is_enabled():
+        return await call_next(request)
+    with span("http.request", method=request.method, path=request.url.path) as request_span:
+        response = await call_next(request)
+        request_span.set_attribute("http.status_code", response.status_code)
+        return response
+
+
+async def _prepare_turn(request: ChatRequest) -> Tuple[str, str, List[Dict]]:
+    """
+    요청에서 (conversation_id, 이번 턴 사용자 메시지, 이전 대화 기록) 추출
+
+    서버에 저장된 대화가 있으면 서버 기록을 우선 사용하고,
+    없으면 요청에 포함된 이전 메시지를 대화 기록으로 사용
+    """
+    if not request.messages or request.messages[-1].role != "user":
+        raise HTTPException(status_code=422, detail="마지막 메시지는 user 메시지여야 합니다.")
+
+    conversation_id = request.conversation_id or request.user_id or uuid.uuid4().hex
+    user_message = request.messages[-1].content
+    current_span().set_attribute("session", conversation_id)
+
+    state = await run_in_threadpool(session_store.load, conversation_id)
+    if state is not None and state.messages:
+        history = list(state.messages)
+    else:
+        history = [
+            {"role": m.role, "content": m.content}
+            for m in request.messages[:-1]
+        ]
+
+    return conversation_id, user_message, history
+
+
+def _save_turn(conversation_id: str, history: List[Dict], user_message: str, response: str, crisis: bool = False):
+    """대화 기록에 이번 턴 저장 (다른 워커와 충돌 시 최신 기록에 이어서 저장)"""
+    def append_turn(state: SessionState):
+        if not state.messages:
+            state.messages = list(history)
+        state.messages.append({"role": "user", "content": user_message})
+        state.messages.append({"role": "assistant", "content": response})
+        if crisis:
+            state.pending_followups += 1
+
+    session_store.update(conversation_id, append_turn)
+
+
+def _chat_turn(conversation_id: str, user_message: str, history: List[Dict]) -> Tuple[str, bool, bool]:
+    """
+    상담 턴 실행 후 저장 -> (응답, 분석 준비 완료 여부, 위기 턴 여부)
+    위기 턴의 상담사 응답은 백그라운드에서 생성되어 세션 저장소에 추가됨 (어느 워커에서든 /followup으로 받음)
+    """
+    triage = orchestrator.triage(user_message)
+    crisis = triage is not None and triage.is_crisis
+    turn_saved = threading.Event()
+    try:
+        response, analysis_ready = orchestrator.chat(
+            user_message, history, conversation_id, triage,
+            session_store.followup_sink(conversation_id, turn_saved) if crisis else None
+        )
+        _save_turn(conversation_id, history, user_message, response, crisis)
+    finally:
+        turn_saved.set()
+    return response, analysis_ready, crisis
+
+
+def _sse_event(event: str, data: Dict) -> str:
+    """Server-Sent Events 형식의 이벤트 문자열 생성"""
+    payload = dumps(data)
+    return f"event: {event}\ndata: {payload}\n\n"
+
+
+@app.get("/")
+async def root():
+    return {
+        "message": "심리 상담 챗봇 + 도서 추천 시스템 API",
+        "version": "1.0.0",
+        "endpoints": {
+            "chat": "/chat",
+            "chat_stream": "/chat/stream",
+            "analyze": "/analyze",
+            "analyze_update": "/analyze/update",
+            "recommend": "/recommend",
+            "analyze_and_recommend": "/analyze-and-recommend",
+            "similar_books": "/books/{isbn}/similar",
+            "book_click": "/books/{isbn}/click",
+            "conversation": "/conversation/{conversation_id}",
+            "crisis_followup": "/conversation/{conversation_id}/followup",
+            "ready": "/ready",
+            "metrics": "/metrics",
+        },
+    }
+
+
+@app.get("/health")
+async def health():
+    return {
+        "status": "healthy",
+        "timestamp": datetime.now().isoformat(),
+        "services": {
+            "chatbot": "operational",
+            "analyzer": "operational",
+            "recommender": "operational",
+        },
+    }
+
+
+@app.get("/ready")
+async def ready():
+    """readiness probe - 백그라운드 에이전트 준비가 끝나야 200"""
+    status = orchestrator.status()
+    if not status["ready"]:
+        raise HTTPException(status_code=503, detail=status)
+    return status
+
+
+@app.get("/usage")
+async def usage():
+    """이 워커의 전체 토큰 사용량 (단계별, 에이전트별)"""
+    return orchestrator.get_usage()
+
+
+@app.get("/cache/warmer")
+async def cache_warmer_status():
+    """이 워커의 검색 캐시 워머 상태 (상위 검색어 빈도, 오늘 네이버 API 호출 수)"""
+    return cache_warmer.status()
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    """스팬 지연 히스토그램, LLM 토큰/캐시 카운터 (Prometheus 텍스트 형식)"""
+    return PlainTextResponse(render_prometheus(), media_type="text/plain; version=0.0.4")
+
+
+@app.post("/chat", response_model=ChatResponse)
+async def chat(request: ChatRequest) -> ChatResponse:
+    """Counselor Agent와 대화 (단일 턴)"""
+    conversation_id, user_message, history = await _prepare_turn(request)
+
+    # CrewAI 실행은 동기 호출이므로 스레드 풀에서 실행 (이벤트 루프 블로킹 방지)
+    response, analysis_ready, crisis = await run_in_threadpool(
+        _chat_turn, conversation_id, user_message, history
+    )
+
+    return ChatResponse(
+        response=response,
+        conversation_id=conversation_id,
+        analysis_ready=analysis_ready,
+        crisis=crisis,
+        usage=orchestrator.get_usage(conversation_id),
+    )
+
+
+@app.post("/chat/stream")
+async def chat_stream(request: ChatRequest, http_request: Request) -> StreamingResponse:
+    """
+    Counselor Agent 응답을 Server-Sent Events로 스트리밍
+
+    이벤트 순서:
+    -     start : conversation_id 전달
+    -     delta : 완성된 응답을 SSE_CHUNK_CHARS 글자씩 나눈 조각
+    -     done  : 최종 ChatResponse
+    -     followup : 위기 턴이면 안전 안내(delta/done) 뒤 상담사 응답 ChatResponse
+    -     error : 처리 중 오류
+    응답 대기 중에는 SSE 주석(: keep-alive)으로 연결 유지
+
+    LLM 토큰을 그대로 중계하지 않음: _chat_turn이 끝날 때까지 delta가 나가지 않고,
+    delta는 완성된 응답을 사후에 나눈 것이라 첫 글자 지연은 /chat과 같음
+    """
+    conversation_id, user_message, history = await _prepare_turn(request)
+
+    async def event_stream():
+        yield _sse_event("start", {"conversation_id": conversation_id})
+
+        task = asyncio.ensure_future(
+            run_in_threadpool(_chat_turn, conversation_id, user_message, history)
+        )
+        try:
+            # 응답이 나올 때까지 주기적으로 keep-alive 전송
+            while not task.done():
+                done, _ = await asyncio.wait({task}, timeout=SSE_PING_SECONDS)
+                if done:
+                    break
+                if await http_request.is_disconnected():
+                    return
+                yield ": keep-alive\n\n"
+
+            response, analysis_ready, crisis = task.result()
+        except Exception as e:
+            yield _sse_event("error", {"conversation_id": conversation_id, "error": str(e)})
+            return
+
+        for i in range(0, len(response), SSE_CHUNK_CHARS):
+            yield _sse_event("delta", {"text": response[i:i + SSE_CHUNK_CHARS]})
+
+        final = ChatResponse(
+            response=response,
+            conversation_id=conversation_id,
+            analysis_ready=analysis_ready,
+            crisis=crisis,
+            usage=orchestrator.get_usage(conversation_id),
+        )
+        yield _sse_event("done", final.model_dump())
+        if not crisis:
+            return
+
+        # 안전 안내는 이미 보냈으므로 상담사 응답은 같은 연결에서 이어서 전송
+        followup = asyncio.ensure_future(
+            run_in_threadpool(session_store.wait_followups, conversation_id, CRISIS_FOLLOWUP_SECONDS)
+        )
+        while not followup.done():
+            done, _ = await asyncio.wait({followup}, timeout=SSE_PING_SECONDS)
+            if done:
+                break
+            if await http_request.is_disconnected():
+                return
+            yield ": keep-alive\n\n"
+        followups, _ = followup.result()
+        if followups:
+            yield _sse_event("followup", ChatResponse(
+                response="\n\n".join(followups),
+                conversation_id=conversation_id,
+                crisis=True,
+                usage=orchestrator.get_usage(conversation_id),
+            ).model_dump())
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "Connection": "keep-alive",
+            "X-Accel-Buffering": "no",  # 프록시 버퍼링 방지
+        },
+    )
+
+
+async def _messages_for_analysis(request: SummaryRequest) -> List[Dict]:
+    """분석 대상 메시지 결정 (요청 메시지 우선, 없으면 서버 저장 대화)"""
+    if request.messages:
+        return [{"role": m.role, "content": m.content} for m in request.messages]
+    state = await run_in_threadpool(session_store.load, request.conversation_id)
+    if state is None or not state.messages:
+        raise HTTPException(status_code=404, detail="대화를 찾을 수 없습니다.")
+    return list(state.messages)
+
+
+async def _analyze_with_cache(conversation_id: str, messages: List[Dict]) -> PsychologicalSummary:
+    """
+    대화 분석 (같은 대화 내용의 분석 결과가 세션에 캐시되어 있으면 재사용)
+    세션의 분석 결과 이후 대화가 이어졌으면 새 메시지만 증분 분석 (incremental_analysis)
+    분석 결과와 분석 완료 상태를 세션에 저장
+    """
+    current_span().set_attribute("session", conversation_id)
+    fingerprint = conversation_fingerprint(messages)
+    state = await run_in_threadpool(session_store.load, conversation_id)
+    cache_hit = state is not None and fingerprint in state.cached_summaries
+    record_cache("analysis", cache_hit)
+    if cache_hit:
+        return state.cached_summaries[fingerprint]
+
+    new_messages = new_messages_since(state, messages)
+    current_span().set_attribute("incremental", new_messages is not None)
+    if new_messages is not None:
+        summary, _ = await run_in_threadpool(
+            orchestrator.update_analysis, state.summary, new_messages, conversation_id
+        )
+    else:
+        summary = await run_in_threadpool(
+            orchestrator.analyze_conversation, messages, conversation_id
+        )
+
+    def store_summary(state: SessionState):
+        if not state.messages:
+            state.messages = list(messages)
+        state.summary = summary
+        state.analysis_done = True
+        mark_analyzed(state, messages, fingerprint)
+        state.cached_summaries[fingerprint] = summary
+        # 오래된 캐시부터 제거 (dict는 삽입 순서 유지)
+        while len(state.cached_summaries) > MAX_CACHED_SUMMARIES:
+            state.cached_summaries.pop(next(iter(state.cached_summaries)))
+
+    await run_in_threadpool(session_store.update, conversation_id, store_summary)
+    return summary
+
+
+@app.post("/analyze", response_model=PsychologicalSummary)
+async def analyze(request: SummaryRequest) -> PsychologicalSummary:
+    """Psychological Analyzer Agent로 대화 분석"""
+    messages = await _messages_for_analysis(request)
+    try:
+        return await _analyze_with_cache(request.conversation_id, messages)
+    except ValueError as e:
+        raise HTTPException(status_code=502, detail=str(e))
+
+
+@app.post("/analyze/update", response_model=AnalysisUpdate)
+async def analyze_update(request: AnalysisUpdateRequest) -> AnalysisUpdate:
+    """
+    증분 분석 - 이전 분석 결과(summary)에 이후 이어진 메시지(new_messages)만 반영
+    세션 상태는 바꾸지 않음 (conversation_id는 토큰 사용량 집계용, 서버 저장 대화는 /analyze가 자동으로 증분 분석)
+    """
+    current_span().set_attribute("session", request.conversation_id)
+    new_messages = [{"role": m.role, "content": m.content} for m in request.new_messages]
+    try:
+        summary, diff = await run_in_threadpool(
+            orchestrator.update_analysis, request.summary, new_messages, request.conversation_id
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=502, detail=str(e))
+    return AnalysisUpdate(summary=summary, diff=diff)
+
+
+async def _recommend_or_reuse(
+    conversation_id: Optional[str], summary: PsychologicalSummary, max_books: int
+) -> List[BookRecommendation]:
+    """
+    도서 추천 - 세션의 이전 추천과 검색어/장르가 같으면 다시 검색하지 않고 이전 추천 도서 재사용
+    (분석 후 대화가 이어져 감정/고민만 갱신된 경우)
+    """
+    state = await run_in_threadpool(session_store.load, conversation_id) if conversation_id else None
+    books = reusable_books(state, summary, max_books)
+    record_cache("recommendation", books is not None)
+    if books is not None:
+        return books
+    return await run_in_threadpool(
+        orchestrator.recommend_books_from_summary, summary, max_books, conversation_id
+    )
+
+
+@app.post("/recommend", response_model=CounselingResult)
+async def recommend(request: RecommendRequest) -> CounselingResult:
+    """분석 결과를 바탕으로 Book Recommender Agent로 도서 추천"""
+    current_span().set_attribute("session", request.conversation_id)
+    try:
+        books = await _recommend_or_reuse(request.conversation_id, request.summary, request.max_books)
+    except ValueError as e:
+        raise HTTPException(status_code=502, detail=str(e))
+
+    if request.conversation_id:
+        def mark_recommended(state: SessionState):
+            state.summary = request.summary
+            state.books_recommended = True
+            state.recommended_books = books
+            state.recommended_summary = request.summary
+
+        await run_in_threadpool(session_store.update, request.conversation_id, mark_recommended)
+
+    return CounselingResult(
+        summary=request.summary,
+        recommended_books=books,
+        generated_at=datetime.now().isoformat(),
+        usage=orchestrator.get_usage(request.conversation_id) if request.conversation_id else None,
+    )
+
+
+@app.post("/analyze-and-recommend", response_model=CounselingResult)
+async def analyze_and_recommend(request: SummaryRequest) -> CounselingResult:
+    """대화 분석 후 도서 추천까지 한 번에 실행"""
+    messages = await _messages_for_analysis(request)
+    try:
+        summary = await _analyze_with_cache(request.conversation_id, messages)
+        books = await _recommend_or_reuse(request.conversation_id, summary, 5)
+    except ValueError as e:
+        raise HTTPException(status_code=502, detail=str(e))
+
+    def mark_recommended(state: SessionState):
+        state.books_recommended = True
+        state.recommended_books = books
+        state.recommended_summary = summary
+
+    await run_in_threadpool(session_store.update, request.conversation_id, mark_recommended)
+
+    return CounselingResult(
+        summary=summary,
+        recommended_books=books,
+        generated_at=datetime.now().isoformat(),
+        usage=orchestrator.get_usage(request.conversation_id),
+    )
+
+
+@app.get("/books/{isbn}/similar", response_model=List[BookRecommendation])
+async def similar_books(isbn: str, limit: int = 5) -> List[BookRecommendation]:
+    """비슷한 책 조회 (이 워커가 지금까지 검색한 책 중에서, 색인에 없는 ISBN이면 404)"""
+    if similar_books_index.get(isbn) is None:
+        raise HTTPException(status_code=404, detail="색인에 없는 ISBN입니다. 먼저 도서 추천을 받아주세요.")
+    return await run_in_threadpool(orchestrator.find_similar_books, isbn, max(1, min(limit, 20)))
+
+
+@app.post("/books/{isbn}/click", status_code=204)
+async def book_click(isbn: str):
+    """추천 도서 클릭 기록 (다음 추천부터 인기도 점수에 반영, PAGEMIND_POPULARITY_WEIGHT > 0일 때)"""
+    popularity_tracker.record_click(isbn)
+
+
+@app.get("/conversation/{conversation_id}")
+async def get_conversation(conversation_id: str):
+    """저장된 대화 조회"""
+    state = await run_in_threadpool(session_store.load, conversation_id)
+    if state is None:
+        raise HTTPException(status_code=404, detail="대화를 찾을 수 없습니다.")
+    return {
+        "conversation_id": conversation_id,
+        "messages": state.messages,
+        "message_count": len(state.messages),
+        "analysis_done": state.analysis_done,
+        "books_recommended": state.books_recommended,
+        "summary": state.summary,
+        "usage": orchestrator.get_usage(conversation_id),  # 이 워커에서 집계한 토큰 사용량
+    }
+
+
+@app.get("/conversation/{conversation_id}/followup", response_model=ChatResponse)
+async def conversation_followup(conversation_id: str, wait: float = CRISIS_FOLLOWUP_SECONDS) -> ChatResponse:
+    """
+    위기 턴의 상담사 응답 (POST /chat 응답의 crisis가 true일 때)
+    응답은 세션 저장소에 추가되므로 어느 워커에서든 받을 수 있음
+    생성 중이면 wait초까지 기다리고, 그래도 없으면 404 (위기 턴이 이어졌으면 아직 받지 않은 응답을 모두 이어 붙여 반환)
+    """
+    followups, pending = await run_in_threadpool(
+        session_store.wait_followups, conversation_id, max(0.0, min(wait, CRISIS_FOLLOWUP_SECONDS))
+    )
+    if not followups:
+        detail = "상담사 응답이 아직 준비되지 않았습니다." if pending else "받을 상담사 응답이 없습니다."
+        raise HTTPException(status_code=404, detail=detail)
+    return ChatResponse(
+        response="\n\n".join(followups),
+        conversation_id=conversation_id,
+        crisis=True,
+        usage=orchestrator.get_usage(conversation_id),
+    )
+
+
+@app.get("/conversation/{conversation_id}/export")
+async def export_conversation(conversation_id: str) -> StreamingResponse:
+    """저장된 대화를 NDJSON으로 스트리밍 내보내기"""
+    state = await run_in_threadpool(session_store.load, conversation_id)
+    if state is None:
+        raise HTTPException(status_code=404, detail="대화를 찾을 수 없습니다.")
+    return StreamingResponse(
+        iter_conversation_ndjson(state),
+        media_type="application/x-ndjson",
+        headers={"Content-Disposition": f'attachment; filename="{conversation_id}.ndjson"'},
+    )
+
+# 서버 실행
+if __name__ == "__main__":
+    import uvicorn
+
+    if API_WORKERS > 1 and not session_store.shared:
+        raise SystemExit(
+            f"PAGEMIND_API_WORKERS={API_WORKERS}: 세션 저장소({os.getenv('PAGEMIND_SESSION_STORE', 'memory://')})가 "
+            "프로세스별이라 워커마다 다른 대화를 보게 됩니다. "
+            "PAGEMIND_SESSION_STORE=sqlite:///... 또는 redis://...를 지정하거나 워커를 1로 설정하세요."
+        )
+
+    print("=" * 60)
+    print("심리 상담 챗봇 + 도서 추천 API 서버")
+    print(f"http://{API_HOST}:{API_PORT} (workers={API_WORKERS})")
+    print("=" * 60 + "\n")
+
+    # 멀티 워커 실행을 위해 앱을 import 문자열로 전달
+    uvicorn.run(
+        "api_server:app",
+        host=API_HOST,
+        port=API_PORT,
+        workers=API_WORKERS,
+        timeout_keep_alive=KEEP_ALIVE_SECONDS,
+    )
@@ -20,9 +20,10 @@ if platform.system() == 'Windows':
 
 import gradio as gr
 from datetime import datetime
-from typing import List, Tuple
-import json
+from typing import Dict, List, Optional, Tuple
 import os
+import tempfile
+import threading
 
 from dotenv import load_dotenv
 load_dotenv()
@@ -31,134 +32,145 @@ NAVER_CLIENT_ID = os.getenv("NAVER_CLIENT_ID")
 NAVER_CLIENT_SECRET = os.getenv("NAVER_CLIENT_SECRET")
 
 # CrewAI Multi-Agent Orchestrator
-from core_crewai.crew_orchestrator import CrewOrchestrator
-from core_crewai.models import PsychologicalSummary, BookRecommendation
+from core_crewai.cache_warmer import cache_warmer
+from core_crewai.crisis_triage import CRISIS_FOLLOWUP_SECONDS
+from core_crewai.incremental_analysis import mark_analyzed, new_messages_since, reusable_books
+from core_crewai.popularity import popularity_tracker
+from core_crewai.startup import start_warmup
+from core_crewai.models import SessionState
+from core_crewai.session_store import create_session_store, iter_conversation_ndjson
+from core_crewai.logs import get_logger
+from core_crewai.formatting import (
+    format_analysis_only,
+    format_books_recommendation,
+    format_similar_books,
+)
+from core_crewai.profiling import annotate_profile, profiled
+from core_crewai.tracing import current_span, span, traced
+
+log = get_logger("gradio")
 
 # 서비스 인스턴스 생성 (CrewAI Orchestrator)
-orchestrator = CrewOrchestrator()
+# crewai import와 에이전트 생성은 백그라운드에서 진행 (UI는 바로 뜨고, 준비 전 요청은 준비될 때까지 대기)
+orchestrator = start_warmup()
+# 자주 나오는 검색어의 네이버 결과를 한가한 시간에 미리 캐시 (PAGEMIND_CACHE_WARMER=1일 때)
+cache_warmer.start()
+# 추천 노출/클릭 인기도를 워커 간 공유 파일에 주기적으로 병합 (PAGEMIND_POPULARITY_PATH가 있을 때)
+popularity_tracker.start()
+
+# 세션 저장소: 브라우저 세션별 대화 기록, 분석 완료 여부, 분석 결과, 책 추천 완료 여부
+# (PAGEMIND_SESSION_STORE로 SQLite/Redis를 지정하면 여러 워커가 공유)
+# 대화 기록의 원본은 세션 저장소 - 브라우저는 대화 기록을 보내지 않고 화면에는 마지막 한 페이지만 받음
+session_store = create_session_store().start()  # spill://은 주기적으로 디스크에 기록, 종료 시(atexit) 모두 기록
+CHAT_PAGE_MESSAGES = int(os.getenv("PAGEMIND_CHAT_PAGE_MESSAGES", "20"))  # 채팅 화면 한 페이지 메시지 수
+
 
-# 대화 저장소 및 분석 상태 추적
-conversation_history = []
-analysis_done = False  # 분석이 이미 수행되었는지 추적
-current_summary = None  # 현재 분석 결과 저장
-books_recommended = False  # 책 추천이 완료되었는지 추적
+def get_session_id(request: Optional[gr.Request]) -> str:
+    """Gradio 요청의 세션 식별자 (요청 정보가 없으면 기본 세션)"""
+    if request is not None and getattr(request, "session_hash", None):
+        return request.session_hash
+    return "default"
 
 
 def count_assistant_messages(history: List) -> int:
     """히스토리에서 assistant 메시지 개수 세기"""
-    count = 0
-    if history:
-        for msg in history:
-            if isinstance(msg, dict) and msg.get("role") == "assistant":
-                count += 1
-            elif isinstance(msg, tuple) and len(msg) == 2:
-                # 튜플 형식인 경우 (하위 호환성)
-                count += 1
-    return count
-
-
-def clean_message(msg: dict) -> dict:
+    return sum(1 for msg in history if msg.get("role") == "assistant")
+
+
+def append_messages(
+    session_id: str,
+    *messages: Dict,
+    analyzed: bool = False,
+    followup: bool = False,
+    **fields
+) -> SessionState:
     """
-    메시지에서 role과 content만 추출 (Anthropic API 호환)
-    Gradio가 추가하는 metadata 등 불필요한 필드 제거
+    세션 대화 기록 끝에 메시지 추가 (다른 필드도 함께 갱신)
+    analyzed면 추가한 메시지까지 분석 결과에 반영된 것으로 기록 (다음 분석은 이후 메시지만 증분 분석)
+    followup이면 위기 턴 상담사 응답을 생성 중으로 기록 (응답은 session_store.add_followup()으로 추가)
+    다른 워커와 충돌하면 최신 기록에 이어서 다시 적용하고, 저장된 세션 상태 반환
     """
-    return {
-        "role": msg.get("role", "user"),
-        "content": msg.get("content", "")
-    }
+    def apply(state: SessionState):
+        state.messages.extend(messages)
+        for name, value in fields.items():
+            setattr(state, name, value)
+        if analyzed:
+            mark_analyzed(state, state.messages)
+        if followup:
+            state.pending_followups += 1
+    
+    return session_store.update(session_id, apply)
 
 
-def format_analysis_only(summary: PsychologicalSummary) -> str:
-    """심리 분석 결과만 채팅 메시지 형식으로 포맷팅 (책 추천 없음)"""
-    result = "## 📊 심리 분석 결과\n\n"
-    
-    result += "### 🎯 주요 고민\n"
-    for concern in summary.main_concerns:
-        result += f"- {concern}\n"
-    result += "\n"
-    
-    result += "### 💭 감정 상태\n"
-    for emotion in summary.emotions:
-        result += f"- {emotion}\n"
-    result += "\n"
-    
-    result += "### 🧠 인지 패턴\n"
-    for pattern in summary.cognitive_patterns:
-        result += f"- {pattern}\n"
-    result += "\n"
-    
-    result += "### 💡 권장 전략\n"
-    for rec in summary.recommendations:
-        result += f"- {rec}\n"
-    result += "\n"
-    
-    result += f"### 🔍 추출된 키워드\n{', '.join(summary.keywords)}\n\n"
-    
-    # 책 추천 제안 메시지 추가
-    result += "---\n\n"
-    result += "충분한 상담이 끝난 것 같은데 책을 추천해드릴까요?"
-    
-    return result
+# 채팅 화면은 브라우저가 보관 - 이벤트마다 새 메시지만 chat_delta_box(gr.JSON)로 보내고
+# APPLY_CHAT_DELTA_JS가 브라우저에서 화면에 덧붙임 (서버 왕복 없음, 화면은 마지막 keep개로 유지)
+APPLY_CHAT_DELTA_JS = """
+(chat, delta) => {
+    if (!delta) return chat;
+    const current = delta.reset ? [] : (chat || []);
+    const messages = [...(delta.prepend || []), ...current, ...(delta.append || [])];
+    return delta.keep > 0 ? messages.slice(-delta.keep) : messages;
+}
+"""
 
 
-def format_books_recommendation(books: List[BookRecommendation], summary: PsychologicalSummary) -> str:
-    """책 추천 결과만 채팅 메시지 형식으로 포맷팅"""
-    result = "## 📚 추천 도서\n\n"
-    
-    if books:
-        for i, book in enumerate(books, 1):
-            result += f"**{i}. {book.title}** - {book.author}\n"
-            result += f"- 출판사: {book.publisher}\n"
-            result += f"- 추천 이유: {book.relevance_reason}\n"
-            if book.link:
-                result += f"- [네이버 도서 보기]({book.link})\n"
-            result += "\n"
-    else:
-        result += "⚠️ 도서 검색에 실패했습니다. "
-        result += f"다음 키워드로 직접 검색해보세요: {', '.join(summary.keywords)}\n"
-    
-    return result
+def chatbot_messages(messages: List[Dict]) -> List[Dict]:
+    """브라우저 채팅 화면 형식으로 변환 (화면에 바로 덧붙이므로 gr.Chatbot 후처리를 서버에서 적용)"""
+    return chatbot_interface.postprocess(messages).model_dump()
 
 
-def format_analysis_result(summary: PsychologicalSummary, books: List) -> str:
-    """분석 결과를 채팅 메시지 형식으로 포맷팅 (하위 호환성용)"""
-    result = format_analysis_only(summary)
-    result = result.replace("충분한 상담이 끝난 것 같은데 책을 추천해드릴까요?", "")
-    result += "\n" + format_books_recommendation(books, summary)
-    return result
+def chat_delta(messages: List[Dict], synced_count: int, visible_count: int) -> Tuple[Dict, int]:
+    """
+    채팅 화면에 덧붙일 새 메시지 -> (delta, 브라우저에 보낸 세션 메시지 수)
+    브라우저에 이미 보낸 synced_count개 이후 메시지만 (최대 visible_count개) 보냄
+    세션이 초기화되어 메시지가 줄었으면 화면을 비우고 마지막 한 페이지를 다시 보냄
+    """
+    reset = synced_count > len(messages)
+    start = 0 if reset else synced_count
+    if visible_count > 0:
+        start = max(start, len(messages) - visible_count)
+    delta = {
+        "seq": len(messages),  # 내용이 같은 delta가 연달아 와도 화면에 적용되도록 (change 이벤트)
+        "reset": reset,
+        "append": chatbot_messages(messages[start:]),
+        "keep": visible_count,
+    }
+    return delta, len(messages)
+
+
+def older_button(messages: List[Dict], visible_count: int):
+    """화면에 보이지 않는 이전 메시지가 있으면 "이전 대화 더 보기" 버튼 표시"""
+    hidden = max(0, len(messages) - visible_count)
+    return gr.update(value=f"⬆️ 이전 대화 더 보기 ({hidden}개)", visible=hidden > 0)
 
 
-async def chat_with_bot(message: str, history: List) -> Tuple[List, str, bool, str]:
+@traced("gradio.chat")
+@profiled("gradio.chat")
+async def chat_with_bot(message: str, request: gr.Request = None) -> Tuple[List, str, bool, str, bool]:
     """
     심리 상담 챗봇과 대화
     5회 이상의 assistant 응답을 받으면 자동으로 분석 및 추천 실행
     
     Args:
         message: 사용자 메시지
-        history: 대화 기록 (Gradio 6.0 형식)
+        request: Gradio 요청 정보 (세션 식별용, Gradio가 자동 주입)
     
     Returns:
-        (업데이트된 대화 기록, 상태 메시지, 장르 드롭다운 표시 여부, 장르 안내 메시지)
+        (세션의 전체 대화 기록, 상태 메시지, 장르 드롭다운 표시 여부, 장르 안내 메시지, 위기 턴 여부)
+        대화 기록은 브라우저에서 받지 않고 세션 저장소의 기록을 사용
     """
-    global conversation_history, analysis_done
+    session_id = get_session_id(request)
+    current_span().set_attribute("session", session_id)
+    annotate_profile(session=session_id)
+    session = session_store.load_or_create(session_id)
+    analysis_done = session.analysis_done
+    history = list(session.messages)
     
     if not message.strip():
-        return history, "메시지를 입력해주세요."
-    
-    # Gradio 6.0 형식에서 메시지 리스트로 변환 (메타데이터 제거)
-    messages = []
-    if history:
-        if isinstance(history[0], dict):
-            for msg in history:
-                if "role" in msg and "content" in msg:
-                    messages.append(clean_message(msg))
-        elif isinstance(history[0], tuple):
-            for user_msg, bot_msg in history:
-                messages.append({"role": "user", "content": user_msg})
-                messages.append({"role": "assistant", "content": bot_msg})
+        return history, "메시지를 입력해주세요.", analysis_done, "", False
     
     # 현재 메시지 추가
-    messages.append({"role": "user", "content": message})
+    messages = history + [{"role": "user", "content": message}]
     
     # assistant 메시지 개수 확인 (현재 응답 전)
     assistant_count_before = count_assistant_messages(history)
@@ -167,28 +179,41 @@ async def chat_with_bot(message: str, history: List) -> Tuple[List, str, bool, s
     is_last_response = (assistant_count_before == 4 and not analysis_done)
     
     try:
-        # 마지막 응답인 경우 끝맺는 말을 하도록 프롬프트 추가
+        # 마지막 응답인 경우 끝맺는 말을 하도록 프롬프트 추가 (분석 입력에만 사용, 화면/세션에는 원래 메시지)
         if is_last_response:
             closing_prompt = "\n\n[중요: 이것이 이번 상담의 마지막 응답입니다. 사용자에게 따뜻하고 격려하는 마무리 인사를 하되, 추가 질문을 하지 말고 상담을 자연스럽게 마무리해주세요. 예: '오늘 대화를 통해 많은 것을 나눈 것 같습니다. 앞으로도 힘내시길 바라며, 필요하시면 언제든 다시 찾아주세요.'와 같은 형식으로 마무리하세요.]"
-            messages[-1]["content"] = message + closing_prompt
+            messages[-1] = {"role": "user", "content": message + closing_prompt}
         
         # CrewAI Orchestrator를 통한 챗봇 응답 생성
         # orchestrator.chat()는 이제 (응답, 분석준비여부) 튜플 반환
-        response, analysis_ready = orchestrator.chat(message, history)
-        
-        # 대화 기록 업데이트
-        conversation_history = messages + [{"role": "assistant", "content": response}]
+        # 위기 턴의 상담사 응답은 백그라운드에서 생성되어 이번 턴이 저장된 뒤 세션 저장소에 추가됨
+        triage = orchestrator.triage(message)
+        crisis = triage is not None and triage.is_crisis
+        turn_saved = threading.Event()
+        try:
+            # CrewAI kickoff는 실행 중인 이벤트 루프 안에서 동기 호출할 수 없으므로 작업 스레드에서 실행
+            response, analysis_ready = await asyncio.to_thread(
+                orchestrator.chat, message, history, session_id, triage,
+                session_store.followup_sink(session_id, turn_saved) if crisis else None
+            )
+            
+            # 대화 기록 업데이트 (세션 저장소가 원본)
+            conversation_history = messages + [{"role": "assistant", "content": response}]
+            turn = [{"role": "user", "content": message}, {"role": "assistant", "content": response}]
+            history = append_messages(session_id, *turn, followup=crisis).messages
+        finally:
+            turn_saved.set()
         
-        # Gradio 히스토리 업데이트
-        history.append({"role": "user", "content": message})
-        history.append({"role": "assistant", "content": response})
+        # 위기 신호로 안전 안내를 먼저 보낸 턴은 자동 분석하지 않음 (상담사 응답은 submit_message에서 이어서 표시)
+        if crisis:
+            return history, "💛 안전 안내를 먼저 전해드렸어요. 상담사 응답을 준비하고 있습니다...", False, "", True
         
         # assistant 메시지 개수 확인
         assistant_count = count_assistant_messages(history)
         
         # LLM이 정보 수집 완료를 판단했거나, 5회 이상 대화했다면 자동 분석 실행
         if (analysis_ready or assistant_count >= 5) and not analysis_done:
-            status = f"✅ 응답 생성 완료 ({len(conversation_history)}개 메시지)\n\n"
+            status = f"✅ 응답 생성 완료 ({len(history)}개 메시지)\n\n"
             if analysis_ready:
                 status += "🤖 AI가 충분한 정보를 수집했다고 판단했습니다. 자동으로 분석을 시작합니다..."
             else:
@@ -196,97 +221,89 @@ async def chat_with_bot(message: str, history: List) -> Tuple[List, str, bool, s
             
             # 심리 분석만 실행 (책 추천은 나중에) - CrewAI Orchestrator 사용
             try:
-                summary = orchestrator.analyze_conversation(conversation_history)
-                
-                # 전역 변수에 저장
-                global current_summary
-                current_summary = summary
-                
-                # 분석 결과만 채팅 메시지로 추가 (책 추천 제안 포함)
-                analysis_result = format_analysis_only(summary)
-                history.append({
-                    "role": "assistant",
-                    "content": analysis_result
-                })
-                
-                # conversation_history에도 추가
-                conversation_history.append({
-                    "role": "assistant",
-                    "content": analysis_result
-                })
+                summary = await asyncio.to_thread(
+                    orchestrator.analyze_conversation, conversation_history, session_id=session_id
+                )
                 
-                analysis_done = True
+                # 분석 결과만 채팅 메시지로 추가 (책 추천 제안 포함) + 세션에 분석 결과 저장
+                with span("gradio.render", view="analysis"):
+                    analysis_result = format_analysis_only(summary)
+                history = append_messages(
+                    session_id,
+                    {"role": "assistant", "content": analysis_result},
+                    analyzed=True,
+                    summary=summary,
+                    analysis_done=True
+                ).messages
                 status += "\n✅ 심리 분석 완료! 선호 장르를 선택한 후 '📚 책 추천받기' 버튼을 눌러주세요."
                 
                 # 장르 선택 UI 표시
-                return history, status, True, "💡 장르를 선택하면 더 정확한 추천을 받을 수 있습니다."
-                
+                return history, status, True, "💡 장르를 선택하면 더 정확한 추천을 받을 수 있습니다.", False
+            
             except Exception as analysis_error:
-                import traceback
-                print(f"분석 오류: {traceback.format_exc()}")
+                log.exception("분석 오류", session_id=session_id)
                 error_msg = f"분석 중 오류가 발생했습니다: {str(analysis_error)}"
-                history.append({
-                    "role": "assistant",
-                    "content": f"⚠️ {error_msg}"
-                })
+                history = append_messages(session_id, {"role": "assistant", "content": f"⚠️ {error_msg}"}).messages
                 status += f"\n❌ 분석 실패: {str(analysis_error)}"
-                return history, status, False, ""
+                return history, status, False, "", False
         else:
             if analysis_done:
-                status = f"✅ 응답 생성 완료 ({len(conversation_history)}개 메시지) - 분석 완료됨"
-                return history, status, True, "💡 장르를 선택하면 더 정확한 추천을 받을 수 있습니다."
+                status = f"✅ 응답 생성 완료 ({len(history)}개 메시지) - 분석 완료됨"
+                return history, status, True, "💡 장르를 선택하면 더 정확한 추천을 받을 수 있습니다.", False
             else:
-                status = f"✅ 응답 생성 완료 ({len(conversation_history)}개 메시지)\n"
+                status = f"✅ 응답 생성 완료 ({len(history)}개 메시지)\n"
                 status += f"💡 AI가 충분한 정보를 수집했다고 판단하면 자동으로 분석이 시작됩니다.\n"
                 if assistant_count < 5:
                     remaining = 5 - assistant_count
                     status += f"   (또는 {remaining}회 더 대화 후 자동 분석)"
         
-        return history, status, False, ""
+        return history, status, False, "", False
     
     except Exception as e:
         error_msg = f"죄송합니다. 오류가 발생했습니다: {str(e)}"
-        history.append({"role": "user", "content": message})
-        history.append({"role": "assistant", "content": error_msg})
-        return history, f"❌ 오류: {str(e)}", False, ""
+        history = append_messages(
+            session_id,
+            {"role": "user", "content": message},
+            {"role": "assistant", "content": error_msg}
+        ).messages
+        return history, f"❌ 오류: {str(e)}", False, "", False
 
 
-async def manual_analyze_and_recommend(history: List, selected_genre: str) -> Tuple[List, str, bool, str]:
+@traced("gradio.analyze_and_recommend")
+@profiled("gradio.analyze_and_recommend")
+async def manual_analyze_and_recommend(selected_genre: str, request: gr.Request = None) -> Tuple[List, str, bool, str]:
     """
     수동으로 분석 및 도서 추천 실행
     - 분석이 안 되어 있으면: 심리 분석 수행 + 책 추천 제안
     - 분석이 되어 있으면: 책 추천 수행
+      (분석 후 대화가 이어졌으면 새 메시지만 증분 분석, 검색 키워드/장르가 이전 추천과 같으면 다시 검색하지 않음)
     
     Args:
-        history: 대화 기록
         selected_genre: 선택된 장르
+        request: Gradio 요청 정보 (세션 식별용, Gradio가 자동 주입)
     
     Returns:
-        (업데이트된 대화 기록, 상태 메시지, 장르 드롭다운 표시 여부, 장르 안내 메시지)
+        (세션의 전체 대화 기록, 상태 메시지, 장르 드롭다운 표시 여부, 장르 안내 메시지)
     """
-    global conversation_history, analysis_done, current_summary, books_recommended
-    
-    # 히스토리에서 메시지 리스트로 변환 (메타데이터 제거)
-    messages = []
-    if history:
-        if isinstance(history[0], dict):
-            for msg in history:
-                if "role" in msg and "content" in msg:
-                    messages.append(clean_message(msg))
-        elif isinstance(history[0], tuple):
-            for user_msg, bot_msg in history:
-                messages.append({"role": "user", "content": user_msg})
-                messages.append({"role": "assistant", "content": bot_msg})
-    
-    if not messages:
+    session_id = get_session_id(request)
+    current_span().set_attribute("session", session_id)
+    annotate_profile(session=session_id)
+    session = session_store.load_or_create(session_id)
+    analysis_done = session.analysis_done
+    current_summary = session.summary
+    books_recommended = session.books_recommended
+    history = list(session.messages)
+    
+    if not history:
         return history, "❌ 대화 내용이 없습니다. 먼저 상담을 진행해주세요.", False, ""
     
-    # conversation_history 업데이트
-    conversation_history = messages
+    # 분석 후 이어진 대화 - 증분 분석 대상 (너무 길게 이어졌으면 None -> 전체 대화를 다시 분석)
+    new_messages = new_messages_since(session, history) if analysis_done else None
+    reanalyze = analysis_done and new_messages is None and 0 < session.analyzed_messages < len(history)
     
     try:
-        # 이미 책 추천이 완료된 경우
-        if books_recommended:
+        # 이미 책 추천이 완료되었고 그 뒤로 이어진 대화가 없는 경우
+        if books_recommended and not (new_messages or reanalyze):
             return history, "ℹ️ 이미 책 추천이 완료되었습니다. 대화를 초기화하고 다시 시도해주세요.", False, ""
         
         # 분석이 이미 완료된 경우 -> 책 추천만 수행
@@ -296,24 +313,41 @@ async def manual_analyze_and_recommend(history: List, selected_genre: str) -> Tu
             # 장르 정보를 summary에 추가
             current_summary.genre = selected_genre
             
-            # CrewAI Orchestrator를 통한 도서 추천
-            books = orchestrator.recommend_books_from_summary(current_summary, max_books=5)
-            
-            # 책 추천 결과를 채팅 메시지로 추가
-            books_result = format_books_recommendation(books, current_summary)
-            history.append({
-                "role": "assistant",
-                "content": books_result
-            })
+            # 분석 후 대화가 이어졌으면 새 메시지만 반영해 분석 결과 갱신
+            if new_messages:
+                current_summary, _ = await asyncio.to_thread(
+                    orchestrator.update_analysis, current_summary, new_messages, session_id=session_id
+                )
+            elif reanalyze:
+                current_summary = await asyncio.to_thread(
+                    orchestrator.analyze_conversation, history, session_id=session_id
+                )
+                current_summary.genre = selected_genre
             
-            # conversation_history에도 추가
-            conversation_history.append({
-                "role": "assistant",
-                "content": books_result
-            })
+            # 이전 추천과 검색어/장르가 같으면 다시 검색하지 않음, 아니면 CrewAI Orchestrator를 통한 도서 추천
+            books = reusable_books(session, current_summary, 5)
+            reused = books is not None
+            if not reused:
+                books = await asyncio.to_thread(
+                    orchestrator.recommend_books_from_summary, current_summary, max_books=5, session_id=session_id
+                )
             
-            books_recommended = True
-            status = f"✅ 책 추천 완료! ({len(books)}권 추천)"
+            # 책 추천 결과를 채팅 메시지로 추가
+            with span("gradio.render", view="books"):
+                books_result = format_books_recommendation(books, current_summary)
+            history = append_messages(
+                session_id,
+                {"role": "assistant", "content": books_result},
+                analyzed=True,
+                summary=current_summary,
+                books_recommended=True,
+                recommended_books=books,
+                recommended_summary=current_summary
+            ).messages
+            if reused:
+                status = f"✅ 이어진 대화를 반영했어요. 검색 키워드가 같아 이전 추천 도서를 다시 보여드립니다 ({len(books)}권)"
+            else:
+                status = f"✅ 책 추천 완료! ({len(books)}권 추천)"
             
             # 장르 드롭다운 숨기기
             return history, status, False, ""
@@ -321,74 +355,122 @@ async def manual_analyze_and_recommend(history: List, selected_genre: str) -> Tu
         # 분석이 안 되어 있는 경우 -> 심리 분석 수행 + 책 추천 제안
         # 먼저 AI의 안내 메시지를 채팅에 추가
         intro_message = "지금까지 나눈 대화를 통해 도움이 될 만한 책을 추천해줄게요"
-        history.append({
-            "role": "assistant",
-            "content": intro_message
-        })
-        conversation_history.append({
-            "role": "assistant",
-            "content": intro_message
-        })
+        history = append_messages(session_id, {"role": "assistant", "content": intro_message}).messages
         
         status = "🔍 분석을 시작합니다. 잠시만 기다려주세요..."
         
         # CrewAI Orchestrator를 통한 심리 분석 실행
-        summary = orchestrator.analyze_conversation(conversation_history)
-        
-        # 전역 변수에 저장
-        current_summary = summary
-        
-        # 분석 결과를 채팅 메시지로 추가 (책 추천 제안 포함)
-        analysis_result = format_analysis_only(summary)
-        history.append({
-            "role": "assistant",
-            "content": analysis_result
-        })
+        summary = await asyncio.to_thread(orchestrator.analyze_conversation, history, session_id=session_id)
         
-        # conversation_history에도 추가
-        conversation_history.append({
-            "role": "assistant",
-            "content": analysis_result
-        })
-        
-        analysis_done = True
+        # 분석 결과를 채팅 메시지로 추가 (책 추천 제안 포함) + 세션에 분석 결과 저장
+        with span("gradio.render", view="analysis"):
+            analysis_result = format_analysis_only(summary)
+        history = append_messages(
+            session_id,
+            {"role": "assistant", "content": analysis_result},
+            analyzed=True,
+            summary=summary,
+            analysis_done=True
+        ).messages
         status = "✅ 심리 분석 완료! 선호 장르를 선택한 후 '📚 책 추천받기' 버튼을 눌러주세요."
         
         # 장르 선택 UI 표시
         return history, status, True, "💡 장르를 선택하면 더 정확한 추천을 받을 수 있습니다."
     
     except Exception as e:
-        import traceback
-        error_detail = traceback.format_exc()
-        print(f"수동 분석 중 오류: {error_detail}")
+        log.exception("수동 분석 중 오류", session_id=session_id)
         error_msg = f"분석 중 오류가 발생했습니다: {str(e)}"
         return history, f"❌ {error_msg}", False, ""
 
 
-def clear_conversation() -> Tuple[List, str, bool, str]:
-    """대화 기록 초기화"""
-    global conversation_history, analysis_done, current_summary, books_recommended
-    conversation_history = []
-    analysis_done = False
-    current_summary = None
-    books_recommended = False
-    return [], "🔄 대화 기록이 초기화되었습니다.", False, ""
+def similar_book_choices(request: gr.Request = None):
+    """추천한 도서가 있으면 "비슷한 책 찾기" 선택 목록 표시 (제목 -> ISBN)"""
+    session = session_store.load(get_session_id(request))
+    books = [book for book in (session.recommended_books if session else []) if book.isbn]
+    choices = [(book.title, book.isbn) for book in books]
+    return (
+        gr.update(choices=choices, value=choices[0][1] if choices else None, visible=bool(choices)),
+        gr.update(visible=bool(choices))
+    )
 
 
-def export_conversation() -> str:
-    """대화 내용을 JSON으로 내보내기"""
-    global conversation_history
+@traced("gradio.similar_books")
+async def find_similar_books(isbn: str, request: gr.Request = None) -> Tuple[List, str]:
+    """
+    선택한 추천 도서와 비슷한 책 찾기 (추천 Crew 재실행 없이 유사 도서 색인 조회)
     
-    if not conversation_history:
-        return "내보낼 대화 내용이 없습니다."
+    Returns:
+        (세션의 전체 대화 기록, 상태 메시지)
+    """
+    session_id = get_session_id(request)
+    current_span().set_attribute("session", session_id)
+    session = session_store.load(session_id)
+    history = list(session.messages) if session else []
+    source = next((book for book in (session.recommended_books if session else []) if book.isbn == isbn), None)
+    if source is None:
+        return history, "❌ 먼저 책 추천을 받은 뒤 기준 도서를 선택해주세요."
+    
+    books = await asyncio.to_thread(orchestrator.find_similar_books, isbn, max_books=5)
+    with span("gradio.render", view="similar"):
+        similar_result = format_similar_books(books, source.title)
+    history = append_messages(session_id, {"role": "assistant", "content": similar_result}).messages
+    return history, f"✅ 비슷한 책 {len(books)}권을 찾았습니다."
+
+
+async def append_crisis_followup(request: gr.Request = None) -> Tuple[List, str]:
+    """
+    위기 턴의 상담사 응답을 기다려 표시 (응답은 백그라운드에서 생성되어 세션 대화 기록에 추가됨)
     
-    export_data = {
-        "exported_at": datetime.now().isoformat(),
-        "message_count": len(conversation_history),
-        "messages": conversation_history
-    }
+    Returns:
+        (세션의 전체 대화 기록, 상태 메시지)
+    """
+    session_id = get_session_id(request)
+    followups, _ = await asyncio.to_thread(session_store.wait_followups, session_id, CRISIS_FOLLOWUP_SECONDS)
+    session = session_store.load(session_id)
+    history = list(session.messages) if session else []
+    if not followups:
+        return history, "⚠️ 상담사 응답이 늦어지고 있습니다. 위의 상담 전화로 바로 연락해 주세요."
+    return history, f"✅ 응답 생성 완료 ({len(history)}개 메시지)"
+
+
+def load_older_messages(synced_count: int, visible_count: int, request: gr.Request = None):
+    """이전 대화 한 페이지(CHAT_PAGE_MESSAGES개)를 화면 앞에 덧붙여 표시 (그 사이 새 메시지도 함께)"""
+    session = session_store.load(get_session_id(request))
+    history = session.messages if session else []
+    # 브라우저 화면의 첫 메시지 위치 (보낸 메시지 중 마지막 visible_count개를 보관)
+    first = max(0, min(synced_count, len(history)) - visible_count)
+    older = history[max(0, first - CHAT_PAGE_MESSAGES):first]
+    visible_count += CHAT_PAGE_MESSAGES
+    delta, synced_count = chat_delta(history, synced_count, visible_count)
+    if not delta["reset"]:
+        delta["prepend"] = chatbot_messages(older)
+    return delta, synced_count, visible_count, older_button(history, visible_count)
+
+
+def clear_conversation(request: gr.Request = None):
+    """대화 기록 초기화 (화면에 보이는 메시지 수도 한 페이지로)"""
+    session_store.delete(get_session_id(request))
+    return [], None, "🔄 대화 기록이 초기화되었습니다.", False, "", 0, CHAT_PAGE_MESSAGES, gr.update(visible=False)
+
+
+def export_conversation(request: gr.Request = None) -> Optional[str]:
+    """
+    대화 내용을 NDJSON 파일로 내보내기
+    세션 저장소에서 한 줄씩 파일로 기록하고 파일 경로 반환 (대화가 없으면 None)
+    """
+    session = session_store.load(get_session_id(request))
+    
+    if session is None or not session.messages:
+        gr.Info("내보낼 대화 내용이 없습니다.")
+        return None
     
-    return json.dumps(export_data, ensure_ascii=False, indent=2)
+    filename = f"conversation_{datetime.now().strftime('%Y%m%d_%H%M%S')}.ndjson"
+    export_path = os.path.join(tempfile.mkdtemp(prefix="pagemind_export_"), filename)
+    with open(export_path, "wb") as f:
+        for line in iter_conversation_ndjson(session):
+            f.write(line)
+    
+    return export_path
 
 
 # Gradio 인터페이스 구성 (단일 탭)
@@ -424,7 +506,12 @@ with gr.Blocks(
         max_lines=3
     )
     
-    # 채팅 인터페이스
+    # 채팅 인터페이스 (마지막 CHAT_PAGE_MESSAGES개부터, 이전 대화는 버튼으로 한 페이지씩)
+    # 화면 내용은 브라우저가 보관하고 서버는 새 메시지만 chat_delta_box로 보냄
+    visible_count = gr.State(CHAT_PAGE_MESSAGES)
+    synced_count = gr.State(0)  # 브라우저에 보낸 세션 메시지 수
+    chat_delta_box = gr.JSON(visible=False)
+    older_btn = gr.Button("⬆️ 이전 대화 더 보기", variant="secondary", size="sm", visible=False)
     chatbot_interface = gr.Chatbot(
         label="대화",
         elem_id="chatbot",
@@ -460,10 +547,20 @@ with gr.Blocks(
         clear_btn = gr.Button("🔄 대화 초기화", variant="secondary")
         export_btn = gr.Button("💾 대화 내보내기", variant="secondary")
     
+    # 비슷한 책 찾기 (책 추천 후 표시)
+    with gr.Row():
+        similar_dropdown = gr.Dropdown(
+            label="🔎 비슷한 책을 찾을 추천 도서",
+            choices=[],
+            interactive=True,
+            visible=False,
+            scale=4
+        )
+        similar_btn = gr.Button("🔎 비슷한 책 찾기", variant="secondary", visible=False, scale=1)
+    
     # 내보내기 출력 (숨김)
-    export_output = gr.Textbox(
-        label="내보낸 대화 (JSON)",
-        lines=10,
+    export_output = gr.File(
+        label="내보낸 대화 (NDJSON)",
         visible=False
     )
     
@@ -477,6 +574,7 @@ with gr.Blocks(
       - AI 판단 기준: 주요 고민, 감정, 상황, 원인 인식, 대처 방식 파악 완료
       - 안전장치: 5회 대화 후 자동 분석 (정보 부족 시)
     - **수동 분석**: 언제든지 "📚 책 추천받기" 버튼을 클릭하여 분석 및 추천을 받을 수 있습니다
+    - **비슷한 책 찾기**: 추천 도서를 고르고 "🔎 비슷한 책 찾기"를 누르면 바로 비슷한 책을 보여드립니다
     - **대화 기록**: 모든 대화 내용이 위에 표시됩니다
     - **개인정보**: 민감한 개인정보는 입력하지 마세요
     
@@ -501,40 +599,92 @@ with gr.Blocks(
     """)
     
     # 이벤트 핸들러
-    async def submit_message(message, history):
-        """메시지 전송 처리 (async)"""
-        new_history, status, show_genre, genre_msg = await chat_with_bot(message, history)
-        return new_history, status, "", gr.update(visible=show_genre), gr.update(value=genre_msg, visible=show_genre)
+    # 대화 기록은 입력으로 받지 않고(세션 저장소가 원본) 브라우저에 아직 보내지 않은 메시지만 chat_delta_box로 보냄
+    async def submit_message(message, synced_count, visible_count, request: gr.Request):
+        """메시지 전송 처리 (async) - 위기 턴은 안전 안내를 먼저 보여 주고 상담사 응답을 이어서 표시"""
+        history, status, show_genre, genre_msg, crisis = await chat_with_bot(message, request)
+        delta, synced_count = chat_delta(history, synced_count, visible_count)
+        yield (
+            delta, synced_count, status, "",
+            gr.update(visible=show_genre), gr.update(value=genre_msg, visible=show_genre),
+            older_button(history, visible_count)
+        )
+        if crisis:
+            history, status = await append_crisis_followup(request)
+            delta, synced_count = chat_delta(history, synced_count, visible_count)
+            yield delta, synced_count, status, "", gr.update(), gr.update(), older_button(history, visible_count)
+    
+    async def recommend(selected_genre, synced_count, visible_count, request: gr.Request):
+        """책 추천받기 처리 (async)"""
+        history, status, show_genre, genre_msg = await manual_analyze_and_recommend(selected_genre, request)
+        delta, synced_count = chat_delta(history, synced_count, visible_count)
+        return (
+            delta, synced_count, status,
+            gr.update(visible=show_genre), gr.update(value=genre_msg, visible=show_genre),
+            older_button(history, visible_count)
+        )
+    
+    async def show_similar_books(isbn, synced_count, visible_count, request: gr.Request):
+        """비슷한 책 찾기 처리 (async)"""
+        history, status = await find_similar_books(isbn, request)
+        delta, synced_count = chat_delta(history, synced_count, visible_count)
+        return delta, synced_count, status, older_button(history, visible_count)
+    
+    # 새 메시지를 브라우저에서 채팅 화면에 덧붙임 (생성기 핸들러의 yield마다 적용)
+    chat_delta_box.change(
+        fn=None,
+        js=APPLY_CHAT_DELTA_JS,
+        inputs=[chatbot_interface, chat_delta_box],
+        outputs=[chatbot_interface]
+    )
     
     submit_btn.click(
         fn=submit_message,
-        inputs=[msg_input, chatbot_interface],
-        outputs=[chatbot_interface, status_box, msg_input, genre_dropdown, genre_info]
+        inputs=[msg_input, synced_count, visible_count],
+        outputs=[chat_delta_box, synced_count, status_box, msg_input, genre_dropdown, genre_info, older_btn]
     )
     
     msg_input.submit(
         fn=submit_message,
-        inputs=[msg_input, chatbot_interface],
-        outputs=[chatbot_interface, status_box, msg_input, genre_dropdown, genre_info]
+        inputs=[msg_input, synced_count, visible_count],
+        outputs=[chat_delta_box, synced_count, status_box, msg_input, genre_dropdown, genre_info, older_btn]
+    )
+    
+    older_btn.click(
+        fn=load_older_messages,
+        inputs=[synced_count, visible_count],
+        outputs=[chat_delta_box, synced_count, visible_count, older_btn]
     )
     
     # 책 추천받기 버튼 이벤트
     recommend_btn.click(
-        fn=manual_analyze_and_recommend,
-        inputs=[chatbot_interface, genre_dropdown],
-        outputs=[chatbot_interface, status_box, genre_dropdown, genre_info]
+        fn=recommend,
+        inputs=[genre_dropdown, synced_count, visible_count],
+        outputs=[chat_delta_box, synced_count, status_box, genre_dropdown, genre_info, older_btn]
+    ).then(
+        fn=similar_book_choices,
+        outputs=[similar_dropdown, similar_btn]
+    )
+    
+    similar_btn.click(
+        fn=show_similar_books,
+        inputs=[similar_dropdown, synced_count, visible_count],
+        outputs=[chat_delta_box, synced_count, status_box, older_btn]
     )
     
     clear_btn.click(
         fn=clear_conversation,
-        outputs=[chatbot_interface, status_box, genre_dropdown, genre_info]
+        outputs=[chatbot_interface, chat_delta_box, status_box, genre_dropdown, genre_info, synced_count, visible_count, older_btn]
+    ).then(
+        fn=similar_book_choices,
+        outputs=[similar_dropdown, similar_btn]
     )
     
     export_btn.click(
         fn=export_conversation,
         outputs=[export_output]
     ).then(
-        fn=lambda: gr.Textbox(visible=True),
+        fn=lambda: gr.File(visible=True),
         outputs=[export_output]
     )
     
@@ -0,0 +1,3 @@
+"""
+PageMind 벤치마크 모음 (python -m benchmarks.<모듈> 로 실행)
+"""
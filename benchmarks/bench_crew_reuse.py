@@ -0,0 +1,109 @@
+"""
+Crew/Task 재사용 벤치마크 (FakeLLM, 외부 API 없이)
+-     crew.build[단계]: 턴마다 Agent + Task + Crew를 새로 만드는 고정 비용 (생성 + 검증 + 해제)
+-     crew.checkout[단계]: 재사용 풀에서 Crew를 빌리고 돌려놓는 비용
+-     chat.turn[rebuild|reuse]: 상담 한 턴 전체 (rebuild는 매 턴 풀을 비워 Crew를 새로 생성)
+-     동시 세션: 스레드 N개 x 턴 M번 실행 후 실제로 생성된 Crew 수
+
+실행:
+    python -m benchmarks.bench_crew_reuse                       # 측정 후 benchmarks/results/crew_reuse.json 저장
+    python -m benchmarks.bench_crew_reuse --compare base.json   # 기준선과 비교
+    python -m benchmarks.bench_crew_reuse --quick
+"""
+
+import argparse
+import contextlib
+import io
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, Tuple
+
+from core_crewai.crew_orchestrator import STAGE_CREWS, CrewOrchestrator
+from core_crewai.fakes import FakeLLM
+
+from .harness import BenchmarkResult, measure, format_results, save_results, compare_results
+
+SUITE = "crew_reuse"
+HISTORY = [
+    {"role": "user", "content": "요즘 회사 일 때문에 잠을 잘 못 자요."},
+    {"role": "assistant", "content": "많이 지치셨겠어요. 언제부터 그러셨나요?"},
+]
+
+
+def _quiet(fn):
+    """CrewAI 실행 로그가 측정 결과 출력을 덮지 않도록 stdout 무시"""
+    def wrapper():
+        with contextlib.redirect_stdout(io.StringIO()):
+            return fn()
+    return wrapper
+
+
+def run(min_seconds: float = 0.2) -> List[BenchmarkResult]:
+    orchestrator = CrewOrchestrator(llm=FakeLLM())
+
+    results = []
+    for stage in STAGE_CREWS:
+        results.append(measure(
+            f"crew.build[{stage}]",
+            lambda: orchestrator._build_crew(stage),
+            min_seconds=min_seconds
+        ))
+
+        def checkout(stage=stage):
+            with orchestrator._checkout_crew(stage):
+                pass
+        results.append(measure(f"crew.checkout[{stage}]", checkout, min_seconds=min_seconds))
+
+    def chat_turn():
+        orchestrator.chat("잠들기 전에 생각이 많아져요.", HISTORY)
+
+    def chat_turn_rebuild():
+        orchestrator._idle_crews.clear()
+        chat_turn()
+
+    results.append(measure("chat.turn[rebuild]", _quiet(chat_turn_rebuild), min_seconds=min_seconds))
+    results.append(measure("chat.turn[reuse]", _quiet(chat_turn), min_seconds=min_seconds))
+    return results
+
+
+def run_concurrent(sessions: int, turns: int) -> Tuple[int, int]:
+    """스레드 sessions개가 각각 turns번 대화 -> (전체 턴 수, 생성된 Crew 수)"""
+    orchestrator = CrewOrchestrator(llm=FakeLLM())
+
+    def session(index: int):
+        for turn in range(turns):
+            orchestrator.chat(f"세션 {index}의 {turn}번째 메시지예요.", HISTORY, session_id=f"bench-{index}")
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        with ThreadPoolExecutor(max_workers=sessions) as pool:
+            list(pool.map(session, range(sessions)))
+    return sessions * turns, orchestrator.crews_built
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Crew/Task 재사용 벤치마크")
+    parser.add_argument("--quick", action="store_true", help="측정 시간을 줄여 빠르게 실행")
+    parser.add_argument("--sessions", type=int, default=8, help="동시 세션 수")
+    parser.add_argument("--turns", type=int, default=5, help="세션당 턴 수")
+    parser.add_argument("--output", help="결과 JSON 경로 (기본: benchmarks/results/crew_reuse.json)")
+    parser.add_argument("--compare", help="비교할 기준선 결과 JSON")
+    args = parser.parse_args(argv)
+
+    results = run(min_seconds=0.05 if args.quick else 0.2)
+    print(format_results(results))
+
+    total_turns, crews_built = run_concurrent(args.sessions, args.turns)
+    print(f"\n동시 세션 {args.sessions}개 x {args.turns}턴: 턴 {total_turns}번, 생성된 Crew {crews_built}개 "
+          f"(재사용 전에는 턴마다 1개)")
+
+    if args.compare:
+        print("\n기준선 대비:")
+        print(compare_results(results, args.compare))
+
+    path = save_results(SUITE, results, args.output)
+    print(f"\n결과 저장: {path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
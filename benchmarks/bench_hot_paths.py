@@ -0,0 +1,140 @@
+"""
+재정렬/포맷팅 핫 패스 마이크로벤치마크
+-     book_reranker: rerank_books, calculate_genre_match_score, parse_pubdate, format_book_for_recommendation
+-     lexical_relevance: BM25 어휘 관련도 (rerank_books[bm25], 말뭉치 캐시 적중 상태)
+-     popularity: count-min sketch 인기도를 섞은 재정렬 (rerank_books[popularity], 노출/클릭 기록이 있는 상태)
+-     similar_books: MinHash 서명 계산, 비슷한 책 조회 (색인 크기별)
+-     formatting: format_analysis_only, format_books_recommendation
+
+실행:
+    python -m benchmarks.bench_hot_paths                       # 측정 후 benchmarks/results/hot_paths.json 저장
+    python -m benchmarks.bench_hot_paths --compare base.json   # 기준선과 비교
+    python -m benchmarks.bench_hot_paths --sizes 10 1000 --quick
+"""
+
+import argparse
+import sys
+from typing import List, Optional
+
+from core_crewai.book_reranker import (
+    rerank_books,
+    calculate_genre_match_score,
+    parse_pubdate,
+    format_book_for_recommendation,
+)
+from core_crewai.formatting import format_analysis_only, format_books_recommendation
+from core_crewai.lexical_relevance import build_query, lexical_scorer
+from core_crewai.popularity import popularity_tracker
+from core_crewai.similar_books import SimilarBooksIndex
+
+from .catalog import make_catalog, make_summary, make_recommendations
+from .harness import BenchmarkResult, measure, format_results, save_results, compare_results
+
+SUITE = "hot_paths"
+DEFAULT_SIZES = [10, 100, 1000, 10000, 100000]
+
+
+def run(sizes: List[int], min_seconds: float = 0.2) -> List[BenchmarkResult]:
+    results = []
+    summary = make_summary()
+    query = build_query(summary.main_concerns, summary.emotions, summary.keywords)
+
+    for size in sizes:
+        catalog = make_catalog(size)
+
+        results.append(measure(
+            "rerank_books",
+            lambda: rerank_books(catalog, preferred_genre="심리학", max_results=5),
+            size=size, min_seconds=min_seconds
+        ))
+        # 책마다 노출 기록, 일부는 클릭 기록이 있는 sketch로 인기도 점수 포함 (점수 계산 비용만 측정)
+        popularity_tracker.record_shown(book["isbn"] for book in catalog)
+        for book in catalog[::10]:
+            popularity_tracker.record_click(book["isbn"])
+        results.append(measure(
+            "rerank_books[popularity]",
+            lambda: rerank_books(catalog, preferred_genre="심리학", max_results=5, popularity_weight=0.1),
+            size=size, min_seconds=min_seconds
+        ))
+        popularity_tracker.clear()
+        if size <= lexical_scorer.max_docs:
+            # 첫 호출(워밍업)에서 말뭉치에 들어간 뒤에는 캐시된 bigram으로 점수 계산
+            results.append(measure(
+                "rerank_books[bm25]",
+                lambda: rerank_books(catalog, preferred_genre="심리학", max_results=5, query=query),
+                size=size, min_seconds=min_seconds
+            ))
+        results.append(measure(
+            "calculate_genre_match_score[pool]",
+            lambda: [
+                calculate_genre_match_score(book["description"], book["title"], "자기계발")
+                for book in catalog
+            ],
+            size=size, min_seconds=min_seconds
+        ))
+        results.append(measure(
+            "parse_pubdate[pool]",
+            lambda: [parse_pubdate(book["pubdate"]) for book in catalog],
+            size=size, min_seconds=min_seconds
+        ))
+        results.append(measure(
+            "format_book_for_recommendation[pool]",
+            lambda: [format_book_for_recommendation(book) for book in catalog],
+            size=size, min_seconds=min_seconds
+        ))
+        if size <= 10000:
+            # 검색 결과 색인 비용 (책마다 1회) / 조회는 색인 크기와 무관하게 1ms 미만이어야 함
+            index = SimilarBooksIndex(max_books=size)
+            if size <= 1000:
+                results.append(measure(
+                    "similar_books.signature[pool]",
+                    lambda: [index.signature(book) for book in catalog],
+                    size=size, min_seconds=min_seconds
+                ))
+            index.add_many(catalog)
+            isbn = catalog[0]["isbn"]
+            results.append(measure(
+                "similar_books.query",
+                lambda: index.query(isbn, limit=5),
+                size=size, min_seconds=min_seconds
+            ))
+
+    # 채팅 메시지 포맷팅 (추천 도서 수는 실제 사용 범위인 5~50권)
+    results.append(measure(
+        "format_analysis_only",
+        lambda: format_analysis_only(summary),
+        size=1, min_seconds=min_seconds
+    ))
+    for count in (5, 20, 50):
+        books = make_recommendations(count)
+        results.append(measure(
+            "format_books_recommendation",
+            lambda: format_books_recommendation(books, summary),
+            size=count, min_seconds=min_seconds
+        ))
+
+    return results
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="재정렬/포맷팅 핫 패스 마이크로벤치마크")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES, help="카탈로그 크기 목록")
+    parser.add_argument("--quick", action="store_true", help="측정 시간을 줄여 빠르게 실행")
+    parser.add_argument("--output", help="결과 JSON 경로 (기본: benchmarks/results/hot_paths.json)")
+    parser.add_argument("--compare", help="비교할 기준선 결과 JSON")
+    args = parser.parse_args(argv)
+
+    results = run(args.sizes, min_seconds=0.05 if args.quick else 0.2)
+    print(format_results(results))
+
+    if args.compare:
+        print("\n기준선 대비:")
+        print(compare_results(results, args.compare))
+
+    path = save_results(SUITE, results, args.output)
+    print(f"\n결과 저장: {path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,103 @@
+"""
+증분 분석(incremental_analysis.py) 벤치마크 - 분석 후 대화가 이어졌을 때 전체 재분석 대비 비용 (FakeLLM, 외부 API 없이)
+-     analyze[full]: 이어진 대화 전체를 다시 분석 (이전 방식, 프롬프트가 대화 길이에 비례)
+-     analyze[incremental]: 이전 분석 결과 + 새 메시지 2개만 분석
+-     new_messages_since: 세션에서 증분 분석 대상 찾기 (분석한 앞부분 지문 확인)
+-     recommend[reuse]: 검색어가 같을 때 이전 추천 재사용 판단 (recommend_books_from_summary 전체를 생략)
+-     대화 길이별 분석 프롬프트 토큰 (FakeLLM 추정치)도 함께 출력
+
+실행:
+    python -m benchmarks.bench_incremental_analysis                       # 측정 후 benchmarks/results/incremental_analysis.json 저장
+    python -m benchmarks.bench_incremental_analysis --compare base.json   # 기준선과 비교
+    python -m benchmarks.bench_incremental_analysis --quick
+"""
+
+import argparse
+import sys
+from typing import List, Optional, Tuple
+
+from core_crewai.crew_orchestrator import CrewOrchestrator
+from core_crewai.fakes import FakeLLM
+from core_crewai.incremental_analysis import mark_analyzed, new_messages_since, reusable_books
+from core_crewai.models import SessionState
+
+from .bench_serialization import make_messages
+from .catalog import make_recommendations, make_summary
+from .harness import BenchmarkResult, measure, format_results, save_results, compare_results
+
+SUITE = "incremental_analysis"
+DEFAULT_SIZES = [10, 50, 200]
+NEW_MESSAGES = [
+    {"role": "user", "content": "추천해 주신 책을 읽어 보려고요. 그래도 출근 전날 밤이 제일 힘들어요."},
+    {"role": "assistant", "content": "출근 전날 밤이 특히 무겁게 느껴지시는군요. 그때 어떤 생각이 가장 먼저 드시나요?"},
+]
+
+
+def _prompt_tokens(llm: FakeLLM, fn) -> int:
+    """fn() 실행 중 LLM 호출의 프롬프트 토큰 합"""
+    before = len(llm.get_calls())
+    fn()
+    return sum(call["prompt_tokens"] for call in llm.get_calls()[before:])
+
+
+def run(sizes: List[int], min_seconds: float = 0.2) -> Tuple[List[BenchmarkResult], List[Tuple[int, int, int]]]:
+    llm = FakeLLM()
+    orchestrator = CrewOrchestrator(llm=llm)
+    summary = make_summary()
+
+    results = []
+    tokens = []
+    for size in sizes:
+        analyzed = make_messages(size)
+        messages = analyzed + NEW_MESSAGES
+        state = SessionState(
+            session_id="bench", messages=messages, analysis_done=True, summary=summary,
+            recommended_books=make_recommendations(5), recommended_summary=summary
+        )
+        mark_analyzed(state, analyzed)
+
+        full = lambda: orchestrator.analyze_conversation(messages)
+        incremental = lambda: orchestrator.update_analysis(summary, new_messages_since(state, messages))
+        tokens.append((size, _prompt_tokens(llm, full), _prompt_tokens(llm, incremental)))
+
+        results.append(measure("analyze[full]", full, size=size, min_seconds=min_seconds))
+        results.append(measure("analyze[incremental]", incremental, size=size, min_seconds=min_seconds))
+        results.append(measure(
+            "new_messages_since", lambda: new_messages_since(state, messages),
+            size=size, min_seconds=min_seconds
+        ))
+
+    updated = summary.model_copy(update={"emotions": summary.emotions + ["안도"]})
+    results.append(measure(
+        "recommend[reuse]", lambda: reusable_books(state, updated, 5), min_seconds=min_seconds
+    ))
+    return results, tokens
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="증분 분석 벤치마크")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES, help="분석 당시 대화 메시지 수")
+    parser.add_argument("--quick", action="store_true", help="측정 시간을 줄여 빠르게 실행")
+    parser.add_argument("--output", help="결과 JSON 경로 (기본: benchmarks/results/incremental_analysis.json)")
+    parser.add_argument("--compare", help="비교할 기준선 결과 JSON")
+    args = parser.parse_args(argv)
+
+    results, tokens = run(args.sizes, min_seconds=0.05 if args.quick else 0.2)
+    print(format_results(results))
+
+    print(f"\n분석 프롬프트 토큰 (새 메시지 {len(NEW_MESSAGES)}개):")
+    print(f"  {'메시지 수':>10}{'full':>10}{'incremental':>14}")
+    for size, full, incremental in tokens:
+        print(f"  {size:>10}{full:>10}{incremental:>14}   x{full / incremental:.1f}")
+
+    if args.compare:
+        print("\n기준선 대비:")
+        print(compare_results(results, args.compare))
+
+    path = save_results(SUITE, results, args.output)
+    print(f"\n결과 저장: {path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
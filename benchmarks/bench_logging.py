@@ -0,0 +1,101 @@
+"""
+구조화 로깅(logs.py) 벤치마크 - 요청 스레드가 로그 한 건에 쓰는 시간
+-     출력 대상은 쓰기 한 번에 0.5ms가 걸리는 느린 스트림 (부하 중인 stdout/파이프 흉내)
+-     print[payload]: 예전 방식 (LLM 원본 결과 약 20KB를 요청 스레드에서 바로 출력)
+-     log.info[fields] / log.error[payload]: 큐에만 넣음 (포맷팅/자르기/쓰기는 리스너 스레드)
+-     log.debug[disabled]: 레벨이 꺼진 로그 (필드 dict도 만들지 않음)
+
+실행:
+    python -m benchmarks.bench_logging                       # 측정 후 benchmarks/results/logging.json 저장
+    python -m benchmarks.bench_logging --compare base.json   # 기준선과 비교
+    python -m benchmarks.bench_logging --quick
+"""
+
+import argparse
+import contextlib
+import io
+import sys
+import time
+from typing import List, Optional
+
+from core_crewai import logs
+from core_crewai.logs import LOG_DROPPED, get_logger
+
+from .harness import BenchmarkResult, measure, format_results, save_results, compare_results
+
+SUITE = "logging"
+WRITE_DELAY_SECONDS = 0.0005
+PAYLOAD = '{"book_ids": ["b1", "b2", "b3"], "notes": "' + "가나다라마바사 " * 2500 + '"}'
+
+
+class SlowStream(io.TextIOBase):
+    """쓰기마다 delay초가 걸리는 스트림"""
+
+    def __init__(self, delay: float = WRITE_DELAY_SECONDS):
+        self.delay = delay
+
+    def write(self, text: str) -> int:
+        if self.delay:
+            time.sleep(self.delay)
+        return len(text)
+
+
+def run(min_seconds: float = 0.2) -> List[BenchmarkResult]:
+    stream = SlowStream()
+    log = get_logger("bench")
+    results = []
+
+    with contextlib.redirect_stdout(stream):
+        results.append(measure(
+            "print[payload]",
+            lambda: (print("JSON 파싱 오류: bench"), print(f"원본 결과: {PAYLOAD}")),
+            size=len(PAYLOAD), min_seconds=min_seconds
+        ))
+
+    logs.configure(level="INFO", levels="", style="text", path="", stream=stream)
+    dropped_before = LOG_DROPPED.value(logger="pagemind.bench")
+    try:
+        results.append(measure(
+            "log.info[fields]",
+            lambda: log.info("검색된 책", count=12, keyword="불안"),
+            min_seconds=min_seconds
+        ))
+        results.append(measure(
+            "log.error[payload]",
+            lambda: log.error("JSON 파싱 오류", stage="recommend", error="bench", payload=PAYLOAD),
+            size=len(PAYLOAD), min_seconds=min_seconds
+        ))
+        results.append(measure(
+            "log.debug[disabled]",
+            lambda: log.debug("재정렬 후 상위 도서 선택", count=5),
+            min_seconds=min_seconds
+        ))
+    finally:
+        dropped = LOG_DROPPED.value(logger="pagemind.bench") - dropped_before
+        stream.delay = 0  # 측정 중 쌓인 레코드는 기다리지 않고 비움
+        logs.configure()
+    print(f"큐가 가득 차 버린 레코드: {dropped:g}건 (느린 출력 대상에서는 요청을 기다리게 하는 대신 버림)")
+    return results
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="구조화 로깅 벤치마크")
+    parser.add_argument("--quick", action="store_true", help="측정 시간을 줄여 빠르게 실행")
+    parser.add_argument("--output", help="결과 JSON 경로 (기본: benchmarks/results/logging.json)")
+    parser.add_argument("--compare", help="비교할 기준선 결과 JSON")
+    args = parser.parse_args(argv)
+
+    results = run(min_seconds=0.05 if args.quick else 0.2)
+    print(format_results(results))
+
+    if args.compare:
+        print("\n기준선 대비:")
+        print(compare_results(results, args.compare))
+
+    path = save_results(SUITE, results, args.output)
+    print(f"\n결과 저장: {path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
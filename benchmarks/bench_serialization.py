@@ -0,0 +1,175 @@
+"""
+JSON 직렬화(serialization.py) 벤치마크 - 표준 json 백엔드와 orjson 백엔드 비교 (한국어 실데이터 형태)
+-     tool_output.dumps: 네이버 검색 도구 반환값 (도서 size권, 문자열 반환)
+-     llm_output.loads: 심리 분석/추천 LLM 출력 JSON 파싱 (들여쓰기된 한국어 JSON)
+-     session_state.encode / decode: 세션 저장소 payload (메시지 size개 + 분석 결과 + 추천 도서)
+      [before]는 이전 경로 (model_dump() + json.dumps / model_validate_json), 지금은 dumps_model() / loads_model()
+-     export.ndjson: 대화 내보내기 (메시지 size개를 한 줄씩 생성)
+-     sse.event: /chat/stream done 이벤트 한 건
+
+실행:
+    python -m benchmarks.bench_serialization                       # 측정 후 benchmarks/results/serialization.json 저장
+    python -m benchmarks.bench_serialization --compare base.json   # 기준선과 비교
+    python -m benchmarks.bench_serialization --quick
+"""
+
+import argparse
+import importlib.util
+import json
+import os
+import sys
+from typing import List, Optional
+
+from core_crewai.loadtest import SIMULATED_USER_MESSAGES
+from core_crewai.models import ChatResponse, SessionState
+
+from .catalog import make_catalog, make_recommendations, make_summary
+from .harness import BenchmarkResult, measure, format_results, save_results, compare_results
+
+SUITE = "serialization"
+DEFAULT_SIZES = [10, 100, 1000]
+
+
+def load_backend(name: str):
+    """PAGEMIND_JSON_BACKEND=name으로 serialization 모듈을 따로 하나 더 불러옴 (두 백엔드를 한 프로세스에서 비교)"""
+    previous = os.environ.get("PAGEMIND_JSON_BACKEND")
+    os.environ["PAGEMIND_JSON_BACKEND"] = name
+    try:
+        spec = importlib.util.find_spec("core_crewai.serialization")
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+    finally:
+        if previous is None:
+            os.environ.pop("PAGEMIND_JSON_BACKEND", None)
+        else:
+            os.environ["PAGEMIND_JSON_BACKEND"] = previous
+    return module
+
+
+def make_messages(count: int) -> List[dict]:
+    replies = [
+        "많이 지치셨겠어요. 그런 상황이 얼마나 오래 이어졌나요?",
+        "그때 어떤 감정이 가장 크게 느껴졌는지 조금 더 이야기해 주실 수 있을까요?",
+    ]
+    return [
+        {"role": "user", "content": SIMULATED_USER_MESSAGES[i // 2 % len(SIMULATED_USER_MESSAGES)]}
+        if i % 2 == 0 else {"role": "assistant", "content": replies[i // 2 % len(replies)]}
+        for i in range(count)
+    ]
+
+
+def run(sizes: List[int], min_seconds: float = 0.2) -> List[BenchmarkResult]:
+    backends = [load_backend("json")]
+    if backends[0].orjson is not None:
+        backends.append(load_backend("auto"))
+    else:
+        print("orjson이 설치되어 있지 않아 표준 json 백엔드만 측정합니다 (pip install orjson)")
+
+    summary = make_summary()
+    analysis_text = "```json\n" + backends[0].dumps(summary.model_dump(), indent=True) + "\n```"
+    analysis_json = analysis_text.split("```json")[1].split("```")[0]
+    recommendations = make_recommendations(5)
+    done_event = ChatResponse(
+        response="\n".join(SIMULATED_USER_MESSAGES), conversation_id="bench", analysis_ready=True,
+        timestamp="2025-01-10T12:00:00"
+    ).model_dump()
+
+    results = []
+    for codec in backends:
+        label = codec.BACKEND
+        results.append(measure(
+            f"llm_output.loads[{label}]", lambda: codec.loads(analysis_json),
+            size=len(analysis_json), min_seconds=min_seconds
+        ))
+        results.append(measure(
+            f"sse.event[{label}]", lambda: f"event: done\ndata: {codec.dumps(done_event)}\n\n",
+            min_seconds=min_seconds
+        ))
+        for size in sizes:
+            tool_result = {"success": True, "total": 1000, "keyword": "불안", "books": make_catalog(size)}
+            messages = make_messages(size)
+            state = SessionState(
+                session_id="bench", messages=messages, analysis_done=True, summary=summary,
+                recommended_books=recommendations
+            )
+            encoded = codec.dumps_model(state)
+
+            results.append(measure(
+                f"tool_output.dumps[{label}]", lambda: codec.dumps(tool_result),
+                size=size, min_seconds=min_seconds
+            ))
+            results.append(measure(
+                f"session_state.encode[{label}]", lambda: codec.dumps_model(state),
+                size=size, min_seconds=min_seconds
+            ))
+            results.append(measure(
+                f"session_state.decode[{label}]", lambda: codec.loads_model(SessionState, encoded),
+                size=size, min_seconds=min_seconds
+            ))
+            results.append(measure(
+                f"export.ndjson[{label}]", lambda: sum(len(line) for line in codec.iter_ndjson(messages)),
+                size=size, min_seconds=min_seconds
+            ))
+
+    # 세션 저장소의 이전 경로 (dict 변환 후 표준 json 인코딩 / pydantic JSON 파서로 디코딩)
+    for size in sizes:
+        state = SessionState(
+            session_id="bench", messages=make_messages(size), analysis_done=True, summary=summary,
+            recommended_books=recommendations
+        )
+        encoded = json.dumps(state.model_dump(mode="json"), ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        results.append(measure(
+            "session_state.encode[before]",
+            lambda: json.dumps(state.model_dump(mode="json"), ensure_ascii=False, separators=(",", ":")).encode("utf-8"),
+            size=size, min_seconds=min_seconds
+        ))
+        results.append(measure(
+            "session_state.decode[before]", lambda: SessionState.model_validate_json(encoded),
+            size=size, min_seconds=min_seconds
+        ))
+    return results
+
+
+def speedups(results: List[BenchmarkResult], base: str, target: str):
+    """(이름, 크기, base 대비 target 속도 비) - 두 라벨이 모두 있는 측정만"""
+    by_name = {(result.name, result.size): result.mean_seconds for result in results}
+    return [
+        (name[:-len(base) - 2], size, seconds / by_name[(name.replace(f"[{base}]", f"[{target}]"), size)])
+        for (name, size), seconds in by_name.items()
+        if name.endswith(f"[{base}]") and (name.replace(f"[{base}]", f"[{target}]"), size) in by_name
+    ]
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="JSON 직렬화 벤치마크")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES, help="도서/메시지 수")
+    parser.add_argument("--quick", action="store_true", help="측정 시간을 줄여 빠르게 실행")
+    parser.add_argument("--output", help="결과 JSON 경로 (기본: benchmarks/results/serialization.json)")
+    parser.add_argument("--compare", help="비교할 기준선 결과 JSON")
+    args = parser.parse_args(argv)
+
+    results = run(args.sizes, min_seconds=0.05 if args.quick else 0.2)
+    print(format_results(results))
+
+    current = "orjson" if any(result.name.endswith("[orjson]") for result in results) else "json"
+    for base, target, title in (
+        ("json", "orjson", "orjson / 표준 json 속도 비"),
+        ("before", current, "세션 저장소 이전 경로 대비 속도 비"),
+    ):
+        ratios = speedups(results, base, target)
+        if ratios:
+            print(f"\n{title} ({target}):")
+            for name, size, ratio in ratios:
+                print(f"  {name:<24}{size:>8}   x{ratio:.1f}")
+
+    if args.compare:
+        print("\n기준선 대비:")
+        print(compare_results(results, args.compare))
+
+    path = save_results(SUITE, results, args.output)
+    print(f"\n결과 저장: {path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
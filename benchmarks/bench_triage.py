@@ -0,0 +1,157 @@
+"""
+위기 신호 빠른 분류(crisis_triage) 벤치마크 (FakeLLM, 외부 API 없이)
+-     assess_message[normal|crisis|long]: 일반 메시지 / 위기 메시지 / 긴 일반 메시지(약 2,000자) 분류 비용
+-     chat.turn[triage off|on]: 일반 상담 턴 전체 (분류를 켜도 차이가 측정 오차 범위여야 함)
+-     chat.turn[crisis]: 위기 턴에서 안전 안내가 반환되기까지 (상담사 응답은 백그라운드)
+-     측정 전에 라벨이 붙은 위기/일반 메시지(LABELLED_MESSAGES)의 is_crisis를 확인 (틀리면 종료 코드 1)
+
+실행:
+    python -m benchmarks.bench_triage                       # 측정 후 benchmarks/results/triage.json 저장
+    python -m benchmarks.bench_triage --compare base.json   # 기준선과 비교
+    python -m benchmarks.bench_triage --quick
+    python -m benchmarks.bench_triage --labels-only         # 분류 결과만 확인 (측정 없음)
+"""
+
+import argparse
+import contextlib
+import io
+import sys
+from typing import List, Optional, Tuple
+
+from core_crewai.crew_orchestrator import CrewOrchestrator
+from core_crewai.crisis_triage import assess_message
+from core_crewai.fakes import FakeLLM
+from core_crewai.loadtest import SIMULATED_USER_MESSAGES
+
+from .harness import BenchmarkResult, measure, format_results, save_results, compare_results
+
+SUITE = "triage"
+CRISIS_MESSAGES = [
+    "요즘은 그냥 사라지고 싶어서 유서도 써 두었어요.",
+    "오늘 밤에 죽고 싶어요.",
+    "몰래 자해를 했어요.",
+]
+# (메시지, 위기로 분류되어야 하는지) - 사전/가중치를 바꿀 때 놓침과 오탐을 함께 확인
+LABELLED_MESSAGES = [
+    *[(message, True) for message in CRISIS_MESSAGES],
+    ("자살하고 싶다는 생각이 자꾸 들어요.", True),
+    ("손목을 그었어요.", True),
+    ("더 이상 살고 싶지 않아요. 지금 당장 끝내고 싶어요.", True),
+    ("유서를 썼어요. 살 이유가 없어요.", True),
+    ("지금 옥상에서 뛰어내리고 싶어요.", True),
+    ("수면제를 모아 두었어요. 다 끝내고 싶어요.", True),
+    ("아침에 깨어나지 않았으면 좋겠어요.", False),  # 소극적 표현 하나만 - 상담사가 이어서 탐색
+    ("유서 깊은 절에 다녀왔어요.", False),
+    ("주말에 번개탄으로 고기 구워 먹었어요.", False),
+    ("승진에 목매는 제 자신이 싫어요.", False),
+    ("그렇게까지 시험에 목맬 필요는 없잖아요.", False),
+    ("요즘 약을 잔뜩 처방받아서 걱정이에요.", False),
+    ("계단에서 뛰어내리다가 발목을 삐었어요.", False),
+    ("지금 자살 예방 교육 받고 왔어요.", False),
+    ("친구가 자해 예방 캠페인을 지금 하고 있어요.", False),
+    ("자살하고 싶지 않아요. 그냥 너무 지쳤어요.", False),
+    ("죽을 생각은 없어요. 다만 잠을 못 자요.", False),
+    ("자해하지 않으려고 노력하고 있어요.", False),
+    ("뉴스에서 자살률 통계를 봤어요.", False),
+    *[(message, False) for message in SIMULATED_USER_MESSAGES],
+]
+LONG_MESSAGE = " ".join(SIMULATED_USER_MESSAGES) * 20
+HISTORY = [
+    {"role": "user", "content": "요즘 회사 일 때문에 잠을 잘 못 자요."},
+    {"role": "assistant", "content": "많이 지치셨겠어요. 언제부터 그러셨나요?"},
+]
+
+
+def _quiet(fn):
+    """CrewAI 실행 로그가 측정 결과 출력을 덮지 않도록 stdout 무시"""
+    def wrapper():
+        with contextlib.redirect_stdout(io.StringIO()):
+            return fn()
+    return wrapper
+
+
+def check_labels() -> List[Tuple[str, bool, float]]:
+    """분류가 라벨과 다른 메시지 -> [(메시지, 기대한 is_crisis, 점수)]"""
+    mistakes = []
+    for message, expected in LABELLED_MESSAGES:
+        triage = assess_message(message)
+        if triage.is_crisis != expected:
+            mistakes.append((message, expected, triage.score))
+    return mistakes
+
+
+def run(min_seconds: float = 0.2) -> List[BenchmarkResult]:
+    results = [
+        measure(
+            "assess_message[normal]",
+            lambda: [assess_message(message) for message in SIMULATED_USER_MESSAGES],
+            size=len(SIMULATED_USER_MESSAGES), min_seconds=min_seconds
+        ),
+        measure(
+            "assess_message[crisis]",
+            lambda: [assess_message(message) for message in CRISIS_MESSAGES],
+            size=len(CRISIS_MESSAGES), min_seconds=min_seconds
+        ),
+        measure(
+            "assess_message[long]",
+            lambda: assess_message(LONG_MESSAGE),
+            size=len(LONG_MESSAGE), min_seconds=min_seconds
+        ),
+    ]
+
+    for label, enabled in (("off", False), ("on", True)):
+        orchestrator = CrewOrchestrator(llm=FakeLLM(), crisis_triage=enabled)
+        results.append(measure(
+            f"chat.turn[triage {label}]",
+            _quiet(lambda: orchestrator.chat("잠들기 전에 생각이 많아져요.", HISTORY)),
+            min_seconds=min_seconds
+        ))
+
+    # 안전 안내가 반환되기까지 (상담사 응답은 followup_executor에서 생성, 측정 후 정리)
+    orchestrator = CrewOrchestrator(llm=FakeLLM())
+    results.append(measure(
+        "chat.turn[crisis]",
+        _quiet(lambda: orchestrator.chat(CRISIS_MESSAGES[0], HISTORY, session_id="bench-crisis")),
+        min_seconds=min_seconds
+    ))
+    with contextlib.redirect_stdout(io.StringIO()):
+        orchestrator.wait_followup("bench-crisis")
+    return results
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="위기 신호 빠른 분류 벤치마크")
+    parser.add_argument("--quick", action="store_true", help="측정 시간을 줄여 빠르게 실행")
+    parser.add_argument("--output", help="결과 JSON 경로 (기본: benchmarks/results/triage.json)")
+    parser.add_argument("--compare", help="비교할 기준선 결과 JSON")
+    parser.add_argument("--labels-only", action="store_true", help="라벨 메시지 분류 결과만 확인")
+    args = parser.parse_args(argv)
+
+    mistakes = check_labels()
+    print(f"라벨 메시지 분류: {len(LABELLED_MESSAGES) - len(mistakes)}/{len(LABELLED_MESSAGES)} 일치")
+    for message, expected, score in mistakes:
+        print(f"  ❌ 기대 {'위기' if expected else '일반'} (점수 {score:.2f}): {message}")
+    if mistakes:
+        return 1
+    if args.labels_only:
+        return 0
+
+    results = run(min_seconds=0.05 if args.quick else 0.2)
+    print(format_results(results))
+
+    turns = {result.name: result.mean_seconds for result in results if result.name.startswith("chat.turn[triage")}
+    added = turns["chat.turn[triage on]"] - turns["chat.turn[triage off]"]
+    print(f"\n일반 턴에 더해진 분류 비용: {added * 1e6:+.1f}µs "
+          f"({added / turns['chat.turn[triage off]'] * 100:+.2f}%, 측정 오차 포함)")
+
+    if args.compare:
+        print("\n기준선 대비:")
+        print(compare_results(results, args.compare))
+
+    path = save_results(SUITE, results, args.output)
+    print(f"\n결과 저장: {path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
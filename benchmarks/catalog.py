@@ -0,0 +1,88 @@
+"""
+벤치마크용 합성 한국어 도서 카탈로그 (네이버 도서 검색 API 응답 형식)
+시드가 같으면 항상 같은 카탈로그를 생성
+"""
+
+import random
+from typing import Dict, List
+
+from core_crewai.models import PsychologicalSummary, BookRecommendation
+
+TITLE_WORDS = [
+    "마음", "불안", "감정", "치유", "회복", "습관", "성장", "관계", "자존감", "위로",
+    "행복", "철학", "일상", "용기", "심리학", "번아웃", "리더십", "이야기", "수업", "연습",
+]
+
+DESCRIPTION_SENTENCES = [
+    "이 책은 마음이 지친 사람들에게 따뜻한 위로를 건넨다.",
+    "저자는 오랜 상담 경험을 바탕으로 일상에서 실천할 수 있는 방법을 소개한다.",
+    "불안과 걱정을 다루는 구체적인 연습이 단계별로 정리되어 있다.",
+    "관계 속에서 나를 지키는 법과 감정을 돌보는 습관을 이야기한다.",
+    "심리학 연구와 실제 사례를 함께 엮어 누구나 쉽게 읽을 수 있다.",
+    "작은 변화가 삶 전체를 바꿀 수 있다는 메시지를 담았다.",
+    "직장에서의 스트레스와 번아웃을 이겨낸 사람들의 경험을 들려준다.",
+    "철학과 역사 속 인물들의 삶에서 오늘을 살아갈 지혜를 찾는다.",
+    "목표를 세우고 동기부여를 유지하는 자기관리 전략을 제시한다.",
+    "소설 속 인물들의 이야기를 통해 외로움과 상실을 들여다본다.",
+]
+
+GENRES = ["자기계발", "심리학", "소설", "에세이", "인문", "경제/경영", "기타", None]
+
+
+def make_book(rng: random.Random, index: int) -> Dict[str, str]:
+    """네이버 API 항목 하나 생성 (설명은 실제 분포와 비슷하게 60~900자)"""
+    title_words = rng.sample(TITLE_WORDS, 3)
+    sentence_count = rng.choice([1, 2, 3, 4, 6, 8, 12, 16])
+    description = " ".join(rng.choice(DESCRIPTION_SENTENCES) for _ in range(sentence_count))
+    year = rng.randint(1995, 2025)
+    pubdate = f"{year}{rng.randint(1, 12):02d}{rng.randint(1, 28):02d}"
+    if rng.random() < 0.05:
+        pubdate = rng.choice(["", "2019", "20xx0101"])  # 출판일 누락/오류 데이터
+    isbn = f"979{rng.randrange(10**10):010d}"
+    return {
+        "title": f"<b>{title_words[0]}</b>의 {title_words[1]} {title_words[2]} {index}",
+        "link": f"https://search.shopping.naver.com/book/catalog/{rng.randrange(10**11)}",
+        "image": f"https://shopping-phinf.pstatic.net/main_{rng.randrange(10**8)}/{isbn}.jpg",
+        "author": f"저자{rng.randrange(500)}^역자{rng.randrange(100)}",
+        "discount": str(rng.randrange(8000, 30000, 100)),
+        "publisher": f"출판사{rng.randrange(200)}",
+        "pubdate": pubdate,
+        "isbn": isbn,
+        "description": description,
+    }
+
+
+def make_catalog(size: int, seed: int = 42) -> List[Dict[str, str]]:
+    """size권짜리 카탈로그 생성"""
+    rng = random.Random(seed)
+    return [make_book(rng, i) for i in range(size)]
+
+
+def make_summary(seed: int = 42) -> PsychologicalSummary:
+    rng = random.Random(seed)
+    return PsychologicalSummary(
+        main_concerns=["직장 스트레스", "상사와의 관계", "거절하지 못하는 어려움"],
+        emotions=["불안", "무력감", "피로"],
+        cognitive_patterns=["파국화", "과도한 책임감", "흑백논리"],
+        recommendations=["경계 설정 연습", "자기주장 훈련", "수면 위생 개선", "감정 일기"],
+        keywords=["직장스트레스", "자존감", "불안"],
+        genre=rng.choice(GENRES[:-1]),
+    )
+
+
+def make_recommendations(count: int, seed: int = 42) -> List[BookRecommendation]:
+    rng = random.Random(seed)
+    books = []
+    for i in range(count):
+        book = make_book(rng, i)
+        books.append(BookRecommendation(
+            title=book["title"].replace("<b>", "").replace("</b>", ""),
+            author=book["author"],
+            publisher=book["publisher"],
+            description=book["description"],
+            isbn=book["isbn"],
+            cover_image=book["image"],
+            link=book["link"],
+            relevance_reason="최신 출간된 책으로 '직장 스트레스'에 대한 통찰을 제공합니다.",
+        ))
+    return books
@@ -0,0 +1,127 @@
+"""
+벤치마크 공통 도구
+-     measure(): 초당 실행 횟수(ops/sec)와 호출당 메모리 할당량(tracemalloc) 측정
+-     save_results() / compare_results(): 결과를 JSON으로 저장하고 기준선(baseline)과 비교
+"""
+
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from dataclasses import dataclass, asdict
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+RESULTS_DIR = os.path.join(os.path.dirname(__file__), "results")
+
+
+@dataclass
+class BenchmarkResult:
+    """벤치마크 하나의 측정 결과"""
+    name: str
+    size: int
+    ops_per_sec: float
+    mean_seconds: float
+    iterations: int
+    peak_alloc_bytes: int  # 호출 1회 동안의 최대 할당량
+    alloc_blocks: int  # 호출 1회 동안 할당된 메모리 블록 수 (해제되지 않은 것 포함)
+
+
+def measure(
+    name: str,
+    fn: Callable[[], object],
+    size: int = 0,
+    min_seconds: float = 0.2,
+    max_iterations: int = 100000
+) -> BenchmarkResult:
+    """
+    fn()을 반복 실행하여 처리량과 할당량 측정
+
+    Args:
+        name: 벤치마크 이름
+        fn: 측정할 인자 없는 함수
+        size: 입력 크기 (결과 표시용)
+        min_seconds: 처리량 측정에 사용할 최소 시간
+        max_iterations: 최대 반복 횟수
+    """
+    fn()  # 워밍업 (지연 초기화, 캐시 등)
+
+    # 처리량: 최소 시간을 채울 때까지 반복 횟수를 늘려가며 측정
+    iterations = 1
+    while True:
+        started = time.perf_counter()
+        for _ in range(iterations):
+            fn()
+        elapsed = time.perf_counter() - started
+        if elapsed >= min_seconds or iterations >= max_iterations:
+            break
+        iterations = min(max_iterations, iterations * 2)
+
+    # 할당량: tracemalloc으로 호출 1회 측정 (tracemalloc은 실행을 느리게 하므로 별도 실행)
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    tracemalloc.reset_peak()
+    base_current, _ = tracemalloc.get_traced_memory()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    blocks = sum(max(0, stat.count_diff) for stat in after.compare_to(before, "lineno"))
+
+    mean = elapsed / iterations
+    return BenchmarkResult(
+        name=name,
+        size=size,
+        ops_per_sec=round(1.0 / mean, 2) if mean > 0 else float("inf"),
+        mean_seconds=mean,
+        iterations=iterations,
+        peak_alloc_bytes=max(0, peak - base_current),
+        alloc_blocks=blocks,
+    )
+
+
+def format_results(results: List[BenchmarkResult]) -> str:
+    lines = [f"{'benchmark':<40}{'size':>8}{'ops/sec':>14}{'mean(ms)':>12}{'peak alloc':>14}{'blocks':>9}"]
+    for r in results:
+        lines.append(
+            f"{r.name:<40}{r.size:>8}{r.ops_per_sec:>14,.1f}{r.mean_seconds * 1000:>12.4f}"
+            f"{r.peak_alloc_bytes:>14,}{r.alloc_blocks:>9}"
+        )
+    return "\n".join(lines)
+
+
+def save_results(suite: str, results: List[BenchmarkResult], path: Optional[str] = None) -> str:
+    """결과를 JSON으로 저장 (기본: benchmarks/results/<suite>.json)"""
+    path = path or os.path.join(RESULTS_DIR, f"{suite}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    data = {
+        "suite": suite,
+        "created_at": datetime.now().isoformat(),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "results": [asdict(r) for r in results],
+    }
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+    return path
+
+
+def compare_results(results: List[BenchmarkResult], baseline_path: str) -> str:
+    """기준선 JSON과 비교한 처리량/할당량 변화율 표"""
+    with open(baseline_path, "r", encoding="utf-8") as f:
+        baseline = {(r["name"], r["size"]): r for r in json.load(f)["results"]}
+
+    lines = [f"{'benchmark':<40}{'size':>8}{'ops/sec Δ':>12}{'peak alloc Δ':>15}"]
+    for r in results:
+        base: Dict = baseline.get((r.name, r.size))
+        if base is None:
+            lines.append(f"{r.name:<40}{r.size:>8}{'(new)':>12}{'':>15}")
+            continue
+        ops_change = (r.ops_per_sec / base["ops_per_sec"] - 1) * 100 if base["ops_per_sec"] else 0.0
+        alloc_change = (
+            (r.peak_alloc_bytes / base["peak_alloc_bytes"] - 1) * 100 if base["peak_alloc_bytes"] else 0.0
+        )
+        lines.append(f"{r.name:<40}{r.size:>8}{ops_change:>+11.1f}%{alloc_change:>+14.1f}%")
+    return "\n".join(lines)
@@ -0,0 +1,198 @@
+"""
+성능 회귀 게이트 - 프롬프트 템플릿(text_prompts/)이나 tasks.py 변경으로 인한 비용/지연 증가 감지
+-     FakeLLM + FakeNaverServer로 고정 시나리오(chat -> analyze -> recommend -> 이어진 대화의 analyze_update)를 실행
+      analyze_update: 새 메시지만 증분 분석, 검색어가 같으면 추천을 다시 검색하지 않음 (네이버 요청 0)
+-     단계별 프롬프트 토큰, 출력 토큰, LLM 호출 수, Tool 호출 수, 네이버 요청 수, 실행 시간 기록
+-     커밋된 기준선(benchmarks/baselines/pipeline.json)과 허용 오차 내에서 비교, 초과 시 실패
+
+실행:
+    python -m benchmarks.perf_regression            # 기준선과 비교 (회귀 시 종료 코드 1)
+    python -m benchmarks.perf_regression --update   # 의도한 변경이면 기준선 갱신 후 커밋
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from typing import Dict, List, Optional
+
+os.environ.setdefault("CREWAI_DISABLE_TELEMETRY", "true")
+os.environ.setdefault("OTEL_SDK_DISABLED", "true")
+
+from core_crewai import crewai_tools
+from core_crewai.crew_orchestrator import CrewOrchestrator
+from core_crewai.fakes import FakeLLM, FakeNaverServer
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), "baselines", "pipeline.json")
+
+# 고정 시나리오 (FakeLLM 응답은 프롬프트에 대해 결정적이므로 매번 같은 경로를 실행)
+SCENARIO_MESSAGES = [
+    "요즘 회사에서 스트레스를 너무 많이 받아요.",
+    "상사가 무리한 요구를 하는데 거절을 못 하겠어요.",
+    "밤에 잠도 잘 안 오고 계속 불안해요.",
+]
+# 분석/추천 후 이어지는 대화 (증분 분석 대상)
+FOLLOWUP_MESSAGES = [
+    "추천해 주신 책을 읽어 보려고요. 그래도 출근 전날 밤이 제일 힘들어요.",
+]
+
+# 지표별 허용 오차: (상대 비율, 절대값) - 기준선 * (1 + 비율) + 절대값 까지 허용
+TOLERANCES = {
+    "prompt_tokens": (0.05, 20),
+    "completion_tokens": (0.10, 20),
+    "llm_calls": (0.0, 0),
+    "tool_calls": (0.0, 0),
+    "naver_requests": (0.0, 0),
+    "wall_seconds": (1.0, 0.5),  # 실행 시간은 기계마다 다르므로 넉넉하게
+}
+
+
+def _stage_metrics(llm: FakeLLM, stage: str, naver_requests: int, wall_seconds: float, since: int = 0) -> Dict:
+    calls = [call for call in llm.get_calls()[since:] if call["stage"] == stage]
+    return {
+        "prompt_tokens": sum(call["prompt_tokens"] for call in calls),
+        "completion_tokens": sum(call["completion_tokens"] for call in calls),
+        "llm_calls": len(calls),
+        "tool_calls": sum(1 for call in calls if call["tool_call"]),
+        "naver_requests": naver_requests,
+        "wall_seconds": round(wall_seconds, 4),
+    }
+
+
+def run_scenario() -> Dict[str, Dict]:
+    """고정 시나리오를 실행하고 단계별 지표 반환"""
+    llm = FakeLLM()
+    orchestrator = CrewOrchestrator(llm=llm)
+    metrics: Dict[str, Dict] = {}
+
+    original_url = crewai_tools.NAVER_BOOK_SEARCH_URL
+    with FakeNaverServer() as naver:
+        crewai_tools.NAVER_BOOK_SEARCH_URL = naver.url
+        try:
+            # 1. 상담 (여러 턴 합계)
+            history: List[Dict] = []
+            started = time.perf_counter()
+            for message in SCENARIO_MESSAGES:
+                response, _ = orchestrator.chat(message, history)
+                history.append({"role": "user", "content": message})
+                history.append({"role": "assistant", "content": response})
+            metrics["chat"] = _stage_metrics(llm, "chat", 0, time.perf_counter() - started)
+
+            # 2. 분석
+            started = time.perf_counter()
+            summary = orchestrator.analyze_conversation(history)
+            metrics["analyze"] = _stage_metrics(llm, "analyze", 0, time.perf_counter() - started)
+
+            # 3. 추천
+            requests_before = naver.request_count
+            started = time.perf_counter()
+            orchestrator.recommend_books_from_summary(summary, max_books=5)
+            metrics["recommend"] = _stage_metrics(
+                llm, "recommend", naver.request_count - requests_before, time.perf_counter() - started
+            )
+
+            # 4. 분석 후 이어진 대화 -> 새 메시지만 증분 분석 (검색어가 바뀐 경우에만 다시 추천)
+            analyzed = len(history)
+            for message in FOLLOWUP_MESSAGES:
+                response, _ = orchestrator.chat(message, history)
+                history.append({"role": "user", "content": message})
+                history.append({"role": "assistant", "content": response})
+            calls_before = len(llm.get_calls())
+            requests_before = naver.request_count
+            started = time.perf_counter()
+            updated, diff = orchestrator.update_analysis(summary, history[analyzed:])
+            if diff.requires_search:
+                orchestrator.recommend_books_from_summary(updated, max_books=5)
+            metrics["analyze_update"] = _stage_metrics(
+                llm, "analyze", naver.request_count - requests_before, time.perf_counter() - started,
+                since=calls_before
+            )
+        finally:
+            crewai_tools.NAVER_BOOK_SEARCH_URL = original_url
+
+    return metrics
+
+
+def compare(current: Dict[str, Dict], baseline: Dict[str, Dict]) -> List[Dict]:
+    """기준선과 비교한 지표별 결과 목록"""
+    rows = []
+    for stage, stage_metrics in current.items():
+        base_metrics = baseline.get(stage, {})
+        for metric, value in stage_metrics.items():
+            base = base_metrics.get(metric)
+            if base is None:
+                rows.append({"stage": stage, "metric": metric, "baseline": None, "current": value,
+                             "limit": None, "regressed": False})
+                continue
+            ratio, absolute = TOLERANCES.get(metric, (0.0, 0))
+            limit = base * (1 + ratio) + absolute
+            rows.append({
+                "stage": stage,
+                "metric": metric,
+                "baseline": base,
+                "current": value,
+                "limit": round(limit, 4),
+                "regressed": value > limit,
+            })
+    return rows
+
+
+def format_diff(rows: List[Dict]) -> str:
+    """비교 결과를 읽기 쉬운 표로 변환 (회귀 항목에 ✗ 표시)"""
+    lines = [f"  {'단계':<16}{'지표':<20}{'기준선':>12}{'현재':>12}{'변화':>10}{'허용 상한':>12}"]
+    for row in rows:
+        base, value = row["baseline"], row["current"]
+        if base is None:
+            change = "(new)"
+        elif base:
+            change = f"{(value / base - 1) * 100:+.1f}%"
+        else:
+            change = "+0.0%" if value == base else "+∞"
+        mark = "✗" if row["regressed"] else " "
+        base_text = "-" if base is None else base
+        limit_text = "-" if row["limit"] is None else row["limit"]
+        lines.append(f"{mark} {row['stage']:<16}{row['metric']:<20}{base_text:>12}{value:>12}{change:>10}{limit_text:>12}")
+    return "\n".join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="파이프라인 토큰/호출 수/지연 회귀 게이트")
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="기준선 JSON 경로")
+    parser.add_argument("--update", action="store_true", help="현재 결과로 기준선 갱신")
+    parser.add_argument("--skip-timing", action="store_true", help="실행 시간(wall_seconds) 비교 제외")
+    args = parser.parse_args(argv)
+
+    current = run_scenario()
+
+    if args.update:
+        os.makedirs(os.path.dirname(os.path.abspath(args.baseline)), exist_ok=True)
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(current, f, ensure_ascii=False, indent=2, sort_keys=True)
+            f.write("\n")
+        print(f"기준선 갱신: {args.baseline}")
+        print(json.dumps(current, ensure_ascii=False, indent=2))
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f"기준선이 없습니다: {args.baseline} (--update로 생성하세요)")
+        return 1
+
+    with open(args.baseline, "r", encoding="utf-8") as f:
+        baseline = json.load(f)
+
+    rows = compare(current, baseline)
+    if args.skip_timing:
+        rows = [row for row in rows if row["metric"] != "wall_seconds"]
+
+    print(format_diff(rows))
+    regressions = [row for row in rows if row["regressed"]]
+    if regressions:
+        print(f"\n❌ 성능 회귀 {len(regressions)}건 - 의도한 변경이면 --update로 기준선을 갱신하세요")
+        return 1
+    print("\n✅ 기준선 대비 회귀 없음")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
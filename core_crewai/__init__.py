@@ -4,21 +4,35 @@ PageMind Core - Multi-Agent Psychological Counseling System
 
 from .models import (
     Message,
+    TokenUsage,
+    UsageReport,
     ChatRequest,
     ChatResponse,
     SummaryRequest,
     PsychologicalSummary,
+    SummaryDiff,
     BookRecommendation,
-    CounselingResult
+    RecommendRequest,
+    CounselingResult,
+    AnalysisUpdateRequest,
+    AnalysisUpdate,
+    SessionState
 )
 
 __all__ = [
     "Message",
+    "TokenUsage",
+    "UsageReport",
     "ChatRequest",
     "ChatResponse",
     "SummaryRequest",
     "PsychologicalSummary",
+    "SummaryDiff",
     "BookRecommendation",
+    "RecommendRequest",
     "CounselingResult",
+    "AnalysisUpdateRequest",
+    "AnalysisUpdate",
+    "SessionState",
 ]
 
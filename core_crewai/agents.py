@@ -6,42 +6,64 @@ CrewAI 에이전트 정의
     챗봇으로 수집된 사용자의 심리 상태에 대해 분석하는 에이전트트
 -     Book Recommender Agent: 분석에서 식별된 심리적 필요에 맞는 책을 찾아 추천하는 에이전트
     네이버 도서 검색 API를 사용 (tool)
+-     Reason Writer Agent: 재정렬로 선정된 추천 도서 전체의 추천 이유를 한 번의 호출로 작성하는 에이전트 (선택)
 """
-from pathlib import Path
+import os
 from crewai import Agent
 from .crewai_tools import search_naver_books_tool, signal_analysis_ready
+from .logs import CREW_VERBOSE
+from .prompts import get_prompt
 
-# 에이전트 설정 
+# 기본 LLM (PAGEMIND_LLM_MODEL 환경 변수로 변경 가능)
+# 각 create_*_agent()에 llm을 넘기면 모델 문자열 대신 LLM 객체(예: fakes.FakeLLM)를 사용
+DEFAULT_LLM = os.getenv("PAGEMIND_LLM_MODEL", "anthropic/claude-sonnet-4-20250514")
+# 세션 토큰 예산 초과 시 사용할 저비용 LLM (PAGEMIND_FALLBACK_LLM_MODEL로 변경 가능)
+FALLBACK_LLM = os.getenv("PAGEMIND_FALLBACK_LLM_MODEL", "anthropic/claude-3-5-haiku-20241022")
+
+# 에이전트 설정 (verbose 콘솔 출력은 PAGEMIND_CREW_VERBOSE=1일 때만, 기본은 logs.py 구조화 로그)
 COUNSELOR_CONFIG = {
     "role": "Empathic Counselor and Data Collector",
     "goal": "Gather comprehensive user information through empathic listening for psychological analysis and book recommendations",
-    "verbose": True,
+    "verbose": CREW_VERBOSE,
     "allow_delegation": False,
 }
 
 ANALYZER_CONFIG = {
     "role": "Expert Psychological Analyst",
     "goal": "Analyze conversations using rigorous psychological frameworks from SKILL.md to provide comprehensive psychological insights",
-    "verbose": True,
+    "verbose": CREW_VERBOSE,
     "allow_delegation": False,
 }
 
 RECOMMENDER_CONFIG = {
     "role": "Bibliotherapy Specialist",
     "goal": "Find and recommend books that match psychological needs identified in the analysis",
-    "verbose": True,
+    "verbose": CREW_VERBOSE,
+    "allow_delegation": False,
+}
+
+REASON_WRITER_CONFIG = {
+    "role": "Bibliotherapy Reason Writer",
+    "goal": "Explain in one batch why each selected book fits the user's psychological needs",
+    "verbose": False,
     "allow_delegation": False,
 }
 
+# 에이전트 role -> 단계 이름
+STAGE_BY_ROLE = {
+    COUNSELOR_CONFIG["role"]: "chat",
+    ANALYZER_CONFIG["role"]: "analyze",
+    RECOMMENDER_CONFIG["role"]: "recommend",
+    REASON_WRITER_CONFIG["role"]: "reasons",
+}
+
 
 def _load_prompt(filename: str) -> str:
-    """text_prompts 디렉토리에서 프롬프트 텍스트 로드"""
-    prompt_dir = Path(__file__).parent / "text_prompts"
-    prompt_path = prompt_dir / filename
-    return prompt_path.read_text(encoding="utf-8").strip()
+    """text_prompts 프롬프트 텍스트 (prompts 레지스트리에 미리 로드된 것을 사용)"""
+    return get_prompt(filename)
 
 
-def create_counselor_agent() -> Agent:
+def create_counselor_agent(llm=None) -> Agent:
     """
 
     """
@@ -54,12 +76,12 @@ def create_counselor_agent() -> Agent:
         backstory=backstory,
         verbose=COUNSELOR_CONFIG["verbose"],
         allow_delegation=COUNSELOR_CONFIG["allow_delegation"],
-        llm="anthropic/claude-sonnet-4-20250514",
+        llm=llm or DEFAULT_LLM,
         tools=[signal_analysis_ready],  
     )
 
 
-def create_psychological_analyzer_agent() -> Agent:
+def create_psychological_analyzer_agent(llm=None) -> Agent:
     backstory = _load_prompt("analyzer_backstory.txt")
     
     return Agent(
@@ -68,12 +90,12 @@ def create_psychological_analyzer_agent() -> Agent:
         backstory=backstory,
         verbose=ANALYZER_CONFIG["verbose"],
         allow_delegation=ANALYZER_CONFIG["allow_delegation"],
-        llm="anthropic/claude-sonnet-4-20250514",
+        llm=llm or DEFAULT_LLM,
         tools=[],
     )
 
 
-def create_book_recommender_agent() -> Agent:
+def create_book_recommender_agent(llm=None) -> Agent:
     backstory = _load_prompt("recommender_backstory.txt")
     
     return Agent(
@@ -82,7 +104,20 @@ def create_book_recommender_agent() -> Agent:
         backstory=backstory,
         verbose=RECOMMENDER_CONFIG["verbose"],
         allow_delegation=RECOMMENDER_CONFIG["allow_delegation"],
-        llm="anthropic/claude-sonnet-4-20250514",
+        llm=llm or DEFAULT_LLM,
         tools=[search_naver_books_tool],
     )
 
+
+def create_reason_writer_agent(llm=None) -> Agent:
+    backstory = _load_prompt("reason_writer_backstory.txt")
+    
+    return Agent(
+        role=REASON_WRITER_CONFIG["role"],
+        goal=REASON_WRITER_CONFIG["goal"],
+        backstory=backstory,
+        verbose=REASON_WRITER_CONFIG["verbose"],
+        allow_delegation=REASON_WRITER_CONFIG["allow_delegation"],
+        llm=llm or DEFAULT_LLM,
+        tools=[],
+    )
@@ -0,0 +1,263 @@
+"""
+오프라인 배치 분석 및 도서 추천 - 내보낸 대화 파일을 대량으로 재처리 (예: 프롬프트 변경 후 재분석)
+-     입력: export_conversation으로 내보낸 파일 (.ndjson: 메타데이터 줄 + 메시지 줄, .json: 이전 형식)
+-     실행: 스레드/프로세스 풀에서 동시 실행 수를 제한하여 분석 + 추천
+-     체크포인트: 처리 완료된 항목을 기록하여 중단된 실행을 이어서 수행
+-     출력: 항목별 결과, 단계별 소요 시간, 실패 원인을 NDJSON으로 기록
+
+실행:
+    python -m core_crewai.batch_runner exports/ -o results.ndjson --workers 4
+"""
+
+import argparse
+import glob
+import os
+import sys
+import threading
+import time
+from concurrent.futures import (
+    Executor,
+    FIRST_COMPLETED,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    wait,
+)
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, Iterable, Iterator, List, Optional, Set
+
+from .serialization import dumps, loads
+
+CONVERSATION_SUFFIXES = (".ndjson", ".jsonl", ".json")
+
+# 워커별 오케스트레이터 (스레드/프로세스마다 하나씩 생성하여 상태 공유 방지)
+_worker_state = threading.local()
+
+
+@dataclass
+class BatchStats:
+    """배치 실행 결과 요약"""
+    total: int = 0
+    succeeded: int = 0
+    failed: int = 0
+    skipped: int = 0
+    elapsed_seconds: float = 0.0
+
+
+def iter_conversation_files(inputs: Iterable[str]) -> Iterator[str]:
+    """입력 경로(파일, 디렉토리, glob 패턴)에서 대화 파일 경로를 정렬된 순서로 생성"""
+    for pattern in inputs:
+        if os.path.isdir(pattern):
+            for root, _, files in os.walk(pattern):
+                for name in sorted(files):
+                    if name.endswith(CONVERSATION_SUFFIXES):
+                        yield os.path.join(root, name)
+        elif os.path.isfile(pattern):
+            yield pattern
+        else:
+            yield from sorted(glob.glob(pattern, recursive=True))
+
+
+def load_conversation(path: str) -> List[Dict]:
+    """
+    내보낸 대화 파일에서 메시지 리스트 로드
+
+    -     .ndjson/.jsonl: 첫 줄 메타데이터(message_count 등), 이후 한 줄에 메시지 하나
+    -     .json: {"exported_at": ..., "messages": [...]} 형식
+    """
+    messages = []
+    with open(path, "r", encoding="utf-8") as f:
+        if path.endswith(".json"):
+            data = loads(f.read())
+            messages = data.get("messages", []) if isinstance(data, dict) else data
+        else:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                record = loads(line)
+                if "role" in record and "content" in record:
+                    messages.append(record)
+    return [
+        {"role": m["role"], "content": m["content"]}
+        for m in messages
+        if isinstance(m, dict) and "role" in m and "content" in m
+    ]
+
+
+def load_checkpoint(checkpoint_path: str) -> Set[str]:
+    """체크포인트 파일에서 성공적으로 처리된 항목 ID 로드"""
+    done = set()
+    if not os.path.exists(checkpoint_path):
+        return done
+    with open(checkpoint_path, "r", encoding="utf-8") as f:
+        for line in f:
+            item_id, _, status = line.rstrip("\n").rpartition("\t")
+            if status == "ok":
+                done.add(item_id)
+    return done
+
+
+def _get_worker_orchestrator():
+    """현재 워커(스레드 또는 프로세스)의 오케스트레이터"""
+    orchestrator = getattr(_worker_state, "orchestrator", None)
+    if orchestrator is None:
+        from .crew_orchestrator import CrewOrchestrator
+
+        orchestrator = CrewOrchestrator()
+        _worker_state.orchestrator = orchestrator
+    return orchestrator
+
+
+def process_conversation_file(path: str, max_books: int = 5) -> Dict:
+    """
+    대화 파일 하나를 분석 + 추천 (워커에서 실행)
+
+    Returns:
+        NDJSON 결과 레코드 (예외는 status=error 레코드로 변환)
+    """
+    # 함수 안에서 import: usage가 agents(-> crewai)를 불러오므로 모듈 import(CLI --help 등)를 가볍게 유지
+    from .usage import usage_tracker
+
+    timings = {}
+    record = {"id": path, "status": "ok"}
+    started = time.perf_counter()
+    try:
+        stage_started = time.perf_counter()
+        messages = load_conversation(path)
+        timings["load_seconds"] = round(time.perf_counter() - stage_started, 4)
+        if not messages:
+            raise ValueError("대화 메시지가 없습니다")
+
+        orchestrator = _get_worker_orchestrator()
+
+        stage_started = time.perf_counter()
+        summary = orchestrator.analyze_conversation(messages, session_id=path)
+        timings["analysis_seconds"] = round(time.perf_counter() - stage_started, 4)
+
+        stage_started = time.perf_counter()
+        books = orchestrator.recommend_books_from_summary(summary, max_books=max_books, session_id=path)
+        timings["recommendation_seconds"] = round(time.perf_counter() - stage_started, 4)
+
+        record["message_count"] = len(messages)
+        record["summary"] = summary.model_dump()
+        record["recommended_books"] = [book.model_dump() for book in books]
+    except Exception as e:
+        record["status"] = "error"
+        record["error"] = f"{type(e).__name__}: {e}"
+
+    timings["total_seconds"] = round(time.perf_counter() - started, 4)
+    record["timings"] = timings
+    record["usage"] = usage_tracker.pop_session(path).model_dump(exclude={"session_id"})
+    record["finished_at"] = datetime.now().isoformat()
+    return record
+
+
+def run_batch(
+    inputs: Iterable[str],
+    output_path: str,
+    checkpoint_path: Optional[str] = None,
+    workers: int = 4,
+    use_processes: bool = False,
+    max_books: int = 5,
+    max_in_flight: Optional[int] = None
+) -> BatchStats:
+    """
+    대화 파일들을 배치로 분석 + 추천
+
+    Args:
+        inputs: 파일, 디렉토리 또는 glob 패턴 목록
+        output_path: 결과 NDJSON 파일 (이어쓰기)
+        checkpoint_path: 체크포인트 파일 (기본: output_path + ".checkpoint")
+        workers: 동시 실행 워커 수
+        use_processes: True면 프로세스 풀, False면 스레드 풀 (LLM 호출은 I/O 대기가 대부분)
+        max_books: 항목별 추천 도서 수
+        max_in_flight: 동시에 제출해 둘 최대 작업 수 (기본: workers * 2)
+
+    Returns:
+        BatchStats
+    """
+    checkpoint_path = checkpoint_path or output_path + ".checkpoint"
+    max_in_flight = max_in_flight or workers * 2
+    done_ids = load_checkpoint(checkpoint_path)
+    stats = BatchStats()
+    started = time.perf_counter()
+
+    executor_cls = ProcessPoolExecutor if use_processes else ThreadPoolExecutor
+    executor: Executor = executor_cls(max_workers=workers)
+
+    with executor, \
+            open(output_path, "a", encoding="utf-8") as output, \
+            open(checkpoint_path, "a", encoding="utf-8") as checkpoint:
+
+        def write_result(record: Dict):
+            output.write(dumps(record) + "\n")
+            output.flush()
+            # 결과를 먼저 기록한 뒤 체크포인트 기록 (중단 시 결과 누락 방지)
+            checkpoint.write(f"{record['id']}\t{record['status']}\n")
+            checkpoint.flush()
+
+            if record["status"] == "ok":
+                stats.succeeded += 1
+            else:
+                stats.failed += 1
+                print(f"✗ {record['id']}: {record.get('error')}")
+            processed = stats.succeeded + stats.failed
+            if processed % 10 == 0:
+                print(f"진행: {processed}건 처리 (성공 {stats.succeeded}, 실패 {stats.failed})")
+
+        # 결과/체크포인트 파일이 입력 디렉토리 안에 있어도 입력으로 취급하지 않음
+        own_files = {os.path.abspath(output_path), os.path.abspath(checkpoint_path)}
+
+        pending = set()
+        for path in iter_conversation_files(inputs):
+            if os.path.abspath(path) in own_files:
+                continue
+            stats.total += 1
+            if path in done_ids:
+                stats.skipped += 1
+                continue
+
+            # 제출된 작업 수 제한 (파일 목록 전체를 메모리에 올리지 않음)
+            while len(pending) >= max_in_flight:
+                finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    write_result(future.result())
+
+            pending.add(executor.submit(process_conversation_file, path, max_books))
+
+        for future in wait(pending).done:
+            write_result(future.result())
+
+    stats.elapsed_seconds = round(time.perf_counter() - started, 2)
+    return stats
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="내보낸 대화 파일 배치 분석 및 도서 추천")
+    parser.add_argument("inputs", nargs="+", help="대화 파일, 디렉토리 또는 glob 패턴")
+    parser.add_argument("-o", "--output", required=True, help="결과 NDJSON 파일")
+    parser.add_argument("--checkpoint", help="체크포인트 파일 (기본: <output>.checkpoint)")
+    parser.add_argument("--workers", type=int, default=4, help="동시 실행 워커 수 (기본 4)")
+    parser.add_argument("--processes", action="store_true", help="스레드 대신 프로세스 풀 사용")
+    parser.add_argument("--max-books", type=int, default=5, help="항목별 추천 도서 수 (기본 5)")
+    args = parser.parse_args(argv)
+
+    print(f"배치 실행 시작 (workers={args.workers}, {'process' if args.processes else 'thread'} 풀)")
+    stats = run_batch(
+        args.inputs,
+        args.output,
+        checkpoint_path=args.checkpoint,
+        workers=args.workers,
+        use_processes=args.processes,
+        max_books=args.max_books
+    )
+    print(
+        f"완료: 전체 {stats.total}건, 성공 {stats.succeeded}, 실패 {stats.failed}, "
+        f"건너뜀 {stats.skipped} ({stats.elapsed_seconds}초)"
+    )
+    return 1 if stats.failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
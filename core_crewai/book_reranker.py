@@ -4,10 +4,19 @@
 실제 call은 crew_orchestrator.py에서 이루어짐
 """
 
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
 from datetime import datetime
+import heapq
 import math
 
+from .candidate_store import clean_text
+from .lexical_relevance import LexicalQuery, lexical_scorer
+from .popularity import POPULARITY_WEIGHT, popularity_tracker
+
+# 어휘 관련도(BM25) 가중치 - query가 있을 때 기존 점수와 (1 - w) : w로 결합
+LEXICAL_WEIGHT = 0.3
+# 인기도 가중치는 popularity.POPULARITY_WEIGHT (PAGEMIND_POPULARITY_WEIGHT, 0보다 크면 위 점수와 (1 - w) : w로 결합)
+
 
 def parse_pubdate(pubdate: str) -> Optional[datetime]:
     if not pubdate or len(pubdate) < 8:
@@ -112,6 +121,59 @@ def calculate_genre_match_score(book_description: str, book_title: str, preferre
         return 0.3  
 
 
+def _score_book(
+    book: Dict,
+    position: int,
+    total_results: int,
+    preferred_genre: Optional[str],
+    recency_weight: float,
+    relevance_weight: float,
+    genre_weight: float,
+    lexical: Optional[float] = None,
+    lexical_weight: float = LEXICAL_WEIGHT,
+    popularity: Optional[float] = None,
+    popularity_weight: float = POPULARITY_WEIGHT
+) -> Tuple[float, Dict]:
+    """
+    책 한 권의 점수 계산 -> (반올림 전 최종 점수, 점수가 추가된 복사본 (_ranking_scores))
+    정렬에는 반올림 전 점수를 사용 (_ranking_scores는 표시용으로 소수 셋째 자리 반올림)
+    lexical/popularity가 None이면 그 점수 없이 계산
+    """
+    # 각 점수 계산
+    recency = calculate_recency_score(book.get("pubdate", ""))
+    relevance = calculate_relevance_score(position, total_results)
+    genre_match = calculate_genre_match_score(
+        book.get("description", ""),
+        book.get("title", ""),
+        preferred_genre
+    )
+    
+    # 가중 평균 계산
+    final_score = (
+        recency_weight * recency +
+        relevance_weight * relevance +
+        genre_weight * genre_match
+    )
+    if lexical is not None:
+        final_score = (1 - lexical_weight) * final_score + lexical_weight * lexical
+    if popularity is not None:
+        final_score = (1 - popularity_weight) * final_score + popularity_weight * popularity
+    
+    # 디버그 정보 추가
+    book_with_score = book.copy()
+    book_with_score["_ranking_scores"] = {
+        "final_score": round(final_score, 3),
+        "recency": round(recency, 3),
+        "relevance": round(relevance, 3),
+        "genre_match": round(genre_match, 3)
+    }
+    if lexical is not None:
+        book_with_score["_ranking_scores"]["lexical"] = round(lexical, 3)
+    if popularity is not None:
+        book_with_score["_ranking_scores"]["popularity"] = round(popularity, 3)
+    return final_score, book_with_score
+
+
 # 4. 최종 하이브리드 리랭킹
 def rerank_books(
     books: List[Dict], 
@@ -119,7 +181,10 @@ def rerank_books(
     recency_weight: float = 0.4,
     relevance_weight: float = 0.4,
     genre_weight: float = 0.2,
-    max_results: int = 5
+    max_results: int = 5,
+    query: Optional[LexicalQuery] = None,
+    lexical_weight: float = LEXICAL_WEIGHT,
+    popularity_weight: float = POPULARITY_WEIGHT
 ) -> List[Dict]:
     """
     하이브리드 알고리즘으로 책 순위 재정렬
@@ -131,6 +196,9 @@ def rerank_books(
         relevance_weight: 관련도 가중치 (기본 0.4)
         genre_weight: 장르 매칭 가중치 (기본 0.2)
         max_results: 반환할 최대 결과 수 (기본 5)
+        query: 심리 분석 결과 BM25 질의 (lexical_relevance.build_query) - 있으면 어휘 관련도를 함께 반영
+        lexical_weight: 어휘 관련도 가중치 (기본 0.3, 나머지 세 점수는 1 - lexical_weight 비율로 축소)
+        popularity_weight: 인기도(popularity_tracker) 가중치 (기본 PAGEMIND_POPULARITY_WEIGHT, 0이면 사용 안 함)
         
     Returns:
         점수 순으로 정렬된 책 리스트
@@ -140,34 +208,17 @@ def rerank_books(
     
     total_results = len(books)
     scored_books = []
+    lexical_scores = lexical_scorer.score_many(books, query) if query else [None] * total_results
+    popularity_scores = popularity_tracker.score_many(books) if popularity_weight > 0 else [None] * total_results
     
     for idx, book in enumerate(books):
-        # 각 점수 계산
-        recency = calculate_recency_score(book.get("pubdate", ""))
-        relevance = calculate_relevance_score(idx, total_results)
-        genre_match = calculate_genre_match_score(
-            book.get("description", ""),
-            book.get("title", ""),
-            preferred_genre
-        )
-        
-        # 가중 평균 계산
-        final_score = (
-            recency_weight * recency +
-            relevance_weight * relevance +
-            genre_weight * genre_match
+        score, book_with_score = _score_book(
+            book, idx, total_results, preferred_genre,
+            recency_weight, relevance_weight, genre_weight,
+            lexical_scores[idx], lexical_weight,
+            popularity_scores[idx], popularity_weight
         )
-        
-        # 디버그 정보 추가
-        book_with_score = book.copy()
-        book_with_score["_ranking_scores"] = {
-            "final_score": round(final_score, 3),
-            "recency": round(recency, 3),
-            "relevance": round(relevance, 3),
-            "genre_match": round(genre_match, 3)
-        }
-        
-        scored_books.append((final_score, book_with_score))
+        scored_books.append((score, book_with_score))
     
     # 점수 내림차순 정렬
     scored_books.sort(key=lambda x: x[0], reverse=True)
@@ -176,22 +227,124 @@ def rerank_books(
     return [book for _, book in scored_books[:max_results]]
 
 
+# 5. 스트리밍 검색 결과용 점진적 재정렬
+class IncrementalReranker:
+    """
+    검색 결과가 도착하는 대로 하나씩 점수를 매겨 상위 max_results개만 유지 (rerank_books와 같은 점수식)
+    
+    관련도는 검색어별 순위(rank)로 계산하므로 순위가 뒤로 갈수록 점수 상한이 낮아짐
+    -> can_improve(next_rank)가 False면 그 검색어의 뒤쪽 결과는 상위권에 들 수 없으므로 페이지 요청 중단 가능
+    
+    사용:
+        reranker = IncrementalReranker(max_results=5, preferred_genre="심리학")
+        for book in iter_naver_books(keyword):
+            reranker.add(book, book["_rank"])
+            if reranker.satisfied or not reranker.can_improve(book["_rank"] + 1):
+                break
+        reranker.top()
+    """
+    
+    def __init__(
+        self,
+        max_results: int = 5,
+        preferred_genre: Optional[str] = None,
+        pool_size: int = 30,
+        stop_score: Optional[float] = None,
+        recency_weight: float = 0.4,
+        relevance_weight: float = 0.4,
+        genre_weight: float = 0.2,
+        query: Optional[LexicalQuery] = None,
+        lexical_weight: float = LEXICAL_WEIGHT,
+        popularity_weight: float = POPULARITY_WEIGHT
+    ):
+        """
+        Args:
+            max_results: 유지할 상위 결과 수
+            preferred_genre: 사용자 선호 장르
+            pool_size: 관련도 점수 계산에 쓰는 검색어별 예상 결과 수 (rerank_books의 total_results)
+            stop_score: 상위 max_results개가 모두 이 점수 이상이면 satisfied (None이면 사용 안 함, 0이면 max_results개가 차면)
+            query: 어휘 관련도 BM25 질의 (rerank_books와 같음)
+            popularity_weight: 인기도 가중치 (rerank_books와 같음)
+        """
+        self.max_results = max_results
+        self.preferred_genre = preferred_genre
+        self.pool_size = pool_size
+        self.stop_score = stop_score
+        self.weights = (recency_weight, relevance_weight, genre_weight)
+        self.query = query if query else None
+        self.lexical_weight = lexical_weight
+        self.popularity_weight = popularity_weight
+        self._heap: List[Tuple[float, int, Dict]] = []  # (점수, -도착 순서, 책) 최소 힙
+        self._seen = set()
+        self._count = 0
+    
+    def add(self, book: Dict, rank: int) -> Optional[float]:
+        """검색어 내 순위가 rank인 책 추가 -> 최종 점수 (ISBN 중복이면 None)"""
+        key = book.get("isbn") or f"{book.get('title', '')}|{book.get('author', '')}"
+        if key in self._seen:
+            return None
+        self._seen.add(key)
+        
+        lexical = lexical_scorer.score(book, self.query) if self.query else None
+        popularity = popularity_tracker.score_many([book])[0] if self.popularity_weight > 0 else None
+        score, book_with_score = _score_book(
+            book, rank, self.pool_size, self.preferred_genre, *self.weights,
+            lexical, self.lexical_weight,
+            popularity, self.popularity_weight
+        )
+        self._count += 1
+        # 같은 점수면 먼저 도착한 책 우선 (rerank_books의 안정 정렬과 같은 순서)
+        entry = (score, -self._count, book_with_score)
+        if len(self._heap) < self.max_results:
+            heapq.heappush(self._heap, entry)
+        elif entry > self._heap[0]:
+            heapq.heapreplace(self._heap, entry)
+        return score
+    
+    @property
+    def threshold(self) -> float:
+        """상위권에 들기 위한 최소 점수 (아직 max_results개 미만이면 0)"""
+        return self._heap[0][0] if len(self._heap) >= self.max_results else 0.0
+    
+    def upper_bound(self, rank: int) -> float:
+        """검색어 내 순위 rank인 책이 받을 수 있는 최대 점수 (최신성, 장르, 어휘 관련도, 인기도 1.0 가정)"""
+        recency_weight, relevance_weight, genre_weight = self.weights
+        genre_max = 0.5 if not self.preferred_genre or self.preferred_genre == "기타" else 1.0
+        bound = recency_weight + relevance_weight * calculate_relevance_score(rank, self.pool_size) + genre_weight * genre_max
+        if self.query:
+            bound = (1 - self.lexical_weight) * bound + self.lexical_weight
+        if self.popularity_weight > 0:
+            bound = (1 - self.popularity_weight) * bound + self.popularity_weight
+        return bound
+    
+    def can_improve(self, next_rank: int) -> bool:
+        """검색어 내 순위 next_rank 이후의 책이 상위권에 들 가능성이 있는지"""
+        return len(self._heap) < self.max_results or self.upper_bound(next_rank) > self.threshold
+    
+    @property
+    def satisfied(self) -> bool:
+        """상위 max_results개가 모두 stop_score 이상 (호출자가 검색을 끝내도 됨)"""
+        return self.stop_score is not None and len(self._heap) >= self.max_results and self.threshold >= self.stop_score
+    
+    @property
+    def seen_count(self) -> int:
+        return self._count
+    
+    def top(self) -> List[Dict]:
+        """점수 내림차순 상위 결과 (rerank_books와 같은 형식)"""
+        return [book for _, _, book in sorted(self._heap, reverse=True)]
+
+
 # 책 추천 결과를 형식에 맞추어 변환
 def format_book_for_recommendation(book: Dict) -> Dict:
     """
     네이버 API 응답을 BookRecommendation 형식으로 변환
     """
-    # HTML 태그 제거
-    def clean_html(text: str) -> str:
-        if not text:
-            return ""
-        return text.replace("<b>", "").replace("</b>", "").strip()
-    
     return {
-        "title": clean_html(book.get("title", "")),
-        "author": clean_html(book.get("author", "")),
-        "publisher": clean_html(book.get("publisher", "")),
-        "description": clean_html(book.get("description", "")),
+        "title": clean_text(book.get("title", "")),
+        "author": clean_text(book.get("author", "")),
+        "publisher": clean_text(book.get("publisher", "")),
+        "description": clean_text(book.get("description", "")),
         "isbn": book.get("isbn", ""),
         "cover_image": book.get("image", ""),
         "link": book.get("link", ""),
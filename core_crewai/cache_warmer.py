@@ -0,0 +1,276 @@
+"""
+검색 캐시 워머 - 자주 나오는 분석 키워드의 네이버 검색 결과를 한가한 시간에 미리 받아 두어
+추천 경로의 검색이 대부분 캐시 적중이 되도록 함
+-     KeywordCounter: space-saving top-k 빈도 카운터 (최대 capacity개 항목만 보관, 긴 꼬리 분포에서도 상위권은 정확)
+      오케스트레이터가 검색 계획의 검색어(겹치는 키워드 병합 후)마다 기록, 하루마다 빈도를 절반으로 감쇠
+-     NaverQuota: 오늘 이 프로세스의 네이버 API 호출 수 (모든 페이지 요청 집계, 날짜가 바뀌면 초기화)
+-     CacheWarmer: 백그라운드 스레드
+      · 한가한 시간대(PAGEMIND_WARMER_QUIET_HOURS)에만 PAGEMIND_WARMER_INTERVAL_SECONDS마다 실행
+      · 상위 N개 검색어 중 캐시가 없거나 유효 시간이 절반 넘게 지난 검색어를 다시 받아 WARMER_TTL 동안 캐시
+      · 워머 호출은 하루 할당량의 PAGEMIND_WARMER_QUOTA_SHARE 이하,
+        전체 호출이 할당량의 (1 - 몫)에 이르면 남은 호출은 실시간 요청용으로 남겨 둠
+-     캐시/카운터/할당량 집계는 프로세스(워커)마다 따로 있으므로 워커가 여럿이면 할당량을 워커 수로 나눠 설정
+
+환경 변수:
+    PAGEMIND_CACHE_WARMER=1                  캐시 워머 사용 (기본 비활성)
+    PAGEMIND_WARMER_TOP_N=20                 미리 받을 상위 검색어 수
+    PAGEMIND_WARMER_INTERVAL_SECONDS=900     실행 간격
+    PAGEMIND_WARMER_QUIET_HOURS=2-6          실행 시간대 (로컬 시각 시작-끝, 끝 미포함, "22-5"처럼 자정을 넘어도 됨)
+    PAGEMIND_WARMER_TTL_SECONDS=86400        워머가 받은 결과의 캐시 유효 시간
+    PAGEMIND_NAVER_DAILY_QUOTA=25000         네이버 검색 API 하루 호출 한도
+    PAGEMIND_WARMER_QUOTA_SHARE=0.1          워머가 쓸 수 있는 하루 한도 비율
+"""
+
+import heapq
+import os
+import threading
+import time
+from contextlib import contextmanager
+from datetime import date, datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from .logs import get_logger
+from .query_planner import query_planner
+from .search_cache import normalize_query, search_cache
+from .tracing import span
+
+CACHE_WARMER_ENABLED = os.getenv("PAGEMIND_CACHE_WARMER", "0").lower() in ("1", "true", "yes")
+WARMER_TOP_N = int(os.getenv("PAGEMIND_WARMER_TOP_N", "20"))
+WARMER_INTERVAL_SECONDS = float(os.getenv("PAGEMIND_WARMER_INTERVAL_SECONDS", "900"))
+WARMER_QUIET_HOURS = os.getenv("PAGEMIND_WARMER_QUIET_HOURS", "2-6")
+WARMER_TTL_SECONDS = float(os.getenv("PAGEMIND_WARMER_TTL_SECONDS", "86400"))
+NAVER_DAILY_QUOTA = int(os.getenv("PAGEMIND_NAVER_DAILY_QUOTA", "25000"))
+WARMER_QUOTA_SHARE = float(os.getenv("PAGEMIND_WARMER_QUOTA_SHARE", "0.1"))
+KEYWORD_COUNTER_CAPACITY = 512
+DAILY_DECAY = 0.5  # 날짜가 바뀔 때마다 빈도에 곱함 (오래된 유행 키워드가 상위권을 계속 차지하지 않도록)
+
+log = get_logger("cache_warmer")
+
+
+def parse_quiet_hours(spec: str) -> Tuple[int, int]:
+    """"2-6" -> (2, 6) (잘못된 형식이면 ValueError)"""
+    start, _, end = spec.partition("-")
+    start_hour, end_hour = int(start), int(end)
+    if not (0 <= start_hour <= 24 and 0 <= end_hour <= 24):
+        raise ValueError(f"시간대 형식이 잘못되었습니다: {spec}")
+    return start_hour, end_hour
+
+
+def in_hours(hour: int, hours: Tuple[int, int]) -> bool:
+    start, end = hours
+    if start == end:
+        return False
+    if start < end:
+        return start <= hour < end
+    return hour >= start or hour < end  # 자정을 넘는 시간대
+
+
+class KeywordCounter:
+    """
+    space-saving top-k 빈도 카운터 (스레드 안전)
+    항목이 capacity개를 넘으면 가장 작은 항목을 새 항목으로 교체하고 그 빈도를 물려줌 (과대 추정 상한 = error)
+    """
+
+    def __init__(self, capacity: int = KEYWORD_COUNTER_CAPACITY):
+        self.capacity = capacity
+        self._counts: Dict[str, float] = {}
+        self._errors: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def add(self, keyword: str, count: float = 1.0):
+        key = normalize_query(keyword)
+        if not key:
+            return
+        with self._lock:
+            if key in self._counts:
+                self._counts[key] += count
+                return
+            if len(self._counts) < self.capacity:
+                self._counts[key] = count
+                self._errors[key] = 0.0
+                return
+            victim = min(self._counts, key=self._counts.__getitem__)
+            floor = self._counts.pop(victim)
+            del self._errors[victim]
+            self._counts[key] = floor + count
+            self._errors[key] = floor
+
+    def add_many(self, keywords: Iterable[str]):
+        for keyword in keywords:
+            self.add(keyword)
+
+    def top(self, n: int) -> List[Tuple[str, float]]:
+        """빈도 상위 n개 (검색어, 추정 빈도)"""
+        with self._lock:
+            return heapq.nlargest(n, self._counts.items(), key=lambda item: item[1])
+
+    def estimate(self, keyword: str) -> Tuple[float, float]:
+        """(추정 빈도, 과대 추정 상한) - 보관하지 않는 항목은 (0, 0)"""
+        key = normalize_query(keyword)
+        with self._lock:
+            return self._counts.get(key, 0.0), self._errors.get(key, 0.0)
+
+    def decay(self, factor: float):
+        with self._lock:
+            for key in self._counts:
+                self._counts[key] *= factor
+                self._errors[key] *= factor
+
+    def clear(self):
+        with self._lock:
+            self._counts.clear()
+            self._errors.clear()
+
+    def __len__(self) -> int:
+        return len(self._counts)
+
+
+class NaverQuota:
+    """오늘의 네이버 API 호출 수 (전체 / 워머)"""
+
+    def __init__(self, daily_limit: int = NAVER_DAILY_QUOTA):
+        self.daily_limit = daily_limit
+        self._day = date.today()
+        self._used = 0
+        self._warmer_used = 0
+        self._lock = threading.Lock()
+        self._local = threading.local()  # 워머 스레드의 호출 표시
+
+    def _roll(self):
+        today = date.today()
+        if today != self._day:
+            self._day, self._used, self._warmer_used = today, 0, 0
+
+    def record(self, calls: int = 1):
+        """API 호출 기록 (warmer_calls() 블록 안의 호출은 워머 몫으로도 집계)"""
+        with self._lock:
+            self._roll()
+            self._used += calls
+            if getattr(self._local, "warmer", False):
+                self._warmer_used += calls
+
+    @contextmanager
+    def warmer_calls(self):
+        self._local.warmer = True
+        try:
+            yield
+        finally:
+            self._local.warmer = False
+
+    def warmer_allowance(self, share: float) -> int:
+        """워머가 오늘 더 쓸 수 있는 호출 수"""
+        with self._lock:
+            self._roll()
+            by_share = int(self.daily_limit * share) - self._warmer_used
+            by_total = int(self.daily_limit * (1 - share)) - self._used + self._warmer_used
+            return max(0, min(by_share, by_total))
+
+    def snapshot(self) -> Dict[str, int]:
+        with self._lock:
+            self._roll()
+            return {"used": self._used, "warmer_used": self._warmer_used, "daily_limit": self.daily_limit}
+
+
+keyword_counter = KeywordCounter()
+naver_quota = NaverQuota()
+
+
+class CacheWarmer:
+    """상위 검색어 네이버 결과를 한가한 시간에 미리 받아 두는 백그라운드 스레드"""
+
+    def __init__(
+        self,
+        counter: KeywordCounter = keyword_counter,
+        quota: NaverQuota = naver_quota,
+        top_n: int = WARMER_TOP_N,
+        interval_seconds: float = WARMER_INTERVAL_SECONDS,
+        quiet_hours: str = WARMER_QUIET_HOURS,
+        ttl_seconds: float = WARMER_TTL_SECONDS,
+        quota_share: float = WARMER_QUOTA_SHARE,
+        enabled: bool = CACHE_WARMER_ENABLED
+    ):
+        self.counter = counter
+        self.quota = quota
+        self.top_n = top_n
+        self.interval_seconds = interval_seconds
+        self.quiet_hours = parse_quiet_hours(quiet_hours)
+        self.ttl_seconds = ttl_seconds
+        self.quota_share = quota_share
+        self.enabled = enabled
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._decayed_on = date.today()
+        self.last_run: Optional[float] = None
+        self.refreshed_total = 0
+
+    def start(self) -> "CacheWarmer":
+        """백그라운드 실행 시작 (비활성이면 아무것도 하지 않음)"""
+        if not self.enabled or self._thread is not None:
+            return self
+        self._thread = threading.Thread(target=self._run, name="search-cache-warmer", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+
+    def _run(self):
+        while not self._stop.wait(self.interval_seconds):
+            self._decay_daily()
+            if in_hours(datetime.now().hour, self.quiet_hours):
+                try:
+                    self.warm_once()
+                except Exception:
+                    log.exception("검색 캐시 워머 오류")
+
+    def _decay_daily(self):
+        today = date.today()
+        if today != self._decayed_on:
+            self._decayed_on = today
+            self.counter.decay(DAILY_DECAY)
+
+    def _needs_refresh(self, query: str, now: float) -> bool:
+        """캐시가 없거나 유효 시간이 절반 넘게 지난 검색어"""
+        page = search_cache.peek(query)
+        if page is None:
+            return True
+        ttl = page.ttl_seconds if page.ttl_seconds is not None else search_cache.ttl_seconds
+        return now - page.stored_at > ttl / 2
+
+    def warm_once(self) -> int:
+        """상위 검색어 캐시 갱신 1회 (갱신한 검색어 수)"""
+        from .crewai_tools import search_naver_books  # crewai import는 실제로 받을 때만
+
+        refreshed = 0
+        with span("cache.warm", top_n=self.top_n) as warm_span:
+            now = time.time()
+            for query, _ in self.counter.top(self.top_n):
+                if not self._needs_refresh(query, now):
+                    continue
+                if self.quota.warmer_allowance(self.quota_share) <= 0:
+                    warm_span.set_attribute("quota_exhausted", True)
+                    break
+                page = search_cache.peek(query)
+                display = max(query_planner.max_display, page.display if page else 0)
+                with self.quota.warmer_calls():
+                    result = search_naver_books(query, display, refresh=True, cache_ttl_seconds=self.ttl_seconds)
+                if result.get("success"):
+                    refreshed += 1
+            warm_span.set_attribute("refreshed", refreshed)
+        self.last_run = time.time()
+        self.refreshed_total += refreshed
+        return refreshed
+
+    def status(self) -> Dict:
+        return {
+            "enabled": self.enabled,
+            "running": self._thread is not None and self._thread.is_alive(),
+            "quiet_hours": f"{self.quiet_hours[0]}-{self.quiet_hours[1]}",
+            "last_run": self.last_run,
+            "refreshed_total": self.refreshed_total,
+            "top_keywords": self.counter.top(self.top_n),
+            "quota": self.quota.snapshot(),
+        }
+
+
+cache_warmer = CacheWarmer()
@@ -0,0 +1,99 @@
+"""
+도서 후보 저장소 - 검색 Tool이 받은 네이버 검색 결과 원본을 요청 단위로 서버에 보관
+-     LLM에는 짧은 핸들(b1, b2, ...)과 요약 필드(제목, 저자, 출판일, 설명 앞부분)만 전달
+      (긴 설명, 이미지/링크 URL은 컨텍스트에 넣지 않음)
+-     오케스트레이터가 LLM이 반환한 핸들을 원본 레코드로 되돌린 뒤 재정렬
+      (책 정보가 LLM을 거치며 잘리거나 바뀌지 않음)
+
+사용:
+    with candidate_scope() as store:
+        crew.kickoff(...)                  # search_naver_books_tool이 store에 원본 저장
+        books = store.resolve(["b1", "b3"])
+"""
+
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Iterable, List, Optional
+
+SUMMARY_DESCRIPTION_CHARS = 60  # LLM에 보여줄 설명 길이
+
+_current_store: ContextVar[Optional["CandidateStore"]] = ContextVar("pagemind_candidate_store", default=None)
+
+
+def clean_text(text: str) -> str:
+    """네이버 검색 결과의 강조 태그(<b>) 제거"""
+    return (text or "").replace("<b>", "").replace("</b>", "").strip()
+
+
+def compact_book(handle: str, book: Dict) -> Dict[str, str]:
+    """LLM에 전달할 요약 항목"""
+    description = clean_text(book.get("description", ""))
+    if len(description) > SUMMARY_DESCRIPTION_CHARS:
+        description = description[:SUMMARY_DESCRIPTION_CHARS].rstrip() + "…"
+    return {
+        "id": handle,
+        "title": clean_text(book.get("title", "")),
+        "author": clean_text(book.get("author", "")),
+        "pubdate": book.get("pubdate", ""),
+        "summary": description,
+    }
+
+
+class CandidateStore:
+    """요청 하나에서 검색된 도서 원본 레코드 (ISBN 기준 중복 제거, 스레드 안전)"""
+
+    def __init__(self):
+        self._records: Dict[str, Dict] = {}
+        self._handle_by_key: Dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def add(self, book: Dict) -> str:
+        """원본 레코드 저장 후 핸들 반환 (이미 저장된 책이면 기존 핸들)"""
+        key = book.get("isbn") or f"{book.get('title', '')}|{book.get('author', '')}"
+        with self._lock:
+            handle = self._handle_by_key.get(key)
+            if handle is None:
+                handle = f"b{len(self._records) + 1}"
+                self._handle_by_key[key] = handle
+                self._records[handle] = book
+            return handle
+
+    def add_many(self, books: Iterable[Dict]) -> List[Dict[str, str]]:
+        """검색 결과 전체를 저장하고 LLM에 전달할 요약 항목 목록 반환"""
+        return [compact_book(self.add(book), book) for book in books]
+
+    def resolve(self, handles: Iterable[str]) -> List[Dict]:
+        """핸들 -> 원본 레코드 (알 수 없는 핸들과 중복은 건너뜀, 순서 유지)"""
+        books, seen = [], set()
+        with self._lock:
+            for handle in handles:
+                handle = str(handle).strip()
+                if handle in seen or handle not in self._records:
+                    continue
+                seen.add(handle)
+                books.append(self._records[handle])
+        return books
+
+    def all(self) -> List[Dict]:
+        with self._lock:
+            return list(self._records.values())
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+
+@contextmanager
+def candidate_scope():
+    """이 블록 안의 도서 검색 Tool 결과를 새 CandidateStore에 저장"""
+    store = CandidateStore()
+    token = _current_store.set(store)
+    try:
+        yield store
+    finally:
+        _current_store.reset(token)
+
+
+def current_candidate_store() -> Optional[CandidateStore]:
+    """현재 요청의 후보 저장소 (candidate_scope() 밖이면 None)"""
+    return _current_store.get()
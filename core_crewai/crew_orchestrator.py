@@ -3,22 +3,97 @@ CrewAI Orchestrator - 멀티 에이전트 워크플로우 관리
 완전한 CrewAI 기반 구현
 """
 
-from typing import List, Dict, Tuple, Optional
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from contextlib import contextmanager
+from typing import Callable, List, Dict, Tuple, Optional
 from crewai import Crew, Process
-import json
+import contextvars
+import os
+import threading
 
 from .agents import (
+    FALLBACK_LLM,
     create_counselor_agent,
     create_psychological_analyzer_agent,
-    create_book_recommender_agent
+    create_book_recommender_agent,
+    create_reason_writer_agent
 )
+from .crewai_tools import iter_naver_books
 from .tasks import (
     create_counseling_task,
     create_analysis_task,
-    create_book_recommendation_task
+    create_analysis_update_task,
+    create_book_recommendation_task,
+    create_reason_task,
+    counseling_task_inputs,
+    analysis_task_inputs,
+    analysis_update_task_inputs,
+    book_recommendation_task_inputs,
+    reason_task_inputs
 )
-from .models import PsychologicalSummary, BookRecommendation
-from .book_reranker import rerank_books, format_book_for_recommendation
+from .models import PsychologicalSummary, BookRecommendation, SummaryDiff, UsageReport
+from .book_reranker import IncrementalReranker, rerank_books, format_book_for_recommendation
+from .cache_warmer import keyword_counter
+from .candidate_store import candidate_scope
+from .crisis_triage import CRISIS_TRIAGE_ENABLED, SAFETY_RESPONSE, TriageResult, assess_message, followup_executor
+from .incremental_analysis import diff_summaries
+from .lexical_relevance import build_query
+from .logs import CREW_VERBOSE, get_logger, install_crewai_listeners
+from .popularity import popularity_tracker
+from .profiling import profiled
+from .query_planner import query_planner
+from .serialization import JSONDecodeError, loads
+from .reason_writer import (
+    LLM_REASONS_ENABLED,
+    REASON_BUDGET_SECONDS,
+    missing_reasons,
+    parse_reasons,
+    reason_cache,
+    submit_reason_call,
+    reason_key
+)
+from .similar_books import similar_books_index
+from .tracing import span, traced
+from .usage import install_usage_listener, track_session, usage_tracker
+
+# LLM 없는 추천 경로의 스트리밍 검색: 검색어당 최대 페이지 수 / 상위권이 모두 이 점수 이상이면 다음 페이지 요청 중단
+# (0이면 상위권 max_books개가 채워지는 즉시 중단)
+STREAM_MAX_PAGES = int(os.getenv("PAGEMIND_STREAM_MAX_PAGES", "3"))
+STREAM_STOP_SCORE = float(os.getenv("PAGEMIND_STREAM_STOP_SCORE", "0"))
+
+log = get_logger("orchestrator")
+
+# 단계 -> (에이전트 생성 함수, Task 템플릿 생성 함수, Crew verbose)
+# verbose 콘솔 출력은 PAGEMIND_CREW_VERBOSE=1일 때만 (기본은 CrewAI 이벤트를 pagemind.crewai 로거로 기록)
+STAGE_CREWS = {
+    "chat": (create_counselor_agent, create_counseling_task, False),  # 대화는 verbose 끄기 (너무 많은 출력 방지)
+    "analyze": (create_psychological_analyzer_agent, create_analysis_task, True),
+    "analyze_update": (create_psychological_analyzer_agent, create_analysis_update_task, True),  # 증분 분석
+    "recommend": (create_book_recommender_agent, create_book_recommendation_task, True),
+    "reasons": (create_reason_writer_agent, create_reason_task, False),  # PAGEMIND_LLM_REASONS=1일 때만 사용
+}
+
+
+class _CrisisFollowup:
+    """
+    한 세션의 위기 턴 상담사 응답 (followup_executor에서 생성)
+    생성을 시작하기 전에 들어온 같은 세션의 위기 메시지는 합쳐서 최신 대화 기록 기준으로 한 번에 답함
+    """
+
+    def __init__(self, previous: Optional[Future]):
+        self.previous = previous  # 같은 세션의 이전 위기 턴 응답 (끝난 뒤에 시작)
+        self.started = False
+        self.user_message = ""
+        self.history: List[Dict] = []
+        self.callbacks: List[Callable[[Optional[str]], None]] = []
+        self.future: Optional[Future] = None
+
+    def merge(self, user_message: str, history: List[Dict], on_followup: Optional[Callable[[Optional[str]], None]]):
+        # 호출자가 반환 직후 history에 이번 턴을 덧붙이므로 복사본 보관
+        self.user_message = user_message
+        self.history = list(history)
+        if on_followup is not None:
+            self.callbacks.append(on_followup)
 
 
 class CrewOrchestrator:
@@ -31,35 +106,160 @@ class CrewOrchestrator:
     3. Book Recommender Agent: 도서 검색 및 추천 (CrewAI Crew 사용)
     """
     
-    def __init__(self):
-        """오케스트레이터 초기화"""
-        # CrewAI Agents (지연 초기화)
-        self.counselor_agent = None
-        self.analyzer_agent = None
-        self.recommender_agent = None
+    def __init__(
+        self,
+        llm=None,
+        fallback_llm=None,
+        llm_reasons: Optional[bool] = None,
+        crisis_triage: Optional[bool] = None
+    ):
+        """
+        오케스트레이터 초기화
+        
+        Args:
+            llm: 에이전트가 사용할 LLM (None이면 agents.DEFAULT_LLM, 부하 테스트에서는 FakeLLM)
+            fallback_llm: 세션 토큰 예산 초과 시 사용할 저비용 LLM
+                (None이면 llm을 넘긴 경우 llm, 아니면 agents.FALLBACK_LLM)
+            llm_reasons: 추천 이유를 Reason Writer Agent로 작성 (None이면 PAGEMIND_LLM_REASONS)
+            crisis_triage: chat() 전에 위기 신호 빠른 분류 (None이면 PAGEMIND_CRISIS_TRIAGE)
+        """
+        self.llm = llm
+        self.fallback_llm = fallback_llm or (llm if llm is not None else FALLBACK_LLM)
+        self.llm_reasons = LLM_REASONS_ENABLED if llm_reasons is None else llm_reasons
+        self.crisis_triage = CRISIS_TRIAGE_ENABLED if crisis_triage is None else crisis_triage
+        
+        # 재사용 Crew 풀: (단계, 저비용 LLM 여부) -> 쉬고 있는 Crew 목록
+        # kickoff가 Task 설명/출력과 에이전트 실행기 상태를 덮어쓰므로 Crew(와 에이전트)는 한 번에 한 요청만 사용
+        # -> 동시 요청 수만큼만 생성되고 이후 턴은 재사용
+        self._idle_crews: Dict[Tuple[str, bool], List[Crew]] = {}
+        self._crew_lock = threading.Lock()
+        self.crews_built = 0
+        
+        # LLM 호출별 토큰 사용량 집계 (usage.usage_tracker)
+        install_usage_listener()
+        # Crew verbose 콘솔 출력 대신 Task/도구 이벤트를 구조화 로그로 (logs.py)
+        install_crewai_listeners()
+        
+        # 생성 중인 위기 턴 상담사 응답: session_id -> _CrisisFollowup (끝나면 제거)
+        self._followups: Dict[Optional[str], _CrisisFollowup] = {}
         
         # 대화 상태
         self.conversation_history: List[Dict] = []
     
-    def _initialize_agents(self):
-        """에이전트 초기화 (지연 초기화)"""
-        if self.counselor_agent is None:
-            self.counselor_agent = create_counselor_agent()
-            self.analyzer_agent = create_psychological_analyzer_agent()
-            self.recommender_agent = create_book_recommender_agent()
+    def warm_up(self):
+        """
+        첫 요청 전에 미리 준비 (startup.WarmOrchestrator가 백그라운드에서 호출)
+        단계별 재사용 Crew(에이전트, LLM 객체 포함)를 하나씩 미리 만들어 풀에 넣어 둠
+        """
+        for stage in STAGE_CREWS:
+            if stage == "reasons" and not self.llm_reasons:
+                continue
+            with self._checkout_crew(stage):
+                pass
+    
+    def _use_fallback(self, stage: str, session_id: Optional[str]) -> bool:
+        """세션 토큰 예산을 넘었으면 저비용 경로 사용 (사용한 단계는 사용량 보고서에 기록)"""
+        if not usage_tracker.is_over_budget(session_id):
+            return False
+        usage_tracker.mark_fallback(session_id, stage)
+        return True
     
-    def chat(self, user_message: str, history: List[Dict]) -> tuple[str, bool]:
+    def _build_crew(self, stage: str, fallback: bool = False) -> Crew:
+        """단계별 Crew 생성 (에이전트 1개 + 치환 필드가 남은 Task 템플릿 1개)"""
+        create_agent, create_task, verbose = STAGE_CREWS[stage]
+        with span("crew.build", stage=stage, fallback=fallback):
+            agent = create_agent(self.fallback_llm if fallback else self.llm)
+            crew = Crew(
+                agents=[agent],
+                tasks=[create_task(agent)],
+                process=Process.sequential,
+                verbose=verbose and CREW_VERBOSE
+            )
+        with self._crew_lock:
+            self.crews_built += 1
+        return crew
+    
+    @contextmanager
+    def _checkout_crew(self, stage: str, fallback: bool = False):
+        """풀에서 단계별 Crew를 빌려 쓰고 돌려놓음 (쉬는 Crew가 없으면 새로 생성)"""
+        key = (stage, fallback)
+        with self._crew_lock:
+            idle = self._idle_crews.setdefault(key, [])
+            crew = idle.pop() if idle else None
+        if crew is None:
+            crew = self._build_crew(stage, fallback)
+        try:
+            yield crew
+        finally:
+            # kickoff가 실패해도 다음 kickoff에서 원본 템플릿으로 다시 치환하므로 재사용 가능
+            with self._crew_lock:
+                self._idle_crews[key].append(crew)
+    
+    def _kickoff(self, stage: str, inputs: Dict[str, str], session_id: Optional[str], fallback: bool = False):
+        """
+        재사용 Crew 실행 (턴마다 달라지는 값은 CrewAI 입력 치환으로 전달)
+        LLM 호출 토큰은 session_id로 집계
+        """
+        with self._checkout_crew(stage, fallback) as crew:
+            with span("crew.kickoff", stage=stage, session=session_id), track_session(session_id):
+                return crew.kickoff(inputs=inputs)
+    
+    def get_usage(self, session_id: Optional[str] = None) -> UsageReport:
+        """세션(session_id가 None이면 전체) 토큰 사용량"""
+        if session_id is None:
+            return usage_tracker.get_global()
+        return usage_tracker.get_session(session_id)
+    
+    @traced("orchestrator.chat")
+    @profiled("orchestrator.chat")
+    def chat(
+        self,
+        user_message: str,
+        history: List[Dict],
+        session_id: Optional[str] = None,
+        triage: Optional[TriageResult] = None,
+        on_followup: Optional[Callable[[Optional[str]], None]] = None
+    ) -> tuple[str, bool]:
         """
         Counselor Agent와 대화 (단일 턴) - CrewAI 사용
         
         Args:
             user_message: 사용자 메시지
             history: 대화 기록
+            session_id: 토큰 사용량 집계/예산 적용 단위 (None이면 전체 집계만)
+            triage: 이 메시지의 triage() 결과 (호출자가 위기 턴인지 미리 알아야 할 때, None이면 여기서 분류)
+            on_followup: 위기 턴의 상담사 응답을 받을 콜백 (followup_executor 스레드에서 호출, 예: 세션 저장소에 추가)
+                생성에 실패했거나 다른 위기 메시지와 합쳐져 응답이 한 번만 나가는 경우 None으로 호출
             
         Returns:
             (상담사 응답, 분석 준비 완료 여부)
+            위기 신호가 분명한 메시지는 미리 검토된 안전 안내를 바로 반환하고
+            상담사 응답은 백그라운드에서 생성해 on_followup으로 전달
         """
-        self._initialize_agents()
+        if triage is None:
+            triage = self.triage(user_message)
+        if triage is not None and triage.is_crisis:
+            self._start_crisis_turn(user_message, history, session_id, triage.signals, on_followup)
+            return SAFETY_RESPONSE, False
+        return self._counsel(user_message, history, session_id)
+    
+    def triage(self, user_message: str) -> Optional[TriageResult]:
+        """위기 신호 빠른 분류 (crisis_triage가 꺼져 있으면 None)"""
+        if not self.crisis_triage:
+            return None
+        with span("triage") as triage_span:
+            triage = assess_message(user_message)
+            triage_span.set_attribute("score", triage.score)
+        return triage
+    
+    def _counsel(
+        self,
+        user_message: str,
+        history: List[Dict],
+        session_id: Optional[str]
+    ) -> tuple[str, bool]:
+        """상담 Crew 실행 (chat()의 일반 경로, 위기 턴에서는 followup_executor 스레드에서 실행)"""
+        fallback = self._use_fallback("chat", session_id)
         
         # 메타데이터 제거하여 Anthropic API 호환성 보장
         messages = []
@@ -72,23 +272,9 @@ class CrewOrchestrator:
         
         messages.append({"role": "user", "content": user_message})
         
-        # CrewAI Task 생성
-        counseling_task = create_counseling_task(
-            self.counselor_agent,
-            user_message,
-            messages
-        )
-        
-        # Crew 생성 및 실행
-        crew = Crew(
-            agents=[self.counselor_agent],
-            tasks=[counseling_task],
-            process=Process.sequential,
-            verbose=False  # 대화는 verbose 끄기 (너무 많은 출력 방지)
-        )
-        
-        # Crew 실행
-        result = crew.kickoff()
+        # Crew 실행 (재사용 Crew에 이번 턴 입력 치환)
+        inputs = counseling_task_inputs(user_message, messages)
+        result = self._kickoff("chat", inputs, session_id, fallback)
         response = str(result).strip()
         
         # Tool 호출 확인 (signal_analysis_ready)
@@ -118,35 +304,136 @@ class CrewOrchestrator:
         
         return response, analysis_ready
     
-    def analyze_conversation(self, messages: List[Dict]) -> PsychologicalSummary:
+    def _start_crisis_turn(
+        self,
+        user_message: str,
+        history: List[Dict],
+        session_id: Optional[str],
+        signals: List[str],
+        on_followup: Optional[Callable[[Optional[str]], None]]
+    ):
+        """
+        상담사 응답을 백그라운드에서 시작 (트레이싱/사용량 컨텍스트 유지)
+        같은 세션의 이전 위기 턴 응답이 생성 중이면 그 뒤에 이어서 생성하고,
+        아직 시작하지 않은 응답이 있으면 이번 메시지를 거기에 합침 (세션당 진행 중인 응답은 최대 둘)
+        """
+        log.warning("위기 신호 감지: 안전 안내를 먼저 보냅니다", signals=",".join(signals), session_id=session_id)
+        with self._crew_lock:
+            followup = self._followups.get(session_id)
+            if followup is not None and not followup.started:
+                followup.merge(user_message, history, on_followup)
+                return
+            followup = _CrisisFollowup(followup.future if followup is not None else None)
+            followup.merge(user_message, history, on_followup)
+            self._followups[session_id] = followup
+            followup.future = followup_executor.submit(
+                contextvars.copy_context().run, self._crisis_followup, session_id, followup
+            )
+    
+    def _crisis_followup(self, session_id: Optional[str], followup: _CrisisFollowup) -> Optional[str]:
+        """위기 턴 상담사 응답 생성 후 콜백으로 전달 (followup_executor 스레드에서 실행)"""
+        previous_response = followup.previous.result() if followup.previous is not None else None
+        with self._crew_lock:
+            followup.started = True
+            user_message, history, callbacks = followup.user_message, followup.history, list(followup.callbacks)
+        # 이전 위기 턴 응답이 호출자가 읽은 대화 기록보다 늦게 저장된 경우
+        if previous_response and all(m.get("content") != previous_response for m in history):
+            history.append({"role": "assistant", "content": previous_response})
+        
+        try:
+            response, _ = self._counsel(user_message, history, session_id)
+        except Exception:
+            log.exception("위기 턴 상담사 응답 생성 실패", session_id=session_id)
+            response = None
+        # 합쳐진 위기 메시지들에는 응답을 한 번만 (나머지 콜백은 None - 생성 중 표시만 해제)
+        for index, callback in enumerate(callbacks):
+            try:
+                callback(response if index == 0 else None)
+            except Exception:
+                log.exception("위기 턴 상담사 응답 전달 실패", session_id=session_id)
+        with self._crew_lock:
+            if self._followups.get(session_id) is followup:
+                del self._followups[session_id]
+        return response
+    
+    def wait_followup(self, session_id: Optional[str] = None, timeout: Optional[float] = None) -> Optional[str]:
+        """
+        이 프로세스에서 생성 중인 위기 턴 상담사 응답을 기다려 반환 (없거나 timeout이면 None)
+        응답은 chat()의 on_followup으로 전달되므로 on_followup 없이 chat()을 부르는 벤치마크/부하 테스트용
+        """
+        with self._crew_lock:
+            followup = self._followups.get(session_id)
+        if followup is None:
+            return None
+        try:
+            return followup.future.result(timeout=timeout)
+        except FutureTimeoutError:
+            return None
+    
+    @traced("orchestrator.analyze")
+    @profiled("orchestrator.analyze")
+    def analyze_conversation(
+        self,
+        messages: List[Dict],
+        session_id: Optional[str] = None
+    ) -> PsychologicalSummary:
         """
         Psychological Analyzer Agent를 사용한 분석 (CrewAI Crew 사용)
         
         Args:
             messages: 대화 메시지 리스트
+            session_id: 토큰 사용량 집계/예산 적용 단위
             
         Returns:
             PsychologicalSummary 객체
         """
-        self._initialize_agents()
-        
-        # CrewAI Task 생성
-        analysis_task = create_analysis_task(self.analyzer_agent, messages)
-        
-        # Crew 생성 및 실행
-        crew = Crew(
-            agents=[self.analyzer_agent],
-            tasks=[analysis_task],
-            process=Process.sequential,
-            verbose=True
-        )
+        fallback = self._use_fallback("analyze", session_id)
         
         # Crew 실행
-        result = crew.kickoff()
+        result = self._kickoff("analyze", analysis_task_inputs(messages), session_id, fallback)
         
-        # 결과 파싱 (JSON 형식으로 반환됨)
-        result_text = str(result)
+        # 결과 파싱 (JSON 형식으로 반환됨, 장르는 나중에 설정됨)
+        return self._parse_summary(str(result), "analyze")
+    
+    @traced("orchestrator.analyze_update")
+    @profiled("orchestrator.analyze_update")
+    def update_analysis(
+        self,
+        previous: PsychologicalSummary,
+        new_messages: List[Dict],
+        session_id: Optional[str] = None
+    ) -> Tuple[PsychologicalSummary, SummaryDiff]:
+        """
+        증분 분석 - 이전 분석 결과에 이후 이어진 메시지만 반영 (전체 대화를 다시 분석하지 않음)
         
+        Args:
+            previous: 이전 분석 결과
+            new_messages: 이전 분석 이후의 메시지만
+            session_id: 토큰 사용량 집계/예산 적용 단위
+            
+        Returns:
+            (갱신된 PsychologicalSummary, 바뀐 필드)
+            diff.requires_search가 False면 이전 추천 도서를 다시 검색하지 않고 사용 가능
+            새 메시지가 없으면 LLM 호출 없이 이전 결과 그대로
+        """
+        if not any(m.get("role") != "system" for m in new_messages):
+            return previous, SummaryDiff()
+        
+        fallback = self._use_fallback("analyze_update", session_id)
+        inputs = analysis_update_task_inputs(previous.model_dump(), new_messages)
+        result = self._kickoff("analyze_update", inputs, session_id, fallback)
+        
+        summary = self._parse_summary(str(result), "analyze_update")
+        summary.genre = previous.genre  # 장르는 분석이 아니라 사용자가 고른 값
+        diff = diff_summaries(previous, summary)
+        log.debug(
+            "증분 분석", session_id=session_id, new_messages=len(new_messages),
+            changed=",".join(diff.changed_fields), requires_search=diff.requires_search
+        )
+        return summary, diff
+    
+    def _parse_summary(self, result_text: str, stage: str) -> PsychologicalSummary:
+        """분석 Crew 결과 -> PsychologicalSummary (파싱 실패 시 ValueError)"""
         # JSON 추출
         try:
             if "```json" in result_text:
@@ -162,7 +449,8 @@ class CrewOrchestrator:
                 else:
                     raise ValueError("JSON을 찾을 수 없습니다")
             
-            analysis_data = json.loads(json_text)
+            with span("parse.json", stage=stage, chars=len(json_text)):
+                analysis_data = loads(json_text)
             
             # PsychologicalSummary 객체 생성
             return PsychologicalSummary(
@@ -173,28 +461,33 @@ class CrewOrchestrator:
                 keywords=analysis_data.get("keywords", []),
                 genre=None  # 장르는 나중에 설정됨
             )
-        except (json.JSONDecodeError, ValueError) as e:
-            print(f"JSON 파싱 오류: {e}")
-            print(f"원본 결과: {result_text}")
+        except (JSONDecodeError, ValueError) as e:
+            log.error("JSON 파싱 오류", stage=stage, error=str(e), payload=result_text)
             # CrewAI만 사용하므로 예외 발생
             raise ValueError(f"심리 분석 결과 파싱 실패: {e}\n원본 결과: {result_text[:500]}")
     
+    @traced("orchestrator.recommend")
+    @profiled("orchestrator.recommend")
     def recommend_books_from_summary(
         self, 
         summary: PsychologicalSummary, 
-        max_books: int = 5
+        max_books: int = 5,
+        session_id: Optional[str] = None
     ) -> List[BookRecommendation]:
         """
         Book Recommender Agent를 사용한 도서 추천 (알고리즘 기반 재정렬)
+        세션 토큰 예산을 넘었으면 LLM 없이 키워드로 직접 검색 후 재정렬
         
         Args:
             summary: 심리 분석 결과
             max_books: 최대 추천 도서 수
+            session_id: 토큰 사용량 집계/예산 적용 단위
             
         Returns:
             BookRecommendation 객체 리스트
         """
-        self._initialize_agents()
+        if self._use_fallback("recommend", session_id):
+            return self._recommend_without_llm(summary, max_books)
         
         # 분석 결과를 dict로 변환
         analysis_dict = {
@@ -205,23 +498,12 @@ class CrewOrchestrator:
             "keywords": summary.keywords
         }
         
-        # CrewAI Task 생성 (장르 포함)
-        recommendation_task = create_book_recommendation_task(
-            self.recommender_agent, 
-            analysis_dict,
-            preferred_genre=summary.genre
-        )
-        
-        # Crew 생성 및 실행
-        crew = Crew(
-            agents=[self.recommender_agent],
-            tasks=[recommendation_task],
-            process=Process.sequential,
-            verbose=True
-        )
-        
-        # Crew 실행 - 모든 검색 결과 수집
-        result = crew.kickoff()
+        # Crew 실행 - 모든 검색 결과 수집 (장르 포함)
+        # 검색 Tool의 원본 결과는 요청 단위 후보 저장소에 보관되고 LLM은 핸들(b1, b2, ...)만 반환
+        search_plan = self._plan_searches(summary)
+        inputs = book_recommendation_task_inputs(analysis_dict, search_plan, preferred_genre=summary.genre)
+        with candidate_scope() as candidates:
+            result = self._kickoff("recommend", inputs, session_id)
         
         # 결과 파싱
         result_text = str(result)
@@ -240,55 +522,230 @@ class CrewOrchestrator:
                 else:
                     raise ValueError("JSON을 찾을 수 없습니다")
             
-            search_data = json.loads(json_text)
-            all_books = search_data.get("all_books", [])
+            with span("parse.json", stage="recommend", chars=len(json_text)):
+                search_data = loads(json_text)
+            
+            # LLM이 반환한 핸들 -> 네이버 API 원본 레코드
+            book_ids = search_data.get("book_ids", [])
+            all_books = candidates.resolve(book_ids if isinstance(book_ids, list) else [])
+            if not all_books and len(candidates):
+                log.info("반환된 도서 id가 없어 검색된 후보 전체를 사용합니다", candidates=len(candidates))
+                all_books = candidates.all()
             
             if not all_books:
-                print("검색 결과가 없습니다.")
+                log.info("검색 결과가 없습니다")
                 return []
             
-            print(f"검색된 책: {len(all_books)}권")
+            log.debug("검색된 책", count=len(all_books))
             
             # 알고리즘 기반 재정렬 (LLM 대신 Python 로직 사용)
-            reranked_books = rerank_books(
-                all_books,
-                preferred_genre=summary.genre,
-                max_results=max_books
-            )
-            
-            print(f"재정렬 후 상위 {len(reranked_books)}권 선택")
-            
-            # BookRecommendation 객체 리스트 생성
-            recommendations = []
-            for book_data in reranked_books:
-                formatted = format_book_for_recommendation(book_data)
-                
-                # 추천 이유 생성 (간단한 템플릿 기반)
-                relevance_reason = self._generate_relevance_reason(
-                    book_data, 
-                    summary,
-                    formatted.get("ranking_scores", {})
+            with span("rerank_books", candidates=len(all_books), genre=summary.genre):
+                reranked_books = rerank_books(
+                    all_books,
+                    preferred_genre=summary.genre,
+                    max_results=max_books,
+                    query=self._lexical_query(summary)
                 )
-                
-                recommendations.append(BookRecommendation(
-                    title=formatted.get("title", ""),
-                    author=formatted.get("author", ""),
-                    publisher=formatted.get("publisher", ""),
-                    description=formatted.get("description", ""),
-                    isbn=formatted.get("isbn", ""),
-                    cover_image=formatted.get("cover_image", ""),
-                    link=formatted.get("link", ""),
-                    relevance_reason=relevance_reason
-                ))
             
-            return recommendations
+            log.debug("재정렬 후 상위 도서 선택", count=len(reranked_books))
             
-        except (json.JSONDecodeError, ValueError, KeyError) as e:
-            print(f"JSON 파싱 오류: {e}")
-            print(f"원본 결과: {result_text}")
+            return self._build_recommendations(
+                reranked_books, summary, session_id=session_id, llm_reasons=self.llm_reasons
+            )
+            
+        except (JSONDecodeError, ValueError, KeyError) as e:
+            log.error("JSON 파싱 오류", stage="recommend", error=str(e), payload=result_text)
             # CrewAI만 사용하므로 예외 발생
             raise ValueError(f"도서 추천 결과 파싱 실패: {e}\n원본 결과: {result_text[:500]}")
     
+    def _recommend_without_llm(
+        self,
+        summary: PsychologicalSummary,
+        max_books: int
+    ) -> List[BookRecommendation]:
+        """
+        저비용 추천 경로: Recommender Agent 없이 검색 계획대로 직접 검색하며 점진적으로 재정렬
+        
+        검색어마다 계획한 크기의 첫 페이지는 모두 받고 도착하는 대로 점수를 매김
+        다음 페이지는 상위권이 아직 충분하지 않고(max_books개 미만이거나 STREAM_STOP_SCORE 미만)
+        뒤쪽 결과가 상위권에 들 수 있을 때만(관련도 상한) 요청 - 검색어당 최대 STREAM_MAX_PAGES 페이지
+        """
+        plan = self._plan_searches(summary)
+        if not plan:
+            return []
+        
+        max_items = {planned.query: planned.display * STREAM_MAX_PAGES for planned in plan}
+        reranker = IncrementalReranker(
+            max_results=max_books,
+            preferred_genre=summary.genre,
+            pool_size=max(max_items.values()),
+            stop_score=STREAM_STOP_SCORE,
+            query=self._lexical_query(summary)
+        )
+        with span("rerank_books", streaming=True, genre=summary.genre) as rerank_span:
+            for planned in plan:
+                for book in iter_naver_books(planned.query, page_size=planned.display, max_items=max_items[planned.query]):
+                    reranker.add(book, book["_rank"])
+                    next_rank = book["_rank"] + 1
+                    if next_rank >= planned.display and (reranker.satisfied or not reranker.can_improve(next_rank)):
+                        break  # 이 검색어의 남은 페이지는 요청하지 않음
+            rerank_span.set_attribute("candidates", reranker.seen_count)
+        
+        return self._build_recommendations(reranker.top(), summary)
+    
+    @traced("orchestrator.similar")
+    def find_similar_books(self, isbn: str, max_books: int = 5) -> List[BookRecommendation]:
+        """
+        "이 책과 비슷한 책" - 지금까지 검색된 책의 MinHash LSH 색인에서 조회 (LLM/네이버 호출 없음)
+        
+        Args:
+            isbn: 기준 도서 ISBN (추천 결과의 isbn 그대로, ISBN10/13 어느 쪽이든 가능)
+            max_books: 최대 결과 수
+            
+        Returns:
+            BookRecommendation 객체 리스트 (색인에 없는 ISBN이면 빈 리스트)
+        """
+        with span("similar.query", isbn=isbn) as query_span:
+            source = similar_books_index.get(isbn)
+            similar = similar_books_index.query(isbn, limit=max_books)
+            query_span.set_attribute("result_count", len(similar))
+        if source is None:
+            return []
+        # 기준 도서를 고른 것 = 그 추천에 관심을 보인 것 (인기도 클릭), 결과는 노출로 집계
+        popularity_tracker.record_click(isbn)
+        popularity_tracker.record_shown(book_data.get("isbn", "") for book_data, _ in similar)
+        
+        source_title = format_book_for_recommendation(source)["title"]
+        recommendations = []
+        for book_data, similarity in similar:
+            formatted = format_book_for_recommendation(book_data)
+            recommendations.append(BookRecommendation(
+                title=formatted.get("title", ""),
+                author=formatted.get("author", ""),
+                publisher=formatted.get("publisher", ""),
+                description=formatted.get("description", ""),
+                isbn=formatted.get("isbn", ""),
+                cover_image=formatted.get("cover_image", ""),
+                link=formatted.get("link", ""),
+                relevance_reason=f"'{source_title}'과(와) 소개 내용이 비슷한 책입니다 (유사도 {similarity:.0%})."
+            ))
+        return recommendations
+    
+    def _lexical_query(self, summary: PsychologicalSummary):
+        """재정렬 어휘 관련도(BM25) 질의 - 주요 고민, 감정, 키워드"""
+        return build_query(summary.main_concerns, summary.emotions, summary.keywords)
+    
+    def _plan_searches(self, summary: PsychologicalSummary):
+        """분석 키워드 -> 검색 계획 (겹치는 키워드 병합, 캐시/과거 결과에 따른 페이지 크기)"""
+        with span("query.plan", keywords=len(summary.keywords)) as plan_span:
+            plan = query_planner.plan(summary.keywords)
+            # 캐시 워머가 미리 받아 둘 검색어 빈도 (병합 후 실제 검색어 기준)
+            keyword_counter.add_many(planned.query for planned in plan)
+            plan_span.set_attribute("queries", len(plan))
+            plan_span.set_attribute("cached_queries", sum(planned.cached for planned in plan))
+        return plan
+    
+    def _build_recommendations(
+        self,
+        reranked_books: List[Dict],
+        summary: PsychologicalSummary,
+        session_id: Optional[str] = None,
+        llm_reasons: bool = False
+    ) -> List[BookRecommendation]:
+        """
+        재정렬된 네이버 API 항목 -> BookRecommendation 객체 리스트
+        llm_reasons면 Reason Writer Agent의 추천 이유 (캐시/예산 초과 시 템플릿)
+        """
+        # 추천한 책은 "비슷한 책" 조회 기준이 되므로 색인에 있는지 확인 (이미 있으면 건너뜀)
+        similar_books_index.add_many(reranked_books)
+        popularity_tracker.record_shown(book.get("isbn", "") for book in reranked_books)
+        if llm_reasons and reranked_books:
+            written = self._write_reasons(reranked_books, summary, session_id)
+        else:
+            written = [None] * len(reranked_books)
+        
+        recommendations = []
+        for book_data, written_reason in zip(reranked_books, written):
+            formatted = format_book_for_recommendation(book_data)
+            
+            # 추천 이유 생성 (LLM 이유가 없으면 간단한 템플릿 기반)
+            relevance_reason = written_reason or self._generate_relevance_reason(
+                book_data, 
+                summary,
+                formatted.get("ranking_scores", {})
+            )
+            
+            recommendations.append(BookRecommendation(
+                title=formatted.get("title", ""),
+                author=formatted.get("author", ""),
+                publisher=formatted.get("publisher", ""),
+                description=formatted.get("description", ""),
+                isbn=formatted.get("isbn", ""),
+                cover_image=formatted.get("cover_image", ""),
+                link=formatted.get("link", ""),
+                relevance_reason=relevance_reason
+            ))
+        
+        return recommendations
+    
+    def _write_reasons(
+        self,
+        books: List[Dict],
+        summary: PsychologicalSummary,
+        session_id: Optional[str]
+    ) -> List[Optional[str]]:
+        """
+        추천 도서 전체의 추천 이유 (책 순서대로, 작성하지 못한 책은 None)
+        캐시에 없는 책만 모아 한 번의 Reason Writer 호출로 작성하고 REASON_BUDGET_SECONDS까지만 기다림
+        """
+        concern = summary.main_concerns[0] if summary.main_concerns else ""
+        with span("reasons", books=len(books)) as reason_span:
+            reasons, pending = missing_reasons(books, concern)
+            reason_span.set_attribute("cached", len(books) - len(pending))
+            if not pending or self._use_fallback("reasons", session_id):
+                return reasons
+            
+            inputs = reason_task_inputs(
+                {"main_concerns": summary.main_concerns, "emotions": summary.emotions},
+                pending
+            )
+            # 예산을 넘겨도 호출은 끝까지 실행되어 캐시를 채움 (트레이싱/사용량 컨텍스트 유지)
+            future = submit_reason_call(
+                contextvars.copy_context().run, self._run_reason_task, inputs, pending, concern, session_id
+            )
+            if future is None:
+                reason_span.set_attribute("busy", True)
+                log.info("추천 이유 작성 워커가 모두 사용 중이라 템플릿 이유를 사용합니다")
+                return reasons
+            try:
+                written = future.result(timeout=REASON_BUDGET_SECONDS)
+            except FutureTimeoutError:
+                reason_span.set_attribute("timed_out", True)
+                log.info("추천 이유 작성이 예산을 넘어 템플릿 이유를 사용합니다", budget_seconds=REASON_BUDGET_SECONDS)
+                return reasons
+            except Exception:
+                log.exception("추천 이유 작성 실패")
+                return reasons
+            reason_span.set_attribute("written", len(written))
+        
+        handles = iter(pending)
+        return [reason if reason is not None else written.get(next(handles)) for reason in reasons]
+    
+    def _run_reason_task(
+        self,
+        inputs: Dict[str, str],
+        pending: Dict[str, Dict],
+        concern: str,
+        session_id: Optional[str]
+    ) -> Dict[str, str]:
+        """Reason Writer 실행 후 핸들별 이유를 캐시에 저장 (reason_executor 스레드에서 실행)"""
+        result = self._kickoff("reasons", inputs, session_id)
+        written = parse_reasons(str(result))
+        for handle, book in pending.items():
+            if handle in written:
+                reason_cache.put(reason_key(book, concern), written[handle])
+        return written
+    
     def _generate_relevance_reason(
         self, 
         book: Dict, 
@@ -347,26 +804,21 @@ class CrewOrchestrator:
         Returns:
             (PsychologicalSummary, List[BookRecommendation])
         """
-        self._initialize_agents()
-        
-        print(f"\n{'='*60}")
-        print("CrewAI 멀티 에이전트 상담 워크플로우 시작")
-        print(f"{'='*60}\n")
+        log.info("CrewAI 멀티 에이전트 상담 워크플로우 시작")
         
         # 1단계: 상담 (다중 턴 대화)
-        print("1단계: Counseling Agent와 대화 중...")
-        print(f"{'='*60}\n")
+        log.info("1단계: Counseling Agent와 대화 중")
         
         conversation = []
         current_message = initial_message
         
         for turn in range(max_conversation_turns):
-            print(f"[Turn {turn + 1}] 사용자: {current_message}")
+            log.info("사용자", turn=turn + 1, message=current_message)
             
             # Counselor 응답 (CrewAI 사용)
             response, _ = self.chat(current_message, conversation)
             
-            print(f"[Turn {turn + 1}] 상담사: {response}\n")
+            log.info("상담사", turn=turn + 1, message=response)
             
             conversation.append({"role": "user", "content": current_message})
             conversation.append({"role": "assistant", "content": response})
@@ -377,59 +829,55 @@ class CrewOrchestrator:
                 current_message = f"네, 알겠습니다. (턴 {turn + 2})"
         
         # 2단계: 심리 분석
-        print(f"\n{'='*60}")
-        print("2단계: Psychological Analyzer Agent 분석 중...")
-        print(f"{'='*60}\n")
+        log.info("2단계: Psychological Analyzer Agent 분석 중")
         
         summary = self.analyze_conversation(conversation)
         
-        print("심리 분석 완료:")
-        print(f"- 주요 고민: {summary.main_concerns}")
-        print(f"- 감정: {summary.emotions}")
-        print(f"- 인지 패턴: {summary.cognitive_patterns}")
-        print(f"- 권장사항: {summary.recommendations}")
-        print(f"- 키워드: {summary.keywords}\n")
+        log.info(
+            "심리 분석 완료",
+            main_concerns=summary.main_concerns,
+            emotions=summary.emotions,
+            cognitive_patterns=summary.cognitive_patterns,
+            recommendations=summary.recommendations,
+            keywords=summary.keywords
+        )
         
         # 3단계: 도서 추천
-        print(f"{'='*60}")
-        print("3단계: Book Recommender Agent 도서 추천 중...")
-        print(f"{'='*60}\n")
+        log.info("3단계: Book Recommender Agent 도서 추천 중")
         
         books = self.recommend_books_from_summary(summary, max_books=5)
         
-        print(f"추천 도서 {len(books)}권:")
         for i, book in enumerate(books, 1):
-            print(f"\n{i}. {book.title} - {book.author}")
-            print(f"   추천 이유: {book.relevance_reason}")
-        
-        print(f"\n{'='*60}")
-        print("워크플로우 완료!")
-        print(f"{'='*60}\n")
+            log.info("추천 도서", rank=i, title=book.title, author=book.author, reason=book.relevance_reason)
+        log.info("워크플로우 완료", books=len(books))
         
         return summary, books
     
+    @profiled("orchestrator.analysis_and_recommendation")
     def run_analysis_and_recommendation(
         self, 
-        conversation_history: List[Dict]
+        conversation_history: List[Dict],
+        session_id: Optional[str] = None
     ) -> Tuple[PsychologicalSummary, List[BookRecommendation]]:
         """
         기존 대화에 대한 분석 및 추천 (Gradio 통합용)
         
         Args:
             conversation_history: 대화 기록
+            session_id: 토큰 사용량 집계/예산 적용 단위
             
         Returns:
             (PsychologicalSummary, List[BookRecommendation])
         """
-        print("\n분석 및 추천 시작...")
+        log.info("분석 및 추천 시작", session_id=session_id)
         
         # 1단계: 심리 분석
-        summary = self.analyze_conversation(conversation_history)
-        print(f"✓ 심리 분석 완료 (키워드: {len(summary.keywords)}개)")
+        summary = self.analyze_conversation(conversation_history, session_id=session_id)
+        log.info("심리 분석 완료", session_id=session_id, keywords=len(summary.keywords))
         
         # 2단계: 도서 추천
-        books = self.recommend_books_from_summary(summary, max_books=5)
-        print(f"✓ 도서 추천 완료 ({len(books)}권)\n")
+        books = self.recommend_books_from_summary(summary, max_books=5, session_id=session_id)
+        log.info("도서 추천 완료", session_id=session_id, books=len(books))
         
         return summary, books
     
@@ -440,7 +888,7 @@ class CrewOrchestrator:
     def clear_conversation(self):
         """대화 기록 초기화"""
         self.conversation_history = []
-        print("대화 기록이 초기화되었습니다.")
+        log.debug("대화 기록이 초기화되었습니다")
 
 
 # 싱글톤 인스턴스 (Gradio 앱에서 사용)
@@ -1,69 +1,198 @@
 """
 CrewAI Tools 정의
 -     search_naver_books_tool: 네이버 도서 검색 API를 사용하여 키워드로 책 검색 (Book Recommender Agent에서 사용)
+    원본 결과는 후보 저장소(candidate_store)에 두고 LLM에는 핸들과 요약 필드만 반환
+-     search_naver_books: Tool 없이 직접 호출하는 검색 함수 (토큰 예산 초과 시 LLM 없는 추천 경로)
+    결과는 search_cache에 캐시하고 결과 수는 query_planner 통계로 기록, 책은 비슷한 책 색인(similar_books_index)에 추가
+-     iter_naver_books: start 페이지네이션을 필요한 만큼만 따라가는 스트리밍 검색 (조기 종료 가능)
 -     signal_analysis_ready: 챗봇으로 충분한 사용자 정보가 수집되었는지를 판단 (Counselor Agent에서 사용)
 """
 
 from crewai.tools import tool
-import json
 import requests
 import os
+from typing import Dict, Iterator, List, Optional, Tuple
 from dotenv import load_dotenv
 
+from .cache_warmer import naver_quota
+from .candidate_store import clean_text, current_candidate_store
+from .logs import get_logger
+from .query_planner import query_planner
+from .search_cache import search_cache
+from .serialization import dumps
+from .similar_books import similar_books_index
+from .tracing import span
+
+log = get_logger("search")
+
 # 환경 변수 로드
 load_dotenv()
 NAVER_CLIENT_ID = os.getenv("NAVER_CLIENT_ID")
 NAVER_CLIENT_SECRET = os.getenv("NAVER_CLIENT_SECRET")
+# 네이버 도서 검색 API 주소 (부하 테스트에서는 fakes.FakeNaverServer 주소로 교체)
+NAVER_BOOK_SEARCH_URL = os.getenv("NAVER_BOOK_SEARCH_URL", "https://openapi.naver.com/v1/search/book.json")
+NAVER_MAX_DISPLAY = 100  # 요청당 최대 결과 수
+NAVER_MAX_START = 1000  # start 파라미터 최댓값
 
 
-@tool("네이버 도서 검색")
-def search_naver_books_tool(keyword: str, display: int = 10) -> str:
+def _request_page(keyword: str, display: int, start: int = 1) -> Tuple[List[Dict], Optional[int]]:
     """
-    네이버 도서 API를 사용하여 키워드로 책 검색
+    네이버 도서 API 한 페이지 요청 (캐시 없음)
+
+    Returns:
+        (결과 항목 목록, 네이버가 보고한 전체 결과 수)
+
+    Raises:
+        RuntimeError: HTTP 오류 응답
+    """
+    headers = {
+        "X-Naver-Client-Id": NAVER_CLIENT_ID,
+        "X-Naver-Client-Secret": NAVER_CLIENT_SECRET
+    }
+    params = {
+        "query": keyword,
+        "display": display,
+        "start": start,
+        "sort": "sim"
+    }
     
+    naver_quota.record()
+    with span("naver.search", keyword=keyword, display=display, start=start) as search_span:
+        response = requests.get(NAVER_BOOK_SEARCH_URL, headers=headers, params=params, timeout=10)
+        search_span.set_attribute("http.status_code", response.status_code)
+        if response.status_code != 200:
+            raise RuntimeError(f"HTTP {response.status_code}")
+        data = response.json()
+        items = data.get("items", [])
+        search_span.set_attribute("result_count", len(items))
+    return items, data.get("total")
+
+
+def search_naver_books(
+    keyword: str,
+    display: int = 10,
+    refresh: bool = False,
+    cache_ttl_seconds: Optional[float] = None
+) -> dict:
+    """
+    네이버 도서 API 검색 (Tool과 LLM 없는 저비용 추천 경로에서 공통 사용)
+
     Args:
         keyword: 검색 키워드
         display: 검색 결과 개수 (최대 100)
-        
+        refresh: 캐시를 무시하고 다시 받아 캐시 갱신 (캐시 워머)
+        cache_ttl_seconds: 이 결과의 캐시 유효 시간 (None이면 캐시 기본값)
+
     Returns:
-        JSON 형식의 검색 결과 문자열
+        {"success", "keyword", "count", "total", "books"} 또는 {"success": False, "error", "keyword"}
     """
+    display = min(display, NAVER_MAX_DISPLAY)
+    if not refresh:
+        cached = search_cache.get(keyword, display)
+        if cached is not None:
+            return cached
+    
     try:
-        url = "https://openapi.naver.com/v1/search/book.json"
-        headers = {
-            "X-Naver-Client-Id": NAVER_CLIENT_ID,
-            "X-Naver-Client-Secret": NAVER_CLIENT_SECRET
-        }
-        params = {
-            "query": keyword,
-            "display": min(display, 100),
-            "sort": "sim"
+        items, total = _request_page(keyword, display)
+    except Exception as e:
+        return {
+            "success": False,
+            "error": str(e),
+            "keyword": keyword
         }
+    
+    search_cache.put(keyword, display, items, total, ttl_seconds=cache_ttl_seconds)
+    query_planner.record_result(keyword, display, len(items), total)
+    similar_books_index.add_many(items)
+    return {
+        "success": True,
+        "keyword": keyword,
+        "count": len(items),
+        "total": total,
+        "books": items
+    }
+
+
+def normalize_naver_item(item: Dict, keyword: str, rank: int) -> Dict:
+    """
+    네이버 검색 결과 항목 정규화 (HTML 강조 태그 제거 + 검색어, 검색어 내 순위 기록)
+    필드 이름은 네이버 API 그대로 유지 (format_book_for_recommendation과 호환)
+    """
+    book = dict(item)
+    for field in ("title", "author", "publisher", "description"):
+        book[field] = clean_text(item.get(field, ""))
+    book["_query"] = keyword
+    book["_rank"] = rank
+    return book
+
+
+def iter_naver_books(keyword: str, page_size: int = 20, max_items: int = 100) -> Iterator[Dict]:
+    """
+    네이버 start 페이지네이션을 따라가며 정규화된 검색 결과를 하나씩 반환하는 제너레이터
+    다음 페이지는 앞 페이지를 모두 소비한 뒤에야 요청하므로 호출자가 중간에 멈추면 이후 요청은 없음
+
+    첫 페이지는 search_naver_books를 거치므로 캐시 적중 시 외부 요청 없음
+
+    Args:
+        keyword: 검색 키워드
+        page_size: 페이지당 결과 수 (최대 100)
+        max_items: 최대 결과 수 (네이버 start 상한 1000)
+
+    사용:
+        for book in iter_naver_books("불안", page_size=10):
+            ...
+            if enough:
+                break  # 남은 페이지는 요청하지 않음
+    """
+    page_size = max(1, min(page_size, NAVER_MAX_DISPLAY))
+    max_items = min(max_items, NAVER_MAX_START + page_size - 1)
+    rank = 0
+    
+    # 첫 페이지: 캐시 (검색 결과 수 통계도 search_naver_books에서 기록)
+    first = search_naver_books(keyword, display=min(page_size, max_items))
+    if not first.get("success"):
+        log.warning("네이버 검색 실패", keyword=keyword, error=first.get("error"))
+        return
+    page, total = first["books"], first.get("total")
+    
+    while True:
+        for item in page:
+            if rank >= max_items:
+                return
+            yield normalize_naver_item(item, keyword, rank)
+            rank += 1
         
-        response = requests.get(url, headers=headers, params=params, timeout=10)
+        start = rank + 1
+        if len(page) < page_size or start > NAVER_MAX_START or rank >= max_items:
+            return
+        if total is not None and rank >= total:
+            return
+        try:
+            page, total = _request_page(keyword, min(page_size, max_items - rank), start=start)
+        except Exception as e:
+            log.warning("네이버 검색 실패", keyword=keyword, start=start, error=str(e))
+            return
+        similar_books_index.add_many(page)
+
+
+@tool("네이버 도서 검색")
+def search_naver_books_tool(keyword: str, display: int = 10) -> str:
+    """
+    네이버 도서 API를 사용하여 키워드로 책 검색
+    
+    Args:
+        keyword: 검색 키워드
+        display: 검색 결과 개수 (최대 100)
         
-        if response.status_code == 200:
-            data = response.json()
-            items = data.get("items", [])
-            return json.dumps({
-                "success": True,
-                "keyword": keyword,
-                "count": len(items),
-                "books": items
-            }, ensure_ascii=False)
-        else:
-            return json.dumps({
-                "success": False,
-                "error": f"HTTP {response.status_code}",
-                "keyword": keyword
-            }, ensure_ascii=False)
-            
-    except Exception as e:
-            return json.dumps({
-                "success": False,
-                "error": str(e),
-                "keyword": keyword
-            }, ensure_ascii=False)
+    Returns:
+        JSON 형식의 검색 결과 문자열 (books의 각 항목: id, title, author, pubdate, summary)
+    """
+    result = search_naver_books(keyword, display)
+    store = current_candidate_store()
+    if store is not None and result.get("success"):
+        # 원본은 서버에 보관하고 LLM 컨텍스트에는 핸들 + 요약만 전달
+        result["books"] = store.add_many(result["books"])
+    return dumps(result)
 
 
 @tool("분석 준비 완료 신호")
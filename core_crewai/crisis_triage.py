@@ -0,0 +1,119 @@
+"""
+위기 신호 빠른 분류 (LLM 호출 전, CPU만 사용) - 자해/자살 신호가 분명한 메시지에는 상담 Crew를 기다리지 않고
+미리 검토된 안전 안내(상담 전화번호 포함)를 바로 보여 주고, 상담사 응답은 백그라운드에서 이어서 생성
+-     범주별 위기 표현 사전을 띄어쓰기/하이픈을 지운 메시지에서 부분 문자열로 검색 (정규식 없이 C 수준 검색만)
+      -> 일반 메시지는 수 마이크로초, 3,000자 가까운 메시지도 0.2ms 안팎으로 일반 턴 지연에 영향 없음
+-     신호가 있으면 범주별 가중치 합으로 점수 계산 (0~1)
+      · 명시적 자살 생각 1.0 / 자해 0.9 / 방법·준비 0.4 / 소극적 죽음 생각 0.4
+        (방법/소극적 표현은 하나만으로는 위기가 아님 - 다른 신호와 함께 나오거나 즉시성 표현이 있어야 함)
+      · 방법 표현은 위기 맥락으로 한정 ("유서를 썼" O, "유서 깊은" X / "목을 매달" O, "승진에 목매는" X)
+      · 즉시성 표현("오늘 밤", "지금", "계획")은 다른 신호와 함께 나올 때만 +0.3
+      · 부정/제3자 맥락("자살하고 싶지 않", "자살 예방")은 감점하고 즉시성 가산도 하지 않음
+-     점수가 PAGEMIND_CRISIS_THRESHOLD 이상이면 위기로 분류 (놓치는 것보다 과하게 안내하는 쪽을 택함)
+
+환경 변수:
+    PAGEMIND_CRISIS_TRIAGE=1              위기 신호 빠른 분류 사용 (기본 활성, 0이면 모든 턴을 상담 Crew로)
+    PAGEMIND_CRISIS_THRESHOLD=0.5         위기로 분류할 최소 점수
+    PAGEMIND_CRISIS_FOLLOWUP_SECONDS=60   안전 안내 뒤 상담사 응답을 기다리는 최대 시간 (API/Gradio)
+
+사용:
+    triage = assess_message(user_message)
+    if triage.is_crisis:
+        response = SAFETY_RESPONSE
+"""
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import List
+
+from .prompts import get_prompt
+
+CRISIS_TRIAGE_ENABLED = os.getenv("PAGEMIND_CRISIS_TRIAGE", "1").lower() in ("1", "true", "yes")
+CRISIS_THRESHOLD = float(os.getenv("PAGEMIND_CRISIS_THRESHOLD", "0.5"))
+CRISIS_FOLLOWUP_SECONDS = float(os.getenv("PAGEMIND_CRISIS_FOLLOWUP_SECONDS", "60"))
+FOLLOWUP_WORKERS = 4  # 동시에 진행할 수 있는 위기 턴 상담사 응답 수
+
+# 미리 검토된 안전 안내 (text_prompts/crisis_safety_response.txt, LLM을 거치지 않고 그대로 보냄)
+SAFETY_RESPONSE = get_prompt("crisis_safety_response.txt")
+
+# 범주 -> (가중치, 표현) - 띄어쓰기/하이픈을 지운 소문자 메시지에서 부분 문자열로 찾음
+# (한국어는 띄어쓰기가 자유롭고 조사가 생략되므로 조사 유무는 표현을 나눠 적음)
+_LEXICON = {
+    "suicidal_ideation": (1.0, (
+        "자살", "죽고싶", "죽어버리고싶", "죽을생각", "목숨을끊", "목숨끊", "생을마감", "삶을끝내", "삶끝내",
+        "세상을떠나고싶", "세상떠나고싶", "killmyself", "suicid", "endmylife",
+    )),
+    "self_harm": (0.9, (
+        "자해", "손목을긋", "손목을그", "손목긋", "손목그", "칼로긋", "칼로그", "몸에상처를내", "몸에상처를냈",
+        "selfharm", "cuttingmyself",
+    )),
+    "method": (0.4, (
+        "유서를쓰", "유서를썼", "유서를써", "유서도쓰", "유서도썼", "유서도써", "유서쓰", "유서썼", "유서써",
+        "유서를남기", "유서남기",
+        "옥상에서뛰어내리", "다리에서뛰어내리", "한강에뛰어내리", "뛰어내리고싶",
+        "목을매달", "목매달", "방에번개탄", "차에서번개탄", "번개탄을피워놓",
+        "수면제를모", "수면제모", "수면제를한꺼번에먹", "약을모으", "약을모아",
+        "약을한꺼번에먹", "약을한꺼번에삼", "약을잔뜩먹", "약을잔뜩삼",
+    )),
+    "passive_ideation": (0.4, (
+        "사라지고싶", "없어지고싶", "살고싶지않", "살이유가없", "살이유없", "태어나지말았",
+        "깨어나지않았으면", "다끝내고싶",
+    )),
+}
+_IMMEDIACY = (0.3, ("오늘밤", "지금", "당장", "계획", "방법", "마지막으로"))
+_NEGATION = (0.6, (
+    "죽고싶지않", "죽고싶진않", "죽고싶지는않", "죽을생각은없", "죽을생각없",
+    "자살하고싶지않", "자살하고싶진않", "자살할생각은없", "자살할생각없", "자해하지않", "자해는안",
+    "자살예방", "자살률", "자살뉴스", "자해예방",
+))
+
+
+def _compact(text: str) -> str:
+    """소문자 + 공백/하이픈 제거 (한국어 문자열에서는 str.translate보다 split/join이 10배 이상 빠름)"""
+    return "".join(text.lower().split()).replace("-", "")
+
+
+def _found(compact: str, phrases) -> bool:
+    return any(phrase in compact for phrase in phrases)
+
+
+# 상담 Crew가 안전 안내 뒤 응답을 만드는 풀 (chat()은 안전 안내를 바로 반환)
+followup_executor = ThreadPoolExecutor(max_workers=FOLLOWUP_WORKERS, thread_name_prefix="crisis-followup")
+
+
+@dataclass
+class TriageResult:
+    """메시지 하나의 위기 신호 분류 결과"""
+    score: float = 0.0
+    signals: List[str] = field(default_factory=list)  # 발견된 범주 (suicidal_ideation, self_harm, ...)
+    threshold: float = CRISIS_THRESHOLD
+
+    @property
+    def is_crisis(self) -> bool:
+        return self.score >= self.threshold
+
+
+def assess_message(text: str, threshold: float = CRISIS_THRESHOLD) -> TriageResult:
+    """메시지의 위기 신호 점수 (신호가 없으면 점수 0)"""
+    if not text:
+        return TriageResult(threshold=threshold)
+    compact = _compact(text)
+
+    score = 0.0
+    signals = []
+    for name, (weight, phrases) in _LEXICON.items():
+        if _found(compact, phrases):
+            signals.append(name)
+            score += weight
+    # 일반 메시지는 여기서 끝남 (즉시성/부정 표현은 위기 표현과 함께 나올 때만 의미 있음)
+    if not signals:
+        return TriageResult(threshold=threshold)
+    # 부정/제3자 맥락이면 즉시성 표현도 가산하지 않음 ("지금 자살 예방 교육 받고 왔어요")
+    if _found(compact, _NEGATION[1]):
+        signals.append("negation")
+        score -= _NEGATION[0]
+    elif _found(compact, _IMMEDIACY[1]):
+        signals.append("immediacy")
+        score += _IMMEDIACY[0]
+    return TriageResult(score=max(0.0, min(1.0, score)), signals=signals, threshold=threshold)
@@ -0,0 +1,398 @@
+"""
+부하 테스트/회귀 테스트용 가짜 외부 서비스 (Anthropic, 네이버 API 없이 전체 파이프라인 실행)
+-     FakeLLM: 결정적 가짜 LLM (지연 시간, 토큰 생성 속도, 스크립트된 Tool 호출/JSON 출력 설정)
+-     FakeNaverServer: 네이버 도서 검색 API를 흉내 내는 로컬 HTTP 서버
+
+FakeLLM은 CrewAI의 ReAct 형식(Thought / Action / Action Input / Final Answer)으로 응답하므로
+실제 CrewAI 에이전트 실행 루프, Tool 호출, 결과 파싱 경로를 그대로 통과함
+"""
+
+import hashlib
+import json
+import re
+import threading
+import time
+from dataclasses import dataclass, asdict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional
+from urllib.parse import parse_qs, urlparse
+
+from crewai import BaseLLM
+from crewai.events.types.llm_events import LLMCallType
+from crewai.llms.base_llm import llm_call_context
+from pydantic import PrivateAttr
+
+from .agents import STAGE_BY_ROLE
+
+# 분석 단계에서 결정적으로 고르는 키워드 후보
+KEYWORD_POOL = [
+    "불안", "자존감", "직장 스트레스", "외로움", "번아웃",
+    "우울", "인간관계", "불면", "완벽주의", "감정 조절",
+]
+
+_SEARCH_KEYWORDS_PATTERN = re.compile(r"검색 키워드\*\*:\s*([^\n]+)")
+_SEARCH_PLAN_PATTERN = re.compile(r'-\s*"([^"\n]+)"\s*\(display=(\d+)\)')
+_OBSERVATION_PATTERN = re.compile(r"Observation:\s*(\{.*)", re.DOTALL)
+_REASON_BOOK_PATTERN = re.compile(r"^- (b\d+): .+? - (.*)$", re.MULTILINE)
+_MAIN_CONCERNS_PATTERN = re.compile(r"주요 고민\*\*:\s*([^\n]+)")
+_PREVIOUS_KEYWORDS_PATTERN = re.compile(r"^- keywords: ([^\n]+)$", re.MULTILINE)
+
+
+def estimate_tokens(text: str) -> int:
+    """토큰 수 근사 (UTF-8 4바이트당 1토큰, 한국어는 글자당 약 0.75토큰)"""
+    return max(1, len(text.encode("utf-8")) // 4)
+
+
+def _stable_hash(text: str) -> int:
+    return int.from_bytes(hashlib.blake2b(text.encode("utf-8"), digest_size=8).digest(), "big")
+
+
+@dataclass
+class FakeLLMCall:
+    """FakeLLM 호출 기록"""
+    stage: str
+    prompt_tokens: int
+    completion_tokens: int
+    tool_call: Optional[str]
+    seconds: float
+
+
+class FakeLLM(BaseLLM):
+    """
+    결정적 가짜 LLM
+
+    Attributes:
+        latency_seconds: 호출당 고정 지연 (첫 토큰까지의 시간)
+        tokens_per_second: 출력 토큰 생성 속도 (0이면 생성 지연 없음)
+        signal_after_user_turns: 사용자 발화가 이 횟수 이상이면 분석 준비 완료 Tool 호출 (0이면 호출 안 함)
+        scripted_responses: 단계별 고정 응답 목록 (chat/analyze/recommend -> 응답 문자열 리스트, 순환 사용)
+        analysis_output: 분석 단계에서 반환할 JSON (None이면 대화 내용으로 결정적으로 생성)
+    """
+
+    latency_seconds: float = 0.0
+    tokens_per_second: float = 0.0
+    signal_after_user_turns: int = 0
+    scripted_responses: Dict[str, List[str]] = {}
+    analysis_output: Optional[Dict[str, Any]] = None
+
+    _calls: List[FakeLLMCall] = PrivateAttr(default_factory=list)
+    _script_index: Dict[str, int] = PrivateAttr(default_factory=dict)
+    _lock: Any = PrivateAttr(default_factory=threading.Lock)
+
+    def __init__(self, model: str = "fake/pagemind-llm", **kwargs):
+        # BaseLLM 검증기가 model 인자를 필수로 요구하므로 기본값을 명시적으로 전달
+        super().__init__(model=model, **kwargs)
+
+    def call(
+        self,
+        messages,
+        tools=None,
+        callbacks=None,
+        available_functions=None,
+        from_task=None,
+        from_agent=None,
+        response_model=None,
+    ) -> str:
+        # 실제 제공자 구현처럼 호출 시작/완료 이벤트를 발행 (트레이싱 스팬, 사용량 집계가 같은 경로를 통과)
+        with llm_call_context():
+            self._emit_call_started_event(
+                messages=messages,
+                tools=tools,
+                callbacks=callbacks,
+                available_functions=available_functions,
+                from_task=from_task,
+                from_agent=from_agent,
+            )
+            response, usage = self._generate(messages, from_agent)
+            self._emit_call_completed_event(
+                response=response,
+                call_type=LLMCallType.LLM_CALL,
+                from_task=from_task,
+                from_agent=from_agent,
+                messages=messages,
+                usage=usage,
+            )
+        return response
+
+    def _generate(self, messages, from_agent) -> tuple[str, Dict[str, int]]:
+        started = time.perf_counter()
+        if isinstance(messages, str):
+            messages = [{"role": "user", "content": messages}]
+        prompt = "\n".join(str(m.get("content", "")) for m in messages)
+        stage = self._detect_stage(prompt, from_agent)
+
+        response = self._next_scripted(stage)
+        if response is None:
+            if stage == "chat":
+                response = self._counseling_response(prompt)
+            elif stage == "analyze":
+                response = self._analysis_response(prompt)
+            elif stage == "recommend":
+                response = self._recommendation_response(messages, prompt)
+            elif stage == "reasons":
+                response = self._reasons_response(prompt)
+            else:
+                response = "Thought: I now know the final answer\nFinal Answer: 네, 알겠습니다."
+
+        prompt_tokens = estimate_tokens(prompt)
+        completion_tokens = estimate_tokens(response)
+
+        # 지연 시간 시뮬레이션
+        delay = self.latency_seconds
+        if self.tokens_per_second > 0:
+            delay += completion_tokens / self.tokens_per_second
+        if delay > 0:
+            time.sleep(delay)
+
+        action = re.search(r"^Action:\s*(.+)$", response, re.MULTILINE)
+        usage = {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens,
+        }
+        with self._lock:
+            self._track_token_usage_internal(usage)
+            self._calls.append(FakeLLMCall(
+                stage=stage,
+                prompt_tokens=prompt_tokens,
+                completion_tokens=completion_tokens,
+                tool_call=action.group(1).strip() if action else None,
+                seconds=time.perf_counter() - started,
+            ))
+        return response, usage
+
+    # 호출 기록
+    def reset_stats(self):
+        with self._lock:
+            self._calls.clear()
+
+    def get_calls(self) -> List[Dict]:
+        with self._lock:
+            return [asdict(call) for call in self._calls]
+
+    # 응답 생성
+    def _detect_stage(self, prompt: str, from_agent) -> str:
+        role = getattr(from_agent, "role", None)
+        if role in STAGE_BY_ROLE:
+            return STAGE_BY_ROLE[role]
+        for config_role, stage in STAGE_BY_ROLE.items():
+            if config_role in prompt:
+                return stage
+        return "unknown"
+
+    def _next_scripted(self, stage: str) -> Optional[str]:
+        responses = self.scripted_responses.get(stage)
+        if not responses:
+            return None
+        with self._lock:
+            index = self._script_index.get(stage, 0)
+            self._script_index[stage] = index + 1
+        return responses[index % len(responses)]
+
+    def _counseling_response(self, prompt: str) -> str:
+        user_turns = prompt.count("사용자:")
+        if (
+            self.signal_after_user_turns
+            and user_turns >= self.signal_after_user_turns
+            and "Observation:" not in prompt
+        ):
+            return (
+                "Thought: 핵심 정보를 충분히 수집했다\n"
+                "Action: 분석 준비 완료 신호\n"
+                f'Action Input: {{"reason": "{user_turns}회 대화로 핵심 정보 파악", '
+                '"collected_info_summary": "주요 고민, 감정, 상황 파악"}'
+            )
+        variant = _stable_hash(prompt) % 3
+        replies = [
+            "많이 힘드셨겠어요. 그런 상황에서 그렇게 느끼시는 건 자연스러운 일이에요. 요즘 가장 마음이 무거운 순간은 언제인가요?",
+            "말씀해주셔서 고마워요. 혼자 감당하기 쉽지 않으셨을 것 같아요. 그럴 때 보통 어떻게 대처하시나요?",
+            "그 마음이 충분히 이해돼요. 지금까지 정말 애쓰셨네요. 평소에 어떤 책을 즐겨 읽으시나요?",
+        ]
+        return f"Thought: 공감하고 질문한다\nFinal Answer: {replies[variant]}"
+
+    def _analysis_response(self, prompt: str) -> str:
+        data = self.analysis_output
+        if data is None:
+            seed = _stable_hash(prompt)
+            keywords = []
+            for i in range(len(KEYWORD_POOL)):
+                keyword = KEYWORD_POOL[(seed + i * 7) % len(KEYWORD_POOL)]
+                if keyword not in keywords:
+                    keywords.append(keyword)
+                if len(keywords) == 3:
+                    break
+            # 증분 분석은 핵심 니즈가 그대로면 키워드를 유지하라는 지시를 따름 (감정/고민만 갱신)
+            previous = _PREVIOUS_KEYWORDS_PATTERN.search(prompt)
+            if previous:
+                keywords = [k.strip() for k in previous.group(1).split(",") if k.strip()] or keywords
+            data = {
+                "main_concerns": [f"{keywords[0]}로 인한 어려움", "일상 기능 저하"],
+                "emotions": ["불안", "무력감"],
+                "cognitive_patterns": ["파국화", "과도한 일반화"],
+                "recommendations": ["감정 기록하기", "작은 목표 세우기"],
+                "keywords": keywords,
+            }
+        payload = json.dumps(data, ensure_ascii=False, indent=2)
+        return f"Thought: I now know the final answer\nFinal Answer: ```json\n{payload}\n```"
+
+    def _recommendation_response(self, messages: List[Dict], prompt: str) -> str:
+        # 검색 계획이 있으면 계획대로, 없으면 키워드마다 10권씩
+        searches = [(query, int(display)) for query, display in _SEARCH_PLAN_PATTERN.findall(prompt)]
+        if not searches:
+            match = _SEARCH_KEYWORDS_PATTERN.search(prompt)
+            keywords = [k.strip() for k in match.group(1).split(",") if k.strip()] if match else []
+            searches = [(keyword, 10) for keyword in keywords]
+
+        # 이전 Tool 결과(Observation)에서 검색된 책 수집
+        observations = []
+        for message in messages:
+            found = _OBSERVATION_PATTERN.search(str(message.get("content", "")))
+            if not found:
+                continue
+            try:
+                observations.append(json.JSONDecoder().raw_decode(found.group(1))[0])
+            except json.JSONDecodeError:
+                continue
+
+        if len(observations) < len(searches):
+            keyword, display = searches[len(observations)]
+            return (
+                f"Thought: '{keyword}' 키워드로 검색한다\n"
+                "Action: 네이버 도서 검색\n"
+                f'Action Input: {{"keyword": "{keyword}", "display": {display}}}'
+            )
+
+        book_ids = []
+        for observation in observations:
+            for book in observation.get("books", []):
+                book_id = book.get("id")
+                if book_id and book_id not in book_ids:
+                    book_ids.append(book_id)
+        payload = json.dumps({"book_ids": book_ids}, ensure_ascii=False)
+        return f"Thought: I now know the final answer\nFinal Answer: ```json\n{payload}\n```"
+
+
+    def _reasons_response(self, prompt: str) -> str:
+        # 책 목록의 id마다 주요 고민 + 설명 앞부분으로 결정적인 이유 작성
+        match = _MAIN_CONCERNS_PATTERN.search(prompt)
+        concern = match.group(1).split(",")[0].strip() if match else "지금의 고민"
+        reasons = {
+            handle: f"'{concern}'을(를) 겪는 지금, \"{summary[:24].rstrip()}\" 같은 내용이 마음을 돌보는 데 도움이 될 수 있어요."
+            for handle, summary in _REASON_BOOK_PATTERN.findall(prompt)
+        }
+        payload = json.dumps({"reasons": reasons}, ensure_ascii=False)
+        return f"Thought: I now know the final answer\nFinal Answer: ```json\n{payload}\n```"
+
+
+# 가짜 네이버 도서 API
+_DESCRIPTION_SENTENCES = [
+    "이 책은 마음이 지친 사람들에게 따뜻한 위로를 건넨다.",
+    "저자는 오랜 상담 경험을 바탕으로 일상에서 실천할 수 있는 방법을 소개한다.",
+    "불안과 걱정을 다루는 구체적인 연습이 단계별로 정리되어 있다.",
+    "관계 속에서 나를 지키는 법과 감정을 돌보는 습관을 이야기한다.",
+    "심리학 연구와 실제 사례를 함께 엮어 누구나 쉽게 읽을 수 있다.",
+    "작은 변화가 삶 전체를 바꿀 수 있다는 메시지를 담았다.",
+]
+
+
+def make_fake_book(query: str, index: int) -> Dict[str, str]:
+    """검색어와 순번으로 결정적인 네이버 도서 검색 결과 항목 생성"""
+    seed = _stable_hash(f"{query}:{index}")
+    isbn = f"979{seed % 10**10:010d}"
+    year = 2005 + seed % 20
+    sentences = [_DESCRIPTION_SENTENCES[(seed >> s) % len(_DESCRIPTION_SENTENCES)] for s in range(0, 40, 8)]
+    return {
+        "title": f"<b>{query}</b>을 다루는 마음 수업 {index + 1}",
+        "link": f"https://search.shopping.naver.com/book/catalog/{seed % 10**11}",
+        "image": f"https://shopping-phinf.pstatic.net/main_{seed % 10**8}/{seed % 10**11}.jpg",
+        "author": f"저자{seed % 97}",
+        "discount": str(10000 + seed % 20 * 500),
+        "publisher": f"출판사{seed % 31}",
+        "pubdate": f"{year}{1 + seed % 12:02d}{1 + seed % 28:02d}",
+        "isbn": isbn,
+        "description": " ".join(sentences) + f" {query}에 대해 깊이 생각해 볼 수 있는 책이다.",
+    }
+
+
+class FakeNaverServer:
+    """
+    네이버 도서 검색 API(/v1/search/book.json)를 흉내 내는 로컬 HTTP 서버
+
+    사용:
+        with FakeNaverServer(latency_seconds=0.05) as server:
+            crewai_tools.NAVER_BOOK_SEARCH_URL = server.url
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency_seconds: float = 0.0,
+        total_per_query: int = 200
+    ):
+        self.latency_seconds = latency_seconds
+        self.total_per_query = total_per_query
+        self.request_count = 0
+        self._count_lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), self._make_handler())
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/v1/search/book.json"
+
+    def _make_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                parsed = urlparse(self.path)
+                if parsed.path != "/v1/search/book.json":
+                    self.send_error(404)
+                    return
+                with server._count_lock:
+                    server.request_count += 1
+                if server.latency_seconds > 0:
+                    time.sleep(server.latency_seconds)
+
+                params = parse_qs(parsed.query)
+                query = params.get("query", [""])[0]
+                display = min(int(params.get("display", ["10"])[0]), 100)
+                start = max(int(params.get("start", ["1"])[0]), 1)
+                end = min(start - 1 + display, server.total_per_query)
+                items = [make_fake_book(query, i) for i in range(start - 1, end)]
+
+                body = json.dumps({
+                    "lastBuildDate": "Mon, 01 Jan 2024 00:00:00 +0900",
+                    "total": server.total_per_query,
+                    "start": start,
+                    "display": len(items),
+                    "items": items,
+                }, ensure_ascii=False).encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass  # 요청마다 stderr 출력하지 않음
+
+        return Handler
+
+    def start(self) -> "FakeNaverServer":
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> "FakeNaverServer":
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
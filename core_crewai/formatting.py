@@ -0,0 +1,86 @@
+"""
+채팅 메시지 포맷팅 - 분석 결과와 추천 도서를 Gradio 채팅용 마크다운으로 변환
+(Gradio 없이도 import 가능하도록 app_gradio.py에서 분리)
+"""
+
+from typing import List
+
+from .models import PsychologicalSummary, BookRecommendation
+
+
+def format_analysis_only(summary: PsychologicalSummary) -> str:
+    """심리 분석 결과만 채팅 메시지 형식으로 포맷팅 (책 추천 없음)"""
+    result = "## 📊 심리 분석 결과\n\n"
+    
+    result += "### 🎯 주요 고민\n"
+    for concern in summary.main_concerns:
+        result += f"- {concern}\n"
+    result += "\n"
+    
+    result += "### 💭 감정 상태\n"
+    for emotion in summary.emotions:
+        result += f"- {emotion}\n"
+    result += "\n"
+    
+    result += "### 🧠 인지 패턴\n"
+    for pattern in summary.cognitive_patterns:
+        result += f"- {pattern}\n"
+    result += "\n"
+    
+    result += "### 💡 권장 전략\n"
+    for rec in summary.recommendations:
+        result += f"- {rec}\n"
+    result += "\n"
+    
+    result += f"### 🔍 추출된 키워드\n{', '.join(summary.keywords)}\n\n"
+    
+    # 책 추천 제안 메시지 추가
+    result += "---\n\n"
+    result += "충분한 상담이 끝난 것 같은데 책을 추천해드릴까요?"
+    
+    return result
+
+
+def format_books_recommendation(books: List[BookRecommendation], summary: PsychologicalSummary) -> str:
+    """책 추천 결과만 채팅 메시지 형식으로 포맷팅"""
+    result = "## 📚 추천 도서\n\n"
+    
+    if books:
+        for i, book in enumerate(books, 1):
+            result += f"**{i}. {book.title}** - {book.author}\n"
+            result += f"- 출판사: {book.publisher}\n"
+            result += f"- 추천 이유: {book.relevance_reason}\n"
+            if book.link:
+                result += f"- [네이버 도서 보기]({book.link})\n"
+            result += "\n"
+    else:
+        result += "⚠️ 도서 검색에 실패했습니다. "
+        result += f"다음 키워드로 직접 검색해보세요: {', '.join(summary.keywords)}\n"
+    
+    return result
+
+
+def format_similar_books(books: List[BookRecommendation], source_title: str) -> str:
+    """비슷한 책 조회 결과를 채팅 메시지 형식으로 포맷팅"""
+    result = f"## 🔎 '{source_title}'과(와) 비슷한 책\n\n"
+    
+    if books:
+        for i, book in enumerate(books, 1):
+            result += f"**{i}. {book.title}** - {book.author}\n"
+            result += f"- 출판사: {book.publisher}\n"
+            result += f"- {book.relevance_reason}\n"
+            if book.link:
+                result += f"- [네이버 도서 보기]({book.link})\n"
+            result += "\n"
+    else:
+        result += "⚠️ 지금까지 검색된 책 중에는 비슷한 책이 없습니다.\n"
+    
+    return result
+
+
+def format_analysis_result(summary: PsychologicalSummary, books: List) -> str:
+    """분석 결과를 채팅 메시지 형식으로 포맷팅 (하위 호환성용)"""
+    result = format_analysis_only(summary)
+    result = result.replace("충분한 상담이 끝난 것 같은데 책을 추천해드릴까요?", "")
+    result += "\n" + format_books_recommendation(books, summary)
+    return result
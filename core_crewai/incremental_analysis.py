@@ -0,0 +1,94 @@
+"""
+증분 분석 - 분석 완료 후 대화가 이어졌을 때 전체 대화 대신 이전 분석 결과 + 새 메시지만 분석
+-     세션에 분석 결과가 반영한 앞쪽 메시지 수와 그 지문을 보관 (SessionState.analyzed_messages / analyzed_fingerprint)
+      -> 대화가 그대로 이어졌으면 뒤쪽 새 메시지만 update_analysis()에 넘김 (프롬프트가 대화 길이에 비례해 늘지 않음)
+-     diff_summaries(): 이전/새 분석 결과에서 바뀐 필드 (순서/공백/대소문자 차이는 무시)
+-     requires_search: 쿼리 플래너 기준 검색어나 장르가 바뀌었는지
+      -> 바뀌지 않았으면 이전 추천 도서를 그대로 사용 (LLM 검색 단계/네이버 호출 생략)
+-     새 메시지가 너무 많으면 (PAGEMIND_INCREMENTAL_MAX_MESSAGES) 누적 오차를 막기 위해 전체 대화를 다시 분석
+
+환경 변수:
+    PAGEMIND_INCREMENTAL_ANALYSIS=1          증분 분석 사용 (0이면 항상 전체 대화 분석)
+    PAGEMIND_INCREMENTAL_MAX_MESSAGES=20     새 메시지가 이보다 많으면 전체 대화 분석
+"""
+
+import os
+from typing import Dict, FrozenSet, Iterable, List, Optional
+
+from .models import PsychologicalSummary, SessionState, SummaryDiff
+from .query_planner import MAX_QUERIES, merge_keywords
+from .search_cache import normalize_query
+from .session_store import conversation_fingerprint
+
+INCREMENTAL_ANALYSIS_ENABLED = os.getenv("PAGEMIND_INCREMENTAL_ANALYSIS", "1").lower() in ("1", "true", "yes")
+INCREMENTAL_MAX_MESSAGES = int(os.getenv("PAGEMIND_INCREMENTAL_MAX_MESSAGES", "20"))
+
+# 비교하는 분석 결과 필드 (genre는 분석이 아니라 사용자가 고른 값)
+SUMMARY_FIELDS = ("main_concerns", "emotions", "cognitive_patterns", "recommendations", "keywords")
+
+
+def _terms(values: Iterable[str]) -> FrozenSet[str]:
+    """비교용 항목 집합 (순서, 공백, 대소문자 차이 무시)"""
+    return frozenset(filter(None, (normalize_query(value) for value in values)))
+
+
+def search_queries(keywords: Iterable[str]) -> FrozenSet[str]:
+    """키워드로 실제 실행될 검색어 집합 (쿼리 플래너와 같은 병합 - "불안"/"불안감"은 한 검색)"""
+    return frozenset(normalize_query(group[0]) for group in merge_keywords(list(keywords))[:MAX_QUERIES])
+
+
+def diff_summaries(previous: PsychologicalSummary, updated: PsychologicalSummary) -> SummaryDiff:
+    """이전 분석 결과 대비 바뀐 필드"""
+    changed = [
+        name for name in SUMMARY_FIELDS
+        if _terms(getattr(previous, name)) != _terms(getattr(updated, name))
+    ]
+    if previous.genre != updated.genre:
+        changed.append("genre")
+
+    old_keywords = _terms(previous.keywords)
+    new_keywords = _terms(updated.keywords)
+    return SummaryDiff(
+        changed_fields=changed,
+        added_keywords=[k for k in updated.keywords if normalize_query(k) not in old_keywords],
+        removed_keywords=[k for k in previous.keywords if normalize_query(k) not in new_keywords],
+        requires_search=(
+            previous.genre != updated.genre
+            or search_queries(previous.keywords) != search_queries(updated.keywords)
+        ),
+    )
+
+
+def new_messages_since(state: Optional[SessionState], messages: List[Dict]) -> Optional[List[Dict]]:
+    """
+    세션의 분석 결과 이후에 이어진 새 메시지 (증분 분석 대상)
+    분석 결과가 없거나, 대화가 분석 당시와 달라졌거나(앞부분 지문 불일치), 새 메시지가 너무 많으면 None (전체 분석)
+    """
+    if not INCREMENTAL_ANALYSIS_ENABLED or state is None or state.summary is None:
+        return None
+    analyzed = state.analyzed_messages
+    if analyzed <= 0 or analyzed > len(messages):
+        return None
+    if len(messages) - analyzed > INCREMENTAL_MAX_MESSAGES:
+        return None
+    if state.analyzed_fingerprint and conversation_fingerprint(messages[:analyzed]) != state.analyzed_fingerprint:
+        return None
+    return messages[analyzed:]
+
+
+def mark_analyzed(state: SessionState, messages: List[Dict], fingerprint: Optional[str] = None):
+    """state.summary가 messages 전체를 반영했다고 기록 (다음 분석은 이후 메시지만)"""
+    state.analyzed_messages = len(messages)
+    state.analyzed_fingerprint = fingerprint or conversation_fingerprint(messages)
+
+
+def reusable_books(state: Optional[SessionState], summary: PsychologicalSummary, max_books: int):
+    """
+    summary로 다시 검색하지 않고 쓸 수 있는 이전 추천 도서 (없으면 None)
+    이전 추천을 검색한 분석 결과와 검색어/장르가 같고 도서 수가 충분할 때만
+    """
+    if state is None or state.recommended_summary is None or len(state.recommended_books) < max_books:
+        return None
+    if diff_summaries(state.recommended_summary, summary).requires_search:
+        return None
+    return state.recommended_books[:max_books]
@@ -0,0 +1,154 @@
+"""
+어휘 기반 관련도 (BM25, 문자 bigram) - 심리 분석 결과와 책 제목/설명 비교
+-     한국어는 조사/어미가 붙어 단어 단위 일치가 어려우므로 어절별 문자 bigram을 용어로 사용
+      ("불안감을" -> 불안, 안감, 감을)
+-     질의: main_concerns, emotions, keywords의 bigram (keywords는 가중치 2배)
+-     말뭉치 통계(문서 빈도, 평균 길이)는 지금까지 점수를 매긴 모든 책으로 누적하고,
+      책별 bigram은 ISBN 기준으로 캐시 -> 후보 풀 점수 계산은 수 밀리초
+-     점수는 0~1로 정규화: 질의 용어가 평균 길이 문서에 한 번씩 모두 나올 때 1.0 (IDF 가중 용어 포함률)
+      말뭉치에 한 번도 나오지 않은 질의 용어("~로 인한" 등)는 정규화 기준에서 제외
+
+사용:
+    query = build_query(summary.main_concerns, summary.emotions, summary.keywords)
+    scores = lexical_scorer.score_many(books, query)
+"""
+
+import math
+import re
+import threading
+from collections import Counter, OrderedDict
+from typing import Dict, Iterable, List, Optional, Sequence
+
+BM25_K1 = 1.2
+BM25_B = 0.75
+KEYWORD_WEIGHT = 2.0
+MAX_CACHED_DOCS = 50000
+
+_NON_WORD = re.compile(r"[^0-9a-z가-힣]+")
+
+
+def tokenize(text: str) -> List[str]:
+    """어절별 문자 bigram (한 글자 어절은 그대로)"""
+    text = (text or "").replace("<b>", "").replace("</b>", "").lower()
+    terms = []
+    for word in _NON_WORD.split(text):
+        if len(word) == 1:
+            terms.append(word)
+        else:
+            terms.extend(word[i:i + 2] for i in range(len(word) - 1))
+    return terms
+
+
+class LexicalQuery:
+    """용어 -> 질의 가중치"""
+
+    __slots__ = ("weights",)
+
+    def __init__(self, weights: Dict[str, float]):
+        self.weights = weights
+
+    def __bool__(self) -> bool:
+        return bool(self.weights)
+
+
+def build_query(
+    main_concerns: Sequence[str] = (),
+    emotions: Sequence[str] = (),
+    keywords: Sequence[str] = ()
+) -> LexicalQuery:
+    """심리 분석 결과 -> BM25 질의 (같은 용어가 여러 번 나와도 가장 큰 가중치 하나만)"""
+    weights: Dict[str, float] = {}
+    for texts, weight in ((main_concerns, 1.0), (emotions, 1.0), (keywords, KEYWORD_WEIGHT)):
+        for text in texts:
+            for term in tokenize(text):
+                weights[term] = max(weights.get(term, 0.0), weight)
+    return LexicalQuery(weights)
+
+
+class _Doc:
+    __slots__ = ("tf", "length")
+
+    def __init__(self, terms: List[str]):
+        self.tf = Counter(terms)
+        self.length = len(terms)
+
+
+class BM25Scorer:
+    """누적 말뭉치 통계를 쓰는 BM25 점수기 (스레드 안전)"""
+
+    def __init__(self, k1: float = BM25_K1, b: float = BM25_B, max_docs: int = MAX_CACHED_DOCS):
+        self.k1 = k1
+        self.b = b
+        self.max_docs = max_docs
+        self._docs: "OrderedDict[str, _Doc]" = OrderedDict()  # 문서 키 -> bigram 빈도 (LRU)
+        self._df: Counter = Counter()
+        self._total_length = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(book: Dict) -> str:
+        return book.get("isbn") or f"{book.get('title', '')}|{book.get('author', '')}"
+
+    def _doc(self, book: Dict) -> _Doc:
+        """책 bigram (처음 보는 책이면 말뭉치 통계에 추가) - 호출자가 lock 보유"""
+        key = self._key(book)
+        doc = self._docs.get(key)
+        if doc is not None:
+            self._docs.move_to_end(key)
+            return doc
+        doc = _Doc(tokenize(f"{book.get('title', '')} {book.get('description', '')}"))
+        self._docs[key] = doc
+        self._df.update(doc.tf.keys())
+        self._total_length += doc.length
+        while len(self._docs) > self.max_docs:
+            _, old = self._docs.popitem(last=False)
+            self._df.subtract(old.tf.keys())
+            self._total_length -= old.length
+        return doc
+
+    def _idf(self, term: str, doc_count: int) -> float:
+        """BM25 IDF (말뭉치에 없는 용어는 0 - 어떤 책도 구분하지 못함)"""
+        df = self._df.get(term, 0)
+        if df <= 0:
+            return 0.0
+        return math.log(1 + (doc_count - df + 0.5) / (df + 0.5))
+
+    def _score(self, doc: _Doc, query: LexicalQuery, idf: Dict[str, float], ideal: float, avg_length: float) -> float:
+        if ideal <= 0 or doc.length == 0:
+            return 0.0
+        norm = self.k1 * (1 - self.b + self.b * doc.length / avg_length)
+        raw = 0.0
+        for term, weight in query.weights.items():
+            tf = doc.tf.get(term)
+            if tf:
+                raw += weight * idf[term] * tf * (self.k1 + 1) / (tf + norm)
+        # 평균 길이 문서에 각 용어가 한 번씩 나오면 tf 항이 1 -> raw == ideal
+        return min(1.0, raw / ideal)
+
+    def score_many(self, books: Iterable[Dict], query: Optional[LexicalQuery]) -> List[float]:
+        """책 목록의 0~1 관련도 (후보 풀을 말뭉치에 먼저 반영한 뒤 같은 통계로 계산)"""
+        books = list(books)
+        if not query:
+            return [0.0] * len(books)
+        with self._lock:
+            docs = [self._doc(book) for book in books]
+            doc_count = len(self._docs)
+            avg_length = (self._total_length / doc_count) if doc_count else 1.0
+            idf = {term: self._idf(term, doc_count) for term in query.weights}
+            ideal = sum(weight * idf[term] for term, weight in query.weights.items())
+            return [self._score(doc, query, idf, ideal, max(avg_length, 1.0)) for doc in docs]
+
+    def score(self, book: Dict, query: Optional[LexicalQuery]) -> float:
+        return self.score_many([book], query)[0]
+
+    def reset(self):
+        with self._lock:
+            self._docs.clear()
+            self._df.clear()
+            self._total_length = 0
+
+    def __len__(self) -> int:
+        return len(self._docs)
+
+
+lexical_scorer = BM25Scorer()
@@ -0,0 +1,209 @@
+"""
+종단 간 부하 생성기 - FakeLLM + FakeNaverServer로 외부 API 없이 전체 파이프라인 측정
+-     여러 세션을 동시에 chat(여러 턴) -> analyze -> recommend 순서로 실행
+-     단계별 처리량과 p50/p95/p99 지연 시간 보고
+
+실행:
+    python -m core_crewai.loadtest --sessions 50 --concurrency 8 --llm-latency 0.2
+"""
+
+import argparse
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+# CrewAI 원격 텔레메트리 끄기 (오프라인 측정)
+os.environ.setdefault("CREWAI_DISABLE_TELEMETRY", "true")
+os.environ.setdefault("OTEL_SDK_DISABLED", "true")
+
+from . import crewai_tools
+from .crew_orchestrator import CrewOrchestrator
+from .fakes import FakeLLM, FakeNaverServer
+from .serialization import dump_file
+
+STAGES = ("chat", "analyze", "recommend", "session")
+
+SIMULATED_USER_MESSAGES = [
+    "요즘 회사에서 스트레스를 너무 많이 받아요.",
+    "상사가 무리한 요구를 하는데 거절을 못 하겠어요.",
+    "밤에 잠도 잘 안 오고 계속 불안해요.",
+    "친구들한테 털어놓기도 어렵고 혼자인 것 같아요.",
+    "주말에는 그냥 누워만 있게 돼요.",
+    "에세이 같은 편한 책을 좋아해요.",
+]
+
+
+def percentile(sorted_values: List[float], p: float) -> float:
+    """정렬된 값에서 p 백분위수 (선형 보간)"""
+    if not sorted_values:
+        return 0.0
+    k = (len(sorted_values) - 1) * p / 100
+    lower = int(k)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (k - lower)
+
+
+@dataclass
+class LoadTestReport:
+    """부하 테스트 결과"""
+    sessions: int
+    concurrency: int
+    elapsed_seconds: float
+    latencies: Dict[str, List[float]] = field(default_factory=dict)
+    errors: Dict[str, int] = field(default_factory=dict)
+
+    def summary(self) -> Dict:
+        result = {
+            "sessions": self.sessions,
+            "concurrency": self.concurrency,
+            "elapsed_seconds": round(self.elapsed_seconds, 3),
+            "sessions_per_second": round(self.sessions / self.elapsed_seconds, 3) if self.elapsed_seconds else 0.0,
+            "stages": {},
+        }
+        for stage in STAGES:
+            values = sorted(self.latencies.get(stage, []))
+            result["stages"][stage] = {
+                "count": len(values),
+                "errors": self.errors.get(stage, 0),
+                "throughput_per_second": round(len(values) / self.elapsed_seconds, 3) if self.elapsed_seconds else 0.0,
+                "p50": round(percentile(values, 50), 4),
+                "p95": round(percentile(values, 95), 4),
+                "p99": round(percentile(values, 99), 4),
+                "max": round(values[-1], 4) if values else 0.0,
+            }
+        return result
+
+    def format_table(self) -> str:
+        summary = self.summary()
+        lines = [
+            f"세션 {summary['sessions']}개, 동시성 {summary['concurrency']}, "
+            f"{summary['elapsed_seconds']}초 ({summary['sessions_per_second']} 세션/초)",
+            f"{'단계':<10}{'건수':>7}{'오류':>6}{'처리량/s':>11}{'p50':>9}{'p95':>9}{'p99':>9}{'max':>9}",
+        ]
+        for stage, s in summary["stages"].items():
+            lines.append(
+                f"{stage:<10}{s['count']:>7}{s['errors']:>6}{s['throughput_per_second']:>11}"
+                f"{s['p50']:>9}{s['p95']:>9}{s['p99']:>9}{s['max']:>9}"
+            )
+        return "\n".join(lines)
+
+
+def run_load_test(
+    sessions: int = 20,
+    concurrency: int = 4,
+    turns: int = 3,
+    llm: Optional[FakeLLM] = None,
+    naver_latency_seconds: float = 0.0
+) -> LoadTestReport:
+    """
+    시뮬레이션 세션을 동시에 실행하고 단계별 지연 시간 수집
+
+    Args:
+        sessions: 전체 세션 수
+        concurrency: 동시에 실행할 세션 수 (워커 스레드마다 오케스트레이터 하나)
+        turns: 세션당 상담 대화 턴 수
+        llm: 사용할 FakeLLM (None이면 지연 없는 기본 FakeLLM)
+        naver_latency_seconds: 가짜 네이버 API 응답 지연
+
+    Returns:
+        LoadTestReport
+    """
+    llm = llm or FakeLLM()
+    latencies: Dict[str, List[float]] = {stage: [] for stage in STAGES}
+    errors: Dict[str, int] = {stage: 0 for stage in STAGES}
+    results_lock = threading.Lock()
+    worker_state = threading.local()
+
+    def record(stage: str, seconds: Optional[float]):
+        with results_lock:
+            if seconds is None:
+                errors[stage] += 1
+            else:
+                latencies[stage].append(seconds)
+
+    def timed(stage: str, fn, *args):
+        started = time.perf_counter()
+        try:
+            result = fn(*args)
+        except Exception as e:
+            record(stage, None)
+            print(f"[{stage}] 오류: {type(e).__name__}: {e}")
+            raise
+        record(stage, time.perf_counter() - started)
+        return result
+
+    def run_session(session_index: int):
+        orchestrator = getattr(worker_state, "orchestrator", None)
+        if orchestrator is None:
+            orchestrator = CrewOrchestrator(llm=llm)
+            worker_state.orchestrator = orchestrator
+
+        session_started = time.perf_counter()
+        try:
+            history: List[Dict] = []
+            for turn in range(turns):
+                message = SIMULATED_USER_MESSAGES[(session_index + turn) % len(SIMULATED_USER_MESSAGES)]
+                response, _ = timed("chat", orchestrator.chat, message, history)
+                history.append({"role": "user", "content": message})
+                history.append({"role": "assistant", "content": response})
+
+            summary = timed("analyze", orchestrator.analyze_conversation, history)
+            timed("recommend", orchestrator.recommend_books_from_summary, summary, 5)
+        except Exception:
+            record("session", None)
+            return
+        record("session", time.perf_counter() - session_started)
+
+    original_url = crewai_tools.NAVER_BOOK_SEARCH_URL
+    with FakeNaverServer(latency_seconds=naver_latency_seconds) as naver:
+        crewai_tools.NAVER_BOOK_SEARCH_URL = naver.url
+        try:
+            started = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=concurrency) as executor:
+                list(executor.map(run_session, range(sessions)))
+            elapsed = time.perf_counter() - started
+        finally:
+            crewai_tools.NAVER_BOOK_SEARCH_URL = original_url
+
+    return LoadTestReport(
+        sessions=sessions,
+        concurrency=concurrency,
+        elapsed_seconds=elapsed,
+        latencies=latencies,
+        errors=errors,
+    )
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="FakeLLM/FakeNaverServer 기반 종단 간 부하 테스트")
+    parser.add_argument("--sessions", type=int, default=20, help="전체 세션 수 (기본 20)")
+    parser.add_argument("--concurrency", type=int, default=4, help="동시 세션 수 (기본 4)")
+    parser.add_argument("--turns", type=int, default=3, help="세션당 상담 턴 수 (기본 3)")
+    parser.add_argument("--llm-latency", type=float, default=0.0, help="LLM 호출당 지연 (초)")
+    parser.add_argument("--tokens-per-second", type=float, default=0.0, help="LLM 출력 토큰 생성 속도 (0이면 즉시)")
+    parser.add_argument("--naver-latency", type=float, default=0.0, help="네이버 API 응답 지연 (초)")
+    parser.add_argument("--json-out", help="결과를 JSON 파일로 저장")
+    args = parser.parse_args(argv)
+
+    llm = FakeLLM(latency_seconds=args.llm_latency, tokens_per_second=args.tokens_per_second)
+    report = run_load_test(
+        sessions=args.sessions,
+        concurrency=args.concurrency,
+        turns=args.turns,
+        llm=llm,
+        naver_latency_seconds=args.naver_latency
+    )
+
+    print(report.format_table())
+    if args.json_out:
+        with open(args.json_out, "wb") as f:
+            dump_file(report.summary(), f)
+    return 1 if any(report.errors.values()) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
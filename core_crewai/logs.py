@@ -0,0 +1,264 @@
+"""
+구조화 로깅 (요청 스레드에서 블로킹 I/O 없음) - print()와 CrewAI verbose 콘솔 출력을 대체
+-     get_logger("orchestrator").info("검색된 책", count=12): 메시지 + 키워드 필드로 구조화된 레코드
+      트레이싱 스팬 안에서 기록하면 trace_id 필드가 자동으로 붙음
+-     요청 스레드는 레코드를 큐에 넣기만 함 (put_nowait) - 포맷팅/쓰기는 백그라운드 스레드 하나(QueueListener)가 담당
+      큐가 가득 차면 레코드를 버리고 pagemind_log_dropped_total 메트릭에 집계 (요청을 기다리게 하지 않음)
+-     큰 페이로드(LLM 원본 결과 등): PAYLOAD_FIELDS 필드는 PAGEMIND_LOG_MAX_FIELD_CHARS자로 자르고,
+      PAGEMIND_LOG_PAYLOAD_SAMPLE 비율의 레코드만 전체 내용을 남김 (자르기도 백그라운드 스레드에서)
+-     컴포넌트별 레벨: pagemind.<컴포넌트> 로거 계층 (PAGEMIND_LOG_LEVELS="orchestrator=DEBUG,crewai=INFO")
+-     CrewAI: Crew/Agent verbose 콘솔 출력 대신 이벤트 버스(Task/Agent 완료, 도구 사용)를 pagemind.crewai 로거로 기록
+      (PAGEMIND_CREW_VERBOSE=1이면 예전처럼 CrewAI 콘솔 출력도 켬 - 개발용)
+
+환경 변수:
+    PAGEMIND_LOG_LEVEL=INFO                 기본 레벨 (pagemind 로거)
+    PAGEMIND_LOG_LEVELS=                    컴포넌트별 레벨 (예: "orchestrator=DEBUG,crewai=DEBUG,search=WARNING")
+    PAGEMIND_LOG_FORMAT=text                text (시각 레벨 컴포넌트 메시지 key=value) 또는 json (한 줄에 레코드 하나)
+    PAGEMIND_LOG_FILE=                      기록할 파일 (비우면 stderr)
+    PAGEMIND_LOG_MAX_FIELD_CHARS=500        페이로드 필드 최대 길이
+    PAGEMIND_LOG_PAYLOAD_SAMPLE=0.01        페이로드 전체를 남길 레코드 비율
+    PAGEMIND_LOG_QUEUE_SIZE=10000           기록 대기 큐 크기
+    PAGEMIND_CREW_VERBOSE=0                 CrewAI verbose 콘솔 출력
+"""
+
+import atexit
+import logging
+import logging.handlers
+import os
+import queue
+import random
+import sys
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+from .serialization import dumps
+from .tracing import current_span, metrics
+
+LOG_LEVEL = os.getenv("PAGEMIND_LOG_LEVEL", "INFO").upper()
+LOG_LEVELS = os.getenv("PAGEMIND_LOG_LEVELS", "")
+LOG_FORMAT = os.getenv("PAGEMIND_LOG_FORMAT", "text").lower()
+LOG_FILE = os.getenv("PAGEMIND_LOG_FILE", "")
+LOG_MAX_FIELD_CHARS = int(os.getenv("PAGEMIND_LOG_MAX_FIELD_CHARS", "500"))
+LOG_PAYLOAD_SAMPLE = float(os.getenv("PAGEMIND_LOG_PAYLOAD_SAMPLE", "0.01"))
+LOG_QUEUE_SIZE = int(os.getenv("PAGEMIND_LOG_QUEUE_SIZE", "10000"))
+CREW_VERBOSE = os.getenv("PAGEMIND_CREW_VERBOSE", "0").lower() in ("1", "true", "yes")
+
+ROOT_LOGGER = "pagemind"
+# 길면 잘라 내는 필드 (LLM 원본 출력, 대화 메시지, 스택 트레이스)
+PAYLOAD_FIELDS = ("payload", "output", "message", "traceback")
+# logging.Logger.log()가 직접 받는 인자 (나머지 키워드는 구조화 필드)
+_LOG_KWARGS = ("exc_info", "stack_info", "stacklevel", "extra")
+
+LOG_DROPPED = metrics.counter("pagemind_log_dropped_total", "Log records dropped because the log queue was full")
+
+
+class StructuredLogger(logging.LoggerAdapter):
+    """logger.info("메시지", key=value, ...) - 키워드를 record.fields로 옮기고 현재 trace_id를 붙임"""
+
+    def process(self, msg, kwargs):
+        fields = {key: kwargs.pop(key) for key in list(kwargs) if key not in _LOG_KWARGS}
+        trace = current_span()
+        if trace is not None and getattr(trace, "trace_id", None):
+            fields["trace_id"] = trace.trace_id
+        extra = kwargs.setdefault("extra", {})
+        extra["fields"] = fields
+        return msg, kwargs
+
+
+def get_logger(component: str) -> StructuredLogger:
+    """컴포넌트 로거 (pagemind.<component>)"""
+    return StructuredLogger(logging.getLogger(f"{ROOT_LOGGER}.{component}"), {})
+
+
+class NonBlockingQueueHandler(logging.handlers.QueueHandler):
+    """큐에 넣기만 하는 핸들러 (가득 차면 버리고 집계)"""
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            LOG_DROPPED.inc(logger=record.name)
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # 기본 prepare()는 요청 스레드에서 포맷터 전체를 실행하므로 메시지 인자 결합만 함
+        # (예외 정보는 리스너 스레드에서 포맷하도록 그대로 넘김)
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+
+def _truncate(value: Any, max_chars: int) -> Any:
+    if isinstance(value, str) and len(value) > max_chars:
+        return f"{value[:max_chars]}…(+{len(value) - max_chars}자)"
+    return value
+
+
+class StructuredFormatter(logging.Formatter):
+    """text: "시각 레벨 컴포넌트 메시지 key=value ..." / json: {"ts", "level", "component", "msg", 필드...}"""
+
+    def __init__(
+        self,
+        style: str = LOG_FORMAT,
+        max_field_chars: int = LOG_MAX_FIELD_CHARS,
+        payload_sample: float = LOG_PAYLOAD_SAMPLE
+    ):
+        super().__init__()
+        self.json = style == "json"
+        self.max_field_chars = max_field_chars
+        self.payload_sample = payload_sample
+
+    def _fields(self, record: logging.LogRecord) -> Dict[str, Any]:
+        fields = dict(getattr(record, "fields", None) or {})
+        if record.exc_info:
+            fields["traceback"] = self.formatException(record.exc_info)
+        # 표본으로 뽑힌 레코드만 페이로드 전체를 남김
+        if self.payload_sample < 1.0 and random.random() >= self.payload_sample:
+            for key in PAYLOAD_FIELDS:
+                if key in fields:
+                    fields[key] = _truncate(fields[key], self.max_field_chars)
+        return fields
+
+    def format(self, record: logging.LogRecord) -> str:
+        fields = self._fields(record)
+        component = record.name[len(ROOT_LOGGER) + 1:] if record.name.startswith(ROOT_LOGGER + ".") else record.name
+        timestamp = datetime.fromtimestamp(record.created).isoformat(timespec="milliseconds")
+        if self.json:
+            entry = {"ts": timestamp, "level": record.levelname, "component": component, "msg": record.getMessage()}
+            entry.update(fields)
+            return dumps(entry)
+        parts = [timestamp, f"{record.levelname:<7}", component, record.getMessage()]
+        for key, value in fields.items():
+            text = str(value)
+            if not text or '"' in text or any(ch.isspace() for ch in text):
+                text = dumps(text)  # 한 줄에 레코드 하나 (줄바꿈/공백은 따옴표 안에서 이스케이프)
+            parts.append(f"{key}={text}")
+        return " ".join(parts)
+
+
+def parse_levels(spec: str) -> Dict[str, int]:
+    """"orchestrator=DEBUG,crewai=info" -> {"pagemind.orchestrator": 10, "pagemind.crewai": 20}"""
+    levels = {}
+    for item in spec.split(","):
+        name, _, level = item.partition("=")
+        name, level = name.strip(), level.strip().upper()
+        if not name or not level:
+            continue
+        if not isinstance(logging.getLevelName(level), int):
+            raise ValueError(f"알 수 없는 로그 레벨입니다: {item}")
+        logger_name = name if name.startswith(ROOT_LOGGER) else f"{ROOT_LOGGER}.{name}"
+        levels[logger_name] = logging.getLevelName(level)
+    return levels
+
+
+# ------------------------------------------------------------
+# CrewAI 이벤트 -> pagemind.crewai 로거 (verbose 콘솔 출력 대체)
+# ------------------------------------------------------------
+
+crew_log = get_logger("crewai")
+_crew_listeners_installed = False
+
+
+def _on_task_completed(source, event):
+    if crew_log.isEnabledFor(logging.DEBUG):
+        output = getattr(event.output, "raw", event.output)
+        crew_log.debug("task 완료", agent=getattr(event.output, "agent", None), output=output)
+
+
+def _on_tool_finished(source, event):
+    if crew_log.isEnabledFor(logging.DEBUG):
+        crew_log.debug(
+            "도구 사용", agent=event.agent_role, tool=event.tool_name, from_cache=event.from_cache,
+            args=event.tool_args, output=event.output
+        )
+
+
+def _on_tool_error(source, event):
+    crew_log.warning("도구 오류", agent=event.agent_role, tool=event.tool_name, error=event.error)
+
+
+def _on_crew_completed(source, event):
+    if crew_log.isEnabledFor(logging.DEBUG):
+        crew_log.debug("crew 완료", crew=event.crew_name, total_tokens=event.total_tokens)
+
+
+def install_crewai_listeners():
+    """CrewAI 이벤트 구독 (crewai를 이미 import한 모듈에서 호출 - 이 모듈만으로는 crewai를 불러오지 않음)"""
+    global _crew_listeners_installed
+    if _crew_listeners_installed:
+        return
+    try:
+        from crewai.events import (
+            crewai_event_bus,
+            CrewKickoffCompletedEvent,
+            TaskCompletedEvent,
+            ToolUsageErrorEvent,
+            ToolUsageFinishedEvent,
+        )
+    except ImportError:
+        return
+    crewai_event_bus.on(TaskCompletedEvent)(_on_task_completed)
+    crewai_event_bus.on(ToolUsageFinishedEvent)(_on_tool_finished)
+    crewai_event_bus.on(ToolUsageErrorEvent)(_on_tool_error)
+    crewai_event_bus.on(CrewKickoffCompletedEvent)(_on_crew_completed)
+    _crew_listeners_installed = True
+
+
+# ------------------------------------------------------------
+# 설정
+# ------------------------------------------------------------
+
+_listener: Optional[logging.handlers.QueueListener] = None
+
+
+def configure(
+    level: Optional[str] = None,
+    levels: Optional[str] = None,
+    style: Optional[str] = None,
+    path: Optional[str] = None,
+    stream=None
+):
+    """
+    로깅 설정 (인자를 생략하면 환경 변수 사용, 다시 호출하면 이전 설정을 대체)
+
+    Args:
+        level: pagemind 로거 기본 레벨
+        levels: 컴포넌트별 레벨 ("orchestrator=DEBUG,crewai=INFO")
+        style: text 또는 json
+        path: 기록할 파일 (없으면 stream, 기본 stderr)
+        stream: 기록할 스트림 (테스트/벤치마크용)
+    """
+    global _listener
+    shutdown()
+    root = logging.getLogger(ROOT_LOGGER)
+    root.setLevel((level or LOG_LEVEL).upper())
+    root.propagate = False  # 루트 로거(uvicorn/gradio 설정)로 중복 출력하지 않음
+    for name, component_level in parse_levels(LOG_LEVELS if levels is None else levels).items():
+        logging.getLogger(name).setLevel(component_level)
+
+    path = LOG_FILE if path is None else path
+    if path:
+        target = logging.FileHandler(path, encoding="utf-8")
+    else:
+        target = logging.StreamHandler(stream or sys.stderr)
+    target.setFormatter(StructuredFormatter(style or LOG_FORMAT))
+
+    log_queue: "queue.Queue[logging.LogRecord]" = queue.Queue(maxsize=LOG_QUEUE_SIZE)
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.addHandler(NonBlockingQueueHandler(log_queue))
+    _listener = logging.handlers.QueueListener(log_queue, target, respect_handler_level=True)
+    _listener.start()
+
+
+def shutdown():
+    """대기 중인 레코드를 모두 기록하고 리스너 스레드 종료"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
+
+
+configure()
+atexit.register(shutdown)
@@ -2,8 +2,8 @@
 데이터 모델 정의
 """
 
-from pydantic import BaseModel
-from typing import List, Optional
+from pydantic import BaseModel, Field
+from typing import Dict, List, Optional
 
 
 class Message(BaseModel):
@@ -11,14 +11,37 @@ class Message(BaseModel):
     content: str
 
 
+class TokenUsage(BaseModel):
+    """LLM 토큰 사용량 (입력 토큰에는 캐시 적중분 포함)"""
+    input_tokens: int = 0
+    output_tokens: int = 0
+    cached_tokens: int = 0  # 프롬프트 캐시에서 읽은 입력 토큰
+    llm_calls: int = 0
+    estimated_cost_usd: float = 0.0
+
+
+class UsageReport(BaseModel):
+    """세션(또는 전체) 단위 토큰 사용량 집계"""
+    session_id: Optional[str] = None
+    total: TokenUsage = Field(default_factory=TokenUsage)
+    by_stage: Dict[str, TokenUsage] = {}  # chat / analyze / recommend
+    by_agent: Dict[str, TokenUsage] = {}  # 에이전트 role
+    budget_tokens: Optional[int] = None  # 세션 토큰 예산 (None이면 무제한)
+    fallback_stages: List[str] = []  # 예산 초과로 저비용 경로를 사용한 단계
+
+
 class ChatRequest(BaseModel):
     messages: List[Message]
     user_id: Optional[str] = None
+    conversation_id: Optional[str] = None  # 없으면 서버에서 새로 발급
 
 
 class ChatResponse(BaseModel):
     response: str
     conversation_id: str
+    analysis_ready: bool = False  # Counselor가 분석 준비 완료 신호를 보냈는지
+    crisis: bool = False  # 위기 신호로 안전 안내를 먼저 보냈는지 (상담사 응답은 /conversation/{id}/followup)
+    usage: Optional[UsageReport] = None  # 대화 세션의 누적 토큰 사용량
 
 
 class SummaryRequest(BaseModel):
@@ -35,6 +58,14 @@ class PsychologicalSummary(BaseModel):
     genre: Optional[str] = None  # 선호 장르 (자기계발, 심리학, 소설, 에세이, 인문, 경제/경영, 기타)
 
 
+class SummaryDiff(BaseModel):
+    """이전 분석 결과 대비 바뀐 필드 (증분 분석, 순서/공백/대소문자 차이는 무시)"""
+    changed_fields: List[str] = []  # 바뀐 PsychologicalSummary 필드 이름
+    added_keywords: List[str] = []
+    removed_keywords: List[str] = []
+    requires_search: bool = False  # 키워드나 장르가 바뀌어 도서를 다시 검색해야 하는지
+
+
 class BookRecommendation(BaseModel):
     title: str
     author: str
@@ -46,7 +77,43 @@ class BookRecommendation(BaseModel):
     relevance_reason: str  # 왜 이 책을 추천하는지
 
 
+class RecommendRequest(BaseModel):
+    summary: PsychologicalSummary
+    conversation_id: Optional[str] = None
+    max_books: int = 5
+
+
 class CounselingResult(BaseModel):
     summary: PsychologicalSummary
     recommended_books: List[BookRecommendation]
     generated_at: str
+    usage: Optional[UsageReport] = None  # 대화 세션의 누적 토큰 사용량
+
+
+class AnalysisUpdateRequest(BaseModel):
+    summary: PsychologicalSummary  # 이전 분석 결과
+    new_messages: List[Message]  # 이전 분석 이후의 메시지만
+    conversation_id: Optional[str] = None
+
+
+class AnalysisUpdate(BaseModel):
+    summary: PsychologicalSummary  # 새 메시지를 반영한 분석 결과
+    diff: SummaryDiff  # 이전 분석 결과 대비 바뀐 필드
+
+
+class SessionState(BaseModel):
+    """세션 저장소에 보관되는 세션 단위 상태 (워커 간 공유)"""
+    session_id: str
+    version: int = 0  # 낙관적 동시성 제어용 버전 (저장할 때마다 1 증가)
+    messages: List[Dict] = []  # 대화 기록 (role, content)
+    analysis_done: bool = False
+    books_recommended: bool = False
+    summary: Optional[PsychologicalSummary] = None  # 현재 분석 결과
+    recommended_books: List[BookRecommendation] = []  # 추천한 도서 ("비슷한 책 찾기" 기준)
+    cached_summaries: Dict[str, PsychologicalSummary] = {}  # 대화 지문 -> 분석 결과
+    analyzed_messages: int = 0  # summary가 반영한 앞쪽 메시지 수 (이후 메시지만 증분 분석)
+    analyzed_fingerprint: str = ""  # 그 메시지들의 지문 (대화가 이어진 것인지 확인)
+    recommended_summary: Optional[PsychologicalSummary] = None  # recommended_books를 검색한 분석 결과
+    pending_followups: int = 0  # 안전 안내를 보내고 상담사 응답을 생성 중인 위기 턴 수
+    followups: List[str] = []  # 생성되었지만 아직 전달하지 않은 위기 턴 상담사 응답 (대화 기록에도 추가됨)
+    updated_at: float = 0.0
@@ -0,0 +1,326 @@
+"""
+도서 인기도 (count-min sketch) - 다른 사용자에게 추천되어 실제로 관심을 받은 책을 재정렬에 반영 (선택)
+-     ISBN별 추천 노출 수(shown)와 클릭 수(clicked)를 count-min sketch 두 개에 근사 집계
+      (depth x width 고정 크기 카운터 -> 책이 아무리 많아도 메모리 일정, 충돌로 인한 과대 추정만 있음)
+-     시간 감쇠: forward decay - 기준 시각(landmark) 이후 경과 시간만큼 커지는 가중치로 더하고
+      조회할 때 현재 가중치로 나눔 (반감기 PAGEMIND_POPULARITY_HALF_LIFE_DAYS, 카운터를 주기적으로 줄일 필요 없음)
+-     같은 크기/해시의 스케치는 카운터를 더하면 병합됨 -> 워커마다 새 이벤트(delta)만 모아 두었다가
+      PAGEMIND_POPULARITY_FLUSH_SECONDS마다 공유 파일(PAGEMIND_POPULARITY_PATH)에 파일 잠금 후 더하고 합계를 다시 읽음
+-     인기도 점수(0~1): 전체 평균 클릭률을 사전값으로 둔 평활 클릭률 / (평활 클릭률 + 평균 클릭률)
+      노출 기록이 없는 책은 0.5 (중립) -> 기록이 쌓인 책만 위아래로 움직임
+-     노출: 추천 결과/비슷한 책 결과로 보여 준 책, 클릭: POST /books/{isbn}/click, "비슷한 책 찾기" 기준 도서
+
+파일 형식 (little-endian):
+    [magic "PMCM"][version u16][depth u16][width u32][landmark f64][half_life f64][crc32 u32]
+    [shown 카운터 depth*width f64][clicked 카운터 depth*width f64]
+
+환경 변수:
+    PAGEMIND_POPULARITY_WEIGHT=0               하이브리드 점수의 인기도 가중치 (0이면 사용 안 함, 예: 0.1)
+    PAGEMIND_POPULARITY_PATH=                  워커 간 공유 스케치 파일 (비우면 프로세스 메모리에만 집계)
+    PAGEMIND_POPULARITY_FLUSH_SECONDS=60       공유 파일에 병합하는 주기
+    PAGEMIND_POPULARITY_HALF_LIFE_DAYS=14      노출/클릭 수 반감기
+"""
+
+import atexit
+import math
+import os
+import struct
+import threading
+import time
+import zlib
+from array import array
+from typing import Dict, Iterable, List, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows: 파일 잠금 없이 병합 (워커 하나일 때만 안전)
+    fcntl = None
+
+from .logs import get_logger
+from .similar_books import isbn_keys
+
+POPULARITY_WEIGHT = float(os.getenv("PAGEMIND_POPULARITY_WEIGHT", "0"))
+POPULARITY_PATH = os.getenv("PAGEMIND_POPULARITY_PATH", "")
+POPULARITY_FLUSH_SECONDS = float(os.getenv("PAGEMIND_POPULARITY_FLUSH_SECONDS", "60"))
+POPULARITY_HALF_LIFE_DAYS = float(os.getenv("PAGEMIND_POPULARITY_HALF_LIFE_DAYS", "14"))
+SKETCH_WIDTH = 4096  # 서로 다른 책 수만 권에서 충돌 과대 추정이 전체 합의 0.1% 안팎 (e/width)
+SKETCH_DEPTH = 4
+PRIOR_SHOWS = 20.0  # 평활 클릭률의 사전 노출 수 (노출이 이보다 적으면 평균 클릭률 쪽으로 당김)
+DEFAULT_CTR = 0.05  # 클릭 기록이 없을 때의 평균 클릭률
+MAX_DECAY_EXPONENT = 64  # 가중치가 2^64를 넘으면 기준 시각을 옮겨 카운터를 줄임 (float 정밀도 유지)
+
+_HEADER = struct.Struct("<4sHHIddI")
+_MAGIC = b"PMCM"
+_VERSION = 1
+
+log = get_logger("popularity")
+
+
+def book_key(isbn: str) -> Optional[str]:
+    """집계 키 (ISBN13 - ISBN10만 있으면 ISBN13으로 변환, 같은 책이 어느 ISBN으로 들어와도 같은 키)"""
+    keys = isbn_keys(isbn)
+    for key in keys:
+        if len(key) == 13:
+            return key
+    if keys and len(keys[0]) == 10 and keys[0][:9].isdigit():
+        body = "978" + keys[0][:9]
+        check = (10 - sum(int(d) * (1 if i % 2 == 0 else 3) for i, d in enumerate(body)) % 10) % 10
+        return body + str(check)
+    return keys[0] if keys else None
+
+
+class CountMinSketch:
+    """시간 감쇠 count-min sketch (depth x width, 같은 크기끼리 병합 가능)"""
+
+    def __init__(
+        self,
+        width: int = SKETCH_WIDTH,
+        depth: int = SKETCH_DEPTH,
+        half_life_seconds: float = POPULARITY_HALF_LIFE_DAYS * 86400,
+        landmark: Optional[float] = None
+    ):
+        self.width = width
+        self.depth = depth
+        self.half_life_seconds = half_life_seconds
+        self.landmark = time.time() if landmark is None else landmark
+        self.counters = array("d", bytes(8 * width * depth))
+
+    def cells(self, key: str) -> List[int]:
+        """행별 카운터 위치 (두 해시 조합 h1 + i*h2 - 모든 워커가 같은 위치를 씀)"""
+        data = key.encode("utf-8")
+        h1 = zlib.crc32(data)
+        h2 = zlib.adler32(data) | 1
+        width = self.width
+        return [row * width + (h1 + row * h2) % width for row in range(self.depth)]
+
+    def _exponent(self, now: float) -> float:
+        return (now - self.landmark) / self.half_life_seconds
+
+    def add(self, key: str, count: float = 1.0, now: Optional[float] = None):
+        now = time.time() if now is None else now
+        exponent = self._exponent(now)
+        if exponent > MAX_DECAY_EXPONENT:
+            self.rebase(now)
+            exponent = 0.0
+        weight = count * math.pow(2.0, exponent)
+        counters = self.counters
+        for cell in self.cells(key):
+            counters[cell] += weight
+
+    def estimate(self, key: str, now: Optional[float] = None) -> float:
+        """감쇠된 근사 횟수 (과대 추정만 가능)"""
+        return self.estimate_cells(self.cells(key), self.scale(now))
+
+    def scale(self, now: Optional[float] = None) -> float:
+        """저장된 카운터 -> 현재 시각 횟수 배율 (여러 키를 조회할 때 한 번만 계산)"""
+        now = time.time() if now is None else now
+        return math.pow(2.0, -self._exponent(now))
+
+    def estimate_cells(self, cells: List[int], scale: float) -> float:
+        """cells()로 미리 구한 위치의 감쇠된 근사 횟수 (같은 크기 스케치끼리는 위치를 재사용)"""
+        return min(map(self.counters.__getitem__, cells)) * scale
+
+    def total(self, now: Optional[float] = None) -> float:
+        """감쇠된 전체 횟수 (행 하나의 합 = 모든 키 합)"""
+        now = time.time() if now is None else now
+        return math.fsum(self.counters[:self.width]) / math.pow(2.0, self._exponent(now))
+
+    def rebase(self, landmark: float):
+        """기준 시각을 landmark로 옮김 (카운터를 그만큼 감쇠)"""
+        factor = math.pow(2.0, -(landmark - self.landmark) / self.half_life_seconds)
+        self.counters = array("d", (value * factor for value in self.counters))
+        self.landmark = landmark
+
+    def merge(self, other: "CountMinSketch"):
+        """다른 스케치의 횟수를 더함 (기준 시각은 둘 중 늦은 쪽으로 맞춤)"""
+        if (other.width, other.depth) != (self.width, self.depth):
+            raise ValueError("크기가 다른 스케치는 병합할 수 없습니다")
+        if other.landmark > self.landmark:
+            self.rebase(other.landmark)
+        factor = math.pow(2.0, -(self.landmark - other.landmark) / self.half_life_seconds)
+        counters = self.counters
+        for i, value in enumerate(other.counters):
+            if value:
+                counters[i] += value * factor
+
+    def copy(self) -> "CountMinSketch":
+        sketch = CountMinSketch(self.width, self.depth, self.half_life_seconds, self.landmark)
+        sketch.counters = array("d", self.counters)
+        return sketch
+
+    def clear(self):
+        self.counters = array("d", bytes(8 * self.width * self.depth))
+
+
+def encode_sketches(shown: CountMinSketch, clicked: CountMinSketch) -> bytes:
+    """노출/클릭 스케치 -> 파일 내용 (두 스케치는 같은 크기/기준 시각)"""
+    if clicked.landmark != shown.landmark:
+        clicked = clicked.copy()
+        clicked.rebase(shown.landmark)
+    body = shown.counters.tobytes() + clicked.counters.tobytes()
+    header = _HEADER.pack(
+        _MAGIC, _VERSION, shown.depth, shown.width, shown.landmark, shown.half_life_seconds, zlib.crc32(body)
+    )
+    return header + body
+
+
+def decode_sketches(data: bytes):
+    """파일 내용 -> (노출, 클릭) 스케치 (형식/체크섬이 맞지 않으면 ValueError)"""
+    magic, version, depth, width, landmark, half_life, crc = _HEADER.unpack_from(data)
+    body = data[_HEADER.size:]
+    if magic != _MAGIC or version != _VERSION or len(body) != 16 * depth * width or zlib.crc32(body) != crc:
+        raise ValueError("인기도 스케치 파일 형식이 잘못되었습니다")
+    sketches = []
+    for part in (body[:len(body) // 2], body[len(body) // 2:]):
+        sketch = CountMinSketch(width, depth, half_life, landmark)
+        sketch.counters = array("d")
+        sketch.counters.frombytes(part)
+        sketches.append(sketch)
+    return sketches[0], sketches[1]
+
+
+class PopularityTracker:
+    """
+    ISBN별 노출/클릭 인기도 (스레드 안전)
+    view: 조회용 (공유 파일 합계 + 아직 병합하지 않은 이 워커의 이벤트), delta: 마지막 병합 이후 이 워커의 이벤트
+    """
+
+    def __init__(
+        self,
+        path: str = POPULARITY_PATH,
+        flush_seconds: float = POPULARITY_FLUSH_SECONDS,
+        half_life_days: float = POPULARITY_HALF_LIFE_DAYS,
+        width: int = SKETCH_WIDTH,
+        depth: int = SKETCH_DEPTH
+    ):
+        self.path = path
+        self.flush_seconds = flush_seconds
+        self._new_sketch = lambda: CountMinSketch(width, depth, half_life_days * 86400)
+        self._shown, self._clicked = self._new_sketch(), self._new_sketch()
+        self._delta_shown, self._delta_clicked = self._new_sketch(), self._new_sketch()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.last_flush: Optional[float] = None
+        if path and os.path.exists(path):
+            try:
+                self._shown, self._clicked = self._read_file()
+            except (OSError, ValueError, struct.error) as e:
+                log.warning("인기도 스케치 파일을 읽지 못했습니다", path=path, error=str(e))
+
+    def _record(self, view: CountMinSketch, delta: CountMinSketch, isbns: Iterable[str]):
+        now = time.time()
+        keys = [key for key in map(book_key, isbns) if key]
+        with self._lock:
+            for key in keys:
+                view.add(key, now=now)
+                delta.add(key, now=now)
+
+    def record_shown(self, isbns: Iterable[str]):
+        """사용자에게 보여 준 추천 도서 ISBN 목록"""
+        self._record(self._shown, self._delta_shown, isbns)
+
+    def record_click(self, isbn: str):
+        """사용자가 관심을 보인 도서 (링크 클릭, 비슷한 책 찾기 기준 도서)"""
+        self._record(self._clicked, self._delta_clicked, [isbn])
+
+    def counts(self, isbn: str) -> Dict[str, float]:
+        """감쇠된 근사 (노출, 클릭) 수"""
+        key = book_key(isbn)
+        with self._lock:
+            if key is None:
+                return {"shown": 0.0, "clicked": 0.0}
+            return {"shown": self._shown.estimate(key), "clicked": self._clicked.estimate(key)}
+
+    def score_many(self, books: Iterable[Dict]) -> List[float]:
+        """책 목록의 0~1 인기도 (노출 기록이 없으면 0.5)"""
+        now = time.time()
+        keys = [book_key(book.get("isbn", "")) for book in books]
+        with self._lock:
+            total_shown = self._shown.total(now)
+            total_clicked = self._clicked.total(now)
+            mean_ctr = min(1.0, total_clicked / total_shown) if total_shown >= PRIOR_SHOWS else DEFAULT_CTR
+            mean_ctr = max(mean_ctr, 1e-6)
+            shown_scale, clicked_scale = self._shown.scale(now), self._clicked.scale(now)
+            scores = []
+            for key in keys:
+                if key is None:
+                    scores.append(0.5)
+                    continue
+                # 노출/클릭 스케치는 크기/해시가 같으므로 카운터 위치를 한 번만 계산
+                cells = self._shown.cells(key)
+                shown = self._shown.estimate_cells(cells, shown_scale)
+                clicked = min(self._clicked.estimate_cells(cells, clicked_scale), shown)
+                ctr = (clicked + PRIOR_SHOWS * mean_ctr) / (shown + PRIOR_SHOWS)
+                scores.append(ctr / (ctr + mean_ctr))
+        return scores
+
+    def _read_file(self):
+        with open(self.path, "rb") as f:
+            return decode_sketches(f.read())
+
+    def flush(self) -> bool:
+        """이 워커의 새 이벤트를 공유 파일에 더하고 다른 워커 이벤트까지 포함한 합계를 다시 읽음"""
+        if not self.path:
+            return False
+        with self._lock:
+            delta_shown, delta_clicked = self._delta_shown, self._delta_clicked
+            self._delta_shown, self._delta_clicked = self._new_sketch(), self._new_sketch()
+        try:
+            with open(self.path + ".lock", "a") as lock_file:
+                if fcntl is not None:
+                    fcntl.flock(lock_file, fcntl.LOCK_EX)
+                try:
+                    shown, clicked = self._read_file() if os.path.exists(self.path) else (
+                        self._new_sketch(), self._new_sketch()
+                    )
+                except ValueError as e:
+                    log.warning("인기도 스케치 파일이 손상되어 새로 만듭니다", path=self.path, error=str(e))
+                    shown, clicked = self._new_sketch(), self._new_sketch()
+                shown.merge(delta_shown)
+                clicked.merge(delta_clicked)
+                tmp_path = self.path + ".tmp"
+                with open(tmp_path, "wb") as out:
+                    out.write(encode_sketches(shown, clicked))
+                os.replace(tmp_path, self.path)
+        except OSError as e:
+            # 병합하지 못한 이벤트는 다음 주기에 다시 시도
+            log.warning("인기도 스케치 저장 실패", path=self.path, error=str(e))
+            with self._lock:
+                self._delta_shown.merge(delta_shown)
+                self._delta_clicked.merge(delta_clicked)
+            return False
+
+        with self._lock:
+            # 병합하는 동안 들어온 이벤트(새 delta)는 합계 위에 다시 더함
+            shown.merge(self._delta_shown)
+            clicked.merge(self._delta_clicked)
+            self._shown, self._clicked = shown, clicked
+        self.last_flush = time.time()
+        return True
+
+    def start(self) -> "PopularityTracker":
+        """주기적 병합 시작 (공유 파일 경로가 없으면 아무것도 하지 않음)"""
+        if not self.path or self._thread is not None:
+            return self
+        self._thread = threading.Thread(target=self._run, name="popularity-flush", daemon=True)
+        self._thread.start()
+        atexit.register(self.stop)  # 종료 시 남은 이벤트 저장
+        return self
+
+    def _run(self):
+        while not self._stop.wait(self.flush_seconds):
+            self.flush()
+
+    def stop(self):
+        """주기적 병합 중단 후 남은 이벤트 저장"""
+        self._stop.set()
+        self.flush()
+
+    def clear(self):
+        with self._lock:
+            for sketch in (self._shown, self._clicked, self._delta_shown, self._delta_clicked):
+                sketch.clear()
+
+
+popularity_tracker = PopularityTracker()
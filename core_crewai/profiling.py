@@ -0,0 +1,237 @@
+"""
+요청 단위 샘플링 프로파일러 (opt-in)
+-     오케스트레이터 진입점과 Gradio 핸들러를 profiled()로 감싸면
+      요청 비율(PAGEMIND_PROFILE_SAMPLE_RATE) 또는 지연 임계값(PAGEMIND_PROFILE_SLOW_SECONDS)에 따라 프로파일링
+-     백그라운드 스레드 하나가 일정 간격으로 프로파일 중인 스레드의 스택을 샘플링 (sys._current_frames)
+-     결과는 collapsed-stack 파일(.folded, flamegraph.pl / speedscope 호환)과 요청 메타데이터(.json)로 저장
+
+환경 변수:
+    PAGEMIND_PROFILE_SAMPLE_RATE=0.01   요청의 1%를 프로파일링 (기본 0 - 비활성)
+    PAGEMIND_PROFILE_SLOW_SECONDS=10    모든 요청을 샘플링하고 10초 이상 걸린 요청만 저장 (기본 0 - 비활성)
+    PAGEMIND_PROFILE_INTERVAL_MS=10     샘플링 간격
+    PAGEMIND_PROFILE_DIR=profiles       결과 저장 디렉토리
+
+async 핸들러는 이벤트 루프 스레드를 샘플링하므로 같은 루프에서 실행 중인 다른 요청의 스택이 섞일 수 있음
+(핸들러 안에서 동기 호출로 루프를 점유하는 구간은 정확히 잡힘)
+"""
+
+import inspect
+import os
+import random
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from datetime import datetime
+from functools import wraps
+from typing import Any, Callable, Dict, Optional
+
+from .serialization import dump_file
+from .tracing import current_span
+
+SAMPLE_RATE = float(os.getenv("PAGEMIND_PROFILE_SAMPLE_RATE", "0"))
+SLOW_SECONDS = float(os.getenv("PAGEMIND_PROFILE_SLOW_SECONDS", "0"))
+INTERVAL_SECONDS = float(os.getenv("PAGEMIND_PROFILE_INTERVAL_MS", "10")) / 1000
+PROFILE_DIR = os.getenv("PAGEMIND_PROFILE_DIR", "profiles")
+MAX_STACK_DEPTH = 128
+
+
+class RequestProfile:
+    """프로파일링 중인 요청 하나 (스레드 하나에 대응)"""
+
+    def __init__(self, name: str, thread_id: int, sampled: bool, metadata: Dict[str, Any]):
+        self.name = name
+        self.thread_id = thread_id
+        self.sampled = sampled  # 비율 샘플링으로 선택됨 (False면 지연 임계값 모드)
+        self.metadata = metadata
+        self.stacks: Counter = Counter()
+        self.sample_count = 0
+        self.started_at = datetime.now().isoformat()
+        self.started = time.perf_counter()
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    return f"{code.co_qualname} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})".replace(";", ":")
+
+
+def _collapse(frame) -> str:
+    labels = []
+    while frame is not None and len(labels) < MAX_STACK_DEPTH:
+        labels.append(_frame_label(frame))
+        frame = frame.f_back
+    labels.reverse()  # 루트 -> 리프
+    return ";".join(labels)
+
+
+class _Sampler:
+    """프로파일 중인 스레드의 스택을 주기적으로 수집하는 공유 백그라운드 스레드"""
+
+    def __init__(self, interval_seconds: float):
+        self.interval_seconds = interval_seconds
+        self._active: Dict[int, RequestProfile] = {}
+        self._condition = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+
+    def register(self, profile: RequestProfile):
+        with self._condition:
+            self._active[profile.thread_id] = profile
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="request-profiler", daemon=True)
+                self._thread.start()
+            self._condition.notify()
+
+    def unregister(self, profile: RequestProfile):
+        with self._condition:
+            if self._active.get(profile.thread_id) is profile:
+                del self._active[profile.thread_id]
+
+    def is_profiling(self, thread_id: int) -> bool:
+        return thread_id in self._active
+
+    def get(self, thread_id: int) -> Optional[RequestProfile]:
+        return self._active.get(thread_id)
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while not self._active:
+                    self._condition.wait()
+                profiles = list(self._active.values())
+
+            frames = sys._current_frames()
+            for profile in profiles:
+                frame = frames.get(profile.thread_id)
+                if frame is not None:
+                    profile.stacks[_collapse(frame)] += 1
+                    profile.sample_count += 1
+            del frames
+            time.sleep(self.interval_seconds)
+
+
+_sampler = _Sampler(INTERVAL_SECONDS)
+
+
+def _should_start() -> Optional[bool]:
+    """프로파일링 여부 (None: 하지 않음, True: 비율 샘플링, False: 지연 임계값 모드)"""
+    if SAMPLE_RATE > 0 and random.random() < SAMPLE_RATE:
+        return True
+    if SLOW_SECONDS > 0:
+        return False
+    return None
+
+
+def _write_profile(profile: RequestProfile, duration: float, reason: str, error: Optional[str]) -> str:
+    os.makedirs(PROFILE_DIR, exist_ok=True)
+    stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+    base = os.path.join(PROFILE_DIR, f"{stamp}-{profile.name}-{uuid.uuid4().hex[:8]}")
+
+    with open(base + ".folded", "w", encoding="utf-8") as f:
+        for stack, count in profile.stacks.most_common():
+            f.write(f"{stack} {count}\n")
+
+    meta = {
+        "name": profile.name,
+        "reason": reason,
+        "started_at": profile.started_at,
+        "duration_seconds": round(duration, 4),
+        "samples": profile.sample_count,
+        "interval_ms": _sampler.interval_seconds * 1000,
+        "error": error,
+        "metadata": profile.metadata,
+    }
+    with open(base + ".json", "wb") as f:
+        dump_file(meta, f)
+    return base + ".folded"
+
+
+class _ProfileScope:
+    __slots__ = ("name", "metadata", "profile")
+
+    def __init__(self, name: str, metadata: Dict[str, Any]):
+        self.name = name
+        self.metadata = metadata
+        self.profile: Optional[RequestProfile] = None
+
+    def __enter__(self):
+        thread_id = threading.get_ident()
+        if _sampler.is_profiling(thread_id):
+            return self  # 바깥 핸들러에서 이미 프로파일링 중
+        sampled = _should_start()
+        if sampled is None:
+            return self
+
+        trace_id = getattr(current_span(), "trace_id", None)
+        if trace_id:
+            self.metadata["trace_id"] = trace_id
+        self.profile = RequestProfile(self.name, thread_id, sampled, self.metadata)
+        _sampler.register(self.profile)
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        profile = self.profile
+        if profile is None:
+            return False
+        _sampler.unregister(profile)
+        duration = time.perf_counter() - profile.started
+        if profile.sampled or duration >= SLOW_SECONDS:
+            reason = "sampled" if profile.sampled else f"slow (>= {SLOW_SECONDS}s)"
+            error = f"{exc_type.__name__}: {exc}" if exc_type else None
+            try:
+                _write_profile(profile, duration, reason, error)
+            except OSError:
+                pass  # 프로파일 저장 실패가 요청을 실패시키지 않도록
+        return False
+
+
+def profile_request(name: str, **metadata):
+    """
+    with 블록을 요청 하나로 프로파일링
+
+    사용:
+        with profile_request("chat", session="abc"):
+            orchestrator.chat(...)
+    """
+    return _ProfileScope(name, metadata)
+
+
+def annotate_profile(**metadata):
+    """현재 스레드에서 프로파일링 중인 요청에 메타데이터 추가 (세션 ID 등)"""
+    profile = _sampler.get(threading.get_ident())
+    if profile is not None:
+        profile.metadata.update(metadata)
+
+
+def _call_metadata(signature: inspect.Signature, args: tuple, kwargs: Dict[str, Any]) -> Dict[str, Any]:
+    """호출 인자에 session_id가 있으면 메타데이터로 기록"""
+    try:
+        session_id = signature.bind_partial(*args, **kwargs).arguments.get("session_id")
+    except TypeError:
+        return {}
+    return {"session": session_id} if session_id else {}
+
+
+def profiled(name: Optional[str] = None) -> Callable:
+    """함수 호출을 요청 하나로 프로파일링하는 데코레이터 (async 함수 지원, 비활성이면 바로 호출)"""
+    def decorator(fn: Callable) -> Callable:
+        profile_name = name or fn.__qualname__
+        signature = inspect.signature(fn)
+
+        if inspect.iscoroutinefunction(fn):
+            @wraps(fn)
+            async def async_wrapper(*args, **kwargs):
+                if SAMPLE_RATE <= 0 and SLOW_SECONDS <= 0:
+                    return await fn(*args, **kwargs)
+                with _ProfileScope(profile_name, _call_metadata(signature, args, kwargs)):
+                    return await fn(*args, **kwargs)
+            return async_wrapper
+
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            if SAMPLE_RATE <= 0 and SLOW_SECONDS <= 0:
+                return fn(*args, **kwargs)
+            with _ProfileScope(profile_name, _call_metadata(signature, args, kwargs)):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
@@ -0,0 +1,92 @@
+"""
+프롬프트 레지스트리 - text_prompts/*.txt를 import 시점에 한 번만 읽고 파싱하여 메모리에 보관
+에이전트/태스크를 만들 때마다 디스크에서 다시 읽지 않음
+
+사용:
+    get_prompt("counselor_backstory.txt")
+    render_prompt("analysis_task_description.txt", conversation_text=...)
+    get_task_template("analysis_task_description.txt")  # crew.kickoff(inputs=...)로 치환할 원문
+"""
+
+from pathlib import Path
+from string import Formatter
+from typing import Dict, FrozenSet
+
+PROMPT_DIR = Path(__file__).parent / "text_prompts"
+
+
+class PromptTemplate:
+    """파싱된 프롬프트 템플릿 (치환 필드 목록을 미리 계산)"""
+
+    __slots__ = ("name", "text", "fields")
+
+    def __init__(self, name: str, text: str):
+        self.name = name
+        self.text = text
+        # backstory처럼 치환 없이 쓰는 프롬프트는 JSON 예시의 중괄호가 필드로 잡히거나 파싱이 실패할 수 있음
+        try:
+            fields = {
+                field.split(".")[0].split("[")[0]
+                for _, field, _, _ in Formatter().parse(text)
+                if field
+            }
+        except ValueError:
+            fields = set()
+        self.fields: FrozenSet[str] = frozenset(fields)
+
+    def render(self, **values) -> str:
+        missing = self.fields - values.keys()
+        if missing:
+            raise KeyError(f"프롬프트 '{self.name}'에 필요한 값이 없습니다: {sorted(missing)}")
+        return self.text.format(**values)
+
+    def to_interpolation(self) -> str:
+        """
+        CrewAI 입력 치환 형식으로 변환 (Crew를 재사용하고 crew.kickoff(inputs=...)로 값을 넣을 때)
+        CrewAI는 {name} 형태만 치환하고 {{ }} 이스케이프를 해제하지 않으므로 미리 해제
+        (JSON 예시의 중괄호는 {name} 형태가 아니라서 그대로 남음)
+        """
+        return self.text.replace("{{", "{").replace("}}", "}")
+
+
+class PromptRegistry:
+    """디렉토리의 모든 프롬프트를 한 번에 로드"""
+
+    def __init__(self, prompt_dir: Path = PROMPT_DIR):
+        self.prompt_dir = prompt_dir
+        self._templates: Dict[str, PromptTemplate] = {}
+        self.reload()
+
+    def reload(self):
+        """디스크에서 다시 로드 (프롬프트 파일 수정 후 재시작 없이 반영할 때)"""
+        templates = {}
+        for path in sorted(self.prompt_dir.glob("*.txt")):
+            templates[path.name] = PromptTemplate(path.name, path.read_text(encoding="utf-8").strip())
+        self._templates = templates
+
+    def get(self, name: str) -> PromptTemplate:
+        try:
+            return self._templates[name]
+        except KeyError:
+            raise FileNotFoundError(f"프롬프트 파일이 없습니다: {self.prompt_dir / name}") from None
+
+    def names(self):
+        return list(self._templates)
+
+
+registry = PromptRegistry()
+
+
+def get_prompt(name: str) -> str:
+    """프롬프트 원문 (치환 없이 그대로 사용하는 backstory 등)"""
+    return registry.get(name).text
+
+
+def render_prompt(name: str, **values) -> str:
+    """프롬프트 템플릿에 값 치환"""
+    return registry.get(name).render(**values)
+
+
+def get_task_template(name: str) -> str:
+    """CrewAI 입력 치환용 프롬프트 원문 (치환은 crew.kickoff(inputs=...)에서)"""
+    return registry.get(name).to_interpolation()
@@ -0,0 +1,170 @@
+"""
+검색 쿼리 플래너 - PsychologicalSummary.keywords와 네이버 검색 사이에서 검색 계획을 세움
+-     키워드 정규화 후 겹치는 키워드 병합 ("불안" / "불안감" -> "불안" 한 번 검색)
+-     쿼리 수와 쿼리별 페이지 크기(display) 결정
+      · 목표 후보 수(PAGEMIND_SEARCH_TARGET_CANDIDATES)를 병합된 키워드 수에 비례해 나눔
+      · 과거 검색 결과가 적었던(네이버 total이 작은) 쿼리는 그만큼만 요청하고 남는 몫을 다른 쿼리로
+      · 캐시(search_cache)에 충분한 페이지가 있으면 그 크기를 그대로 사용 (외부 호출 없음)
+
+사용:
+    plan = query_planner.plan(summary.keywords)
+    for planned in plan:
+        search_naver_books(planned.query, display=planned.display)
+"""
+
+import os
+import threading
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence
+
+from .search_cache import SearchCache, normalize_query, search_cache
+
+TARGET_CANDIDATES = int(os.getenv("PAGEMIND_SEARCH_TARGET_CANDIDATES", "30"))  # 기존 키워드 3개 x 10권
+MIN_DISPLAY = 5
+MAX_DISPLAY = 30
+MAX_QUERIES = 3
+# 캐시된 페이지가 계획한 크기의 이 비율 이상이면 더 큰 페이지를 받으러 가지 않고 캐시 사용
+CACHE_ACCEPT_RATIO = 0.7
+
+
+def _compact(keyword: str) -> str:
+    """병합 비교용 (공백 제거) - "직장 스트레스"와 "직장스트레스"를 같은 키워드로"""
+    return normalize_query(keyword).replace(" ", "")
+
+
+@dataclass
+class PlannedQuery:
+    """실행할 검색 하나"""
+    query: str
+    display: int
+    keywords: List[str] = field(default_factory=list)  # 이 검색으로 병합된 원래 키워드
+    cached: bool = False  # 캐시로 응답 가능 (외부 호출 없음)
+
+
+@dataclass
+class QueryStats:
+    """검색어별 과거 검색 결과"""
+    searches: int = 0
+    total: Optional[int] = None  # 마지막으로 보고된 네이버 전체 결과 수
+    fill_ratio: float = 1.0  # 받은 결과 수 / 요청한 결과 수 (지수 이동 평균)
+
+
+def merge_keywords(keywords: Sequence[str]) -> List[List[str]]:
+    """
+    겹치는 키워드를 그룹으로 병합 (순서 유지)
+    정규화 후 같거나 한쪽이 다른 쪽을 포함하면 같은 그룹 - 그룹의 첫 항목이 가장 짧은(넓은) 키워드
+    """
+    groups: List[List[str]] = []
+    for keyword in keywords:
+        compact = _compact(keyword)
+        if not compact:
+            continue
+        for group in groups:
+            head = _compact(group[0])
+            if compact == head or (min(len(compact), len(head)) >= 2 and (compact in head or head in compact)):
+                group.append(keyword.strip())
+                group.sort(key=lambda k: len(_compact(k)))
+                break
+        else:
+            groups.append([keyword.strip()])
+    return groups
+
+
+class QueryPlanner:
+    """키워드 -> 검색 계획 (과거 결과 통계는 search_naver_books가 record_result로 기록)"""
+
+    def __init__(
+        self,
+        cache: SearchCache = search_cache,
+        target_candidates: int = TARGET_CANDIDATES,
+        min_display: int = MIN_DISPLAY,
+        max_display: int = MAX_DISPLAY,
+        max_queries: int = MAX_QUERIES
+    ):
+        self.cache = cache
+        self.target_candidates = target_candidates
+        self.min_display = min_display
+        self.max_display = max_display
+        self.max_queries = max_queries
+        self._stats: Dict[str, QueryStats] = {}
+        self._lock = threading.Lock()
+
+    def record_result(self, query: str, requested: int, returned: int, total: Optional[int] = None):
+        """외부 검색 결과 기록 (다음 계획의 페이지 크기에 반영)"""
+        if requested <= 0:
+            return
+        key = normalize_query(query)
+        with self._lock:
+            stats = self._stats.setdefault(key, QueryStats())
+            stats.searches += 1
+            stats.fill_ratio = 0.5 * stats.fill_ratio + 0.5 * min(1.0, returned / requested)
+            if total is not None:
+                stats.total = total
+
+    def get_stats(self, query: str) -> Optional[QueryStats]:
+        with self._lock:
+            return self._stats.get(normalize_query(query))
+
+    def _available(self, query: str) -> Optional[int]:
+        """이 검색어로 받을 수 있는 최대 결과 수 (알 수 없으면 None)"""
+        page = self.cache.peek(query)
+        if page is not None and page.exhausted:
+            return len(page.books)
+        stats = self.get_stats(query)
+        if stats is None:
+            return None
+        if stats.total is not None:
+            return stats.total
+        if stats.fill_ratio < 1.0:
+            return max(1, int(self.max_display * stats.fill_ratio))
+        return None
+
+    def plan(self, keywords: Sequence[str]) -> List[PlannedQuery]:
+        """검색 계획 (병합 -> 페이지 크기 배분 -> 결과가 적은 쿼리 몫 재배분 -> 캐시 반영)"""
+        groups = merge_keywords(keywords)[:self.max_queries]
+        if not groups:
+            return []
+
+        weights = [len(group) for group in groups]
+        budget = self.target_candidates
+        displays = [
+            max(self.min_display, min(self.max_display, round(budget * w / sum(weights))))
+            for w in weights
+        ]
+
+        # 결과가 적은 쿼리는 받을 수 있는 만큼만, 남는 몫은 여유 있는 쿼리에 나눔
+        available = [self._available(group[0]) for group in groups]
+        leftover = 0
+        for i, limit in enumerate(available):
+            if limit is not None and limit < displays[i]:
+                leftover += displays[i] - max(limit, 0)
+                displays[i] = max(limit, 0)
+        open_slots = [i for i, limit in enumerate(available) if limit is None or limit > displays[i]]
+        while leftover > 0 and open_slots:
+            for i in list(open_slots):
+                cap = min(self.max_display, available[i] if available[i] is not None else self.max_display)
+                if displays[i] >= cap:
+                    open_slots.remove(i)
+                    continue
+                displays[i] += 1
+                leftover -= 1
+                if leftover == 0:
+                    break
+
+        plan = []
+        for group, display in zip(groups, displays):
+            if display <= 0:
+                continue  # 과거에 결과가 없었던 검색어
+            page = self.cache.peek(group[0])
+            cached = page is not None and page.covers(display)
+            if not cached and page is not None and page.display >= display * CACHE_ACCEPT_RATIO:
+                display, cached = page.display, True
+            plan.append(PlannedQuery(query=group[0], display=display, keywords=group, cached=cached))
+
+        if not plan:
+            # 모든 검색어가 과거에 결과가 없었으면 첫 키워드로 최소 크기 검색
+            plan.append(PlannedQuery(query=groups[0][0], display=self.min_display, keywords=groups[0]))
+        return plan
+
+
+query_planner = QueryPlanner()
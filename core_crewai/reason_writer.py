@@ -0,0 +1,135 @@
+"""
+LLM 추천 이유 (선택) - 재정렬로 선정된 추천 도서 전체의 추천 이유를 한 번의 구조화된 LLM 호출로 작성
+-     Reason Writer Agent가 {"reasons": {"b1": "...", ...}} JSON으로 책마다 다른 이유를 반환
+-     (ISBN, 정규화된 주요 고민) 단위로 캐시 -> 같은 책/고민 조합은 다시 호출하지 않음
+-     지연 예산(PAGEMIND_REASON_BUDGET_SECONDS) 안에 끝나지 않으면 템플릿 이유로 응답
+      (호출은 백그라운드에서 계속되어 끝나면 캐시에 저장 -> 다음 추천부터 사용)
+-     진행 중인 호출이 REASON_WORKERS개면 새 호출은 큐에 넣지 않고 바로 템플릿 이유로 응답
+      (부하가 이어질 때 늦은 호출이 쌓여 모든 요청이 예산만큼 기다리고 LLM 비용이 끝없이 늘지 않도록)
+
+환경 변수:
+    PAGEMIND_LLM_REASONS=1                  LLM 추천 이유 사용 (기본 비활성, 템플릿 이유)
+    PAGEMIND_REASON_BUDGET_SECONDS=4        추천 응답이 추천 이유를 기다리는 최대 시간
+    PAGEMIND_REASON_CACHE_SIZE=4096         보관할 추천 이유 수
+"""
+
+import os
+import re
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Tuple
+
+from .serialization import JSONDecodeError, loads
+from .tracing import record_cache
+
+LLM_REASONS_ENABLED = os.getenv("PAGEMIND_LLM_REASONS", "0").lower() in ("1", "true", "yes")
+REASON_BUDGET_SECONDS = float(os.getenv("PAGEMIND_REASON_BUDGET_SECONDS", "4"))
+REASON_CACHE_SIZE = int(os.getenv("PAGEMIND_REASON_CACHE_SIZE", "4096"))
+REASON_WORKERS = 4  # 동시에 진행할 수 있는 추천 이유 호출 수 (예산 초과로 남은 호출 포함)
+MAX_REASON_CHARS = 200  # 이보다 긴 이유는 자름
+
+_JSON_OBJECT = re.compile(r"\{.*\}", re.DOTALL)
+
+# 추천 응답은 예산까지만 기다리고, 늦은 호출은 이 풀에서 끝까지 실행되어 캐시를 채움
+reason_executor = ThreadPoolExecutor(max_workers=REASON_WORKERS, thread_name_prefix="reason-writer")
+# 진행 중인(예산을 넘겨 계속 실행 중인 것 포함) 호출 수 - 워커가 모두 바쁘면 제출하지 않음
+_reason_slots = threading.BoundedSemaphore(REASON_WORKERS)
+
+
+def submit_reason_call(fn: Callable, *args) -> Optional[Future]:
+    """빈 워커가 있으면 reason_executor에 제출, 모두 바쁘면 None (대기열에 쌓지 않음)"""
+    if not _reason_slots.acquire(blocking=False):
+        return None
+    try:
+        future = reason_executor.submit(fn, *args)
+    except BaseException:
+        _reason_slots.release()
+        raise
+    future.add_done_callback(lambda _: _reason_slots.release())
+    return future
+
+
+def normalize_concern(concern: str) -> str:
+    """캐시 키용 주요 고민 (공백/문장부호 차이 무시)"""
+    return re.sub(r"[\s.,!?·'\"]+", "", concern or "").lower()
+
+
+def reason_key(book: Dict, concern: str) -> Tuple[str, str]:
+    """(ISBN, 정규화된 주요 고민) - ISBN이 없으면 제목|저자"""
+    isbn = book.get("isbn") or f"{book.get('title', '')}|{book.get('author', '')}"
+    return isbn, normalize_concern(concern)
+
+
+def parse_reasons(text: str) -> Dict[str, str]:
+    """Reason Writer 출력 -> 핸들별 추천 이유 (형식이 맞지 않으면 빈 dict)"""
+    if "```json" in text:
+        text = text.split("```json")[1].split("```")[0]
+    elif "```" in text:
+        text = text.split("```")[1].split("```")[0]
+    match = _JSON_OBJECT.search(text)
+    if not match:
+        return {}
+    try:
+        data = loads(match.group(0))
+    except JSONDecodeError:
+        return {}
+    reasons = data.get("reasons") if isinstance(data, dict) else None
+    if not isinstance(reasons, dict):
+        return {}
+    parsed = {}
+    for handle, reason in reasons.items():
+        if isinstance(reason, str) and reason.strip():
+            reason = " ".join(reason.split())
+            parsed[str(handle).strip()] = reason[:MAX_REASON_CHARS]
+    return parsed
+
+
+class ReasonCache:
+    """(ISBN, 주요 고민) -> 추천 이유 LRU 캐시 (스레드 안전)"""
+
+    def __init__(self, max_entries: int = REASON_CACHE_SIZE):
+        self.max_entries = max_entries
+        self._reasons: "OrderedDict[Tuple[str, str], str]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Tuple[str, str]) -> Optional[str]:
+        with self._lock:
+            reason = self._reasons.get(key)
+            if reason is not None:
+                self._reasons.move_to_end(key)
+        record_cache("reasons", reason is not None)
+        return reason
+
+    def put(self, key: Tuple[str, str], reason: str):
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._reasons[key] = reason
+            self._reasons.move_to_end(key)
+            while len(self._reasons) > self.max_entries:
+                self._reasons.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._reasons.clear()
+
+    def __len__(self) -> int:
+        return len(self._reasons)
+
+
+reason_cache = ReasonCache()
+
+
+def missing_reasons(books: List[Dict], concern: str) -> Tuple[List[Optional[str]], Dict[str, Dict]]:
+    """
+    캐시 조회 결과 (책 순서대로, 없으면 None)와 LLM에 요청할 책 (핸들 b1, b2, ... -> 책)
+    """
+    reasons: List[Optional[str]] = []
+    pending: Dict[str, Dict] = {}
+    for book in books:
+        reason = reason_cache.get(reason_key(book, concern))
+        reasons.append(reason)
+        if reason is None:
+            pending[f"b{len(pending) + 1}"] = book
+    return reasons, pending
@@ -0,0 +1,131 @@
+"""
+네이버 도서 검색 결과 캐시 (프로세스 메모리, LRU + TTL)
+-     키는 정규화된 검색어, 값은 가장 큰 display로 받은 결과 페이지
+-     더 작은 display 요청은 캐시된 페이지 앞부분으로 응답 (네이버 sim 정렬은 display와 무관하게 같은 순서)
+-     쿼리 플래너(query_planner)가 캐시 내용을 보고 검색 횟수와 페이지 크기를 정함
+-     캐시 워머(cache_warmer)가 미리 받아 둔 페이지는 항목별로 더 긴 유효 시간을 가짐
+
+환경 변수:
+    PAGEMIND_SEARCH_CACHE_TTL_SECONDS=3600   캐시 유효 시간 (0이면 캐시 비활성)
+    PAGEMIND_SEARCH_CACHE_SIZE=1024          보관할 검색어 수
+"""
+
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+from .tracing import record_cache
+
+SEARCH_CACHE_TTL_SECONDS = float(os.getenv("PAGEMIND_SEARCH_CACHE_TTL_SECONDS", "3600"))
+SEARCH_CACHE_SIZE = int(os.getenv("PAGEMIND_SEARCH_CACHE_SIZE", "1024"))
+
+
+def normalize_query(query: str) -> str:
+    """캐시/통계 키 (앞뒤 공백 제거, 연속 공백 하나로, 소문자)"""
+    return " ".join(query.split()).lower()
+
+
+@dataclass
+class CachedPage:
+    """캐시된 검색 결과 한 페이지"""
+    display: int  # 요청한 결과 수
+    books: list
+    total: Optional[int]  # 네이버가 보고한 전체 검색 결과 수
+    stored_at: float
+    ttl_seconds: Optional[float] = None  # 항목별 유효 시간 (None이면 캐시 기본값)
+
+    @property
+    def exhausted(self) -> bool:
+        """요청보다 적게 돌아옴 -> 더 큰 display로 다시 검색해도 결과가 늘지 않음"""
+        return len(self.books) < self.display
+
+    def covers(self, display: int) -> bool:
+        return self.display >= display or self.exhausted
+
+
+class SearchCache:
+    """검색어별 결과 페이지 캐시 (스레드 안전)"""
+
+    def __init__(self, ttl_seconds: float = SEARCH_CACHE_TTL_SECONDS, max_entries: int = SEARCH_CACHE_SIZE):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._pages: "OrderedDict[str, CachedPage]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl_seconds > 0 and self.max_entries > 0
+
+    def _expired(self, page: CachedPage, now: float) -> bool:
+        ttl = page.ttl_seconds if page.ttl_seconds is not None else self.ttl_seconds
+        return now - page.stored_at > ttl
+
+    def peek(self, query: str) -> Optional[CachedPage]:
+        """만료되지 않은 캐시 페이지 (LRU 순서와 적중 통계는 바꾸지 않음 - 플래너용)"""
+        if not self.enabled:
+            return None
+        with self._lock:
+            page = self._pages.get(normalize_query(query))
+            if page is None or self._expired(page, time.time()):
+                return None
+            return page
+
+    def get(self, query: str, display: int) -> Optional[Dict]:
+        """display개 이상을 덮는 캐시가 있으면 search_naver_books 결과 형식으로 반환"""
+        if not self.enabled:
+            return None
+        key = normalize_query(query)
+        with self._lock:
+            page = self._pages.get(key)
+            if page is not None and self._expired(page, time.time()):
+                del self._pages[key]
+                page = None
+            hit = page is not None and page.covers(display)
+            if hit:
+                self._pages.move_to_end(key)
+        record_cache("naver_search", hit)
+        if not hit:
+            return None
+        books = page.books[:display]
+        return {"success": True, "keyword": query, "count": len(books), "total": page.total, "books": books}
+
+    def put(
+        self,
+        query: str,
+        display: int,
+        books: list,
+        total: Optional[int] = None,
+        ttl_seconds: Optional[float] = None
+    ):
+        """결과 페이지 저장 (같은 검색어의 더 큰 페이지가 이미 있으면 유지, ttl_seconds: 이 항목만의 유효 시간)"""
+        if not self.enabled:
+            return
+        key = normalize_query(query)
+        now = time.time()
+        with self._lock:
+            current = self._pages.get(key)
+            if (
+                current is not None
+                and current.display > display
+                and not self._expired(current, now)
+            ):
+                return
+            self._pages[key] = CachedPage(
+                display=display, books=list(books), total=total, stored_at=now, ttl_seconds=ttl_seconds
+            )
+            self._pages.move_to_end(key)
+            while len(self._pages) > self.max_entries:
+                self._pages.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._pages.clear()
+
+    def __len__(self) -> int:
+        return len(self._pages)
+
+
+search_cache = SearchCache()
@@ -0,0 +1,120 @@
+"""
+JSON 직렬화 - 도구 출력, LLM 출력 파싱, 세션 저장, SSE, 내보내기, 로그가 함께 쓰는 단일 코덱
+-     orjson이 있으면 사용 (선택 의존성, 없거나 PAGEMIND_JSON_BACKEND=json이면 표준 json)
+-     두 백엔드 모두 같은 형식: UTF-8, 한글은 이스케이프하지 않음 (ensure_ascii=False), 공백 없는 구분자
+-     dumps_bytes(): str을 거치지 않고 바로 UTF-8 바이트 (저장소/파일/HTTP 본문용, 추가 복사 없음)
+      dumps(): str이 필요한 곳 (CrewAI 도구 반환값, SSE 이벤트)
+-     iter_ndjson(): 큰 내보내기를 한 줄씩 생성 (전체를 하나의 문자열로 만들지 않음, orjson은 줄바꿈까지 한 번에)
+-     pydantic 모델, datetime 등 JSON 타입이 아닌 값은 model_dump(mode="json") / str()로 변환
+-     dumps_model()/loads_model(): pydantic 모델 전체 (세션 상태) - 인코딩은 pydantic-core 직렬화기가 바로 바이트로,
+      디코딩은 loads() 후 model_validate() (model_validate_json()보다 1.5~2배 빠름)
+
+환경 변수:
+    PAGEMIND_JSON_BACKEND=auto     auto (orjson이 있으면 orjson) 또는 json (항상 표준 json)
+"""
+
+import json
+import os
+from datetime import date, datetime
+from typing import Any, IO, Iterable, Iterator, Type, TypeVar, Union
+
+from pydantic import BaseModel
+
+try:
+    import orjson  # 선택 의존성
+except ImportError:
+    orjson = None
+
+JSON_BACKEND = os.getenv("PAGEMIND_JSON_BACKEND", "auto").lower()
+BACKEND = "orjson" if orjson is not None and JSON_BACKEND != "json" else "json"
+
+# json.loads()/orjson.loads() 모두 이 예외(의 하위 클래스)를 발생시킴
+JSONDecodeError = json.JSONDecodeError
+
+_COMPACT = (",", ":")
+
+Model = TypeVar("Model", bound=BaseModel)
+
+
+def _default(value: Any) -> Any:
+    """JSON 타입이 아닌 값 (pydantic 모델 -> dict, datetime -> ISO 문자열, 그 밖에는 str)"""
+    model_dump = getattr(value, "model_dump", None)
+    if model_dump is not None:
+        return model_dump(mode="json")
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    return str(value)
+
+
+if BACKEND == "orjson":
+    def _orjson_dumps(obj: Any, options: int) -> bytes:
+        try:
+            return orjson.dumps(obj, default=_default, option=options)
+        except orjson.JSONEncodeError:
+            # 문자열이 아닌 dict 키 (표준 json처럼 문자열로 변환) - 옵션을 켜면 모든 호출이 2배 느려지므로 실패할 때만
+            return orjson.dumps(obj, default=_default, option=options | orjson.OPT_NON_STR_KEYS)
+
+    def dumps_bytes(obj: Any, indent: bool = False, sort_keys: bool = False) -> bytes:
+        """obj -> UTF-8 JSON 바이트 (indent=True면 2칸 들여쓰기)"""
+        options = 0
+        if indent:
+            options |= orjson.OPT_INDENT_2
+        if sort_keys:
+            options |= orjson.OPT_SORT_KEYS
+        return _orjson_dumps(obj, options)
+
+    def dumps_line(obj: Any) -> bytes:
+        """obj -> NDJSON 한 줄 (줄바꿈 포함)"""
+        return _orjson_dumps(obj, orjson.OPT_APPEND_NEWLINE)
+
+    def dumps(obj: Any, indent: bool = False, sort_keys: bool = False) -> str:
+        """obj -> JSON 문자열"""
+        return dumps_bytes(obj, indent=indent, sort_keys=sort_keys).decode("utf-8")
+
+    def loads(data: Union[str, bytes, bytearray, memoryview]) -> Any:
+        """JSON 문자열/바이트 -> 객체 (형식이 잘못되면 JSONDecodeError)"""
+        return orjson.loads(data)
+
+else:
+    def dumps(obj: Any, indent: bool = False, sort_keys: bool = False) -> str:
+        """obj -> JSON 문자열"""
+        if indent:
+            return json.dumps(obj, ensure_ascii=False, indent=2, sort_keys=sort_keys, default=_default)
+        return json.dumps(obj, ensure_ascii=False, separators=_COMPACT, sort_keys=sort_keys, default=_default)
+
+    def dumps_bytes(obj: Any, indent: bool = False, sort_keys: bool = False) -> bytes:
+        """obj -> UTF-8 JSON 바이트 (indent=True면 2칸 들여쓰기)"""
+        return dumps(obj, indent=indent, sort_keys=sort_keys).encode("utf-8")
+
+    def dumps_line(obj: Any) -> bytes:
+        """obj -> NDJSON 한 줄 (줄바꿈 포함)"""
+        return (dumps(obj) + "\n").encode("utf-8")
+
+    def loads(data: Union[str, bytes, bytearray, memoryview]) -> Any:
+        """JSON 문자열/바이트 -> 객체 (형식이 잘못되면 JSONDecodeError)"""
+        if isinstance(data, memoryview):
+            data = data.tobytes()
+        return json.loads(data)
+
+
+def dumps_model(model: BaseModel) -> bytes:
+    """pydantic 모델 -> UTF-8 JSON 바이트 (model_dump() dict를 거치지 않음, 출력 형식은 dumps_bytes()와 같음)"""
+    return type(model).__pydantic_serializer__.to_json(model)
+
+
+def loads_model(cls: Type[Model], data: Union[str, bytes, bytearray, memoryview]) -> Model:
+    """JSON -> pydantic 모델"""
+    return cls.model_validate(loads(data))
+
+
+def iter_ndjson(items: Iterable[Any]) -> Iterator[bytes]:
+    """객체마다 NDJSON 한 줄 (스트리밍 응답/파일 쓰기에 그대로 넘김)"""
+    for item in items:
+        yield dumps_line(item)
+
+
+def dump_file(obj: Any, f: IO[bytes], indent: bool = True):
+    """사람이 읽을 JSON 파일 (바이너리 모드로 연 파일)"""
+    f.write(dumps_bytes(obj, indent=indent))
@@ -0,0 +1,493 @@
+"""
+세션 저장소 - 여러 워커 프로세스가 같은 세션을 이어서 처리할 수 있도록 상태를 외부화
+-     InMemorySessionStore: 단일 프로세스용 (기본값, 개발/테스트)
+-     SQLiteSessionStore: SQLite WAL 모드 파일 DB (같은 호스트의 여러 워커)
+-     KeyValueSessionStore: Redis 같은 키-값 서버 위에 구현 (KeyValueClient 인터페이스)
+        LocalKeyValueServer: 프로세스 내 stand-in (테스트용)
+        RedisKeyValueClient: redis-py 기반 어댑터
+-     SpillingSessionStore (spill_store.py): 메모리 상한 + 유휴 세션 디스크 로그
+
+모든 저장소는 버전 기반 낙관적 동시성 제어를 사용
+save() 시점에 저장된 버전이 state.version과 다르면 SessionConflictError 발생
+"""
+
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+from .models import SessionState
+from .serialization import dumps_line, dumps_model, iter_ndjson, loads_model
+
+# 이 크기 이상의 payload는 zlib으로 압축
+COMPRESS_THRESHOLD_BYTES = 1024
+
+# 위기 턴 상담사 응답을 기다릴 때 저장소를 다시 읽는 간격 (다른 워커가 만든 응답도 저장소로 받음)
+FOLLOWUP_POLL_SECONDS = 0.2
+# 상담사 응답을 대화에 추가하기 전 그 위기 턴이 저장되기를 기다리는 최대 시간 (메시지 순서 유지)
+FOLLOWUP_TURN_WAIT_SECONDS = 30.0
+
+_RAW_MARKER = b"j"
+_ZLIB_MARKER = b"z"
+
+
+class SessionConflictError(Exception):
+    """다른 워커가 먼저 세션을 갱신하여 저장이 거부됨"""
+
+
+# 직렬화
+def encode_state(state: SessionState) -> bytes:
+    """
+    SessionState를 압축된 바이트로 직렬화
+
+    공백 없는 JSON(UTF-8) + 큰 payload는 zlib 압축
+    첫 바이트는 인코딩 마커 (j: 원본 JSON, z: zlib)
+    """
+    payload = dumps_model(state)
+    if len(payload) >= COMPRESS_THRESHOLD_BYTES:
+        return _ZLIB_MARKER + zlib.compress(payload, 6)
+    return _RAW_MARKER + payload
+
+
+def decode_state(data: bytes) -> SessionState:
+    """encode_state()로 직렬화된 바이트를 SessionState로 복원"""
+    marker, payload = data[:1], data[1:]
+    if marker == _ZLIB_MARKER:
+        payload = zlib.decompress(payload)
+    elif marker != _RAW_MARKER:
+        raise ValueError(f"알 수 없는 세션 인코딩: {marker!r}")
+    return loads_model(SessionState, payload)
+
+
+def conversation_fingerprint(messages: List[Dict]) -> str:
+    """대화 내용의 지문 (분석 결과 캐시 키)"""
+    digest = hashlib.blake2b(digest_size=16)
+    for msg in messages:
+        digest.update(msg.get("role", "").encode("utf-8"))
+        digest.update(b"\x00")
+        digest.update(msg.get("content", "").encode("utf-8"))
+        digest.update(b"\x01")
+    return digest.hexdigest()
+
+
+def iter_conversation_ndjson(state: SessionState) -> Iterator[bytes]:
+    """
+    대화 내보내기를 NDJSON 줄 단위로 생성 (전체를 하나의 문자열로 만들지 않음)
+    첫 줄은 메타데이터, 이후 한 줄에 메시지 하나
+    """
+    header = {
+        "session_id": state.session_id,
+        "exported_at": datetime.now().isoformat(),
+        "message_count": len(state.messages),
+    }
+    yield dumps_line(header)
+    yield from iter_ndjson(state.messages)
+
+
+class SessionStore(ABC):
+    """세션 저장소 인터페이스"""
+
+    # 여러 워커 프로세스가 같은 세션을 볼 수 있는지 (False면 워커마다 다른 저장소 - 멀티 워커 불가)
+    shared = False
+
+    @abstractmethod
+    def load(self, session_id: str) -> Optional[SessionState]:
+        """세션 상태 조회 (없으면 None)"""
+
+    @abstractmethod
+    def save(self, state: SessionState) -> SessionState:
+        """
+        세션 상태 저장 (compare-and-set)
+
+        state.version이 저장된 버전과 같을 때만 저장하고 버전을 1 올린 상태를 반환
+        새 세션은 version=0으로 저장
+        """
+
+    @abstractmethod
+    def delete(self, session_id: str):
+        """세션 삭제"""
+
+    def start(self) -> "SessionStore":
+        """백그라운드 작업 시작 (주기적으로 디스크에 기록하는 저장소만, 나머지는 아무것도 하지 않음)"""
+        return self
+
+    def close(self):
+        """종료 전 정리 (메모리에만 있는 변경을 기록하는 저장소만, 여러 번 호출해도 됨)"""
+
+    def load_or_create(self, session_id: str) -> SessionState:
+        """세션 조회, 없으면 빈 세션 생성 (저장은 하지 않음)"""
+        state = self.load(session_id)
+        if state is None:
+            state = SessionState(session_id=session_id)
+        return state
+
+    def update(
+        self,
+        session_id: str,
+        mutate: Callable[[SessionState], None],
+        retries: int = 5
+    ) -> SessionState:
+        """
+        세션을 읽고 mutate(state)를 적용한 뒤 저장
+        다른 워커와 충돌하면 최신 상태를 다시 읽어 재시도
+        """
+        for _ in range(retries):
+            state = self.load_or_create(session_id)
+            mutate(state)
+            try:
+                return self.save(state)
+            except SessionConflictError:
+                continue
+        raise SessionConflictError(f"세션 갱신 충돌이 반복되었습니다: {session_id}")
+
+    # 위기 턴 상담사 응답 (CrewOrchestrator.chat()의 on_followup으로 받아 저장, 어느 워커에서든 꺼내 감)
+    def followup_sink(self, session_id: str, turn_saved: threading.Event) -> Callable[[Optional[str]], None]:
+        """chat(on_followup=...)에 넘길 콜백 - 이번 턴이 저장된 뒤(turn_saved) 상담사 응답을 세션에 추가"""
+        def deliver(response: Optional[str]):
+            turn_saved.wait(FOLLOWUP_TURN_WAIT_SECONDS)
+            self.add_followup(session_id, response)
+
+        return deliver
+
+    def add_followup(self, session_id: str, response: Optional[str]) -> SessionState:
+        """
+        위기 턴의 상담사 응답을 대화 기록과 전달 대기 목록에 추가
+        response가 None이면 (생성 실패, 다른 위기 메시지와 합쳐진 응답) 생성 중 표시만 해제
+        """
+        def add(state: SessionState):
+            state.pending_followups = max(0, state.pending_followups - 1)
+            if response:
+                state.messages.append({"role": "assistant", "content": response})
+                state.followups.append(response)
+
+        return self.update(session_id, add)
+
+    def take_followups(self, session_id: str) -> Tuple[List[str], int]:
+        """전달하지 않은 상담사 응답을 꺼냄 -> (응답 목록, 아직 생성 중인 위기 턴 수)"""
+        state = self.load(session_id)
+        if state is None or not state.followups:
+            return [], state.pending_followups if state else 0
+        taken: List[str] = []
+
+        def take(state: SessionState):
+            taken[:] = state.followups
+            state.followups = []
+
+        state = self.update(session_id, take)
+        return taken, state.pending_followups
+
+    def wait_followups(
+        self,
+        session_id: str,
+        timeout: float,
+        poll_seconds: float = FOLLOWUP_POLL_SECONDS
+    ) -> Tuple[List[str], int]:
+        """상담사 응답이 생성 중이면 timeout초까지 기다려 꺼냄 (take_followups()와 같은 반환값)"""
+        deadline = time.monotonic() + timeout
+        while True:
+            followups, pending = self.take_followups(session_id)
+            if followups or not pending or time.monotonic() >= deadline:
+                return followups, pending
+            time.sleep(poll_seconds)
+
+
+class InMemorySessionStore(SessionStore):
+    """프로세스 메모리 세션 저장소 (직렬화된 바이트로 보관하여 객체 공유 방지)"""
+
+    def __init__(self):
+        self._data: Dict[str, Tuple[int, bytes]] = {}
+        self._lock = threading.Lock()
+
+    def load(self, session_id: str) -> Optional[SessionState]:
+        with self._lock:
+            entry = self._data.get(session_id)
+        if entry is None:
+            return None
+        return decode_state(entry[1])
+
+    def save(self, state: SessionState) -> SessionState:
+        new_state = state.model_copy(update={"version": state.version + 1, "updated_at": time.time()})
+        data = encode_state(new_state)
+        with self._lock:
+            current = self._data.get(state.session_id)
+            current_version = current[0] if current else 0
+            if current_version != state.version:
+                raise SessionConflictError(state.session_id)
+            self._data[state.session_id] = (new_state.version, data)
+        return new_state
+
+    def delete(self, session_id: str):
+        with self._lock:
+            self._data.pop(session_id, None)
+
+
+class SQLiteSessionStore(SessionStore):
+    """
+    SQLite(WAL) 세션 저장소
+
+    WAL 모드에서는 읽기와 쓰기가 서로 막지 않으므로
+    같은 호스트의 여러 워커 프로세스가 하나의 DB 파일을 공유할 수 있음
+    """
+
+    shared = True
+
+    def __init__(self, path: str):
+        self.path = path
+        self._local = threading.local()
+        conn = self._connection()
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS sessions ("
+            " session_id TEXT PRIMARY KEY,"
+            " version INTEGER NOT NULL,"
+            " data BLOB NOT NULL,"
+            " updated_at REAL NOT NULL)"
+        )
+        conn.commit()
+
+    def _connection(self) -> sqlite3.Connection:
+        """스레드별 연결 (sqlite3 연결은 스레드 간 공유 불가)"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def load(self, session_id: str) -> Optional[SessionState]:
+        row = self._connection().execute(
+            "SELECT data FROM sessions WHERE session_id = ?", (session_id,)
+        ).fetchone()
+        if row is None:
+            return None
+        return decode_state(row[0])
+
+    def save(self, state: SessionState) -> SessionState:
+        new_state = state.model_copy(update={"version": state.version + 1, "updated_at": time.time()})
+        data = encode_state(new_state)
+        conn = self._connection()
+        with conn:
+            if state.version == 0:
+                cursor = conn.execute(
+                    "INSERT INTO sessions (session_id, version, data, updated_at) VALUES (?, ?, ?, ?)"
+                    " ON CONFLICT(session_id) DO NOTHING",
+                    (state.session_id, new_state.version, data, new_state.updated_at)
+                )
+            else:
+                cursor = conn.execute(
+                    "UPDATE sessions SET version = ?, data = ?, updated_at = ?"
+                    " WHERE session_id = ? AND version = ?",
+                    (new_state.version, data, new_state.updated_at, state.session_id, state.version)
+                )
+        if cursor.rowcount != 1:
+            raise SessionConflictError(state.session_id)
+        return new_state
+
+    def delete(self, session_id: str):
+        conn = self._connection()
+        with conn:
+            conn.execute("DELETE FROM sessions WHERE session_id = ?", (session_id,))
+
+
+class KeyValueClient(ABC):
+    """
+    세션 저장에 필요한 최소한의 키-값 서버 인터페이스
+    Redis 같은 서버는 Lua 스크립트나 WATCH/MULTI로 compare_and_set을 구현
+    """
+
+    shared = False  # 다른 프로세스와 공유되는 서버인지
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[Tuple[int, bytes]]:
+        """(버전, 데이터) 조회 (없으면 None)"""
+
+    @abstractmethod
+    def compare_and_set(
+        self,
+        key: str,
+        expected_version: int,
+        version: int,
+        data: bytes,
+        ttl_seconds: Optional[int] = None
+    ) -> bool:
+        """저장된 버전이 expected_version(없으면 0)일 때만 저장, 성공 여부 반환"""
+
+    @abstractmethod
+    def delete(self, key: str):
+        """키 삭제"""
+
+
+class LocalKeyValueServer(KeyValueClient):
+    """KeyValueClient의 프로세스 내 stand-in (TTL 지원, 테스트용)"""
+
+    def __init__(self):
+        self._data: Dict[str, Tuple[int, bytes, Optional[float]]] = {}
+        self._lock = threading.Lock()
+
+    def _get_live(self, key: str):
+        entry = self._data.get(key)
+        if entry is not None and entry[2] is not None and entry[2] < time.time():
+            del self._data[key]
+            return None
+        return entry
+
+    def get(self, key: str) -> Optional[Tuple[int, bytes]]:
+        with self._lock:
+            entry = self._get_live(key)
+        if entry is None:
+            return None
+        return entry[0], entry[1]
+
+    def compare_and_set(self, key, expected_version, version, data, ttl_seconds=None) -> bool:
+        with self._lock:
+            entry = self._get_live(key)
+            current_version = entry[0] if entry else 0
+            if current_version != expected_version:
+                return False
+            expires_at = time.time() + ttl_seconds if ttl_seconds else None
+            self._data[key] = (version, data, expires_at)
+            return True
+
+    def delete(self, key: str):
+        with self._lock:
+            self._data.pop(key, None)
+
+
+class RedisKeyValueClient(KeyValueClient):
+    """redis-py 기반 KeyValueClient (HASH {v: 버전, d: 데이터} + Lua compare-and-set)"""
+
+    shared = True
+
+    _CAS_SCRIPT = """
+local current = redis.call('HGET', KEYS[1], 'v')
+if (current == false and ARGV[1] == '0') or current == ARGV[1] then
+    redis.call('HSET', KEYS[1], 'v', ARGV[2], 'd', ARGV[3])
+    if tonumber(ARGV[4]) > 0 then
+        redis.call('EXPIRE', KEYS[1], ARGV[4])
+    end
+    return 1
+end
+return 0
+"""
+
+    def __init__(self, url: str):
+        import redis  # 선택 의존성
+
+        self._redis = redis.Redis.from_url(url)
+        self._cas = self._redis.register_script(self._CAS_SCRIPT)
+
+    def get(self, key: str) -> Optional[Tuple[int, bytes]]:
+        version, data = self._redis.hmget(key, "v", "d")
+        if version is None or data is None:
+            return None
+        return int(version), data
+
+    def compare_and_set(self, key, expected_version, version, data, ttl_seconds=None) -> bool:
+        result = self._cas(
+            keys=[key],
+            args=[str(expected_version), str(version), data, str(ttl_seconds or 0)]
+        )
+        return result == 1
+
+    def delete(self, key: str):
+        self._redis.delete(key)
+
+
+class KeyValueSessionStore(SessionStore):
+    """KeyValueClient 위에 구현한 세션 저장소 (Redis 등 원격 서버 공유)"""
+
+    def __init__(
+        self,
+        client: KeyValueClient,
+        key_prefix: str = "pagemind:session:",
+        ttl_seconds: Optional[int] = None
+    ):
+        self.client = client
+        self.key_prefix = key_prefix
+        self.ttl_seconds = ttl_seconds
+        self.shared = client.shared
+
+    def _key(self, session_id: str) -> str:
+        return self.key_prefix + session_id
+
+    def load(self, session_id: str) -> Optional[SessionState]:
+        entry = self.client.get(self._key(session_id))
+        if entry is None:
+            return None
+        return decode_state(entry[1])
+
+    def save(self, state: SessionState) -> SessionState:
+        new_state = state.model_copy(update={"version": state.version + 1, "updated_at": time.time()})
+        ok = self.client.compare_and_set(
+            self._key(state.session_id),
+            state.version,
+            new_state.version,
+            encode_state(new_state),
+            self.ttl_seconds
+        )
+        if not ok:
+            raise SessionConflictError(state.session_id)
+        return new_state
+
+    def delete(self, session_id: str):
+        self.client.delete(self._key(session_id))
+
+
+def _url_path(url: str, scheme: str, default: str) -> str:
+    """
+    파일 저장소 URL -> 경로 (SQLAlchemy와 같은 규칙)
+    scheme:///rel/path는 현재 디렉토리 기준 상대 경로, scheme:////abs/path는 절대 경로
+    """
+    prefix = f"{scheme}:///" if url.startswith(f"{scheme}:///") else f"{scheme}://"
+    return url[len(prefix):] or default
+
+
+def _ensure_parent(path: str) -> str:
+    """파일 저장소의 상위 디렉토리 생성 (상대 경로 spill:///data/s.log 등)"""
+    parent = os.path.dirname(path)
+    if parent:
+        os.makedirs(parent, exist_ok=True)
+    return path
+
+
+def create_session_store(url: Optional[str] = None) -> SessionStore:
+    """
+    URL로 세션 저장소 생성 (기본값: 환경 변수 PAGEMIND_SESSION_STORE)
+    경로는 scheme:///상대경로, scheme:////절대경로 (예: spill:////var/lib/pagemind/sessions.log)
+
+    -     memory://               : InMemorySessionStore
+    -     sqlite:///path/to.db    : SQLiteSessionStore
+    -     redis://host:6379/0     : KeyValueSessionStore + RedisKeyValueClient
+    -     local-kv://             : KeyValueSessionStore + LocalKeyValueServer
+    -     spill:///path/to.log    : SpillingSessionStore (PAGEMIND_SPILL_MAX_HOT, PAGEMIND_SPILL_IDLE_SECONDS,
+                                    PAGEMIND_SPILL_FLUSH_SECONDS)
+
+    파일에 기록하는 저장소는 start()로 주기적 기록을 시작하고 종료할 때 close() 호출
+    """
+    url = url or os.getenv("PAGEMIND_SESSION_STORE", "memory://")
+    ttl = os.getenv("PAGEMIND_SESSION_TTL_SECONDS")
+    ttl_seconds = int(ttl) if ttl else None
+
+    if url.startswith("memory://"):
+        return InMemorySessionStore()
+    if url.startswith("sqlite://"):
+        return SQLiteSessionStore(_ensure_parent(_url_path(url, "sqlite", "pagemind_sessions.db")))
+    if url.startswith(("redis://", "rediss://")):
+        return KeyValueSessionStore(RedisKeyValueClient(url), ttl_seconds=ttl_seconds)
+    if url.startswith("local-kv://"):
+        return KeyValueSessionStore(LocalKeyValueServer(), ttl_seconds=ttl_seconds)
+    if url.startswith("spill://"):
+        from .spill_store import SpillingSessionStore
+
+        return SpillingSessionStore(
+            _ensure_parent(_url_path(url, "spill", "pagemind_sessions.log")),
+            max_hot_sessions=int(os.getenv("PAGEMIND_SPILL_MAX_HOT", "1000")),
+            idle_seconds=float(os.getenv("PAGEMIND_SPILL_IDLE_SECONDS", "600")),
+            flush_seconds=float(os.getenv("PAGEMIND_SPILL_FLUSH_SECONDS", "5"))
+        )
+    raise ValueError(f"지원하지 않는 세션 저장소 URL: {url}")
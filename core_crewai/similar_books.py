@@ -0,0 +1,219 @@
+"""
+비슷한 책 색인 (MinHash + LSH) - "이 책과 비슷한 책" 조회를 추천 Crew 없이 처리
+-     책마다 제목 + 설명의 문자 3-gram 집합을 MinHash 서명(NUM_PERM개 최솟값)으로 요약
+      (one permutation hashing: 3-gram마다 해시 하나로 NUM_PERM개 구간 중 한 곳의 최솟값만 갱신
+       -> 긴 설명의 책도 1ms 미만, 빈 구간은 오른쪽 구간 값을 빌려 채움 - densification)
+-     서명을 BANDS개 밴드로 나눠 밴드별 버킷에 넣고, 한 밴드라도 같은 책만 후보로 비교
+      (rows=2, bands=32 -> 자카드 유사도 0.15에서 약 50%, 0.3 이상이면 95% 이상 후보가 됨
+       - 서로 다른 책의 설명은 3-gram이 많이 겹치지 않으므로 낮은 유사도까지 후보로 둠)
+-     조회 비용은 색인 크기와 무관: 버킷마다 최근에 들어온 MAX_BUCKET_SCAN권만 보고
+      ("있다." 같은 흔한 3-gram이 최솟값이 되는 큰 버킷), 같은 밴드 수가 많은 순으로 MAX_CANDIDATES권만 서명 비교
+-     네이버 검색 결과가 들어올 때마다(search_naver_books, iter_naver_books) 증분 추가
+      -> 지금까지 검색된 모든 책이 대상, 조회는 ISBN 기준 1ms 미만
+-     프로세스 메모리 색인 (API 워커마다 따로 쌓임), 오래 조회되지 않은 책부터 제거
+
+환경 변수:
+    PAGEMIND_SIMILAR_INDEX_SIZE=20000   색인에 보관할 최대 책 수
+
+사용:
+    similar_books_index.add_many(items)
+    for book, similarity in similar_books_index.query(isbn, limit=5):
+        ...
+"""
+
+import os
+import re
+import threading
+import zlib
+from collections import Counter, OrderedDict
+from itertools import islice
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from .candidate_store import clean_text
+
+SIMILAR_INDEX_SIZE = int(os.getenv("PAGEMIND_SIMILAR_INDEX_SIZE", "20000"))
+NUM_PERM = 64
+BANDS = 32
+SHINGLE_SIZE = 3
+MIN_SIMILARITY = 0.1  # 추정 자카드 유사도가 이보다 낮은 후보는 제외
+MAX_CANDIDATES = 50  # 조회 한 번에 서명을 비교할 최대 후보 수
+MAX_BUCKET_SCAN = 64  # 버킷 하나에서 후보로 볼 최대 책 수 (최근에 들어온 순)
+
+_MIX = 0x9E3779B1  # 32비트 곱셈 해시 (crc32 하위 비트 편향 완화)
+_DENSIFY_STEP = 1 << 32  # 빌려 온 값은 원래 구간 값과 겹치지 않도록 거리만큼 이동
+_SPACES = re.compile(r"\s+")
+
+
+def _clean(text: str) -> str:
+    return _SPACES.sub(" ", clean_text(text)).lower()
+
+
+def shingles(book: Dict) -> Set[int]:
+    """제목 + 설명의 문자 3-gram 해시 집합 (짧은 제목만 있으면 제목 전체 하나)"""
+    text = _clean(f"{book.get('title', '')} {book.get('description', '')}")
+    if len(text) <= SHINGLE_SIZE:
+        return {zlib.crc32(text.encode("utf-8"))} if text else set()
+    return {
+        zlib.crc32(text[i:i + SHINGLE_SIZE].encode("utf-8"))
+        for i in range(len(text) - SHINGLE_SIZE + 1)
+    }
+
+
+def isbn_keys(isbn: str) -> List[str]:
+    """네이버 isbn 필드("ISBN10 ISBN13" 또는 하나) -> 조회 키 목록"""
+    return [part for part in (isbn or "").replace("-", "").split() if part]
+
+
+class _Entry:
+    __slots__ = ("book", "title", "bands", "minhashes")
+
+    def __init__(self, book: Dict, signature: Tuple[int, ...], bands: List[Tuple[int, ...]]):
+        self.book = book
+        self.title = _clean(book.get("title", ""))
+        self.bands = bands
+        # (위치, 값) 집합 -> 같은 위치의 값이 같은 수 = 교집합 크기 (C 수준 set 연산으로 비교)
+        self.minhashes = frozenset((i << 40) | value for i, value in enumerate(signature))
+
+
+class SimilarBooksIndex:
+    """ISBN -> 비슷한 책 MinHash LSH 색인 (스레드 안전)"""
+
+    def __init__(self, num_perm: int = NUM_PERM, bands: int = BANDS, max_books: int = SIMILAR_INDEX_SIZE):
+        if num_perm % bands:
+            raise ValueError("num_perm은 bands의 배수여야 합니다")
+        if num_perm & (num_perm - 1):
+            raise ValueError("num_perm은 2의 거듭제곱이어야 합니다")
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.max_books = max_books
+        self._bin_shift = 32 - (num_perm - 1).bit_length()
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()  # 대표 ISBN -> 항목 (LRU)
+        self._aliases: Dict[str, str] = {}  # ISBN10/ISBN13 -> 대표 ISBN
+        # 밴드별 버킷: 밴드 값 -> 대표 ISBN (dict를 삽입 순서 있는 집합으로 사용)
+        self._buckets: List[Dict[Tuple[int, ...], Dict[str, None]]] = [{} for _ in range(bands)]
+        self._lock = threading.Lock()
+
+    def signature(self, book: Dict) -> Optional[Tuple[int, ...]]:
+        """MinHash 서명 (제목/설명이 모두 비어 있으면 None)"""
+        hashes = shingles(book)
+        if not hashes:
+            return None
+        num_perm, shift = self.num_perm, self._bin_shift
+        value_mask = (1 << shift) - 1
+        bins: List[Optional[int]] = [None] * num_perm
+        for h in hashes:
+            h = (h * _MIX) & 0xFFFFFFFF
+            i, value = h >> shift, h & value_mask
+            current = bins[i]
+            if current is None or value < current:
+                bins[i] = value
+        # 빈 구간은 오른쪽(순환)으로 가장 가까운 구간 값 + 거리 (두 책이 같은 구간을 빌리면 같은 값)
+        signature = []
+        for i in range(num_perm):
+            for distance in range(num_perm):
+                value = bins[(i + distance) % num_perm]
+                if value is not None:
+                    signature.append(value + distance * _DENSIFY_STEP)
+                    break
+        return tuple(signature)
+
+    def _band_keys(self, signature: Tuple[int, ...]) -> List[Tuple[int, ...]]:
+        rows = self.rows
+        return [signature[i * rows:(i + 1) * rows] for i in range(self.bands)]
+
+    def add(self, book: Dict) -> bool:
+        """책 추가 (ISBN이 없거나 이미 색인된 책이면 False)"""
+        keys = isbn_keys(book.get("isbn", ""))
+        if not keys:
+            return False
+        with self._lock:
+            if any(key in self._aliases for key in keys):
+                return False
+        # 서명 계산은 lock 밖에서 (검색 결과 여러 건이 동시에 들어와도 조회를 막지 않음)
+        signature = self.signature(book)
+        if signature is None:
+            return False
+        bands = self._band_keys(signature)
+        main_key = keys[-1]
+        with self._lock:
+            if any(key in self._aliases for key in keys):
+                return False
+            self._entries[main_key] = _Entry(book, signature, bands)
+            for key in keys:
+                self._aliases[key] = main_key
+            for band, bucket_key in zip(self._buckets, bands):
+                band.setdefault(bucket_key, {})[main_key] = None
+            while len(self._entries) > self.max_books:
+                self._evict_oldest()
+        return True
+
+    def add_many(self, books: Iterable[Dict]) -> int:
+        """검색 결과 추가 (새로 색인된 책 수)"""
+        return sum(self.add(book) for book in books)
+
+    def _evict_oldest(self):
+        """가장 오래 조회/추가되지 않은 책 제거 - 호출자가 lock 보유"""
+        main_key, entry = self._entries.popitem(last=False)
+        for band, bucket_key in zip(self._buckets, entry.bands):
+            bucket = band.get(bucket_key)
+            if bucket is not None:
+                bucket.pop(main_key, None)
+                if not bucket:
+                    del band[bucket_key]
+        for key in isbn_keys(entry.book.get("isbn", "")):
+            if self._aliases.get(key) == main_key:
+                del self._aliases[key]
+
+    def get(self, isbn: str) -> Optional[Dict]:
+        """색인된 책 원본 레코드 (없으면 None)"""
+        with self._lock:
+            for key in isbn_keys(isbn):
+                main_key = self._aliases.get(key)
+                if main_key is not None:
+                    return self._entries[main_key].book
+        return None
+
+    def query(self, isbn: str, limit: int = 5, min_similarity: float = MIN_SIMILARITY) -> List[Tuple[Dict, float]]:
+        """
+        ISBN과 비슷한 책 (추정 자카드 유사도 내림차순)
+        같은 제목의 다른 판본은 제외, 색인에 없는 ISBN이면 빈 목록
+        """
+        with self._lock:
+            main_key = next((self._aliases[key] for key in isbn_keys(isbn) if key in self._aliases), None)
+            if main_key is None:
+                return []
+            entry = self._entries[main_key]
+            self._entries.move_to_end(main_key)
+            # 같은 밴드 수 = 유사도가 높을수록 많음 -> 많은 순으로 상위 후보만 비교
+            collisions: Counter = Counter()
+            for band, bucket_key in zip(self._buckets, entry.bands):
+                bucket = band.get(bucket_key)
+                if bucket:
+                    collisions.update(islice(reversed(bucket), MAX_BUCKET_SCAN))
+            del collisions[main_key]
+            others = [self._entries[key] for key, _ in collisions.most_common(MAX_CANDIDATES)]
+
+        minhashes = entry.minhashes
+        scored = []
+        for other in others:
+            if other.title == entry.title:
+                continue
+            similarity = len(minhashes & other.minhashes) / self.num_perm
+            if similarity >= min_similarity:
+                scored.append((other.book, similarity))
+        scored.sort(key=lambda item: item[1], reverse=True)
+        return scored[:limit]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._aliases.clear()
+            for band in self._buckets:
+                band.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+similar_books_index = SimilarBooksIndex()
@@ -0,0 +1,250 @@
+"""
+메모리 상한이 있는 세션 저장소 - 자주 쓰는 세션만 메모리에 두고 유휴 세션은 디스크로 내보냄
+-     hot 세션: LRU 순서로 메모리에 보관 (max_hot_sessions 개까지)
+-     cold 세션: append-only 로그 파일에 압축 바이너리로 기록, 인덱스(오프셋)만 메모리에 유지
+-     다시 접근하면 로그에서 읽어 hot 세션으로 복귀 (지연 로드)
+-     start() 후에는 flush_seconds마다 변경된 hot 세션을 로그에 기록(체크포인트)하고 유휴 세션을 내보냄
+      -> 비정상 종료 시 잃는 변경은 최대 flush_seconds, 정상 종료(close(), atexit)는 모두 기록
+
+로그 레코드 형식 (little-endian):
+    [payload 길이 u32][crc32 u32][session_id 길이 u16][session_id UTF-8][payload]
+    payload는 session_store.encode_state() 결과, 길이 0이면 삭제 표시(tombstone)
+
+로그 파일은 한 프로세스가 소유 (여러 워커가 공유하려면 SQLite/Redis 저장소 사용)
+"""
+
+import atexit
+import os
+import struct
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+from .models import SessionState
+from .session_store import SessionStore, SessionConflictError, encode_state, decode_state
+
+_HEADER = struct.Struct("<IIH")
+
+# 로그에서 죽은 레코드 비율이 이 값을 넘으면 압축(compaction)
+COMPACTION_GARBAGE_RATIO = 0.5
+COMPACTION_MIN_BYTES = 4 * 1024 * 1024
+
+
+class SpillingSessionStore(SessionStore):
+    """hot 세션은 메모리, 유휴 세션은 append-only 로그에 보관하는 세션 저장소"""
+
+    def __init__(
+        self,
+        log_path: str,
+        max_hot_sessions: int = 1000,
+        idle_seconds: float = 600.0,
+        flush_seconds: float = 5.0
+    ):
+        self.log_path = log_path
+        self.max_hot_sessions = max_hot_sessions
+        self.idle_seconds = idle_seconds
+        self.flush_seconds = flush_seconds
+
+        # session_id -> (상태, 마지막 접근 시각, 로그 기록 이후 변경 여부)
+        self._hot: "OrderedDict[str, Tuple[SessionState, float, bool]]" = OrderedDict()
+        # session_id -> (오프셋, 레코드 길이, 버전)
+        self._index: Dict[str, Tuple[int, int, int]] = {}
+        self._live_bytes = 0
+        self._lock = threading.RLock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+        self._log = open(log_path, "a+b")
+        self._rebuild_index()
+
+    # 로그 파일
+    def _rebuild_index(self):
+        """기존 로그를 처음부터 읽어 인덱스 복구 (재시작 후에도 세션 유지)"""
+        self._log.seek(0)
+        offset = 0
+        while True:
+            header = self._log.read(_HEADER.size)
+            if len(header) < _HEADER.size:
+                break
+            length, checksum, id_length = _HEADER.unpack(header)
+            session_id = self._log.read(id_length).decode("utf-8")
+            payload = self._log.read(length)
+            record_size = _HEADER.size + id_length + length
+            if len(payload) < length or zlib.crc32(payload) != checksum:
+                # 쓰다가 중단된 마지막 레코드는 버림
+                self._log.truncate(offset)
+                break
+            self._drop_index(session_id)
+            if length:
+                version = decode_state(payload).version
+                self._index[session_id] = (offset, record_size, version)
+                self._live_bytes += record_size
+            offset += record_size
+        self._log.seek(0, os.SEEK_END)
+
+    def _append(self, session_id: str, payload: bytes) -> Tuple[int, int]:
+        """로그 끝에 레코드 추가, (오프셋, 레코드 길이) 반환"""
+        id_bytes = session_id.encode("utf-8")
+        record = _HEADER.pack(len(payload), zlib.crc32(payload), len(id_bytes)) + id_bytes + payload
+        self._log.seek(0, os.SEEK_END)
+        offset = self._log.tell()
+        self._log.write(record)
+        self._log.flush()
+        return offset, len(record)
+
+    def _read(self, offset: int, record_size: int) -> SessionState:
+        """로그에서 레코드 하나를 읽어 세션 상태로 복원"""
+        self._log.seek(offset)
+        record = self._log.read(record_size)
+        _, _, id_length = _HEADER.unpack_from(record)
+        return decode_state(record[_HEADER.size + id_length:])
+
+    def _drop_index(self, session_id: str):
+        entry = self._index.pop(session_id, None)
+        if entry is not None:
+            self._live_bytes -= entry[1]
+
+    def _maybe_compact(self):
+        """죽은 레코드가 많아지면 살아있는 레코드만 새 로그로 다시 기록"""
+        total = self._log.seek(0, os.SEEK_END)
+        if total < COMPACTION_MIN_BYTES or self._live_bytes > total * (1 - COMPACTION_GARBAGE_RATIO):
+            return
+
+        tmp_path = self.log_path + ".compact"
+        new_index: Dict[str, Tuple[int, int, int]] = {}
+        with open(tmp_path, "wb") as out:
+            for session_id, (offset, record_size, version) in self._index.items():
+                self._log.seek(offset)
+                new_index[session_id] = (out.tell(), record_size, version)
+                out.write(self._log.read(record_size))
+            out.flush()
+            os.fsync(out.fileno())
+
+        self._log.close()
+        os.replace(tmp_path, self.log_path)
+        self._log = open(self.log_path, "a+b")
+        self._index = new_index
+        self._live_bytes = sum(entry[1] for entry in new_index.values())
+
+    # hot/cold 관리
+    def _write(self, session_id: str, state: SessionState):
+        """세션 상태를 로그에 기록하고 인덱스 갱신"""
+        offset, record_size = self._append(session_id, encode_state(state))
+        self._drop_index(session_id)
+        self._index[session_id] = (offset, record_size, state.version)
+        self._live_bytes += record_size
+
+    def _spill(self, session_id: str):
+        """hot 세션 하나를 로그로 내보냄 (변경이 없으면 기존 레코드 재사용)"""
+        state, _, dirty = self._hot.pop(session_id)
+        if dirty or session_id not in self._index:
+            self._write(session_id, state)
+
+    def _evict(self):
+        """용량 초과분과 유휴 세션을 로그로 내보냄 (LRU 순서)"""
+        now = time.time()
+        while self._hot:
+            session_id, (_, last_access, _) = next(iter(self._hot.items()))
+            if len(self._hot) > self.max_hot_sessions or now - last_access > self.idle_seconds:
+                self._spill(session_id)
+            else:
+                break
+        self._maybe_compact()
+
+    def spill_idle(self):
+        """유휴 세션 정리 (start()의 백그라운드 스레드가 주기적으로 호출)"""
+        with self._lock:
+            self._evict()
+
+    def checkpoint(self):
+        """변경된 hot 세션을 로그에 기록 (메모리에는 그대로 유지)"""
+        with self._lock:
+            for session_id, (state, last_access, dirty) in list(self._hot.items()):
+                if dirty:
+                    self._write(session_id, state)
+                    self._hot[session_id] = (state, last_access, False)
+            os.fsync(self._log.fileno())
+
+    def flush(self):
+        """모든 hot 세션을 로그로 내보냄 (종료 전 호출)"""
+        with self._lock:
+            for session_id in list(self._hot):
+                self._spill(session_id)
+            os.fsync(self._log.fileno())
+
+    def start(self) -> "SpillingSessionStore":
+        """주기적 체크포인트/유휴 세션 정리 시작 (종료 시 atexit에서 close())"""
+        if self._thread is not None or self.flush_seconds <= 0:
+            return self
+        self._thread = threading.Thread(target=self._run, name="session-spill", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+        return self
+
+    def _run(self):
+        while not self._stop.wait(self.flush_seconds):
+            self.checkpoint()
+            self.spill_idle()
+
+    def close(self):
+        """주기적 기록 중단 후 모든 세션 기록, 로그 파일 닫기 (여러 번 호출해도 됨)"""
+        self._stop.set()
+        with self._lock:
+            if self._log.closed:
+                return
+            self.flush()
+            self._log.close()
+
+    def stats(self) -> Dict:
+        """저장소 상태 (hot/cold 세션 수, 로그 크기)"""
+        with self._lock:
+            cold = sum(1 for session_id in self._index if session_id not in self._hot)
+            return {
+                "hot_sessions": len(self._hot),
+                "cold_sessions": cold,
+                "log_bytes": self._log.seek(0, os.SEEK_END),
+                "live_bytes": self._live_bytes,
+            }
+
+    # SessionStore 인터페이스
+    def _current_version(self, session_id: str) -> int:
+        if session_id in self._hot:
+            return self._hot[session_id][0].version
+        entry = self._index.get(session_id)
+        return entry[2] if entry else 0
+
+    def load(self, session_id: str) -> Optional[SessionState]:
+        with self._lock:
+            if session_id in self._hot:
+                state, _, dirty = self._hot.pop(session_id)
+            elif session_id in self._index:
+                offset, record_size, _ = self._index[session_id]
+                state, dirty = self._read(offset, record_size), False
+            else:
+                return None
+            self._hot[session_id] = (state, time.time(), dirty)
+            self._evict()
+            # 호출자가 수정해도 저장된 상태가 바뀌지 않도록 복사본 반환
+            return state.model_copy(deep=True)
+
+    def save(self, state: SessionState) -> SessionState:
+        with self._lock:
+            if self._current_version(state.session_id) != state.version:
+                raise SessionConflictError(state.session_id)
+            new_state = state.model_copy(
+                update={"version": state.version + 1, "updated_at": time.time()},
+                deep=True
+            )
+            self._hot.pop(state.session_id, None)
+            self._hot[state.session_id] = (new_state, time.time(), True)
+            self._evict()
+            return new_state.model_copy(deep=True)
+
+    def delete(self, session_id: str):
+        with self._lock:
+            self._hot.pop(session_id, None)
+            if session_id in self._index:
+                self._drop_index(session_id)
+                self._append(session_id, b"")
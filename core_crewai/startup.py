@@ -0,0 +1,192 @@
+"""
+빠른 시작 - 무거운 import(crewai, LLM 제공자 SDK)와 에이전트 생성을 백그라운드로 미뤄 서버가 바로 뜨게 함
+-     WarmOrchestrator: CrewOrchestrator 대리 객체. 백그라운드에서 import + 에이전트 생성을 마치고,
+      준비 전에 들어온 호출은 준비될 때까지 기다린 뒤 그대로 위임
+-     status(): 준비 상태와 단계별 소요 시간 (/ready readiness probe에서 사용)
+-     import_time_report(): python -X importtime으로 모듈별 import 시간 측정
+
+환경 변수:
+    PAGEMIND_WARMUP=background   시작과 동시에 백그라운드 준비 (기본)
+    PAGEMIND_WARMUP=eager        준비가 끝날 때까지 시작을 막음
+    PAGEMIND_WARMUP=lazy         첫 호출에서 준비 (첫 사용자가 비용 부담)
+
+실행:
+    python -m core_crewai.startup                  # import 시간 보고서
+    python -m core_crewai.startup --warmup         # 백그라운드 준비 단계별 소요 시간
+"""
+
+import argparse
+import os
+import re
+import subprocess
+import sys
+import threading
+import time
+from typing import Dict, List, Optional, Sequence
+
+WARMUP_MODE = os.getenv("PAGEMIND_WARMUP", "background").lower()
+DEFAULT_REPORT_MODULES = ("gradio", "crewai", "anthropic", "core_crewai.crew_orchestrator")
+
+
+class WarmOrchestrator:
+    """
+    CrewOrchestrator 대리 객체
+
+    속성 접근(orchestrator.chat 등)은 준비가 끝난 CrewOrchestrator로 위임되므로
+    기존 호출 코드를 바꾸지 않고 모듈 수준 orchestrator를 대체할 수 있음
+    """
+
+    def __init__(self, llm=None, mode: str = WARMUP_MODE):
+        self._llm = llm
+        self._mode = mode
+        self._instance = None
+        self._error: Optional[BaseException] = None
+        self._ready = threading.Event()
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._state = "pending"
+        self._started_at: Optional[float] = None
+        self.timings: Dict[str, float] = {}
+
+    def start(self) -> "WarmOrchestrator":
+        """모드에 따라 준비 시작 (lazy면 아무것도 하지 않음)"""
+        if self._mode == "lazy":
+            return self
+        with self._lock:
+            if self._thread is None and not self._ready.is_set():
+                self._thread = threading.Thread(target=self._build, name="orchestrator-warmup", daemon=True)
+                self._thread.start()
+        if self._mode == "eager":
+            self.wait()
+        return self
+
+    def _timed(self, stage: str, fn):
+        started = time.perf_counter()
+        self._state = stage
+        result = fn()
+        self.timings[f"{stage}_seconds"] = round(time.perf_counter() - started, 4)
+        return result
+
+    def _build(self):
+        self._started_at = time.perf_counter()
+        try:
+            self._timed("import_crewai", lambda: __import__("crewai"))
+            module = self._timed(
+                "import_orchestrator",
+                lambda: __import__("core_crewai.crew_orchestrator", fromlist=["CrewOrchestrator"])
+            )
+            instance = self._timed("create_orchestrator", lambda: module.CrewOrchestrator(llm=self._llm))
+            # 에이전트 생성 시 LLM 객체와 제공자 SDK 클라이언트도 함께 초기화됨
+            self._timed("build_agents", instance.warm_up)
+            self._instance = instance
+            self._state = "ready"
+        except BaseException as e:
+            self._error = e
+            self._state = "failed"
+        finally:
+            self.timings["total_seconds"] = round(time.perf_counter() - self._started_at, 4)
+            self._ready.set()
+
+    def wait(self, timeout: Optional[float] = None):
+        """준비된 CrewOrchestrator 반환 (lazy 모드에서는 호출한 스레드에서 준비)"""
+        if not self._ready.is_set() and self._thread is None:
+            with self._lock:
+                if not self._ready.is_set() and self._thread is None:
+                    self._build()
+        if not self._ready.wait(timeout):
+            raise TimeoutError("오케스트레이터 준비가 끝나지 않았습니다")
+        if self._error is not None:
+            raise RuntimeError(f"오케스트레이터 준비 실패: {self._error}") from self._error
+        return self._instance
+
+    def is_ready(self) -> bool:
+        return self._ready.is_set() and self._error is None
+
+    def status(self) -> Dict:
+        """readiness probe용 상태"""
+        return {
+            "ready": self.is_ready(),
+            "state": self._state,
+            "mode": self._mode,
+            "timings": dict(self.timings),
+            "error": str(self._error) if self._error else None,
+        }
+
+    def __getattr__(self, name: str):
+        # __init__에서 설정한 속성은 여기로 오지 않음 -> 나머지는 실제 오케스트레이터로 위임
+        if name.startswith("__"):
+            raise AttributeError(name)
+        return getattr(self.wait(), name)
+
+
+def start_warmup(llm=None, mode: str = WARMUP_MODE) -> WarmOrchestrator:
+    """WarmOrchestrator 생성 후 준비 시작"""
+    return WarmOrchestrator(llm=llm, mode=mode).start()
+
+
+_IMPORTTIME_LINE = re.compile(r"import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+
+def measure_import_times(module: str) -> List[Dict]:
+    """새 인터프리터에서 module을 import하며 -X importtime 결과 수집 (마이크로초)"""
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    )
+    entries = []
+    for line in completed.stderr.splitlines():
+        match = _IMPORTTIME_LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            entries.append({
+                "module": name,
+                "self_us": int(self_us),
+                "cumulative_us": int(cumulative_us),
+                "depth": len(indent) // 2,
+            })
+    return entries
+
+
+def import_time_report(modules: Sequence[str] = DEFAULT_REPORT_MODULES, top: int = 10) -> str:
+    """모듈별 전체 import 시간과 가장 오래 걸린 하위 패키지 표"""
+    lines = []
+    for module in modules:
+        entries = measure_import_times(module)
+        root = next((e for e in entries if e["module"] == module), None)
+        if root is None:
+            lines.append(f"{module}: import 실패 또는 미설치")
+            continue
+        lines.append(f"{module}: {root['cumulative_us'] / 1000:.1f} ms")
+
+        # 최상위 패키지별 self 시간 합계
+        by_package: Dict[str, int] = {}
+        for entry in entries:
+            package = entry["module"].split(".")[0]
+            by_package[package] = by_package.get(package, 0) + entry["self_us"]
+        for package, self_us in sorted(by_package.items(), key=lambda item: -item[1])[:top]:
+            lines.append(f"    {package:<32}{self_us / 1000:>10.1f} ms")
+    return "\n".join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="시작 시간 분석 (import 시간, 에이전트 준비 시간)")
+    parser.add_argument("modules", nargs="*", default=list(DEFAULT_REPORT_MODULES), help="측정할 모듈")
+    parser.add_argument("--top", type=int, default=10, help="모듈별로 표시할 패키지 수")
+    parser.add_argument("--warmup", action="store_true", help="백그라운드 준비 단계별 소요 시간 측정")
+    args = parser.parse_args(argv)
+
+    if args.warmup:
+        warm = start_warmup(mode="background")
+        warm.wait()
+        for stage, seconds in warm.status()["timings"].items():
+            print(f"{stage:<32}{seconds:>10.3f} s")
+        return 0
+
+    print(import_time_report(args.modules, top=args.top))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,28 +1,21 @@
 """
 CrewAI 작업 정의 - 순차적 워크플로우
+
+Task는 치환 필드({user_message} 등)가 남아 있는 템플릿으로 한 번 만들어 재사용하고,
+턴마다 달라지는 값은 *_task_inputs()로 만들어 crew.kickoff(inputs=...)로 넘김
 """
 
-import os
-from pathlib import Path
 from crewai import Task
-from typing import List
+from typing import Dict, List
 
+from .candidate_store import compact_book
+from .prompts import get_task_template
+from .query_planner import PlannedQuery
 
-def _load_prompt_template(filename: str) -> str:
-    """text_prompts 디렉토리에서 프롬프트 템플릿 로드"""
-    prompt_dir = Path(__file__).parent / "text_prompts"
-    prompt_path = prompt_dir / filename
-    return prompt_path.read_text(encoding="utf-8").strip()
 
+def counseling_task_inputs(user_message: str, conversation_history: List[dict]) -> Dict[str, str]:
+    """상담 작업 입력 (counseling_task_description.txt 치환 값)"""
 
-def create_counseling_task(agent, user_message: str, conversation_history: List[dict]) -> Task:
-    """
-    작업 1: 상담 세션
-    
-    에이전트: Counselor Agent
-    목표: 공감적 대화를 통해 사용자 정보 수집
-    """
-    
     # 맥락을 위한 대화 기록 포맷팅
     history_text = ""
     if conversation_history:
@@ -31,41 +24,49 @@ def create_counseling_task(agent, user_message: str, conversation_history: List[
             role = "사용자" if msg["role"] == "user" else "상담사"
             history_text += f"{role}: {msg['content']}\n"
         history_text += "================\n\n"
-    
-    # 템플릿 로드 및 변수로 포맷팅
-    template = _load_prompt_template("counseling_task_description.txt")
-    description = template.format(
-        history_text=history_text,
-        user_message=user_message
-    )
-    
+
+    return {"history_text": history_text, "user_message": user_message}
+
+
+def create_counseling_task(agent) -> Task:
+    """
+    작업 1: 상담 세션
+
+    에이전트: Counselor Agent
+    목표: 공감적 대화를 통해 사용자 정보 수집
+    입력: counseling_task_inputs()
+    """
     return Task(
-        description=description,
+        description=get_task_template("counseling_task_description.txt"),
         agent=agent,
         expected_output="사용자에게 공감하는 따뜻한 응답과 정보 수집을 위한 질문 (2-4문장)"
     )
 
 
-def create_analysis_task(agent, conversation_history: List[dict]) -> Task:
+def _conversation_text(messages: List[dict]) -> str:
+    """분석을 위한 대화 포맷팅 (system 메시지 제외)"""
+    return "\n\n".join([
+        f"{'사용자' if m.get('role') == 'user' else '상담사'}: {m['content']}"
+        for m in messages if m.get('role') != 'system'
+    ])
+
+
+def analysis_task_inputs(conversation_history: List[dict]) -> Dict[str, str]:
+    """분석 작업 입력 (analysis_task_description.txt 치환 값)"""
+
+    return {"conversation_text": _conversation_text(conversation_history)}
+
+
+def create_analysis_task(agent) -> Task:
     """
     작업 2: 심리 분석
-    
+
     에이전트: Psychological Analyzer Agent
     목표: SKILL.md 6단계 프레임워크를 적용하여 대화 분석
+    입력: analysis_task_inputs()
     """
-    
-    # 분석을 위한 대화 포맷팅
-    conversation_text = "\n\n".join([
-        f"{'사용자' if m['role'] == 'user' else '상담사'}: {m['content']}"
-        for m in conversation_history if m['role'] != 'system'
-    ])
-    
-    # 템플릿 로드 및 변수로 포맷팅
-    template = _load_prompt_template("analysis_task_description.txt")
-    description = template.format(conversation_text=conversation_text)
-    
     return Task(
-        description=description,
+        description=get_task_template("analysis_task_description.txt"),
         agent=agent,
         expected_output="""JSON 형식의 심리 분석 결과:
 {
@@ -78,47 +79,110 @@ def create_analysis_task(agent, conversation_history: List[dict]) -> Task:
     )
 
 
-def create_book_recommendation_task(agent, analysis_result: dict, preferred_genre: str = None) -> Task:
+def analysis_update_task_inputs(previous_summary: dict, new_messages: List[dict]) -> Dict[str, str]:
+    """증분 분석 작업 입력 (analysis_update_task_description.txt 치환 값) - 이전 분석 결과 + 새 메시지만"""
+
+    previous_text = "\n".join(
+        f"- {field}: {', '.join(previous_summary.get(field, []))}"
+        for field in ("main_concerns", "emotions", "cognitive_patterns", "recommendations", "keywords")
+    )
+
+    return {"previous_summary": previous_text, "new_conversation_text": _conversation_text(new_messages)}
+
+
+def create_analysis_update_task(agent) -> Task:
     """
-    작업 3: 도서 검색
-    
-    에이전트: Book Recommender Agent
-    목표: 심리 분석 키워드를 기반으로 도서 검색
+    작업 2-1: 증분 심리 분석 (분석 완료 후 대화가 이어진 경우)
+
+    에이전트: Psychological Analyzer Agent
+    목표: 이전 분석 결과에 새 대화 내용을 반영 (전체 대화를 다시 분석하지 않음)
+    입력: analysis_update_task_inputs()
     """
-    
+    return Task(
+        description=get_task_template("analysis_update_task_description.txt"),
+        agent=agent,
+        expected_output="""JSON 형식의 갱신된 심리 분석 결과:
+{
+  "main_concerns": [...],
+  "emotions": [...],
+  "cognitive_patterns": [...],
+  "recommendations": [...],
+  "keywords": [...]
+}"""
+    )
+
+
+def book_recommendation_task_inputs(
+    analysis_result: dict,
+    search_plan: List[PlannedQuery],
+    preferred_genre: str = None
+) -> Dict[str, str]:
+    """도서 검색 작업 입력 (book_recommendation_task_description.txt 치환 값)"""
+
     keywords = analysis_result.get('keywords', [])
     genre_info = f"\n**선호 장르**: {preferred_genre}" if preferred_genre else ""
-    
-    # 템플릿 로드 및 변수로 포맷팅
-    template = _load_prompt_template("book_recommendation_task_description.txt")
-    description = template.format(
-        main_concerns=', '.join(analysis_result.get('main_concerns', [])),
-        emotions=', '.join(analysis_result.get('emotions', [])),
-        keywords=', '.join(keywords),
-        genre_info=genre_info,
-        keyword1=keywords[0] if len(keywords) > 0 else '',
-        keyword2=keywords[1] if len(keywords) > 1 else '',
-        keyword3=keywords[2] if len(keywords) > 2 else ''
+
+    # 쿼리 플래너가 병합/크기 조정한 검색 목록
+    plan_text = "\n".join(
+        f'   - "{planned.query}" (display={planned.display})' for planned in search_plan
     )
-    
+
+    return {
+        "main_concerns": ', '.join(analysis_result.get('main_concerns', [])),
+        "emotions": ', '.join(analysis_result.get('emotions', [])),
+        "keywords": ', '.join(keywords),
+        "genre_info": genre_info,
+        "search_plan": plan_text,
+    }
+
+
+def create_book_recommendation_task(agent) -> Task:
+    """
+    작업 3: 도서 검색
+
+    에이전트: Book Recommender Agent
+    목표: 심리 분석 키워드를 기반으로 도서 검색
+    입력: book_recommendation_task_inputs()
+    """
     return Task(
-        description=description,
+        description=get_task_template("book_recommendation_task_description.txt"),
         agent=agent,
-        expected_output="""JSON 형식의 검색된 모든 도서:
+        expected_output="""JSON 형식의 검색된 모든 도서 id (검색 결과의 id 그대로):
 {
-  "all_books": [
-    {
-      "title": "...",
-      "author": "...",
-      "publisher": "...",
-      "description": "...",
-      "isbn": "...",
-      "pubdate": "...",
-      "cover_image": "...",
-      "link": "..."
-    },
-    ...
-  ]
+  "book_ids": ["b1", "b2", ...]
 }"""
     )
 
+
+def reason_task_inputs(analysis_result: dict, books: Dict[str, dict]) -> Dict[str, str]:
+    """추천 이유 작성 입력 (reason_task_description.txt 치환 값) - books: 핸들 -> 네이버 API 항목"""
+
+    # 책마다 한 줄 (제목, 저자, 설명 앞부분)
+    books_text = "\n".join(
+        f"- {item['id']}: {item['title']} ({item['author']}) - {item['summary']}"
+        for item in (compact_book(handle, book) for handle, book in books.items())
+    )
+
+    return {
+        "main_concerns": ', '.join(analysis_result.get('main_concerns', [])),
+        "emotions": ', '.join(analysis_result.get('emotions', [])),
+        "books": books_text,
+    }
+
+
+def create_reason_task(agent) -> Task:
+    """
+    작업 4: 추천 이유 작성 (선택)
+
+    에이전트: Reason Writer Agent
+    목표: 재정렬로 선정된 도서 전체의 추천 이유를 한 번에 작성
+    입력: reason_task_inputs()
+    """
+    return Task(
+        description=get_task_template("reason_task_description.txt"),
+        agent=agent,
+        expected_output="""JSON 형식의 책 id별 추천 이유:
+{
+  "reasons": {"b1": "...", "b2": "..."}
+}"""
+    )
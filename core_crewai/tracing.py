@@ -0,0 +1,541 @@
+"""
+단계별 트레이싱 스팬 + 메트릭
+-     span(): 오케스트레이터 단계, crew.kickoff, JSON 파싱, rerank_books, 네이버 요청 등을 감싸는 중첩 타이밍 스팬
+-     LLM 호출: CrewAI 이벤트 버스(LLMCallStarted/Completed)를 구독하여 모델, 에이전트, 토큰 수를 담은 스팬 생성
+-     내보내기: OpenTelemetry OTLP/JSON 형식 (파일 또는 OTLP/HTTP 수집기)
+-     메트릭: 스팬 지연 히스토그램, LLM 토큰/캐시 카운터를 Prometheus 텍스트 형식으로 노출
+
+환경 변수:
+    PAGEMIND_TRACING=1                               트레이싱/메트릭 활성화 (기본: 비활성 - 스팬은 공유 no-op 객체)
+    PAGEMIND_OTLP_FILE=traces.jsonl                  스팬을 OTLP/JSON 한 줄씩 파일로 기록
+    PAGEMIND_OTLP_ENDPOINT=http://localhost:4318/v1/traces  OTLP/HTTP(JSON) 수집기로 배치 전송
+"""
+
+import inspect
+import os
+import queue
+import threading
+import time
+from bisect import bisect_left
+from collections import deque
+from contextvars import ContextVar
+from functools import wraps
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import requests
+
+from .serialization import dumps, dumps_bytes
+
+SERVICE_NAME = "pagemind"
+RECENT_SPAN_LIMIT = 1000  # get_recent_spans()로 조회할 수 있는 최근 스팬 수
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+# ------------------------------------------------------------
+# 메트릭 (Prometheus 텍스트 형식)
+# ------------------------------------------------------------
+
+def _escape_label(value: Any) -> str:
+    return str(value).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+def _format_labels(labels: Tuple[Tuple[str, str], ...], extra: str = "") -> str:
+    parts = [f'{key}="{_escape_label(value)}"' for key, value in labels]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+class Counter:
+    """레이블별 누적 카운터"""
+
+    def __init__(self, name: str, help_text: str):
+        self.name = name
+        self.help_text = help_text
+        self._values: Dict[Tuple, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1, **labels):
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels) -> float:
+        with self._lock:
+            return self._values.get(tuple(sorted(labels.items())), 0)
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            for key, value in sorted(self._values.items()):
+                lines.append(f"{self.name}{_format_labels(key)} {value:g}")
+        return lines
+
+
+class Histogram:
+    """레이블별 누적 버킷 히스토그램"""
+
+    def __init__(self, name: str, help_text: str, buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.name = name
+        self.help_text = help_text
+        self.buckets = tuple(sorted(buckets))
+        self._series: Dict[Tuple, List] = {}  # key -> [버킷별 개수..., 합계, 개수]
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels):
+        key = tuple(sorted(labels.items()))
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [0] * len(self.buckets) + [0.0, 0]
+            if index < len(self.buckets):
+                series[index] += 1
+            series[-2] += value
+            series[-1] += 1
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            for key, series in sorted(self._series.items()):
+                cumulative = 0
+                for bound, count in zip(self.buckets, series):
+                    cumulative += count
+                    le = 'le="%g"' % bound
+                    lines.append(f"{self.name}_bucket{_format_labels(key, le)} {cumulative}")
+                inf = 'le="+Inf"'
+                lines.append(f"{self.name}_bucket{_format_labels(key, inf)} {series[-1]}")
+                lines.append(f"{self.name}_sum{_format_labels(key)} {series[-2]:g}")
+                lines.append(f"{self.name}_count{_format_labels(key)} {series[-1]}")
+        return lines
+
+
+class MetricsRegistry:
+    """메트릭 모음 (/metrics 엔드포인트에서 render_prometheus()로 출력)"""
+
+    def __init__(self):
+        self._metrics: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+
+    def counter(self, name: str, help_text: str) -> Counter:
+        with self._lock:
+            return self._metrics.setdefault(name, Counter(name, help_text))
+
+    def histogram(self, name: str, help_text: str, buckets: Tuple[float, ...] = DEFAULT_BUCKETS) -> Histogram:
+        with self._lock:
+            return self._metrics.setdefault(name, Histogram(name, help_text, buckets))
+
+    def render_prometheus(self) -> str:
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+metrics = MetricsRegistry()
+SPAN_DURATION = metrics.histogram("pagemind_span_duration_seconds", "Duration of traced stages in seconds")
+SPAN_ERRORS = metrics.counter("pagemind_span_errors_total", "Traced stages that raised an exception")
+LLM_TOKENS = metrics.counter("pagemind_llm_tokens_total", "LLM tokens by model, agent and kind")
+CACHE_REQUESTS = metrics.counter("pagemind_cache_requests_total", "Cache lookups by cache name and result")
+
+
+def render_prometheus() -> str:
+    return metrics.render_prometheus()
+
+
+# ------------------------------------------------------------
+# 스팬
+# ------------------------------------------------------------
+
+class Span:
+    """완료 시점에 메트릭 기록 및 내보내기되는 타이밍 스팬"""
+
+    __slots__ = ("name", "trace_id", "span_id", "parent_id", "start_ns", "end_ns", "attributes", "error")
+
+    def __init__(self, name: str, parent: Optional["Span"] = None, start_ns: Optional[int] = None):
+        self.name = name
+        self.trace_id = parent.trace_id if parent else os.urandom(16).hex()
+        self.span_id = os.urandom(8).hex()
+        self.parent_id = parent.span_id if parent else None
+        self.start_ns = start_ns if start_ns is not None else time.time_ns()
+        self.end_ns: Optional[int] = None
+        self.attributes: Dict[str, Any] = {}
+        self.error: Optional[str] = None
+
+    def set_attribute(self, key: str, value: Any):
+        if value is not None:
+            self.attributes[key] = value
+
+    def set_attributes(self, **attributes):
+        for key, value in attributes.items():
+            self.set_attribute(key, value)
+
+    def record_exception(self, exc: BaseException):
+        self.error = f"{type(exc).__name__}: {exc}"
+
+    @property
+    def duration_seconds(self) -> float:
+        end_ns = self.end_ns if self.end_ns is not None else time.time_ns()
+        return (end_ns - self.start_ns) / 1e9
+
+    def end(self, end_ns: Optional[int] = None):
+        self.end_ns = end_ns if end_ns is not None else time.time_ns()
+        SPAN_DURATION.observe(self.duration_seconds, span=self.name)
+        if self.error:
+            SPAN_ERRORS.inc(span=self.name)
+        _finish(self)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "duration_ms": round(self.duration_seconds * 1000, 3),
+            "attributes": dict(self.attributes),
+            "error": self.error,
+        }
+
+
+class _NoopSpan:
+    """비활성 상태에서 span()이 돌려주는 공유 객체 (할당/시계 호출 없음)"""
+
+    __slots__ = ()
+
+    def __enter__(self) -> "_NoopSpan":
+        return self
+
+    def __exit__(self, *exc) -> bool:
+        return False
+
+    def set_attribute(self, key: str, value: Any):
+        pass
+
+    def set_attributes(self, **attributes):
+        pass
+
+    def record_exception(self, exc: BaseException):
+        pass
+
+
+_NOOP_SPAN = _NoopSpan()
+_current_span: ContextVar[Optional[Span]] = ContextVar("pagemind_current_span", default=None)
+
+
+class _SpanScope:
+    """with 블록 동안 현재 스팬으로 설정"""
+
+    __slots__ = ("span", "_token")
+
+    def __init__(self, name: str, attributes: Dict[str, Any]):
+        self.span = Span(name, parent=_current_span.get())
+        self.span.set_attributes(**attributes)
+        self._token = None
+
+    def __enter__(self) -> Span:
+        self._token = _current_span.set(self.span)
+        return self.span
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        _current_span.reset(self._token)
+        if exc is not None:
+            self.span.record_exception(exc)
+        self.span.end()
+        return False
+
+
+_enabled = False
+
+
+def is_enabled() -> bool:
+    return _enabled
+
+
+def span(name: str, **attributes):
+    """
+    중첩 타이밍 스팬
+
+    사용:
+        with span("crew.kickoff", stage="analyze") as s:
+            result = crew.kickoff()
+            s.set_attribute("total_tokens", ...)
+    """
+    if not _enabled:
+        return _NOOP_SPAN
+    return _SpanScope(name, attributes)
+
+
+def traced(name: Optional[str] = None, **attributes) -> Callable:
+    """함수 전체를 스팬으로 감싸는 데코레이터 (비활성 상태면 원래 함수를 그대로 호출, async 함수 지원)"""
+    def decorator(fn: Callable) -> Callable:
+        span_name = name or f"{fn.__module__}.{fn.__qualname__}"
+
+        if inspect.iscoroutinefunction(fn):
+            @wraps(fn)
+            async def async_wrapper(*args, **kwargs):
+                if not _enabled:
+                    return await fn(*args, **kwargs)
+                with _SpanScope(span_name, attributes):
+                    return await fn(*args, **kwargs)
+            return async_wrapper
+
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return fn(*args, **kwargs)
+            with _SpanScope(span_name, attributes):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def current_span():
+    """현재 스팬 (없거나 비활성이면 no-op 스팬)"""
+    return _current_span.get() or _NOOP_SPAN
+
+
+def record_cache(cache: str, hit: bool):
+    """캐시 조회 결과를 현재 스팬 속성과 카운터에 기록"""
+    if not _enabled:
+        return
+    current_span().set_attribute("cache_hit", hit)
+    CACHE_REQUESTS.inc(cache=cache, result="hit" if hit else "miss")
+
+
+# ------------------------------------------------------------
+# 내보내기 (OTLP/JSON)
+# ------------------------------------------------------------
+
+def _otlp_value(value: Any) -> Dict[str, Any]:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    if isinstance(value, (list, tuple)):
+        return {"arrayValue": {"values": [_otlp_value(v) for v in value]}}
+    return {"stringValue": str(value)}
+
+
+def to_otlp_json(spans: List[Span]) -> Dict[str, Any]:
+    """스팬 목록을 OTLP/JSON ExportTraceServiceRequest 형식으로 변환"""
+    otlp_spans = []
+    for s in spans:
+        item = {
+            "traceId": s.trace_id,
+            "spanId": s.span_id,
+            "name": s.name,
+            "kind": 1,  # SPAN_KIND_INTERNAL
+            "startTimeUnixNano": str(s.start_ns),
+            "endTimeUnixNano": str(s.end_ns),
+            "attributes": [{"key": key, "value": _otlp_value(value)} for key, value in s.attributes.items()],
+            "status": {"code": 2, "message": s.error} if s.error else {"code": 1},
+        }
+        if s.parent_id:
+            item["parentSpanId"] = s.parent_id
+        otlp_spans.append(item)
+
+    return {
+        "resourceSpans": [{
+            "resource": {"attributes": [{"key": "service.name", "value": {"stringValue": SERVICE_NAME}}]},
+            "scopeSpans": [{"scope": {"name": "core_crewai.tracing"}, "spans": otlp_spans}],
+        }]
+    }
+
+
+class OtlpJsonFileExporter:
+    """스팬 하나당 OTLP/JSON 한 줄 기록 (OpenTelemetry Collector의 otlpjsonfile 수신기로 읽을 수 있음)"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def export(self, span_: Span):
+        line = dumps(to_otlp_json([span_]))
+        with self._lock:
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(line + "\n")
+
+    def shutdown(self):
+        pass
+
+
+class OtlpHttpExporter:
+    """백그라운드 스레드에서 OTLP/HTTP(JSON)로 배치 전송 (요청 경로를 막지 않음)"""
+
+    def __init__(self, endpoint: str, batch_size: int = 64, flush_interval_seconds: float = 5.0):
+        self.endpoint = endpoint
+        self.batch_size = batch_size
+        self.flush_interval_seconds = flush_interval_seconds
+        self._queue: "queue.Queue[Optional[Span]]" = queue.Queue(maxsize=10000)
+        self._thread = threading.Thread(target=self._run, name="otlp-exporter", daemon=True)
+        self._thread.start()
+
+    def export(self, span_: Span):
+        try:
+            self._queue.put_nowait(span_)
+        except queue.Full:
+            pass  # 수집기가 느리면 버림
+
+    def _run(self):
+        batch: List[Span] = []
+        deadline = time.monotonic() + self.flush_interval_seconds
+        while True:
+            try:
+                item = self._queue.get(timeout=max(0.0, deadline - time.monotonic()))
+            except queue.Empty:
+                item = ...
+            if item is None:
+                self._post(batch)
+                return
+            if item is not ...:
+                batch.append(item)
+            if len(batch) >= self.batch_size or time.monotonic() >= deadline:
+                self._post(batch)
+                batch = []
+                deadline = time.monotonic() + self.flush_interval_seconds
+
+    def _post(self, batch: List[Span]):
+        if not batch:
+            return
+        try:
+            requests.post(
+                self.endpoint, data=dumps_bytes(to_otlp_json(batch)),
+                headers={"Content-Type": "application/json"}, timeout=5
+            )
+        except requests.RequestException:
+            pass
+
+    def shutdown(self):
+        self._queue.put(None)
+        self._thread.join(timeout=5)
+
+
+_exporters: List[Any] = []
+_recent: "deque[Span]" = deque(maxlen=RECENT_SPAN_LIMIT)
+
+
+def _finish(span_: Span):
+    _recent.append(span_)
+    for exporter in _exporters:
+        exporter.export(span_)
+
+
+def get_recent_spans(trace_id: Optional[str] = None) -> List[Dict[str, Any]]:
+    """최근 완료된 스팬 목록 (trace_id로 필터링 가능)"""
+    spans = list(_recent)
+    if trace_id:
+        spans = [s for s in spans if s.trace_id == trace_id]
+    return [s.to_dict() for s in spans]
+
+
+# ------------------------------------------------------------
+# CrewAI LLM 호출 이벤트 -> 스팬
+# ------------------------------------------------------------
+
+# call_id -> (시작 시각, 부모 스팬) - 이벤트 핸들러는 CrewAI 스레드 풀에서 호출 시점 컨텍스트 복사본으로 실행됨
+_pending_llm_calls: Dict[str, Tuple[int, Optional[Span]]] = {}
+_pending_lock = threading.Lock()
+_listeners_installed = False
+
+
+def _event_time_ns(event) -> int:
+    timestamp = getattr(event, "timestamp", None)
+    return int(timestamp.timestamp() * 1e9) if timestamp else time.time_ns()
+
+
+def _on_llm_call_started(source, event):
+    with _pending_lock:
+        _pending_llm_calls[event.call_id] = (_event_time_ns(event), _current_span.get())
+
+
+def _on_llm_call_finished(source, event):
+    with _pending_lock:
+        pending = _pending_llm_calls.pop(event.call_id, None)
+    if pending is None or not _enabled:
+        return
+    start_ns, parent = pending
+
+    llm_span = Span("llm.call", parent=parent, start_ns=start_ns)
+    agent = getattr(event, "agent_role", None)
+    llm_span.set_attributes(model=event.model, agent=agent)
+
+    from crewai.types.usage_metrics import UsageMetrics  # 제공자별 usage 키 이름 정규화
+
+    usage = UsageMetrics.from_provider_dict(getattr(event, "usage", None))
+    for kind, key in (("input", "prompt_tokens"), ("output", "completion_tokens"),
+                      ("cached", "cached_prompt_tokens")):
+        count = getattr(usage, key, 0) if usage else 0
+        if count:
+            llm_span.set_attribute(f"tokens.{kind}", count)
+            LLM_TOKENS.inc(count, model=event.model or "", agent=agent or "", kind=kind)
+
+    error = getattr(event, "error", None)
+    if error:
+        llm_span.error = error
+    llm_span.end(end_ns=_event_time_ns(event))
+
+
+def _install_crewai_listeners():
+    global _listeners_installed
+    if _listeners_installed:
+        return
+    try:
+        from crewai.events import crewai_event_bus
+        from crewai.events.types.llm_events import (
+            LLMCallStartedEvent,
+            LLMCallCompletedEvent,
+            LLMCallFailedEvent,
+        )
+    except ImportError:
+        return
+    crewai_event_bus.on(LLMCallStartedEvent)(_on_llm_call_started)
+    crewai_event_bus.on(LLMCallCompletedEvent)(_on_llm_call_finished)
+    crewai_event_bus.on(LLMCallFailedEvent)(_on_llm_call_finished)
+    _listeners_installed = True
+
+
+# ------------------------------------------------------------
+# 설정
+# ------------------------------------------------------------
+
+def configure(
+    enabled: Optional[bool] = None,
+    otlp_file: Optional[str] = None,
+    otlp_endpoint: Optional[str] = None
+):
+    """
+    트레이싱 설정 (인자를 생략하면 환경 변수 사용)
+
+    Args:
+        enabled: 스팬/메트릭 기록 여부
+        otlp_file: OTLP/JSON 파일 경로
+        otlp_endpoint: OTLP/HTTP 수집기 주소 (예: http://localhost:4318/v1/traces)
+    """
+    global _enabled
+    if enabled is None:
+        enabled = os.getenv("PAGEMIND_TRACING", "").lower() in ("1", "true", "yes", "on")
+    otlp_file = otlp_file or os.getenv("PAGEMIND_OTLP_FILE")
+    otlp_endpoint = otlp_endpoint or os.getenv("PAGEMIND_OTLP_ENDPOINT")
+
+    shutdown()
+    if otlp_file:
+        _exporters.append(OtlpJsonFileExporter(otlp_file))
+    if otlp_endpoint:
+        _exporters.append(OtlpHttpExporter(otlp_endpoint))
+
+    _enabled = enabled
+    if enabled:
+        _install_crewai_listeners()
+
+
+def shutdown():
+    """내보내기 중지 (대기 중인 배치 전송)"""
+    while _exporters:
+        _exporters.pop().shutdown()
+
+
+configure()
@@ -0,0 +1,200 @@
+"""
+토큰/비용 집계 - LLM 호출마다 입력/출력/캐시 토큰을 에이전트, 단계, 세션별로 누적
+-     CrewAI 이벤트 버스(LLMCallCompletedEvent)의 usage를 구독 (crew.kickoff()는 반환 전에 이벤트 핸들러를 모두 flush)
+-     세션은 track_session() 컨텍스트로 지정 (이벤트 핸들러는 호출 시점 컨텍스트 복사본에서 실행됨)
+-     세션 토큰 예산(PAGEMIND_SESSION_TOKEN_BUDGET)을 넘으면 오케스트레이터가 저비용 경로로 전환
+
+사용:
+    with track_session("conversation-1"):
+        crew.kickoff()
+    usage_tracker.get_session("conversation-1")  # UsageReport
+"""
+
+import os
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Optional, Tuple
+
+from .agents import STAGE_BY_ROLE
+from .models import TokenUsage, UsageReport
+
+# 모델별 100만 토큰당 가격 (USD): (입력, 출력, 캐시 읽기)
+MODEL_PRICING_PER_MILLION: Dict[str, Tuple[float, float, float]] = {
+    "anthropic/claude-sonnet-4-20250514": (3.0, 15.0, 0.30),
+    "anthropic/claude-3-5-haiku-20241022": (0.80, 4.0, 0.08),
+}
+
+# 세션 토큰 예산 (0 또는 미설정이면 무제한)
+SESSION_TOKEN_BUDGET = int(os.getenv("PAGEMIND_SESSION_TOKEN_BUDGET", "0")) or None
+MAX_TRACKED_SESSIONS = 10000  # 메모리 상한 (오래된 세션부터 제거)
+
+_current_session: ContextVar[Optional[str]] = ContextVar("pagemind_usage_session", default=None)
+
+
+def _model_key(model: Optional[str]) -> str:
+    model = model or ""
+    if "/" not in model and model.startswith("claude"):
+        return f"anthropic/{model}"  # CrewAI 네이티브 제공자는 접두사 없는 모델명을 보고함
+    return model
+
+
+def estimate_cost(model: Optional[str], input_tokens: int, output_tokens: int, cached_tokens: int) -> float:
+    """모델 가격표 기준 추정 비용 (가격표에 없는 모델은 0)"""
+    pricing = MODEL_PRICING_PER_MILLION.get(_model_key(model))
+    if pricing is None:
+        return 0.0
+    input_price, output_price, cached_price = pricing
+    uncached = max(0, input_tokens - cached_tokens)
+    return (uncached * input_price + cached_tokens * cached_price + output_tokens * output_price) / 1_000_000
+
+
+def _add(usage: TokenUsage, input_tokens: int, output_tokens: int, cached_tokens: int, cost: float):
+    usage.input_tokens += input_tokens
+    usage.output_tokens += output_tokens
+    usage.cached_tokens += cached_tokens
+    usage.llm_calls += 1
+    usage.estimated_cost_usd += cost
+
+
+def _record_into(report: UsageReport, stage: str, agent: str, counts: Tuple[int, int, int], cost: float):
+    _add(report.total, *counts, cost)
+    _add(report.by_stage.setdefault(stage, TokenUsage()), *counts, cost)
+    _add(report.by_agent.setdefault(agent, TokenUsage()), *counts, cost)
+
+
+class UsageTracker:
+    """세션별 + 전체 토큰 사용량 집계 (스레드 안전)"""
+
+    def __init__(self, budget_tokens: Optional[int] = SESSION_TOKEN_BUDGET, max_sessions: int = MAX_TRACKED_SESSIONS):
+        self.budget_tokens = budget_tokens
+        self.max_sessions = max_sessions
+        self._sessions: "OrderedDict[str, UsageReport]" = OrderedDict()
+        self._global = UsageReport()
+        self._lock = threading.Lock()
+
+    def _session(self, session_id: str) -> UsageReport:
+        report = self._sessions.get(session_id)
+        if report is None:
+            report = self._sessions[session_id] = UsageReport(session_id=session_id, budget_tokens=self.budget_tokens)
+            while len(self._sessions) > self.max_sessions:
+                self._sessions.popitem(last=False)
+        else:
+            self._sessions.move_to_end(session_id)
+        return report
+
+    def record(
+        self,
+        agent: Optional[str],
+        model: Optional[str],
+        input_tokens: int,
+        output_tokens: int,
+        cached_tokens: int = 0,
+        session_id: Optional[str] = None
+    ):
+        """LLM 호출 1회 기록 (단계는 에이전트 role로 결정)"""
+        agent = agent or "unknown"
+        stage = STAGE_BY_ROLE.get(agent, "other")
+        counts = (input_tokens, output_tokens, cached_tokens)
+        cost = estimate_cost(model, *counts)
+        with self._lock:
+            _record_into(self._global, stage, agent, counts, cost)
+            if session_id:
+                _record_into(self._session(session_id), stage, agent, counts, cost)
+
+    def mark_fallback(self, session_id: Optional[str], stage: str):
+        """예산 초과로 저비용 경로를 사용한 단계 기록"""
+        if not session_id:
+            return
+        with self._lock:
+            report = self._session(session_id)
+            if stage not in report.fallback_stages:
+                report.fallback_stages.append(stage)
+
+    def session_tokens(self, session_id: Optional[str]) -> int:
+        if not session_id:
+            return 0
+        with self._lock:
+            report = self._sessions.get(session_id)
+            return report.total.input_tokens + report.total.output_tokens if report else 0
+
+    def is_over_budget(self, session_id: Optional[str]) -> bool:
+        """세션 누적 토큰이 예산 이상인지 (예산 미설정이면 항상 False)"""
+        if not self.budget_tokens or not session_id:
+            return False
+        return self.session_tokens(session_id) >= self.budget_tokens
+
+    def get_session(self, session_id: str) -> UsageReport:
+        with self._lock:
+            report = self._sessions.get(session_id)
+            if report is None:
+                return UsageReport(session_id=session_id, budget_tokens=self.budget_tokens)
+            return report.model_copy(deep=True)
+
+    def pop_session(self, session_id: str) -> UsageReport:
+        """세션 집계를 꺼내고 제거 (배치 처리처럼 세션이 한 번만 쓰이는 경우)"""
+        with self._lock:
+            report = self._sessions.pop(session_id, None)
+        return report or UsageReport(session_id=session_id, budget_tokens=self.budget_tokens)
+
+    def get_global(self) -> UsageReport:
+        with self._lock:
+            return self._global.model_copy(deep=True)
+
+    def reset(self):
+        with self._lock:
+            self._sessions.clear()
+            self._global = UsageReport()
+
+
+usage_tracker = UsageTracker()
+
+
+@contextmanager
+def track_session(session_id: Optional[str]):
+    """이 블록 안의 LLM 호출을 session_id로 집계"""
+    token = _current_session.set(session_id)
+    try:
+        yield
+    finally:
+        _current_session.reset(token)
+
+
+def _on_llm_call_completed(source, event):
+    from crewai.types.usage_metrics import UsageMetrics
+
+    metrics = UsageMetrics.from_provider_dict(getattr(event, "usage", None))
+    if metrics is None:
+        return
+    usage_tracker.record(
+        agent=getattr(event, "agent_role", None),
+        model=event.model,
+        input_tokens=metrics.prompt_tokens,
+        output_tokens=metrics.completion_tokens,
+        cached_tokens=metrics.cached_prompt_tokens,
+        session_id=_current_session.get(),
+    )
+
+
+_listener_installed = False
+_install_lock = threading.Lock()
+
+
+def install_usage_listener():
+    """
+    CrewAI 이벤트 버스에 사용량 집계 핸들러 등록 (한 번만)
+    이벤트 버스가 없는 crewai(1.x 이전)에서는 등록하지 않음 (사용량 보고서는 0, 세션 예산 미적용)
+    """
+    global _listener_installed
+    with _install_lock:
+        if _listener_installed:
+            return
+        try:
+            from crewai.events import crewai_event_bus
+            from crewai.events.types.llm_events import LLMCallCompletedEvent
+        except ImportError:
+            return
+
+        crewai_event_bus.on(LLMCallCompletedEvent)(_on_llm_call_completed)
+        _listener_installed = True